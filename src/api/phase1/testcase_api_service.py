@@ -14,7 +14,7 @@ Updated to use PostgreSQL database storage instead of filesystem storage.
 import os
 import logging
 import json
-from typing import Dict, List, Any, Tuple, Optional, Union
+from typing import Dict, List, Any, Tuple, Optional, Union, Iterator
 from datetime import datetime
 import traceback
 import tempfile
@@ -22,7 +22,7 @@ from io import BytesIO
 import uuid
 
 # Import Flask framework
-from flask import Flask, request, jsonify, Response, send_file
+from flask import Flask, request, jsonify, Response, send_file, stream_with_context, g
 from flask_cors import CORS
 import pandas as pd
 import psycopg2
@@ -36,6 +36,7 @@ from src.common.logging.log_utils import setup_logger
 from src.common.exceptions.custom_exceptions import (
     TestCaseNotFoundError,
     MetadataError,
+    MetadataValidationError,
     VersionControlError,
     InvalidVersionError,
     DatabaseError
@@ -93,7 +94,9 @@ def handle_error(error: Exception, status_code: int = 500) -> Tuple[Dict[str, An
     error_type = error.__class__.__name__
     
     # Map certain exceptions to appropriate status codes
-    if isinstance(error, TestCaseNotFoundError):
+    if isinstance(error, MetadataValidationError):
+        status_code = 400  # Bad Request
+    elif isinstance(error, TestCaseNotFoundError):
         status_code = 404  # Not Found
     elif isinstance(error, InvalidVersionError):
         status_code = 404  # Not Found
@@ -116,6 +119,32 @@ def handle_error(error: Exception, status_code: int = 500) -> Tuple[Dict[str, An
     
     return response, status_code
 
+# Per-request database statement counters
+@app.before_request
+def start_statement_tracking():
+    """Start counting the database statements of this request."""
+    if metadata_manager is not None:
+        g.statement_counts = metadata_manager.statements.start_tracking()
+
+@app.after_request
+def add_statement_headers(response: Response) -> Response:
+    """Report the statements and round trips saved by this request in response headers."""
+    counts = g.pop("statement_counts", None)
+    if counts is not None:
+        counts = metadata_manager.statements.stop_tracking(counts)
+        response.headers["X-DB-Statements"] = str(counts["statements"])
+        response.headers["X-DB-Round-Trips"] = str(counts["round_trips"])
+        response.headers["X-DB-Round-Trips-Saved"] = str(counts["round_trips_saved"])
+        logger.debug(f"{request.method} {request.path}: {counts}")
+    return response
+
+@app.teardown_request
+def stop_statement_tracking(error=None):
+    """Drop the request's counters if the request ended without a response."""
+    counts = g.pop("statement_counts", None)
+    if counts is not None and metadata_manager is not None:
+        metadata_manager.statements.stop_tracking(counts)
+
 # Helper function to convert DataFrame to in-memory file
 def df_to_excel_bytes(df: pd.DataFrame) -> bytes:
     """
@@ -199,6 +228,141 @@ def prepare_test_case_for_db(test_case_df: pd.DataFrame, test_case_id: str = Non
     }
 
 
+# Formats that /api/reports/* can stream instead of building in memory
+STREAMING_EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+    'excel': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx')
+}
+
+# Number of rows buffered before a streamed chunk is sent to the client
+STREAMING_EXPORT_CHUNK_SIZE = 1000
+
+def _export_json_default(obj: Any) -> str:
+    """JSON fallback serializer for streamed report rows."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+# Helper function to flatten test case metadata into one row per step
+def flatten_test_case_metadata(metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Flatten test case metadata into tabular rows, one per step.
+    
+    Args:
+        metadata (Dict[str, Any]): Test case metadata with a STEPS array.
+        
+    Returns:
+        List[Dict[str, Any]]: Rows combining the test case level fields with each step.
+    """
+    header = {key: value for key, value in metadata.items() if key != "STEPS"}
+    steps = metadata.get("STEPS") or [{}]
+    return [{**header, **step} for step in steps]
+
+def _iter_ndjson_export(records: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Yield test case metadata as newline-delimited JSON chunks."""
+    buffer = []
+    for metadata in records:
+        buffer.append(json.dumps(metadata, default=_export_json_default))
+        if len(buffer) >= STREAMING_EXPORT_CHUNK_SIZE:
+            yield "\n".join(buffer) + "\n"
+            buffer = []
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+def _iter_csv_export(records: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Yield test case rows as CSV chunks, one row per step."""
+    import csv
+    from io import StringIO
+    
+    output = StringIO()
+    writer = None
+    pending = 0
+    
+    for metadata in records:
+        for row in flatten_test_case_metadata(metadata):
+            if writer is None:
+                writer = csv.DictWriter(output, fieldnames=list(row.keys()), extrasaction='ignore')
+                writer.writeheader()
+            writer.writerow({key: _export_json_default(value) if isinstance(value, datetime) else value
+                             for key, value in row.items()})
+            pending += 1
+        
+        if pending >= STREAMING_EXPORT_CHUNK_SIZE:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+            pending = 0
+    
+    if output.tell():
+        yield output.getvalue()
+
+def _iter_xlsx_export(records: Iterator[Dict[str, Any]], sheet_name: str = "Test Cases") -> Iterator[bytes]:
+    """
+    Yield an XLSX workbook built with openpyxl's write-only mode.
+    
+    Rows are spooled to a temporary file by openpyxl instead of being kept in
+    memory; the finished workbook is then sent to the client in chunks.
+    """
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    columns = None
+    
+    for metadata in records:
+        for row in flatten_test_case_metadata(metadata):
+            if columns is None:
+                columns = list(row.keys())
+                worksheet.append(columns)
+            worksheet.append([row.get(column) for column in columns])
+    
+    temp_file = tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False)
+    temp_file.close()
+    
+    try:
+        workbook.save(temp_file.name)
+        with open(temp_file.name, 'rb') as f:
+            while True:
+                chunk = f.read(64 * 1024)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        if os.path.exists(temp_file.name):
+            os.remove(temp_file.name)
+
+def stream_report_export(criteria: Dict[str, Any], output_format: str, report_name: str) -> Response:
+    """
+    Stream a report export straight from a server-side database cursor.
+    
+    Args:
+        criteria (Dict[str, Any]): Search criteria for the exported test cases.
+        output_format (str): One of STREAMING_EXPORT_FORMATS.
+        report_name (str): Prefix used for the download file name.
+        
+    Returns:
+        Response: A streaming Flask response.
+    """
+    mimetype, extension = STREAMING_EXPORT_FORMATS[output_format]
+    records = metadata_manager.iter_test_case_metadata(criteria, chunk_size=STREAMING_EXPORT_CHUNK_SIZE)
+    
+    if output_format == 'ndjson':
+        body = _iter_ndjson_export(records)
+    elif output_format == 'csv':
+        body = _iter_csv_export(records)
+    else:
+        body = _iter_xlsx_export(records)
+    
+    download_name = f"{report_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={download_name}"}
+    )
+
+
 # Health check endpoint
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -618,11 +782,15 @@ def check_in_new_version() -> Tuple[Dict[str, Any], int]:
                 changed_by
             )
             
-            # Notify owner if requested
+            # Notify owner if requested; queued, so check-in does not wait on the notifier
             if notify_owner and metadata.get("OWNER"):
-                # This would be implemented with a notification service
-                # For now, just log the notification
-                logger.info(f"Would notify owner {metadata.get('OWNER')} about new version {new_version} of test case {test_case_id}")
+                version_controller.queue_owner_notification(
+                    test_case_id,
+                    metadata.get("OWNER"),
+                    new_version,
+                    change_comment,
+                    changed_by
+                )
         
             # Return the result
             return {
@@ -1100,6 +1268,9 @@ def search_test_cases() -> Tuple[Dict[str, Any], int]:
     
     Request body:
         - criteria (Dict): Search criteria.
+        - limit (int, optional): Page size. If omitted, returns all matches.
+        - order (str, optional): Sort direction on test case number (asc, desc).
+        - cursor (str, optional): next_cursor from a previous response.
         
     Returns:
         Tuple[Dict[str, Any], int]: Search results and HTTP status code.
@@ -1113,10 +1284,52 @@ def search_test_cases() -> Tuple[Dict[str, Any], int]:
         
         criteria = request_data['criteria']
         
-        # Search test cases
-        results = metadata_manager.search_test_cases(criteria)
+        # Search test cases, letting the database apply the page boundaries
+        try:
+            page = metadata_manager.search_test_cases_page(
+                criteria,
+                limit=request_data.get('limit'),
+                order=request_data.get('order', 'asc'),
+                cursor=request_data.get('cursor')
+            )
+        except MetadataValidationError as e:
+            return {"status": "error", "message": str(e)}, 400
+        results = page["test_cases"]
         
         # Return the results
+        return {
+            "status": "success",
+            "message": f"Found {len(results)} matching test cases",
+            "data": results,
+            "next_cursor": page["next_cursor"]
+        }, 200
+        
+    except Exception as e:
+        return handle_error(e)
+
+@app.route('/api/test-cases/search/content', methods=['GET'])
+def search_test_cases_by_content() -> Tuple[Dict[str, Any], int]:
+    """
+    Full-text search over test case step text.
+    
+    Query parameters:
+        - q (str): Search text (quoted phrases, OR and -excluded terms are supported).
+        - limit (int, optional): Maximum number of test cases. Defaults to 50.
+        
+    Returns:
+        Tuple[Dict[str, Any], int]: Ranked results with highlights and HTTP status code.
+    """
+    try:
+        search_text = request.args.get('q')
+        
+        if not search_text:
+            return {"status": "error", "message": "Missing search text"}, 400
+        
+        results = metadata_manager.search_test_cases_by_content(
+            search_text,
+            limit=request.args.get('limit', type=int, default=50)
+        )
+        
         return {
             "status": "success",
             "message": f"Found {len(results)} matching test cases",
@@ -1337,6 +1550,47 @@ def remove_tags_from_test_case(test_case_id: str) -> Tuple[Dict[str, Any], int]:
     except Exception as e:
         return handle_error(e)
 
+@app.route('/api/tags/bulk', methods=['POST'])
+def bulk_tag_test_cases() -> Tuple[Dict[str, Any], int]:
+    """
+    Apply tags to many test cases at once.
+    
+    Request body:
+        - test_case_ids (List[str]): Test cases to tag.
+        - tags (List[str]): Tags to apply.
+        - replace (bool, optional): Replace the existing tags instead of adding to them.
+        
+    Returns:
+        Tuple[Dict[str, Any], int]: Result and HTTP status code.
+    """
+    try:
+        # Get request data
+        request_data = request.json
+        
+        if not request_data or 'test_case_ids' not in request_data or 'tags' not in request_data:
+            return {"status": "error", "message": "Missing test_case_ids or tags"}, 400
+        
+        test_case_ids = request_data['test_case_ids']
+        
+        # Tag all test cases in one transaction
+        created = metadata_manager.bulk_tag(
+            test_case_ids,
+            request_data['tags'],
+            replace=request_data.get('replace', False)
+        )
+        
+        return {
+            "status": "success",
+            "message": f"Tagged {len(test_case_ids)} test cases",
+            "data": {
+                "test_case_count": len(test_case_ids),
+                "associations_created": created
+            }
+        }, 200
+        
+    except Exception as e:
+        return handle_error(e)
+
 @app.route('/api/tags', methods=['GET'])
 def get_all_tags() -> Tuple[Dict[str, Any], int]:
     """
@@ -1380,21 +1634,29 @@ def get_test_case_file_content(test_case_id: str) -> Response:
         if not metadata:
             return jsonify({"status": "error", "message": f"Test case {test_case_id} not found"}), 404
         
+        if output_format == 'binary':
+            file_info = metadata_manager.get_test_case_file_info(test_case_id)
+            
+            if not file_info or not file_info["file_size"]:
+                return jsonify({"status": "error", "message": f"No file content found for test case {test_case_id}"}), 404
+            
+            # Stream raw binary content from the blob store
+            return Response(
+                stream_with_context(metadata_manager.iter_test_case_file_content(test_case_id)),
+                mimetype='application/octet-stream',
+                headers={
+                    'Content-Disposition': f'attachment; filename="{file_info["file_name"]}"',
+                    'Content-Length': str(file_info["file_size"])
+                }
+            )
+        
         # Get the file content from the database
         file_name, file_type, file_content = metadata_manager.retrieve_test_case_file_content(test_case_id)
         
         if not file_content:
             return jsonify({"status": "error", "message": f"No file content found for test case {test_case_id}"}), 404
         
-        if output_format == 'binary':
-            # Return raw binary content
-            return Response(
-                file_content,
-                mimetype='application/octet-stream',
-                headers={'Content-Disposition': f'attachment; filename="{file_name}"'}
-            )
-        
-        elif output_format == 'excel':
+        if output_format == 'excel':
             # Return as Excel file
             return send_file(
                 BytesIO(file_content),
@@ -1522,9 +1784,8 @@ def delete_test_case_file_content(test_case_id: str) -> Tuple[Dict[str, Any], in
             return {"status": "error", "message": f"Test case {test_case_id} not found"}, 404
         
         # Delete file content
-        # In a real implementation, metadata_manager would have a method to delete file content
-        # For now, simulate with a placeholder response
-        logger.info(f"Would delete file content for test case {test_case_id}")
+        if not metadata_manager.delete_test_case_file_content(test_case_id):
+            return {"status": "error", "message": f"No file content found for test case {test_case_id}"}, 404
         
         # Update metadata to reflect deleted file
         metadata_manager.update_test_case_metadata(
@@ -1578,7 +1839,10 @@ def export_metadata() -> Tuple[Dict[str, Any], int]:
             
             # If requested, include file content
             if include_file_content and test_case_ids:
-                for test_case_id in test_case_ids:
+                # Only fetch content for the test cases that have a file
+                file_info = metadata_manager.get_test_case_file_info_bulk(test_case_ids)
+                
+                for test_case_id in file_info:
                     try:
                         _, file_type, file_content = metadata_manager.retrieve_test_case_file_content(test_case_id)
                         if file_content:
@@ -1739,86 +2003,27 @@ def bulk_export_test_cases() -> Tuple[Dict[str, Any], int]:
         test_case_ids = request_data['test_case_ids']
         include_metadata = request_data.get('include_metadata', True)
         
-        # Create a temporary directory for files
-        temp_dir = tempfile.mkdtemp()
+        # Check if we want a download or API response
+        download_format = request.args.get('download', 'false').lower()
         
-        try:
-            # Create individual files for each test case
-            exported_files = []
-            
-            for test_case_id in test_case_ids:
-                try:
-                    # Get metadata
-                    metadata = metadata_manager.get_test_case_metadata(test_case_id)
-                    if not metadata:
-                        logger.warning(f"Test case not found: {test_case_id}")
-                        continue
-                    
-                    # Get file content
-                    file_name, file_type, file_content = metadata_manager.retrieve_test_case_file_content(test_case_id)
-                    
-                    if not file_content:
-                        logger.warning(f"No file content found for test case: {test_case_id}")
-                        continue
-                    
-                    # Create file path
-                    file_path = os.path.join(temp_dir, file_name or f"{test_case_id}.xlsx")
-                    
-                    # Write to file
-                    with open(file_path, 'wb') as f:
-                        f.write(file_content)
-                    
-                    exported_files.append(file_path)
-                    
-                except Exception as case_error:
-                    logger.error(f"Failed to export test case {test_case_id}: {str(case_error)}")
-                    # Continue with next test case
-            
-            # Export metadata if requested
-            if include_metadata:
-                metadata_path = os.path.join(temp_dir, "metadata.json")
-                metadata_manager.export_metadata_to_json(metadata_path, test_case_ids)
-                exported_files.append(metadata_path)
-            
-            # Create ZIP file
-            zip_file_path = os.path.join(temp_dir, f"test_cases_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip")
-            
-            import zipfile
-            with zipfile.ZipFile(zip_file_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in exported_files:
-                    zipf.write(file_path, os.path.basename(file_path))
-            
-            # Check if we want a download or API response
-            download_format = request.args.get('download', 'false').lower()
+        if download_format == 'true' or download_format == 'zip':
+            # Stream the archive as it is built; files are fetched from the database in parallel
+            download_name = f"test_cases_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
             
-            if download_format == 'true' or download_format == 'zip':
-                # Return ZIP file for download
-                with open(zip_file_path, 'rb') as f:
-                    zip_content = f.read()
-                
-                return send_file(
-                    BytesIO(zip_content),
-                    mimetype='application/zip',
-                    as_attachment=True,
-                    download_name=os.path.basename(zip_file_path)
-                )
-            else:
-                # Return result as JSON
-                return {
-                    "status": "success",
-                    "message": f"Exported {len(exported_files)} files for {len(test_case_ids)} test cases",
-                    "data": {
-                        "test_case_count": len(test_case_ids),
-                        "file_count": len(exported_files),
-                        "exported_test_cases": [tc_id for tc_id in test_case_ids if metadata_manager.get_test_case_metadata(tc_id)]
-                    }
-                }, 200
-                
-        finally:
-            # Clean up temporary directory
-            import shutil
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+            return Response(
+                stream_with_context(metadata_manager.iter_test_cases_zip(test_case_ids, include_metadata)),
+                mimetype='application/zip',
+                headers={"Content-Disposition": f"attachment; filename={download_name}"}
+            )
+        
+        # Report what the archive would contain from one lookup, without building it
+        summary = metadata_manager.summarize_test_cases_export(test_case_ids)
+        
+        return {
+            "status": "success",
+            "message": f"Exported {summary['file_count']} files for {len(test_case_ids)} test cases",
+            "data": summary
+        }, 200
         
     except Exception as e:
         return handle_error(e)
@@ -1831,6 +2036,8 @@ def bulk_import_test_cases() -> Tuple[Dict[str, Any], int]:
     Request body for multipart/form-data:
         - files: List of files to import.
         - zip_file: ZIP archive containing files to import.
+        - parallel (bool, optional): Parse Excel files in parallel worker processes.
+        - max_workers (int, optional): Number of worker processes for parallel parsing.
         
     Returns:
         Tuple[Dict[str, Any], int]: Result and HTTP status code.
@@ -1889,18 +2096,25 @@ def bulk_import_test_cases() -> Tuple[Dict[str, Any], int]:
             # Get uploader from form or JSON
             uploaded_by = request.form.get('uploaded_by') if request.form else request.json.get('uploaded_by') if request.json else None
             
+            # Excel files are parsed (optionally in parallel) and written in bulk
+            excel_files = [file_path for file_path in files if os.path.splitext(file_path)[1].lower() in ['.xlsx', '.xls']]
+            
+            if excel_files:
+                test_case_ids.extend(metadata_manager.bulk_import_test_cases(
+                    excel_files,
+                    uploaded_by=uploaded_by,
+                    parallel=request.form.get('parallel', 'false').lower() == 'true',
+                    max_workers=request.form.get('max_workers', type=int)
+                ))
+            
             for file_path in files:
                 try:
                     # Import based on file extension
                     file_ext = os.path.splitext(file_path)[1].lower()
                     
                     if file_ext in ['.xlsx', '.xls']:
-                        # Import Excel as test case
-                        test_case_id = metadata_manager.import_test_case_from_excel(
-                            file_path,
-                            uploaded_by=uploaded_by
-                        )
-                        test_case_ids.append(test_case_id)
+                        # Already imported above
+                        continue
                     
                     elif file_ext == '.json':
                         # Check if it's metadata JSON
@@ -1979,6 +2193,7 @@ def get_system_stats() -> Tuple[Dict[str, Any], int]:
             "data": {
                 "test_cases": test_case_stats,
                 "database": db_stats,
+                "metadata_cache": metadata_manager.get_cache_metrics(),
                 "connection_status": "connected" if db_connection else "disconnected",
                 "timestamp": datetime.now().isoformat()
             }
@@ -2003,7 +2218,11 @@ def get_test_case_report() -> Tuple[Dict[str, Any], int]:
         - modified_before (str, optional): Filter by modification date.
         - limit (int, optional): Limit number of results.
         - offset (int, optional): Offset for pagination.
-        - format (str, optional): Output format (json, excel, pdf).
+        - order (str, optional): Sort direction on test case number (asc, desc).
+        - cursor (str, optional): next_cursor from a previous response.
+        - format (str, optional): Output format (json, excel, pdf, ndjson, csv).
+        - stream (bool, optional): Stream the full export from a server-side cursor.
+          Always on for ndjson and csv; pagination parameters are ignored.
         
     Returns:
         Tuple[Dict[str, Any], int]: Report data and HTTP status code.
@@ -2048,18 +2267,26 @@ def get_test_case_report() -> Tuple[Dict[str, Any], int]:
             else:
                 criteria["MODIFIED_DATE"] = {"op": "<", "value": request.args.get('modified_before')}
         
-        # Search test cases with criteria
-        results = metadata_manager.search_test_cases(criteria)
-        
-        # Apply pagination if requested
-        limit = request.args.get('limit', type=int)
-        offset = request.args.get('offset', type=int, default=0)
+        # Large exports are streamed without loading the result set
+        output_format = request.args.get('format', 'json').lower()
+        stream = request.args.get('stream', 'false').lower() == 'true'
         
-        if limit is not None:
-            results = results[offset:offset+limit]
+        if output_format in ('ndjson', 'csv') or (stream and output_format in STREAMING_EXPORT_FORMATS):
+            return stream_report_export(criteria, output_format, "test_case_report")
         
-        # Get requested format
-        output_format = request.args.get('format', 'json').lower()
+        # Search test cases with criteria, pushing pagination into the query.
+        # limit and offset are passed as given so malformed values are rejected, not ignored
+        try:
+            page = metadata_manager.search_test_cases_page(
+                criteria,
+                limit=request.args.get('limit'),
+                order=request.args.get('order', 'asc'),
+                cursor=request.args.get('cursor'),
+                offset=request.args.get('offset', 0)
+            )
+        except MetadataValidationError as e:
+            return {"status": "error", "message": str(e)}, 400
+        results = page["test_cases"]
         
         if output_format == 'json':
             # Return as JSON
@@ -2067,7 +2294,8 @@ def get_test_case_report() -> Tuple[Dict[str, Any], int]:
                 "status": "success",
                 "data": {
                     "count": len(results),
-                    "test_cases": results
+                    "test_cases": results,
+                    "next_cursor": page["next_cursor"]
                 }
             }, 200
             
@@ -2205,7 +2433,9 @@ def get_execution_status_report() -> Tuple[Dict[str, Any], int]:
         - executed_after (str, optional): Filter by execution date.
         - executed_before (str, optional): Filter by execution date.
         - result (str, optional): Filter by execution result.
-        - format (str, optional): Output format (json, excel, pdf).
+        - format (str, optional): Output format (json, excel, ndjson, csv).
+        - stream (bool, optional): Stream the matching test cases from a server-side
+          cursor instead of building the summary report. Always on for ndjson and csv.
         
     Returns:
         Tuple[Dict[str, Any], int]: Report data and HTTP status code.
@@ -2239,6 +2469,13 @@ def get_execution_status_report() -> Tuple[Dict[str, Any], int]:
             else:
                 criteria["LAST_EXECUTION_DATE"] = {"op": "<", "value": request.args.get('executed_before')}
         
+        # Large exports are streamed without loading the result set
+        output_format = request.args.get('format', 'json').lower()
+        stream = request.args.get('stream', 'false').lower() == 'true'
+        
+        if output_format in ('ndjson', 'csv') or (stream and output_format in STREAMING_EXPORT_FORMATS):
+            return stream_report_export(criteria, output_format, "execution_status_report")
+        
         # Search test cases with criteria
         results = metadata_manager.search_test_cases(criteria)
         
@@ -2261,9 +2498,6 @@ def get_execution_status_report() -> Tuple[Dict[str, Any], int]:
         executed_count = sum(len(items) for status, items in results_by_status.items() if status != "Not Executed")
         summary["execution_rate"] = (executed_count / len(results)) * 100 if len(results) > 0 else 0
         
-        # Get requested format
-        output_format = request.args.get('format', 'json').lower()
-        
         if output_format == 'json':
             # Return as JSON
             return {
@@ -2370,8 +2604,11 @@ def perform_database_maintenance() -> Tuple[Dict[str, Any], int]:
             output_path = request_data['output_path']
             include_files = request_data.get('include_files', True)
             
-            # Create backup
-            result = metadata_manager.create_backup(output_path, include_files)
+            # An incremental backup builds on the backup at base_path
+            base_path = request_data.get('base_path')
+            
+            # Create backup (re-running it on an interrupted backup resumes it)
+            result = metadata_manager.create_backup(output_path, include_files, base_dir=base_path)
             
             return {
                 "status": "success",
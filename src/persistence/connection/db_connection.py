@@ -1,12 +1,445 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Database Connection Module for the Watsonx IPG Testing platform.
+
+This module owns the PostgreSQL connection pools shared by every persistence
+call site. There is one pool per DSN per process, obtained with get_pool().
+Connections are checked out with the pool's connection() context manager (or
+getconn/putconn), health checked on borrow, retired after a maximum lifetime,
+and evicted once idle for too long.
+
+Pool settings default to the DB_POOL_* environment variables.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+
 import psycopg2
-from psycopg2.extras import RealDictCursor
-
-def get_db_connection():
-    conn = psycopg2.connect(
-        dbname="ai_data",
-        user="postgres",
-        password="secure_password",
-        host="localhost",
-        port="5432"
-    )
-    return conn
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, parse_dsn, make_dsn
+
+from src.common.exceptions.custom_exceptions import DatabaseError
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# DSN used when a caller does not name a database and DATABASE_URL is unset
+DEFAULT_DSN = make_dsn(
+    dbname="ai_data",
+    user="postgres",
+    password="secure_password",
+    host="localhost",
+    port="5432"
+)
+
+
+def _pool_settings_from_env() -> Dict[str, Any]:
+    return {
+        "min_size": int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+        "max_size": int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+        "max_lifetime": float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+        "idle_timeout": float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300')),
+        "health_check_after": float(os.getenv('DB_POOL_HEALTH_CHECK_AFTER', '30')),
+        "timeout": float(os.getenv('DB_POOL_TIMEOUT', '30'))
+    }
+
+
+class _PooledConnection:
+    """A pooled connection and its timestamps (time.monotonic)."""
+
+    __slots__ = ("conn", "created_at", "last_used_at")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = self.last_used_at = time.monotonic()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of connections to one database.
+
+    Exposes getconn/putconn/closeall like psycopg2's pools, plus a connection()
+    context manager. Idle connections are reused most-recently-used first, so
+    the least recently used ones age out under idle_timeout.
+    """
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10,
+                 max_lifetime: float = 1800, idle_timeout: float = 300,
+                 health_check_after: float = 30, timeout: float = 30):
+        """
+        Initialize the pool and open min_size connections.
+
+        Args:
+            dsn (str): libpq connection string or URI.
+            min_size (int, optional): Connections kept open even when idle.
+            max_size (int, optional): Maximum open connections; further borrowers wait.
+            max_lifetime (float, optional): Seconds after which a connection is
+                closed instead of reused. 0 disables the limit.
+            idle_timeout (float, optional): Seconds an idle connection above
+                min_size is kept before being closed.
+            health_check_after (float, optional): A connection idle for longer than
+                this is pinged with SELECT 1 before being handed out.
+            timeout (float, optional): Seconds to wait for a free connection.
+
+        Raises:
+            DatabaseError: If the initial connections cannot be opened.
+        """
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size, 1)
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.timeout = timeout
+
+        self.closed = False
+        self._idle = deque()
+        self._in_use = {}
+        self._size = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "connections_created": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "health_checks": 0,
+            "discarded_unhealthy": 0,
+            "discarded_expired": 0,
+            "discarded_idle": 0,
+            "discarded_broken": 0
+        }
+
+        for _ in range(min_size):
+            self._size += 1
+            try:
+                self._idle.append(self._connect())
+            except Exception:
+                self._size -= 1
+                self.closeall()
+                raise
+
+    @property
+    def name(self) -> str:
+        """The DSN without its password, for logs and stats."""
+        try:
+            params = parse_dsn(self.dsn)
+        except Exception:
+            return "<unparseable dsn>"
+        return (f"{params.get('user', '')}@{params.get('host', 'localhost')}:"
+                f"{params.get('port', '5432')}/{params.get('dbname', '')}")
+
+    def _connect(self) -> _PooledConnection:
+        try:
+            conn = psycopg2.connect(self.dsn)
+        except Exception as e:
+            logger.error(f"Failed to open connection to {self.name}: {str(e)}")
+            raise DatabaseError(f"Failed to connect to database {self.name}: {str(e)}")
+
+        with self._cond:
+            self._stats["connections_created"] += 1
+        return _PooledConnection(conn)
+
+    def _is_expired(self, entry: _PooledConnection, now: float) -> bool:
+        return bool(self.max_lifetime) and now - entry.created_at > self.max_lifetime
+
+    def _discard(self, entry: _PooledConnection, reason: str):
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+
+        with self._cond:
+            self._size -= 1
+            self._stats[f"discarded_{reason}"] += 1
+            self._cond.notify()
+
+    def _evict_idle(self, now: float):
+        # Called with the lock held; the oldest idle connections are on the left
+        while (self._idle and self._size > self.min_size
+               and now - self._idle[0].last_used_at > self.idle_timeout):
+            self._discard(self._idle.popleft(), "idle")
+
+    def _acquire(self, deadline: float):
+        """Take an idle connection, or reserve a slot for a new one. Returns (entry, reserved)."""
+        with self._cond:
+            waited = False
+            while True:
+                if self.closed:
+                    raise DatabaseError(f"Connection pool for {self.name} is closed")
+
+                now = time.monotonic()
+                self._evict_idle(now)
+
+                while self._idle:
+                    entry = self._idle.pop()
+                    if entry.conn.closed:
+                        self._discard(entry, "broken")
+                    elif self._is_expired(entry, now):
+                        self._discard(entry, "expired")
+                    else:
+                        return entry, False
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, True
+
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise DatabaseError(
+                        f"Timed out waiting for a connection to {self.name} "
+                        f"({self.max_size} in use)"
+                    )
+
+                if not waited:
+                    self._stats["waits"] += 1
+                    waited = True
+                self._cond.wait(remaining)
+
+    def _is_healthy(self, entry: _PooledConnection) -> bool:
+        conn = entry.conn
+        if conn.closed:
+            return False
+
+        try:
+            if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+
+            if time.monotonic() - entry.last_used_at > self.health_check_after:
+                with self._cond:
+                    self._stats["health_checks"] += 1
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                cursor.close()
+                conn.rollback()
+
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy connection to {self.name}: {str(e)}")
+            return False
+
+    def getconn(self, timeout: float = None):
+        """
+        Borrow a connection. It must be given back with putconn.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free connection.
+                Defaults to the pool timeout.
+
+        Returns:
+            Connection: A healthy psycopg2 connection.
+
+        Raises:
+            DatabaseError: If the pool is closed, exhausted past the timeout,
+                or a new connection cannot be opened.
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+
+        while True:
+            entry, reserved = self._acquire(deadline)
+
+            if reserved:
+                try:
+                    entry = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(entry):
+                self._discard(entry, "unhealthy")
+                continue
+
+            with self._cond:
+                self._in_use[id(entry.conn)] = entry
+                self._stats["checkouts"] += 1
+            return entry.conn
+
+    def putconn(self, conn, close: bool = False):
+        """
+        Give a borrowed connection back to the pool.
+
+        Any open transaction is rolled back. The connection is closed instead of
+        kept if close is True, it is broken, it has outlived max_lifetime, or the
+        pool has been closed.
+
+        Args:
+            conn: The connection returned by getconn.
+            close (bool, optional): Close the connection instead of reusing it.
+        """
+        with self._cond:
+            entry = self._in_use.pop(id(conn), None)
+
+        if entry is None:
+            logger.warning(f"Connection returned to {self.name} was not borrowed from it")
+            return
+
+        if not close and not conn.closed:
+            try:
+                if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                close = True
+
+        now = time.monotonic()
+        if close or conn.closed:
+            self._discard(entry, "broken")
+        elif self._is_expired(entry, now):
+            self._discard(entry, "expired")
+        elif self.closed:
+            self._discard(entry, "idle")
+        else:
+            entry.last_used_at = now
+            with self._cond:
+                self._idle.append(entry)
+                self._evict_idle(now)
+                self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: float = None) -> Iterator[Any]:
+        """
+        Borrow a connection for the duration of a with block.
+
+        The transaction is committed when the block succeeds and rolled back
+        when it raises; the connection is then returned to the pool.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free connection.
+
+        Yields:
+            Connection: A healthy psycopg2 connection.
+        """
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            raise
+        finally:
+            self.putconn(conn)
+
+    def closeall(self):
+        """
+        Close the pool. Idle connections are closed now, borrowed ones when returned.
+        """
+        with self._cond:
+            self.closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._cond.notify_all()
+
+        for entry in idle:
+            self._discard(entry, "idle")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dict[str, Any]: Counters since the pool was created plus current
+                open, idle and in-use connection counts.
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                "database": self.name,
+                "open": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "closed": self.closed
+            })
+        return stats
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(dsn: str = None, **settings) -> ConnectionPool:
+    """
+    Get the process-wide pool for a database, creating it on first use.
+
+    Args:
+        dsn (str, optional): libpq connection string or URI. Defaults to DATABASE_URL.
+        **settings: ConnectionPool settings, used only when the pool is created.
+            Missing settings come from the DB_POOL_* environment variables.
+
+    Returns:
+        ConnectionPool: The shared pool.
+
+    Raises:
+        DatabaseError: If the pool has to be created and cannot connect.
+    """
+    dsn = dsn or os.getenv('DATABASE_URL') or DEFAULT_DSN
+
+    with _pools_lock:
+        pool = _pools.get(dsn)
+        if pool is None or pool.closed:
+            pool = ConnectionPool(dsn, **{**_pool_settings_from_env(), **settings})
+            _pools[dsn] = pool
+            logger.info(f"Created connection pool for {pool.name}")
+
+    return pool
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get statistics of every pool in this process.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Pool stats keyed by database (without passwords).
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.stats() for pool in pools}
+
+
+def close_all_pools():
+    """
+    Close every pool in this process, e.g. at shutdown.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        pool.closeall()
+
+
+def get_db_connection(dsn: str = None):
+    """
+    Borrow a connection from the shared pool.
+
+    Prefer get_pool(dsn).connection() as a context manager; connections taken
+    here must be given back with release_db_connection.
+
+    Args:
+        dsn (str, optional): libpq connection string or URI. Defaults to DATABASE_URL.
+
+    Returns:
+        Connection: A pooled psycopg2 connection.
+    """
+    return get_pool(dsn).getconn()
+
+
+def release_db_connection(conn, dsn: str = None):
+    """
+    Give a connection taken with get_db_connection back to the shared pool.
+
+    Args:
+        conn: The connection.
+        dsn (str, optional): The DSN it was borrowed with.
+    """
+    get_pool(dsn).putconn(conn)
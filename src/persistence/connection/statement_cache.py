@@ -0,0 +1,432 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Statement Cache Module for the Watsonx IPG Testing platform.
+
+This module sits between callers and psycopg2 cursors. It prepares hot queries
+once per connection with server-side PREPARE, so repeated calls skip parsing
+and planning, and sends batches of parameter sets in as few round trips as
+possible (execute_values for "VALUES %s" inserts, execute_batch otherwise).
+
+Every statement is counted, globally and per tracking scope (for example one
+HTTP request), so callers can see how many round trips and parses were saved.
+"""
+
+import re
+import math
+import logging
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple, Iterator, Iterable
+
+import psycopg2
+from psycopg2.errors import FeatureNotSupported
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INERROR
+from psycopg2.extras import execute_batch, execute_values
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Statements that PREPARE accepts
+PREPARABLE_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "VALUES")
+
+# Maximum number of distinct query texts whose usage is counted
+MAX_TRACKED_QUERIES = 1000
+
+_PLACEHOLDER_PATTERN = re.compile(r"%%|%s|%\(")
+_VALUES_PLACEHOLDER_PATTERN = re.compile(r"\bVALUES\s+%s", re.IGNORECASE)
+
+# Statement names are unique per process, since caches can share pooled connections
+_statement_names = itertools.count(1)
+
+_COUNTERS = (
+    "statements",
+    "round_trips",
+    "prepares",
+    "prepared_executions",
+    "batches"
+)
+
+
+def to_server_query(query: str, has_params: bool = True) -> Optional[Tuple[str, int]]:
+    """
+    Convert a psycopg2 query into the body of a PREPARE statement.
+
+    Args:
+        query (str): Query using %s placeholders.
+        has_params (bool, optional): Whether the query is executed with parameters.
+            Without parameters psycopg2 sends the text as is.
+
+    Returns:
+        Optional[Tuple[str, int]]: (query with $n placeholders, number of parameters),
+            or None if the query cannot be prepared.
+    """
+    stripped = query.strip().rstrip(";")
+    keyword = stripped.split(None, 1)[0].upper() if stripped else ""
+
+    # Named placeholders, dollar quoting and multi-statement strings are left alone
+    if keyword not in PREPARABLE_STATEMENTS or "$" in stripped or ";" in stripped:
+        return None
+
+    if not has_params:
+        return (stripped, 0) if "%" not in stripped else None
+
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        token = match.group(0)
+        if token == "%%":
+            return "%"
+        if token == "%(":
+            raise ValueError("named placeholder")
+        count += 1
+        return f"${count}"
+
+    try:
+        return _PLACEHOLDER_PATTERN.sub(replace, stripped), count
+    except ValueError:
+        return None
+
+
+class StatementCache:
+    """
+    Per-connection prepared statement cache with batched execution and counters.
+
+    A query is prepared on a connection once it has been executed
+    prepare_threshold times in this process. Each connection keeps at most
+    max_prepared statements, least recently used first out. Prepared
+    statements live as long as their session, so pooled connections keep
+    them across checkouts.
+    """
+
+    def __init__(self, enabled: bool = True, prepare_threshold: int = 5,
+                 max_prepared: int = 100, page_size: int = 100):
+        """
+        Initialize the statement cache.
+
+        Args:
+            enabled (bool, optional): Prepare hot queries. Batching and counters
+                work either way.
+            prepare_threshold (int, optional): Executions of a query before it is prepared.
+            max_prepared (int, optional): Prepared statements kept per connection.
+            page_size (int, optional): Parameter sets sent per round trip by execute_many.
+        """
+        self.enabled = enabled
+        self.prepare_threshold = max(1, prepare_threshold)
+        self.max_prepared = max(1, max_prepared)
+        self.page_size = max(1, page_size)
+
+        self._lock = threading.Lock()
+        self._prepared = weakref.WeakKeyDictionary()
+        # Names of invalidated statements whose connection was in a failed transaction
+        self._stale = weakref.WeakKeyDictionary()
+        self._usage = OrderedDict()
+        self._unpreparable = set()
+        self._totals = dict.fromkeys(_COUNTERS, 0)
+        self._local = threading.local()
+
+    def _count(self, **increments):
+        with self._lock:
+            for key, value in increments.items():
+                self._totals[key] += value
+
+        for scope in getattr(self._local, "scopes", ()):
+            for key, value in increments.items():
+                scope[key] += value
+
+    def _note_usage(self, key: Tuple[str, bool]) -> int:
+        with self._lock:
+            count = self._usage.pop(key, 0) + 1
+            self._usage[key] = count
+            if len(self._usage) > MAX_TRACKED_QUERIES:
+                self._usage.popitem(last=False)
+            return count
+
+    def _mark_unpreparable(self, key: Tuple[str, bool]):
+        with self._lock:
+            if len(self._unpreparable) >= MAX_TRACKED_QUERIES:
+                self._unpreparable.clear()
+            self._unpreparable.add(key)
+
+    def _get_statement(self, cursor, query: str, has_params: bool,
+                       force: bool = False) -> Optional[Tuple[str, int]]:
+        """
+        Return the prepared statement for a query on the cursor's connection,
+        preparing it if it has become hot.
+
+        Args:
+            cursor: Cursor of the current transaction.
+            query (str): The query text.
+            has_params (bool): Whether the query is executed with parameters.
+            force (bool, optional): Prepare regardless of the usage count.
+
+        Returns:
+            Optional[Tuple[str, int]]: (statement name, number of parameters), or None
+                to execute the query text directly.
+        """
+        conn = cursor.connection
+        key = (query, has_params)
+
+        with self._lock:
+            statements = self._prepared.get(conn)
+            if statements is not None and key in statements:
+                statements.move_to_end(key)
+                return statements[key]
+            if key in self._unpreparable:
+                return None
+
+        if conn.autocommit or conn.get_transaction_status() == TRANSACTION_STATUS_INERROR:
+            return None
+
+        self._deallocate_stale(cursor)
+
+        if self._note_usage(key) < self.prepare_threshold and not force:
+            return None
+
+        converted = to_server_query(query, has_params)
+        if converted is None:
+            self._mark_unpreparable(key)
+            return None
+
+        server_query, param_count = converted
+        name = f"stmt_{next(_statement_names)}"
+
+        # A query PREPARE rejects (e.g. untyped parameters) must not abort the caller's transaction
+        try:
+            cursor.execute(
+                f"SAVEPOINT stmt_prepare; PREPARE {name} AS {server_query}; RELEASE SAVEPOINT stmt_prepare"
+            )
+        except psycopg2.Error as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT stmt_prepare")
+            self._count(round_trips=2)
+            logger.debug(f"Query cannot be prepared, executing it directly: {str(e)}")
+            self._mark_unpreparable(key)
+            return None
+
+        self._count(prepares=1, round_trips=1)
+
+        with self._lock:
+            statements = self._prepared.setdefault(conn, OrderedDict())
+            statements[key] = (name, param_count)
+            evicted = statements.popitem(last=False)[1][0] if len(statements) > self.max_prepared else None
+
+        if evicted:
+            cursor.execute(f"DEALLOCATE {evicted}")
+            self._count(round_trips=1)
+
+        return name, param_count
+
+    def _forget(self, conn, key: Tuple[str, bool]):
+        with self._lock:
+            statements = self._prepared.get(conn)
+            if statements is not None:
+                statements.pop(key, None)
+
+    def _deallocate_stale(self, cursor):
+        """
+        Deallocate statements that were invalidated while their connection's
+        transaction could not run DEALLOCATE.
+
+        Args:
+            cursor: Cursor of a usable transaction on the connection.
+        """
+        conn = cursor.connection
+        with self._lock:
+            names = self._stale.pop(conn, None)
+
+        if names:
+            cursor.execute("; ".join(f"DEALLOCATE {name}" for name in names))
+            self._count(round_trips=1)
+
+    @staticmethod
+    def _execute_prepared(cursor, name: str, param_count: int, params: Any):
+        statement = f"EXECUTE {name} ({', '.join(['%s'] * param_count)})" if param_count else f"EXECUTE {name}"
+        cursor.execute(statement, params if param_count else None)
+
+    def execute(self, cursor, query: str, params: Any = None):
+        """
+        Execute a query, through its prepared statement if it has one.
+
+        A prepared statement whose plan was invalidated by a schema change
+        ("cached plan must not change result type") is forgotten and
+        deallocated. Outside a transaction the query is then prepared again
+        and retried once. Inside a transaction the failure has already
+        aborted the caller's work, so the error is raised and the statement is
+        deallocated and prepared again the next time the query runs.
+
+        Args:
+            cursor: Cursor of the current transaction. Results are read from it as usual.
+            query (str): Query using %s placeholders.
+            params (Any, optional): Query parameters.
+
+        Raises:
+            psycopg2.Error: If the query fails, including FeatureNotSupported for
+                a statement invalidated inside a transaction.
+        """
+        has_params = bool(params)
+        conn = cursor.connection
+        # Taken first: preparing the statement opens a transaction of its own
+        in_transaction = conn.get_transaction_status() != TRANSACTION_STATUS_IDLE
+        statement = self._get_statement(cursor, query, has_params) if self.enabled else None
+
+        if statement is None:
+            cursor.execute(query, params if has_params else None)
+            self._count(statements=1, round_trips=1)
+            return
+
+        name, param_count = statement
+        try:
+            self._execute_prepared(cursor, name, param_count, params)
+        except FeatureNotSupported:
+            # "cached plan must not change result type": the table changed under the plan
+            self._forget(conn, (query, has_params))
+            if in_transaction:
+                # The aborted transaction rejects DEALLOCATE until the caller rolls back
+                with self._lock:
+                    self._stale.setdefault(conn, []).append(name)
+                self._count(round_trips=1)
+                raise
+
+            # The EXECUTE was the only statement, so rolling back loses nothing
+            conn.rollback()
+            cursor.execute(f"DEALLOCATE {name}")
+            self._count(round_trips=3)
+            logger.debug(f"Prepared statement {name} was invalidated by a schema change, preparing it again")
+
+            statement = self._get_statement(cursor, query, has_params, force=True)
+            if statement is None:
+                cursor.execute(query, params if has_params else None)
+                self._count(statements=1, round_trips=1)
+                return
+            self._execute_prepared(cursor, *statement, params)
+
+        self._count(statements=1, round_trips=1, prepared_executions=1)
+
+    def execute_many(self, cursor, query: str, params_list: Iterable[Any],
+                     page_size: int = None) -> int:
+        """
+        Execute a query once per parameter set, several sets per round trip.
+
+        "INSERT ... VALUES %s" queries are expanded into multi-row inserts with
+        execute_values; other queries are sent in pages with execute_batch,
+        through a prepared statement when possible.
+
+        Args:
+            cursor: Cursor of the current transaction.
+            query (str): Query using %s placeholders (or a single VALUES %s).
+            params_list (Iterable[Any]): Parameter sets.
+            page_size (int, optional): Parameter sets per round trip.
+
+        Returns:
+            int: Number of parameter sets executed.
+
+        Raises:
+            psycopg2.Error: If any statement fails.
+        """
+        params_list = list(params_list)
+        page_size = page_size or self.page_size
+
+        if not params_list:
+            return 0
+
+        if _VALUES_PLACEHOLDER_PATTERN.search(query):
+            execute_values(cursor, query, params_list, page_size=page_size)
+        else:
+            statement = self._get_statement(cursor, query, True, force=True) if self.enabled else None
+
+            if statement is None:
+                execute_batch(cursor, query, params_list, page_size=page_size)
+            else:
+                name, param_count = statement
+                execute_batch(
+                    cursor,
+                    f"EXECUTE {name} ({', '.join(['%s'] * param_count)})",
+                    params_list,
+                    page_size=page_size
+                )
+                self._count(prepared_executions=len(params_list))
+
+        self._count(
+            statements=len(params_list),
+            round_trips=math.ceil(len(params_list) / page_size),
+            batches=1
+        )
+        return len(params_list)
+
+    def start_tracking(self) -> Dict[str, int]:
+        """
+        Start counting the statements of the current thread.
+
+        Returns:
+            Dict[str, int]: Counters updated in place until stop_tracking is called.
+        """
+        counts = dict.fromkeys(_COUNTERS, 0)
+        if not hasattr(self._local, "scopes"):
+            self._local.scopes = []
+        self._local.scopes.append(counts)
+        return counts
+
+    def stop_tracking(self, counts: Dict[str, int]) -> Dict[str, int]:
+        """
+        Stop a tracking scope started with start_tracking.
+
+        Args:
+            counts (Dict[str, int]): The counters returned by start_tracking.
+
+        Returns:
+            Dict[str, int]: The final counters, with derived savings.
+        """
+        scopes = getattr(self._local, "scopes", [])
+        for index, scope in enumerate(scopes):
+            if scope is counts:
+                del scopes[index]
+                break
+
+        return self._with_savings(counts)
+
+    @contextmanager
+    def track(self) -> Iterator[Dict[str, int]]:
+        """
+        Count the statements executed by the current thread within a block.
+
+        Yields:
+            Dict[str, int]: Counters for the block, updated in place.
+        """
+        counts = self.start_tracking()
+        try:
+            yield counts
+        finally:
+            self.stop_tracking(counts)
+            counts.update(self._with_savings(counts))
+
+    @staticmethod
+    def _with_savings(counts: Dict[str, int]) -> Dict[str, int]:
+        result = dict(counts)
+        # Without the cache and batching every statement costs one round trip and one parse
+        result["round_trips_saved"] = max(0, counts["statements"] - counts["round_trips"])
+        result["parses_saved"] = max(0, counts["prepared_executions"] - counts["prepares"])
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get process-wide statement counters.
+
+        Returns:
+            Dict[str, Any]: Counters, derived savings and cache settings.
+        """
+        with self._lock:
+            totals = dict(self._totals)
+            prepared = sum(len(statements) for statements in self._prepared.values())
+
+        metrics = self._with_savings(totals)
+        metrics.update({
+            "enabled": self.enabled,
+            "prepare_threshold": self.prepare_threshold,
+            "prepared_statements": prepared
+        })
+        return metrics
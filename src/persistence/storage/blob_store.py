@@ -0,0 +1,437 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Blob Store Module for the Watsonx IPG Testing platform.
+
+This module stores file contents (test case spreadsheets, etc.) by content
+address. Each blob is keyed by the SHA-256 of its bytes, written once and
+reference counted in the test_case_blobs table, so identical uploads share a
+single copy. The bytes themselves live in a pluggable backend: PostgreSQL large
+objects or a local filesystem directory. Reads and writes are streamed in chunks.
+
+All methods take a psycopg2 connection owned by the caller, so that blob
+references change in the same transaction as the rows that point at them.
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+from typing import Tuple, Iterator, Union, BinaryIO
+
+from src.common.exceptions.custom_exceptions import DatabaseError
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Default chunk size for streamed reads and writes
+CHUNK_SIZE = 1024 * 1024
+
+# Streamed uploads are spooled to disk above this size while being hashed
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+class BlobBackend:
+    """
+    Base class for blob backends. A backend stores bytes under a location
+    string and knows nothing about hashing or reference counts.
+    """
+
+    name = None
+
+    # Whether deletes are part of the database transaction
+    transactional = False
+
+    def write(self, conn, sha256: str, chunks: Iterator[bytes]) -> str:
+        """
+        Write a blob.
+
+        Args:
+            conn: Database connection of the current transaction.
+            sha256 (str): Content hash of the blob.
+            chunks (Iterator[bytes]): The content, in chunks.
+
+        Returns:
+            str: Backend location of the stored blob.
+        """
+        raise NotImplementedError
+
+    def read(self, conn, location: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Read a blob in chunks.
+
+        Args:
+            conn: Database connection of the current transaction.
+            location (str): Backend location returned by write.
+            chunk_size (int, optional): Bytes per chunk.
+
+        Yields:
+            bytes: The content, in chunks.
+        """
+        raise NotImplementedError
+
+    def delete(self, conn, location: str):
+        """
+        Delete a blob. Transactional backends are called inside the transaction
+        that removes the metadata row; others only after it has committed.
+
+        Args:
+            conn: Database connection.
+            location (str): Backend location returned by write.
+        """
+        raise NotImplementedError
+
+    def detach(self, location: str) -> str:
+        """
+        Move a blob of a non-transactional backend out of its location, so that
+        the location can be reused as soon as the metadata row is gone.
+
+        Args:
+            location (str): Backend location returned by write.
+
+        Returns:
+            str: Location of the detached blob (pass to delete or reattach), or
+                None if the blob does not exist.
+        """
+        raise NotImplementedError
+
+    def reattach(self, location: str, detached: str):
+        """
+        Undo detach after the metadata row could not be removed.
+
+        Args:
+            location (str): Original backend location.
+            detached (str): Location returned by detach.
+        """
+        raise NotImplementedError
+
+
+class PostgresLargeObjectBackend(BlobBackend):
+    """Stores blobs as PostgreSQL large objects; the location is the object OID."""
+
+    name = "postgres"
+    transactional = True
+
+    def write(self, conn, sha256: str, chunks: Iterator[bytes]) -> str:
+        lobject = conn.lobject(0, 'wb')
+        try:
+            for chunk in chunks:
+                lobject.write(chunk)
+            return str(lobject.oid)
+        finally:
+            lobject.close()
+
+    def read(self, conn, location: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        lobject = conn.lobject(int(location), 'rb')
+        try:
+            while True:
+                chunk = lobject.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            lobject.close()
+
+    def delete(self, conn, location: str):
+        conn.lobject(int(location), 'rb').unlink()
+
+
+class FileSystemBackend(BlobBackend):
+    """Stores blobs as files under a root directory, sharded by hash prefix."""
+
+    name = "filesystem"
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def write(self, conn, sha256: str, chunks: Iterator[bytes]) -> str:
+        location = os.path.join(sha256[:2], sha256[2:4], sha256)
+        path = os.path.join(self.root_dir, location)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file first so readers never see a partial blob
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return location
+
+    def read(self, conn, location: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        with open(os.path.join(self.root_dir, location), 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def delete(self, conn, location: str):
+        path = os.path.join(self.root_dir, location)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def detach(self, location: str) -> str:
+        detached = location + '.deleted'
+        try:
+            os.replace(os.path.join(self.root_dir, location), os.path.join(self.root_dir, detached))
+        except FileNotFoundError:
+            return None
+        return detached
+
+    def reattach(self, location: str, detached: str):
+        os.replace(os.path.join(self.root_dir, detached), os.path.join(self.root_dir, location))
+
+
+class BlobStore:
+    """
+    Content-addressed, reference-counted blob store on top of a BlobBackend.
+    """
+
+    def __init__(self, backend: str = "postgres", root_dir: str = None):
+        """
+        Initialize the blob store.
+
+        Args:
+            backend (str, optional): Backend used for new blobs ("postgres" or "filesystem").
+            root_dir (str, optional): Root directory of the filesystem backend.
+        """
+        root_dir = root_dir or os.path.join("storage", "blobs")
+        self.backends = {
+            PostgresLargeObjectBackend.name: PostgresLargeObjectBackend(),
+            FileSystemBackend.name: FileSystemBackend(root_dir)
+        }
+
+        if backend not in self.backends:
+            raise DatabaseError(f"Unknown blob backend: {backend}. Must be one of: {list(self.backends)}")
+
+        self.backend = self.backends[backend]
+
+    def init_schema(self, cursor):
+        """
+        Create the blob reference table.
+
+        Args:
+            cursor: Cursor of the schema initialization transaction.
+        """
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS test_case_blobs (
+            sha256 CHAR(64) PRIMARY KEY,
+            size BIGINT NOT NULL,
+            backend VARCHAR(20) NOT NULL,
+            location TEXT,
+            ref_count INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+
+    @staticmethod
+    def hash_bytes(content: bytes) -> str:
+        """
+        Compute the content address of in-memory bytes.
+
+        Args:
+            content (bytes): The content.
+
+        Returns:
+            str: Hex SHA-256 digest.
+        """
+        return hashlib.sha256(content).hexdigest()
+
+    def put(self, conn, data: Union[bytes, BinaryIO], chunk_size: int = CHUNK_SIZE) -> Tuple[str, int]:
+        """
+        Store content and add one reference to it.
+
+        The content is only written to the backend when no blob with the same
+        hash exists yet. Does not commit.
+
+        Args:
+            conn: Database connection of the current transaction.
+            data (Union[bytes, BinaryIO]): The content, or a binary file object to stream from.
+            chunk_size (int, optional): Bytes per chunk when streaming.
+
+        Returns:
+            Tuple[str, int]: (sha256, size)
+        """
+        spool = None
+        try:
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                content = bytes(data)
+                sha256, size = self.hash_bytes(content), len(content)
+                chunks = lambda: (content[i:i + chunk_size] for i in range(0, size, chunk_size))
+            else:
+                # Hash while spooling, since the hash decides whether to write at all
+                spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+                hasher = hashlib.sha256()
+                size = 0
+                while True:
+                    chunk = data.read(chunk_size)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    spool.write(chunk)
+                    size += len(chunk)
+                sha256 = hasher.hexdigest()
+
+                def chunks():
+                    spool.seek(0)
+                    while True:
+                        chunk = spool.read(chunk_size)
+                        if not chunk:
+                            break
+                        yield chunk
+
+            cursor = conn.cursor()
+
+            # Take the reference first; xmax = 0 means this statement inserted the row.
+            # The upsert waits on the row lock collect_garbage holds while it removes
+            # the same blob, and re-inserts (and rewrites) it once the delete commits
+            cursor.execute("""
+            INSERT INTO test_case_blobs (sha256, size, backend, ref_count)
+            VALUES (%s, %s, %s, 1)
+            ON CONFLICT (sha256) DO UPDATE SET ref_count = test_case_blobs.ref_count + 1
+            RETURNING (xmax = 0) AS inserted
+            """, (sha256, size, self.backend.name))
+            inserted = cursor.fetchone()[0]
+
+            if inserted:
+                location = self.backend.write(conn, sha256, chunks())
+                cursor.execute(
+                    "UPDATE test_case_blobs SET location = %s WHERE sha256 = %s",
+                    (location, sha256)
+                )
+            else:
+                logger.debug(f"Blob {sha256} already stored, skipping write")
+
+            return sha256, size
+
+        finally:
+            if spool is not None:
+                spool.close()
+
+    def release(self, conn, sha256: str, count: int = 1):
+        """
+        Drop references to a blob. Unreferenced blobs are removed by collect_garbage.
+
+        Args:
+            conn: Database connection of the current transaction.
+            sha256 (str): The blob hash.
+            count (int, optional): Number of references to drop.
+        """
+        if not sha256:
+            return
+
+        conn.cursor().execute(
+            "UPDATE test_case_blobs SET ref_count = GREATEST(ref_count - %s, 0) WHERE sha256 = %s",
+            (count, sha256)
+        )
+
+    def iter_content(self, conn, sha256: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Stream a blob's content.
+
+        Args:
+            conn: Database connection, held open until the iterator is exhausted.
+            sha256 (str): The blob hash.
+            chunk_size (int, optional): Bytes per chunk.
+
+        Yields:
+            bytes: The content, in chunks.
+
+        Raises:
+            DatabaseError: If the blob does not exist.
+        """
+        cursor = conn.cursor()
+        cursor.execute("SELECT backend, location FROM test_case_blobs WHERE sha256 = %s", (sha256,))
+        row = cursor.fetchone()
+
+        if not row or row[1] is None:
+            raise DatabaseError(f"Blob not found: {sha256}")
+
+        backend_name, location = row
+        yield from self.backends[backend_name].read(conn, location, chunk_size)
+
+    def read(self, conn, sha256: str) -> bytes:
+        """
+        Read a blob's full content.
+
+        Args:
+            conn: Database connection of the current transaction.
+            sha256 (str): The blob hash.
+
+        Returns:
+            bytes: The content.
+        """
+        return b"".join(self.iter_content(conn, sha256))
+
+    def collect_garbage(self, conn) -> int:
+        """
+        Delete blobs that are no longer referenced. Commits the connection.
+
+        The unreferenced rows stay locked until the delete commits, so a
+        concurrent put of the same content either takes its reference first
+        (and the blob is skipped) or waits and writes the blob anew. Files are
+        moved aside before the commit and removed after it, so a put that
+        recreates a blob never has its new file deleted.
+
+        Args:
+            conn: Database connection.
+
+        Returns:
+            int: Number of blobs deleted.
+
+        Raises:
+            DatabaseError: If the unreferenced blobs cannot be removed.
+        """
+        cursor = conn.cursor()
+        cursor.execute("""
+        SELECT sha256, backend, location FROM test_case_blobs
+        WHERE ref_count <= 0
+        FOR UPDATE SKIP LOCKED
+        """)
+        unreferenced = cursor.fetchall()
+
+        if not unreferenced:
+            conn.commit()
+            return 0
+
+        detached = []
+        try:
+            for _, backend_name, location in unreferenced:
+                if location is None:
+                    continue
+                backend = self.backends[backend_name]
+                if backend.transactional:
+                    # Large objects are removed with the rows
+                    backend.delete(conn, location)
+                else:
+                    detached_location = backend.detach(location)
+                    if detached_location is not None:
+                        detached.append((backend, location, detached_location))
+
+            cursor.execute(
+                "DELETE FROM test_case_blobs WHERE sha256 = ANY(%s)",
+                ([row[0] for row in unreferenced],)
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            for backend, location, detached_location in detached:
+                backend.reattach(location, detached_location)
+            logger.error(f"Blob garbage collection failed: {str(e)}")
+            raise DatabaseError(f"Blob garbage collection failed: {str(e)}")
+
+        # Detached files can only be removed once the rows are gone for good
+        for backend, location, detached_location in detached:
+            try:
+                backend.delete(conn, detached_location)
+            except OSError as e:
+                logger.warning(f"Failed to delete blob file {location}: {str(e)}")
+
+        return len(unreferenced)
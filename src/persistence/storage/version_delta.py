@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Version Delta Module for the Watsonx IPG Testing platform.
+
+This module encodes test case versions compactly. A version is either a
+keyframe (the whole table) or a row-level delta against an earlier version.
+Both are JSON documents compressed with zlib.
+
+A snapshot is {"columns": [...], "dtypes": [...], "rows": [[...], ...]} with
+JSON-safe cell values. A delta keeps the new columns and dtypes plus a list of
+operations that rebuild the new rows from the base rows:
+
+- ["copy", start, end]: base rows start to end (exclusive), unchanged
+- ["patch", index, {column_position: value}]: base row index with some cells changed
+- ["row", [values]]: a new row
+"""
+
+import json
+import zlib
+import difflib
+import numbers
+from datetime import datetime, date
+from typing import Dict, List, Any
+
+import pandas as pd
+
+# Payload encodings stored with each version
+KEYFRAME = "keyframe"
+DELTA = "delta"
+
+
+def _to_json_value(value):
+    if value is None or (not isinstance(value, (str, bytes, list, dict)) and pd.isna(value)):
+        return None
+    if isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        return float(value)
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_frame(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Convert a DataFrame into a snapshot.
+
+    Args:
+        df (pd.DataFrame): The test case.
+
+    Returns:
+        Dict[str, Any]: The snapshot.
+    """
+    return {
+        "columns": [str(column) for column in df.columns],
+        "dtypes": [str(dtype) for dtype in df.dtypes],
+        "rows": [[_to_json_value(value) for value in row] for row in df.itertuples(index=False, name=None)]
+    }
+
+
+def decode_frame(snapshot: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Convert a snapshot back into a DataFrame with its original dtypes.
+
+    Args:
+        snapshot (Dict[str, Any]): The snapshot.
+
+    Returns:
+        pd.DataFrame: The test case.
+    """
+    df = pd.DataFrame(snapshot["rows"], columns=snapshot["columns"])
+
+    for position, dtype in enumerate(snapshot["dtypes"]):
+        column = df.columns[position]
+        if dtype.startswith("datetime64"):
+            df[column] = pd.to_datetime(df[column])
+        elif dtype != "object":
+            try:
+                df[column] = df[column].astype(dtype)
+            except (TypeError, ValueError):
+                pass
+
+    return df
+
+
+def _project_rows(snapshot: Dict[str, Any], columns: List[str]) -> List[List[Any]]:
+    """
+    Rearrange a snapshot's rows to the given columns; missing columns are None.
+    """
+    if snapshot["columns"] == columns:
+        return snapshot["rows"]
+
+    positions = {column: position for position, column in enumerate(snapshot["columns"])}
+    picks = [positions.get(column) for column in columns]
+    return [[row[p] if p is not None else None for p in picks] for row in snapshot["rows"]]
+
+
+def diff_snapshots(base: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute the delta that turns one snapshot into another.
+
+    Rows are aligned with difflib; a replaced block of the same length becomes
+    cell patches, anything else becomes new rows.
+
+    Args:
+        base (Dict[str, Any]): The earlier snapshot.
+        target (Dict[str, Any]): The new snapshot.
+
+    Returns:
+        Dict[str, Any]: The delta.
+    """
+    columns = target["columns"]
+    base_rows = _project_rows(base, columns)
+    target_rows = target["rows"]
+
+    # Rows are compared by their JSON form, which is hashable
+    matcher = difflib.SequenceMatcher(
+        None,
+        [json.dumps(row) for row in base_rows],
+        [json.dumps(row) for row in target_rows],
+        autojunk=False
+    )
+
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["copy", i1, i2])
+        elif tag == "replace" and i2 - i1 == j2 - j1:
+            for base_index, target_row in zip(range(i1, i2), target_rows[j1:j2]):
+                base_row = base_rows[base_index]
+                ops.append(["patch", base_index, {
+                    str(position): value
+                    for position, value in enumerate(target_row)
+                    if value != base_row[position]
+                }])
+        else:
+            ops.extend(["row", row] for row in target_rows[j1:j2])
+
+    return {"columns": columns, "dtypes": target["dtypes"], "ops": ops}
+
+
+def apply_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rebuild a snapshot from its base and a delta.
+
+    Args:
+        base (Dict[str, Any]): The base snapshot.
+        delta (Dict[str, Any]): The delta computed by diff_snapshots.
+
+    Returns:
+        Dict[str, Any]: The new snapshot.
+    """
+    base_rows = _project_rows(base, delta["columns"])
+    rows = []
+
+    for op in delta["ops"]:
+        if op[0] == "copy":
+            rows.extend(base_rows[op[1]:op[2]])
+        elif op[0] == "patch":
+            row = list(base_rows[op[1]])
+            for position, value in op[2].items():
+                row[int(position)] = value
+            rows.append(row)
+        else:
+            rows.append(op[1])
+
+    return {"columns": delta["columns"], "dtypes": delta["dtypes"], "rows": rows}
+
+
+def pack(document: Dict[str, Any]) -> bytes:
+    """
+    Serialize a snapshot or delta.
+
+    Args:
+        document (Dict[str, Any]): The snapshot or delta.
+
+    Returns:
+        bytes: Compressed JSON.
+    """
+    return zlib.compress(json.dumps(document, separators=(',', ':')).encode('utf-8'), 9)
+
+
+def unpack(payload: bytes) -> Dict[str, Any]:
+    """
+    Deserialize a snapshot or delta written by pack.
+
+    Args:
+        payload (bytes): Compressed JSON.
+
+    Returns:
+        Dict[str, Any]: The snapshot or delta.
+    """
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
@@ -0,0 +1,790 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Version Store Module for the Watsonx IPG Testing platform.
+
+This module keeps the version history of test cases for the VersionController.
+Two interchangeable stores are provided:
+
+- FileVersionStore: one {id}_version_history.json per test case plus one file
+  per version under a directory (the original layout).
+- PostgresVersionStore: indexed version rows in PostgreSQL. Version numbers are
+  allocated under a row lock in the same transaction that records the version,
+  and version contents go to the content-addressed BlobStore, so identical
+  files are stored once.
+
+Use create_version_store() to pick one from the environment.
+"""
+
+import os
+import json
+import glob
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Tuple, Optional
+
+from src.common.exceptions.custom_exceptions import DatabaseError
+from src.persistence.connection.db_connection import get_pool
+from src.persistence.storage.blob_store import BlobStore
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Version entry fields that can change after the version is recorded
+UPDATABLE_VERSION_FIELDS = ("sharepoint_url", "sharepoint_path")
+
+# Status that starts a maintenance period; any other status ends it
+MAINTENANCE_STATUS = "Under Maintenance"
+
+
+def parse_version(version: str) -> Tuple[int, int]:
+    """
+    Split a "major.minor" version string.
+
+    Args:
+        version (str): The version string.
+
+    Returns:
+        Tuple[int, int]: (major, minor)
+    """
+    major, minor = map(int, version.split('.'))
+    return major, minor
+
+
+def next_version(last_version: Optional[str]) -> str:
+    """
+    Get the version number that follows another. The first version is 1.0.
+
+    Args:
+        last_version (Optional[str]): The latest version, or None if there is none.
+
+    Returns:
+        str: The next version.
+    """
+    if not last_version:
+        return "1.0"
+
+    # For now, just increment the minor version
+    major, minor = parse_version(last_version)
+    return f"{major}.{minor + 1}"
+
+
+class VersionStore:
+    """
+    Base class for version stores.
+
+    A history is a dict with test_case_id, created_at, current_version, the
+    list of version entries (oldest first) and, once set, status,
+    maintenance_started and maintenance_ended. A version entry holds version,
+    timestamp, content_hash, changed_by, comment, file_name and owner, plus
+    sharepoint_url and sharepoint_path once uploaded. Entries whose content is
+    not a plain workbook also record its encoding, the base_version a delta
+    applies to and the chain_length of deltas back to a keyframe.
+    """
+
+    name = None
+
+    def get_history(self, test_case_id: str) -> Dict[str, Any]:
+        """
+        Get the version history of a test case.
+
+        Args:
+            test_case_id (str): The test case ID.
+
+        Returns:
+            Dict[str, Any]: The history; empty (no versions) if none was recorded.
+        """
+        raise NotImplementedError
+
+    def get_version(self, test_case_id: str, version: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Get one version entry.
+
+        Args:
+            test_case_id (str): The test case ID.
+            version (str, optional): The version. If None, the current version.
+
+        Returns:
+            Optional[Dict[str, Any]]: The version entry, or None if it does not exist.
+        """
+        raise NotImplementedError
+
+    def read_version_content(self, test_case_id: str, version: str) -> Optional[bytes]:
+        """
+        Read the file stored for a version.
+
+        Args:
+            test_case_id (str): The test case ID.
+            version (str): The version.
+
+        Returns:
+            Optional[bytes]: The file content, or None if it is missing.
+        """
+        raise NotImplementedError
+
+    def get_version_path(self, test_case_id: str, version: str) -> Optional[str]:
+        """
+        Get the local path of a version's file, for stores that keep one.
+
+        Args:
+            test_case_id (str): The test case ID.
+            version (str): The version.
+
+        Returns:
+            Optional[str]: The path, or None if versions are not stored as local files.
+        """
+        return None
+
+    def add_version(self, test_case_id: str, content: bytes, content_hash: str,
+                    entry: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Record a new version unless the content matches the current version.
+
+        Args:
+            test_case_id (str): The test case ID.
+            content (bytes): The stored content: a workbook or an encoded payload.
+            content_hash (str): Hash of the test case content, used to detect changes.
+            entry (Dict[str, Any]): changed_by, comment, file_name and owner of the version,
+                and encoding, base_version and chain_length for encoded payloads.
+
+        Returns:
+            Tuple[Dict[str, Any], bool]: (version entry, created). When the content is
+                unchanged the current version's entry is returned with created=False.
+        """
+        raise NotImplementedError
+
+    def update_version(self, test_case_id: str, version: str, fields: Dict[str, Any]) -> bool:
+        """
+        Update fields of a recorded version (see UPDATABLE_VERSION_FIELDS).
+
+        Args:
+            test_case_id (str): The test case ID.
+            version (str): The version.
+            fields (Dict[str, Any]): The fields to set.
+
+        Returns:
+            bool: True if the version exists.
+        """
+        raise NotImplementedError
+
+    def set_status(self, test_case_id: str, status: str, timestamp: str) -> None:
+        """
+        Set the status of a test case's history.
+
+        MAINTENANCE_STATUS records maintenance_started; any other status records
+        maintenance_ended if a maintenance period was started.
+
+        Args:
+            test_case_id (str): The test case ID.
+            status (str): The new status.
+            timestamp (str): ISO timestamp of the change.
+        """
+        raise NotImplementedError
+
+    def list_test_case_ids(self) -> List[str]:
+        """
+        List the test cases that have a history.
+
+        Returns:
+            List[str]: Test case IDs, sorted.
+        """
+        raise NotImplementedError
+
+    def list_versions(self, test_case_ids: List[str] = None, since: str = None,
+                      limit: int = None) -> List[Dict[str, Any]]:
+        """
+        List version entries across test cases, newest first.
+
+        Args:
+            test_case_ids (List[str], optional): Only these test cases.
+            since (str, optional): Only versions recorded at or after this ISO timestamp.
+            limit (int, optional): Maximum number of entries.
+
+        Returns:
+            List[Dict[str, Any]]: Version entries, each with its test_case_id.
+        """
+        raise NotImplementedError
+
+
+class FileVersionStore(VersionStore):
+    """
+    Stores each history as a JSON file and each version as {version}.xlsx in a
+    directory per test case.
+    """
+
+    name = "file"
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        os.makedirs(self.root_dir, exist_ok=True)
+
+        # Serializes read-modify-write of history files within this process
+        self.lock = threading.Lock()
+
+    def _history_path(self, test_case_id: str) -> str:
+        return os.path.join(self.root_dir, f"{test_case_id}_version_history.json")
+
+    def _new_history(self, test_case_id: str) -> Dict[str, Any]:
+        return {
+            "test_case_id": test_case_id,
+            "created_at": datetime.now().isoformat(),
+            "current_version": None,
+            "versions": []
+        }
+
+    def _load_history(self, test_case_id: str) -> Dict[str, Any]:
+        history_path = self._history_path(test_case_id)
+
+        if not os.path.exists(history_path):
+            return self._new_history(test_case_id)
+
+        try:
+            with open(history_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load version history: {str(e)}")
+            # Return a new empty history if file is corrupted
+            return self._new_history(test_case_id)
+
+    def _save_history(self, test_case_id: str, history: Dict[str, Any]) -> None:
+        history_path = self._history_path(test_case_id)
+
+        # Replace the file atomically so readers never see a partial history
+        fd, temp_path = tempfile.mkstemp(dir=self.root_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(history, f, indent=2)
+            os.replace(temp_path, history_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        logger.debug(f"Version history saved for {test_case_id}")
+
+    def _content_path(self, test_case_id: str, version: str, encoding: str = None) -> str:
+        # Workbooks keep the original {version}.xlsx name
+        return os.path.join(self.root_dir, test_case_id, f"{version}.{encoding or 'xlsx'}")
+
+    def get_version_path(self, test_case_id: str, version: str) -> Optional[str]:
+        entry = self.get_version(test_case_id, version)
+        return self._content_path(test_case_id, version, entry.get("encoding") if entry else None)
+
+    def get_history(self, test_case_id: str) -> Dict[str, Any]:
+        return self._load_history(test_case_id)
+
+    def get_version(self, test_case_id: str, version: str = None) -> Optional[Dict[str, Any]]:
+        history = self._load_history(test_case_id)
+        target_version = version or history.get("current_version")
+
+        for entry in history["versions"]:
+            if entry["version"] == target_version:
+                return entry
+
+        return None
+
+    def read_version_content(self, test_case_id: str, version: str) -> Optional[bytes]:
+        version_path = self.get_version_path(test_case_id, version)
+
+        if not os.path.exists(version_path):
+            return None
+
+        with open(version_path, 'rb') as f:
+            return f.read()
+
+    def add_version(self, test_case_id: str, content: bytes, content_hash: str,
+                    entry: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        with self.lock:
+            history = self._load_history(test_case_id)
+
+            current_version = history.get("current_version")
+            for version in history["versions"]:
+                if version["version"] == current_version and version["content_hash"] == content_hash:
+                    return version, False
+
+            last_version = history["versions"][-1]["version"] if history["versions"] else None
+            version_entry = {
+                "version": next_version(last_version),
+                "timestamp": datetime.now().isoformat(),
+                "content_hash": content_hash,
+                **entry
+            }
+
+            version_path = self._content_path(test_case_id, version_entry["version"], entry.get("encoding"))
+            os.makedirs(os.path.dirname(version_path), exist_ok=True)
+            with open(version_path, 'wb') as f:
+                f.write(content)
+
+            history["versions"].append(version_entry)
+            history["current_version"] = version_entry["version"]
+            self._save_history(test_case_id, history)
+
+            return version_entry, True
+
+    def update_version(self, test_case_id: str, version: str, fields: Dict[str, Any]) -> bool:
+        with self.lock:
+            history = self._load_history(test_case_id)
+
+            for entry in history["versions"]:
+                if entry["version"] == version:
+                    entry.update({key: fields[key] for key in UPDATABLE_VERSION_FIELDS if key in fields})
+                    self._save_history(test_case_id, history)
+                    return True
+
+            return False
+
+    def set_status(self, test_case_id: str, status: str, timestamp: str) -> None:
+        with self.lock:
+            history = self._load_history(test_case_id)
+
+            history["status"] = status
+            if status == MAINTENANCE_STATUS:
+                history["maintenance_started"] = timestamp
+            elif "maintenance_started" in history:
+                history["maintenance_ended"] = timestamp
+
+            self._save_history(test_case_id, history)
+
+    def list_test_case_ids(self) -> List[str]:
+        suffix = "_version_history.json"
+        return sorted(
+            os.path.basename(path)[:-len(suffix)]
+            for path in glob.glob(os.path.join(self.root_dir, f"*{suffix}"))
+        )
+
+    def list_versions(self, test_case_ids: List[str] = None, since: str = None,
+                      limit: int = None) -> List[Dict[str, Any]]:
+        # Reads every history file; use PostgresVersionStore for large stores
+        versions = []
+        for test_case_id in test_case_ids or self.list_test_case_ids():
+            for entry in self._load_history(test_case_id)["versions"]:
+                if since and entry["timestamp"] < since:
+                    continue
+                versions.append({"test_case_id": test_case_id, **entry})
+
+        versions.sort(key=lambda entry: entry["timestamp"], reverse=True)
+        return versions[:limit] if limit else versions
+
+
+class PostgresVersionStore(VersionStore):
+    """
+    Stores histories in PostgreSQL: one head row per test case (current version
+    and status) and one indexed row per version. Version files are kept in the
+    BlobStore and referenced by hash.
+    """
+
+    name = "postgres"
+
+    _VERSION_COLUMNS = """
+    test_case_id, version, created_at, content_hash, changed_by, comment,
+    file_name, owner, sharepoint_url, sharepoint_path, encoding, base_version, chain_length
+    """
+
+    def __init__(self, dsn: str = None, blob_store: BlobStore = None):
+        """
+        Initialize the store and create its tables.
+
+        Args:
+            dsn (str, optional): libpq connection string or URI. Defaults to DATABASE_URL.
+            blob_store (BlobStore, optional): Where version files are stored. Defaults to
+                the BLOB_STORE_BACKEND and BLOB_STORE_PATH environment variables.
+
+        Raises:
+            DatabaseError: If the database cannot be reached or initialized.
+        """
+        self.pool = get_pool(dsn)
+        self.blob_store = blob_store or BlobStore(
+            os.getenv('BLOB_STORE_BACKEND', 'postgres'),
+            os.getenv('BLOB_STORE_PATH')
+        )
+
+        try:
+            with self.pool.connection() as conn:
+                self.init_schema(conn.cursor())
+        except Exception as e:
+            logger.error(f"Failed to initialize version store: {str(e)}")
+            raise DatabaseError(f"Failed to initialize version store: {str(e)}")
+
+    def init_schema(self, cursor):
+        """
+        Create the version tables.
+
+        Args:
+            cursor: Cursor of the schema initialization transaction.
+        """
+        self.blob_store.init_schema(cursor)
+
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS test_case_version_heads (
+            test_case_id VARCHAR(100) PRIMARY KEY,
+            current_version VARCHAR(20),
+            status VARCHAR(50),
+            maintenance_started TIMESTAMP,
+            maintenance_ended TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS test_case_versions (
+            test_case_id VARCHAR(100) NOT NULL,
+            major INTEGER NOT NULL,
+            minor INTEGER NOT NULL,
+            version VARCHAR(20) NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            content_hash CHAR(64) NOT NULL,
+            blob_sha256 CHAR(64),
+            changed_by VARCHAR(100),
+            comment TEXT,
+            file_name VARCHAR(255),
+            owner VARCHAR(100),
+            sharepoint_url TEXT,
+            sharepoint_path TEXT,
+            PRIMARY KEY (test_case_id, major, minor),
+            UNIQUE (test_case_id, version)
+        )
+        """)
+
+        # Payload encoding and delta chain of each version (NULL for plain workbooks)
+        cursor.execute("""
+        ALTER TABLE test_case_versions
+        ADD COLUMN IF NOT EXISTS encoding VARCHAR(20),
+        ADD COLUMN IF NOT EXISTS base_version VARCHAR(20),
+        ADD COLUMN IF NOT EXISTS chain_length INTEGER
+        """)
+
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_test_case_versions_created_at
+        ON test_case_versions (created_at)
+        """)
+
+    @staticmethod
+    def _format_timestamp(value) -> Optional[str]:
+        return value.isoformat() if isinstance(value, datetime) else value
+
+    def _format_entry(self, row: Tuple) -> Dict[str, Any]:
+        (_, version, created_at, content_hash, changed_by, comment,
+         file_name, owner, sharepoint_url, sharepoint_path, encoding, base_version, chain_length) = row
+
+        entry = {
+            "version": version,
+            "timestamp": self._format_timestamp(created_at),
+            "content_hash": content_hash,
+            "changed_by": changed_by,
+            "comment": comment,
+            "file_name": file_name,
+            "owner": owner
+        }
+        if sharepoint_url is not None:
+            entry["sharepoint_url"] = sharepoint_url
+        if sharepoint_path is not None:
+            entry["sharepoint_path"] = sharepoint_path
+        if encoding is not None:
+            entry.update({"encoding": encoding, "base_version": base_version, "chain_length": chain_length})
+        return entry
+
+    def get_history(self, test_case_id: str) -> Dict[str, Any]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT current_version, status, maintenance_started, maintenance_ended, created_at
+            FROM test_case_version_heads
+            WHERE test_case_id = %s
+            """, (test_case_id,))
+            head = cursor.fetchone()
+
+            cursor.execute(f"""
+            SELECT {self._VERSION_COLUMNS}
+            FROM test_case_versions
+            WHERE test_case_id = %s
+            ORDER BY major, minor
+            """, (test_case_id,))
+            versions = [self._format_entry(row) for row in cursor.fetchall()]
+
+        if head is None:
+            return {
+                "test_case_id": test_case_id,
+                "created_at": datetime.now().isoformat(),
+                "current_version": None,
+                "versions": versions
+            }
+
+        current_version, status, maintenance_started, maintenance_ended, created_at = head
+        history = {
+            "test_case_id": test_case_id,
+            "created_at": self._format_timestamp(created_at),
+            "current_version": current_version,
+            "versions": versions
+        }
+        if status is not None:
+            history["status"] = status
+        if maintenance_started is not None:
+            history["maintenance_started"] = self._format_timestamp(maintenance_started)
+        if maintenance_ended is not None:
+            history["maintenance_ended"] = self._format_timestamp(maintenance_ended)
+        return history
+
+    def get_version(self, test_case_id: str, version: str = None) -> Optional[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+            SELECT {self._VERSION_COLUMNS}
+            FROM test_case_versions
+            WHERE test_case_id = %s
+            AND version = COALESCE(%s, (
+                SELECT current_version FROM test_case_version_heads WHERE test_case_id = %s
+            ))
+            """, (test_case_id, version, test_case_id))
+            row = cursor.fetchone()
+
+        return self._format_entry(row) if row else None
+
+    def read_version_content(self, test_case_id: str, version: str) -> Optional[bytes]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT blob_sha256 FROM test_case_versions
+            WHERE test_case_id = %s AND version = %s
+            """, (test_case_id, version))
+            row = cursor.fetchone()
+
+            if not row or not row[0]:
+                return None
+
+            return self.blob_store.read(conn, row[0])
+
+    def add_version(self, test_case_id: str, content: bytes, content_hash: str,
+                    entry: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+
+            # The head row lock serializes check-ins of the same test case
+            cursor.execute("""
+            INSERT INTO test_case_version_heads (test_case_id)
+            VALUES (%s)
+            ON CONFLICT (test_case_id) DO NOTHING
+            """, (test_case_id,))
+            cursor.execute("""
+            SELECT current_version FROM test_case_version_heads
+            WHERE test_case_id = %s
+            FOR UPDATE
+            """, (test_case_id,))
+            current_version = cursor.fetchone()[0]
+
+            if current_version:
+                cursor.execute(f"""
+                SELECT {self._VERSION_COLUMNS}
+                FROM test_case_versions
+                WHERE test_case_id = %s AND version = %s
+                """, (test_case_id, current_version))
+                current = cursor.fetchone()
+                if current and current[3] == content_hash:
+                    return self._format_entry(current), False
+
+            cursor.execute("""
+            SELECT version FROM test_case_versions
+            WHERE test_case_id = %s
+            ORDER BY major DESC, minor DESC
+            LIMIT 1
+            """, (test_case_id,))
+            last = cursor.fetchone()
+
+            version = next_version(last[0] if last else None)
+            major, minor = parse_version(version)
+            blob_sha256, _ = self.blob_store.put(conn, content)
+
+            cursor.execute(f"""
+            INSERT INTO test_case_versions (
+                test_case_id, major, minor, version, created_at, content_hash, blob_sha256,
+                changed_by, comment, file_name, owner, encoding, base_version, chain_length
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            RETURNING {self._VERSION_COLUMNS}
+            """, (
+                test_case_id, major, minor, version, datetime.now(), content_hash, blob_sha256,
+                entry.get("changed_by"), entry.get("comment"), entry.get("file_name"), entry.get("owner"),
+                entry.get("encoding"), entry.get("base_version"), entry.get("chain_length")
+            ))
+            version_entry = self._format_entry(cursor.fetchone())
+
+            cursor.execute("""
+            UPDATE test_case_version_heads SET current_version = %s WHERE test_case_id = %s
+            """, (version, test_case_id))
+
+        return version_entry, True
+
+    def update_version(self, test_case_id: str, version: str, fields: Dict[str, Any]) -> bool:
+        updates = {key: fields[key] for key in UPDATABLE_VERSION_FIELDS if key in fields}
+
+        if not updates:
+            return self.get_version(test_case_id, version) is not None
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+            UPDATE test_case_versions
+            SET {', '.join(f'{key} = %s' for key in updates)}
+            WHERE test_case_id = %s AND version = %s
+            """, (*updates.values(), test_case_id, version))
+            return cursor.rowcount > 0
+
+    def set_status(self, test_case_id: str, status: str, timestamp: str) -> None:
+        maintenance = status == MAINTENANCE_STATUS
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            INSERT INTO test_case_version_heads (test_case_id)
+            VALUES (%s)
+            ON CONFLICT (test_case_id) DO NOTHING
+            """, (test_case_id,))
+            cursor.execute("""
+            UPDATE test_case_version_heads
+            SET status = %(status)s,
+                maintenance_started = CASE WHEN %(maintenance)s THEN %(timestamp)s::timestamp
+                                           ELSE maintenance_started END,
+                maintenance_ended = CASE WHEN NOT %(maintenance)s AND maintenance_started IS NOT NULL
+                                         THEN %(timestamp)s::timestamp ELSE maintenance_ended END
+            WHERE test_case_id = %(test_case_id)s
+            """, {
+                "status": status,
+                "maintenance": maintenance,
+                "timestamp": timestamp,
+                "test_case_id": test_case_id
+            })
+
+    def list_test_case_ids(self) -> List[str]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT test_case_id FROM test_case_version_heads ORDER BY test_case_id")
+            return [row[0] for row in cursor.fetchall()]
+
+    def list_versions(self, test_case_ids: List[str] = None, since: str = None,
+                      limit: int = None) -> List[Dict[str, Any]]:
+        conditions = []
+        params = []
+
+        if test_case_ids is not None:
+            conditions.append("test_case_id = ANY(%s)")
+            params.append(list(test_case_ids))
+        if since:
+            conditions.append("created_at >= %s")
+            params.append(since)
+
+        query = f"SELECT {self._VERSION_COLUMNS} FROM test_case_versions"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC"
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, tuple(params))
+            return [{"test_case_id": row[0], **self._format_entry(row)} for row in cursor.fetchall()]
+
+    def import_from(self, source: VersionStore) -> Dict[str, int]:
+        """
+        Copy every history from another store, e.g. an existing FileVersionStore.
+
+        Each test case is copied in its own transaction, keeping version numbers
+        and timestamps. Versions already present are left alone, so an
+        interrupted import can be run again.
+
+        Args:
+            source (VersionStore): The store to copy from.
+
+        Returns:
+            Dict[str, int]: test_cases and versions imported, versions_missing_content.
+        """
+        stats = {"test_cases": 0, "versions": 0, "versions_missing_content": 0}
+
+        for test_case_id in source.list_test_case_ids():
+            history = source.get_history(test_case_id)
+
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                INSERT INTO test_case_version_heads (
+                    test_case_id, current_version, status, maintenance_started, maintenance_ended, created_at
+                )
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (test_case_id) DO UPDATE
+                SET current_version = EXCLUDED.current_version,
+                    status = EXCLUDED.status,
+                    maintenance_started = EXCLUDED.maintenance_started,
+                    maintenance_ended = EXCLUDED.maintenance_ended
+                """, (
+                    test_case_id, history.get("current_version"), history.get("status"),
+                    history.get("maintenance_started"), history.get("maintenance_ended"),
+                    history.get("created_at")
+                ))
+
+                cursor.execute(
+                    "SELECT version FROM test_case_versions WHERE test_case_id = %s",
+                    (test_case_id,)
+                )
+                existing = {row[0] for row in cursor.fetchall()}
+
+                for entry in history.get("versions", []):
+                    if entry["version"] in existing:
+                        continue
+
+                    content = source.read_version_content(test_case_id, entry["version"])
+                    blob_sha256 = None
+                    if content is None:
+                        logger.warning(f"No file for version {entry['version']} of test case {test_case_id}")
+                        stats["versions_missing_content"] += 1
+                    else:
+                        blob_sha256, _ = self.blob_store.put(conn, content)
+
+                    major, minor = parse_version(entry["version"])
+                    cursor.execute("""
+                    INSERT INTO test_case_versions (
+                        test_case_id, major, minor, version, created_at, content_hash, blob_sha256,
+                        changed_by, comment, file_name, owner, sharepoint_url, sharepoint_path,
+                        encoding, base_version, chain_length
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    """, (
+                        test_case_id, major, minor, entry["version"], entry["timestamp"],
+                        entry["content_hash"], blob_sha256, entry.get("changed_by"), entry.get("comment"),
+                        entry.get("file_name"), entry.get("owner"), entry.get("sharepoint_url"),
+                        entry.get("sharepoint_path"), entry.get("encoding"), entry.get("base_version"),
+                        entry.get("chain_length")
+                    ))
+                    stats["versions"] += 1
+
+            stats["test_cases"] += 1
+
+        logger.info(f"Imported {stats['versions']} versions of {stats['test_cases']} test cases")
+        return stats
+
+
+def create_version_store(backend: str = None, root_dir: str = None) -> VersionStore:
+    """
+    Create a version store.
+
+    Args:
+        backend (str, optional): "file" or "postgres". Defaults to the
+            VERSION_STORE_BACKEND environment variable, or "file".
+        root_dir (str, optional): Directory of the file store.
+
+    Returns:
+        VersionStore: The store.
+
+    Raises:
+        DatabaseError: If the backend is unknown or cannot be initialized.
+    """
+    backend = backend or os.getenv('VERSION_STORE_BACKEND', 'file')
+
+    if backend == FileVersionStore.name:
+        return FileVersionStore(root_dir)
+    if backend == PostgresVersionStore.name:
+        return PostgresVersionStore(os.getenv('VERSION_STORE_DATABASE_URL'))
+
+    raise DatabaseError(f"Unknown version store backend: {backend}. Must be 'file' or 'postgres'")
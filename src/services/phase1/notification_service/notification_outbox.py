@@ -0,0 +1,455 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Notification Outbox Module for the Watsonx IPG Testing platform.
+
+This module takes notification sending off the request path. Callers enqueue
+notifications into a durable SQLite outbox, which costs one local insert, and a
+background dispatcher sends them later:
+
+- Notifications to the same recipient are held for a coalescing window and
+  sent together as one digest.
+- A failed send is retried with exponential backoff; after max_attempts the
+  notifications are marked failed and kept for inspection.
+- Rows are claimed before sending, so several processes can share one outbox
+  file, and a claim left behind by a crashed process expires after a lease.
+
+Use create_notification_outbox() to configure one from the environment.
+"""
+
+import os
+import time
+import random
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Iterator
+
+from src.common.exceptions.custom_exceptions import DatabaseError
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Outbox row statuses
+PENDING = "pending"
+SENDING = "sending"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipient TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    message TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    claimed_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_notification_outbox_due
+    ON notification_outbox (status, next_attempt_at, recipient);
+"""
+
+
+class NotificationOutbox:
+    """
+    Durable queue of notifications with a background, coalescing dispatcher.
+    """
+
+    def __init__(self, db_path: str = None, send: Callable[[Dict[str, Any]], Any] = None,
+                 coalesce_window: float = 60, max_attempts: int = 8,
+                 retry_base: float = 30, retry_max: float = 3600,
+                 poll_interval: float = 5, claim_lease: float = 300,
+                 batch_size: int = 100):
+        """
+        Initialize the outbox, creating its database if needed.
+
+        If the database holds notifications left by an earlier run (pending, or
+        claimed by a process that died mid-send), the dispatcher starts right
+        away so they are delivered without waiting for the next enqueue.
+
+        Args:
+            db_path (str, optional): Path of the SQLite database. If None, uses a
+                default path in the storage directory.
+            send (Callable, optional): Sends one notification dict (recipient,
+                subject, message). Defaults to send_notification.
+            coalesce_window (float, optional): Seconds a recipient's first pending
+                notification waits for others to join its digest.
+            max_attempts (int, optional): Sends attempted before a digest is marked failed.
+            retry_base (float, optional): Backoff in seconds after the first failure,
+                doubled for each further attempt.
+            retry_max (float, optional): Upper bound of the backoff in seconds.
+            poll_interval (float, optional): Seconds between dispatcher runs.
+            claim_lease (float, optional): Seconds after which a claim left by a
+                crashed dispatcher is released.
+            batch_size (int, optional): Recipients handled per dispatcher run.
+
+        Raises:
+            DatabaseError: If the database cannot be created.
+        """
+        self.db_path = db_path or os.path.join(
+            os.path.dirname(__file__), "../../../storage/notification_outbox.db"
+        )
+        self.send = send
+        self.coalesce_window = max(0.0, coalesce_window)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base = max(0.0, retry_base)
+        self.retry_max = max(self.retry_base, retry_max)
+        self.poll_interval = max(0.01, poll_interval)
+        self.claim_lease = max(1.0, claim_lease)
+        self.batch_size = max(1, batch_size)
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._counts = {"sent": 0, "digests": 0, "retries": 0, "failed": 0}
+
+        try:
+            directory = os.path.dirname(os.path.abspath(self.db_path))
+            os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                # WAL lets enqueues proceed while the dispatcher reads
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                undelivered = conn.execute(
+                    "SELECT COUNT(*) FROM notification_outbox WHERE status IN (?, ?)",
+                    (PENDING, SENDING)
+                ).fetchone()[0]
+            finally:
+                conn.close()
+        except (OSError, sqlite3.Error) as e:
+            self.logger.error(f"Failed to initialize notification outbox: {str(e)}")
+            raise DatabaseError(f"Failed to initialize notification outbox: {str(e)}")
+
+        if undelivered:
+            self.logger.info(f"Resuming delivery of {undelivered} queued notifications")
+            self.start()
+
+    @contextmanager
+    def _transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection for one transaction, committed on success.
+
+        Args:
+            immediate (bool, optional): Take the write lock at the start, so rows
+                read in the transaction cannot be claimed by another process.
+
+        Yields:
+            sqlite3.Connection: The connection.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def enqueue(self, recipient: str, subject: str, message: str) -> int:
+        """
+        Queue a notification and make sure the dispatcher is running.
+
+        Args:
+            recipient (str): Email address or user identifier.
+            subject (str): Notification subject.
+            message (str): Notification content.
+
+        Returns:
+            int: ID of the queued notification.
+
+        Raises:
+            DatabaseError: If the notification cannot be stored.
+        """
+        now = time.time()
+
+        try:
+            with self._transaction() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO notification_outbox (recipient, subject, message, created_at, next_attempt_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (recipient, subject, message, now, now)
+                )
+                notification_id = cursor.lastrowid
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to queue notification: {str(e)}")
+            raise DatabaseError(f"Failed to queue notification: {str(e)}")
+
+        self.start()
+        return notification_id
+
+    def _claim(self, force: bool) -> Dict[str, List[sqlite3.Row]]:
+        """
+        Claim the due notifications of up to batch_size recipients.
+
+        A recipient is due once its oldest pending notification has waited for
+        the coalescing window (or immediately if force is set).
+
+        Args:
+            force (bool): Ignore the coalescing window.
+
+        Returns:
+            Dict[str, List[sqlite3.Row]]: Claimed notifications by recipient, oldest first.
+        """
+        now = time.time()
+        window_start = now if force else now - self.coalesce_window
+
+        with self._transaction(immediate=True) as conn:
+            conn.row_factory = sqlite3.Row
+
+            # Release claims of dispatchers that died mid-send
+            conn.execute(
+                "UPDATE notification_outbox SET status = ?, claimed_at = NULL "
+                "WHERE status = ? AND claimed_at < ?",
+                (PENDING, SENDING, now - self.claim_lease)
+            )
+
+            recipients = [row[0] for row in conn.execute(
+                "SELECT recipient FROM notification_outbox "
+                "WHERE status = ? AND next_attempt_at <= ? "
+                "GROUP BY recipient HAVING MIN(created_at) <= ? "
+                "ORDER BY MIN(created_at) LIMIT ?",
+                (PENDING, now, window_start, self.batch_size)
+            )]
+
+            if not recipients:
+                return {}
+
+            placeholders = ", ".join("?" * len(recipients))
+            rows = conn.execute(
+                f"SELECT id, recipient, subject, message, attempts FROM notification_outbox "
+                f"WHERE status = ? AND next_attempt_at <= ? AND recipient IN ({placeholders}) "
+                f"ORDER BY id",
+                (PENDING, now, *recipients)
+            ).fetchall()
+
+            conn.executemany(
+                "UPDATE notification_outbox SET status = ?, claimed_at = ? WHERE id = ?",
+                [(SENDING, now, row["id"]) for row in rows]
+            )
+
+        claimed = {}
+        for row in rows:
+            claimed.setdefault(row["recipient"], []).append(row)
+        return claimed
+
+    @staticmethod
+    def _build_digest(recipient: str, rows: List[sqlite3.Row]) -> Dict[str, Any]:
+        """
+        Combine the notifications of one recipient into a single notification.
+
+        Args:
+            recipient (str): The recipient.
+            rows (List[sqlite3.Row]): The notifications, oldest first.
+
+        Returns:
+            Dict[str, Any]: Notification data for send_notification.
+        """
+        if len(rows) == 1:
+            return {"recipient": recipient, "subject": rows[0]["subject"], "message": rows[0]["message"]}
+
+        sections = [f"{row['subject']}\n\n{row['message']}" for row in rows]
+        return {
+            "recipient": recipient,
+            "subject": f"{len(rows)} test case updates",
+            "message": "\n\n----------\n\n".join(sections)
+        }
+
+    def _send(self, data: Dict[str, Any]):
+        """
+        Send one notification, raising if the notifier reports an error.
+        """
+        send = self.send
+        if send is None:
+            from src.phase1.notification_service.notification_manager import send_notification
+            send = self.send = send_notification
+
+        result = send(data)
+        if isinstance(result, dict) and result.get("status") == "error":
+            raise RuntimeError(result.get("message") or "Notification failed")
+
+    def dispatch_pending(self, force: bool = False) -> int:
+        """
+        Send due notifications, one digest per recipient.
+
+        Args:
+            force (bool, optional): Send everything pending now, ignoring the
+                coalescing window (not the retry backoff).
+
+        Returns:
+            int: Number of notifications sent.
+
+        Raises:
+            DatabaseError: If the outbox cannot be read or updated.
+        """
+        sent = 0
+
+        try:
+            while True:
+                claimed = self._claim(force)
+                if not claimed:
+                    return sent
+
+                for recipient, rows in claimed.items():
+                    ids = [row["id"] for row in rows]
+
+                    try:
+                        self._send(self._build_digest(recipient, rows))
+                    except Exception as e:
+                        self._record_failure(recipient, rows, str(e))
+                        continue
+
+                    with self._transaction() as conn:
+                        conn.execute(
+                            f"DELETE FROM notification_outbox WHERE id IN ({', '.join('?' * len(ids))})",
+                            ids
+                        )
+
+                    sent += len(ids)
+                    with self._lock:
+                        self._counts["sent"] += len(ids)
+                        self._counts["digests"] += 1
+
+                    self.logger.info(f"Sent {len(ids)} queued notification(s) to {recipient}")
+
+                # Retried rows are not due again in this run, so the loop ends
+                if len(claimed) < self.batch_size:
+                    return sent
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to dispatch notifications: {str(e)}")
+            raise DatabaseError(f"Failed to dispatch notifications: {str(e)}")
+
+    def _record_failure(self, recipient: str, rows: List[sqlite3.Row], error: str):
+        """
+        Schedule a retry of a failed digest, or mark it failed after max_attempts.
+        """
+        attempts = max(row["attempts"] for row in rows) + 1
+        ids = [row["id"] for row in rows]
+
+        if attempts >= self.max_attempts:
+            status, delay = FAILED, 0
+            self.logger.error(f"Giving up on {len(ids)} notification(s) to {recipient} "
+                              f"after {attempts} attempts: {error}")
+        else:
+            # Jitter keeps retries of many recipients from arriving together
+            status = PENDING
+            delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1)) * random.uniform(0.8, 1.0)
+            self.logger.warning(f"Failed to send notification(s) to {recipient} "
+                                f"(attempt {attempts}), retrying in {delay:.0f}s: {error}")
+
+        with self._transaction() as conn:
+            conn.execute(
+                f"UPDATE notification_outbox SET status = ?, attempts = ?, next_attempt_at = ?, "
+                f"claimed_at = NULL, last_error = ? WHERE id IN ({', '.join('?' * len(ids))})",
+                (status, attempts, time.time() + delay, error, *ids)
+            )
+
+        with self._lock:
+            self._counts["failed" if status == FAILED else "retries"] += len(ids)
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.dispatch_pending()
+            except Exception as e:
+                self.logger.error(f"Notification dispatcher run failed: {str(e)}")
+
+    def start(self):
+        """
+        Start the background dispatcher if it is not running.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="notification-dispatcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """
+        Stop the background dispatcher. Queued notifications stay in the outbox.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a running dispatch to finish.
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout)
+
+    def flush(self) -> int:
+        """
+        Send everything pending now, ignoring the coalescing window.
+
+        Returns:
+            int: Number of notifications sent.
+        """
+        return self.dispatch_pending(force=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get outbox counts.
+
+        Returns:
+            Dict[str, Any]: Rows by status in the outbox, plus counters of this process.
+        """
+        with self._transaction() as conn:
+            by_status = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM notification_outbox GROUP BY status"
+            ).fetchall())
+
+        with self._lock:
+            counts = dict(self._counts)
+            running = self._thread is not None and self._thread.is_alive()
+
+        return {
+            "pending": by_status.get(PENDING, 0),
+            "sending": by_status.get(SENDING, 0),
+            "failed": by_status.get(FAILED, 0),
+            "dispatcher_running": running,
+            "process": counts
+        }
+
+
+def create_notification_outbox(db_path: str = None,
+                               send: Callable[[Dict[str, Any]], Any] = None) -> NotificationOutbox:
+    """
+    Create a notification outbox configured from the environment.
+
+    Args:
+        db_path (str, optional): Path of the SQLite database. Defaults to the
+            NOTIFICATION_OUTBOX_PATH environment variable.
+        send (Callable, optional): Sends one notification dict.
+
+    Returns:
+        NotificationOutbox: The outbox.
+
+    Raises:
+        DatabaseError: If the database cannot be created.
+    """
+    return NotificationOutbox(
+        db_path=db_path or os.getenv('NOTIFICATION_OUTBOX_PATH'),
+        send=send,
+        coalesce_window=float(os.getenv('NOTIFICATION_COALESCE_SECONDS', '60')),
+        max_attempts=int(os.getenv('NOTIFICATION_MAX_ATTEMPTS', '8')),
+        retry_base=float(os.getenv('NOTIFICATION_RETRY_BASE_SECONDS', '30')),
+        retry_max=float(os.getenv('NOTIFICATION_RETRY_MAX_SECONDS', '3600')),
+        poll_interval=float(os.getenv('NOTIFICATION_POLL_SECONDS', '5'))
+    )
@@ -6,6 +6,9 @@ import logging
 import psycopg2
 import redis
 
+from src.common.exceptions.custom_exceptions import DatabaseError
+from src.persistence.connection.db_connection import get_pool
+
 class ConfigManager:
     def __init__(self, env: str = "dev", config_dir: str = "./configs"):
         self.env = env
@@ -13,10 +16,9 @@ class ConfigManager:
         self.config = {}
         self._load_config()
         try:
-            self.conn = psycopg2.connect("dbname=config_db user=admin password=secure123")
-            self.cursor = self.conn.cursor()
+            self.pool = get_pool(os.getenv("CONFIG_DB_URL", "dbname=config_db user=admin password=secure123"))
             self.redis_client = redis.Redis(host='localhost', port=6379, decode_responses=True)
-        except psycopg2.Error as e:
+        except (psycopg2.Error, DatabaseError) as e:
             print(f"Database connection error: {e}")
 
     def _load_config(self):
@@ -68,26 +70,28 @@ class ConfigManager:
             if cached_value:
                 return cached_value
 
-            self.cursor.execute("SELECT config_value FROM configurations WHERE config_key=%s ORDER BY version DESC LIMIT 1", (key,))
-            result = self.cursor.fetchone()
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT config_value FROM configurations WHERE config_key=%s ORDER BY version DESC LIMIT 1", (key,))
+                result = cursor.fetchone()
             if result:
                 self.redis_client.set(key, result[0])  # Cache the value
                 return result[0]
             return None
-        except psycopg2.Error as e:
+        except (psycopg2.Error, DatabaseError) as e:
             print(f"Error fetching configuration: {e}")
             
     def update_config_to_DB(self, key, value):
         """Update configuration with version tracking."""
         try:
-            self.cursor.execute("""
-                INSERT INTO configurations (config_key, config_value, version)
-                VALUES (%s, %s, (SELECT COALESCE(MAX(version), 0) + 1 FROM configurations WHERE config_key=%s))
-                ON CONFLICT (config_key) DO UPDATE SET config_value=%s, version=configurations.version + 1
-            """, (key, value, key, value))
-            self.conn.commit()
+            with self.pool.connection() as conn:
+                conn.cursor().execute("""
+                    INSERT INTO configurations (config_key, config_value, version)
+                    VALUES (%s, %s, (SELECT COALESCE(MAX(version), 0) + 1 FROM configurations WHERE config_key=%s))
+                    ON CONFLICT (config_key) DO UPDATE SET config_value=%s, version=configurations.version + 1
+                """, (key, value, key, value))
             self.redis_client.set(key, value)  # Update cache
-        except psycopg2.Error as e:
+        except (psycopg2.Error, DatabaseError) as e:
             print(f"Error updating configuration: {e}")
     
     def bulk_update_configurations(self, updates):
@@ -98,12 +102,12 @@ class ConfigManager:
         """
         try:
             query = "UPDATE configurations SET config_value = %s WHERE config_key = %s"
-            self.cursor.executemany(query, [(update["config_value"], update["config_key"]) for update in updates])
+            with self.pool.connection() as conn:
+                conn.cursor().executemany(query, [(update["config_value"], update["config_key"]) for update in updates])
 
-            self.conn.commit()
             return {"status": "Bulk update successful", "updated_records": len(updates)}
 
-        except psycopg2.Error as e:
+        except (psycopg2.Error, DatabaseError) as e:
             return {"error": f"Bulk update failed: {str(e)}"}
     
     
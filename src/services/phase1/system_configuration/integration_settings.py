@@ -1,11 +1,12 @@
+import os
 from cryptography.fernet import Fernet
-import psycopg2
 import redis
 
+from src.persistence.connection.db_connection import get_pool
+
 class CredentialManager:
     def __init__(self):
-        self.conn = psycopg2.connect("dbname=dbName user=user password=pwd")
-        self.cursor = self.conn.cursor()
+        self.pool = get_pool(os.getenv("CREDENTIALS_DB_URL", "dbname=dbName user=user password=pwd"))
         self.redis_client = redis.Redis(host='localhost', port=6379, decode_responses=True)
         self.key = self.load_or_generate_key()
         self.cipher = Fernet(self.key)
@@ -28,10 +29,10 @@ class CredentialManager:
 
     def store_credentials(self, service, key, value):
         encrypted_value = self.encrypt(value)
-        self.cursor.execute(
-            "INSERT INTO credentials (service_name, config_key, encrypted_value) VALUES (%s, %s, %s)",
-            (service, key, encrypted_value))
-        self.conn.commit()
+        with self.pool.connection() as conn:
+            conn.cursor().execute(
+                "INSERT INTO credentials (service_name, config_key, encrypted_value) VALUES (%s, %s, %s)",
+                (service, key, encrypted_value))
         self.redis_client.set(f"{service}:{key}", value)  # Cache the value
         print(f"Stored {service} credential securely.")
 
@@ -40,9 +41,11 @@ class CredentialManager:
         if cached_value:
             return cached_value  # Return from cache if available
         
-        self.cursor.execute(
-            "SELECT encrypted_value FROM credentials WHERE service_name=%s AND config_key=%s ORDER BY version DESC LIMIT 1",
-            (service, key))
-        result = self.cursor.fetchone()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT encrypted_value FROM credentials WHERE service_name=%s AND config_key=%s ORDER BY version DESC LIMIT 1",
+                (service, key))
+            result = cursor.fetchone()
 
         return self.decrypt(result[0]) if result else None
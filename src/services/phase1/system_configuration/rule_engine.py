@@ -1,12 +1,13 @@
-import psycopg2
+import os
 import pandas as pd
 import redis
 import json
 
+from src.persistence.connection.db_connection import get_pool
+
 class RuleEngine:
     def __init__(self):
-        self.conn = psycopg2.connect("dbname=rules_db user=admin password=secure123")
-        self.cursor = self.conn.cursor()
+        self.pool = get_pool(os.getenv("RULES_DB_URL", "dbname=rules_db user=admin password=secure123"))
         self.redis_client = redis.Redis(host='localhost', port=6379, decode_responses=True)
 
     def load_rules(self):
@@ -14,8 +15,10 @@ class RuleEngine:
         if cached_rules:
             return pd.DataFrame(json.loads(cached_rules))
         
-        self.cursor.execute("SELECT * FROM rule_definitions")
-        rules = self.cursor.fetchall()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM rule_definitions")
+            rules = cursor.fetchall()
         rules_df = pd.DataFrame(rules, columns=["id", "test_priority", "defect_severity", "module", "assigned_team"])
         
         self.redis_client.set("cached_rules", json.dumps(rules_df.to_dict()))
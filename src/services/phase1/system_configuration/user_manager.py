@@ -1,42 +1,46 @@
+import os
 import bcrypt
 import psycopg2
 
+from src.common.exceptions.custom_exceptions import DatabaseError
+from src.persistence.connection.db_connection import get_pool
+
 
 class UserManager:
     def __init__(self):
         try:
-            self.conn = psycopg2.connect("dbname=secure_db user=admin password=secure123")
-            self.cursor = self.conn.cursor()
-        except psycopg2.Error as e:
+            self.pool = get_pool(os.getenv("USERS_DB_URL", "dbname=secure_db user=admin password=secure123"))
+        except (psycopg2.Error, DatabaseError) as e:
             print(f"Database connection failed: {e}")
             
     def execute_query(self, query, values=None):
         try:
-            self.cursor.execute(query, values)
-            self.conn.commit()
-        except psycopg2.Error as e:
+            with self.pool.connection() as conn:
+                conn.cursor().execute(query, values)
+        except (psycopg2.Error, DatabaseError) as e:
             print(f"Database query error: {e}")
     
     def fetch_one(self, query, values=None):
         try:
-            self.cursor.execute(query, values)
-            return self.cursor.fetchone()
-        except psycopg2.Error as e:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, values)
+                return cursor.fetchone()
+        except (psycopg2.Error, DatabaseError) as e:
             print(f"Error fetching data: {e}")
     
     def close(self):
-        self.cursor.close()
-        self.conn.close()
+        # Connections are borrowed per call from the shared pool; nothing is held open here
+        pass
     
     def get_permissions(self, role):
         try:
-            self.cursor.execute("SELECT * FROM permissions WHERE role=%s", (role,))
-            result = self.cursor.fetchone()
+            result = self.fetch_one("SELECT * FROM permissions WHERE role=%s", (role,))
         
             if result:
                 return {"can_edit": result[1], "can_view": result[2], "can_delete": result[3]}
             return None
-        except psycopg2.Error as e:
+        except (psycopg2.Error, DatabaseError) as e:
             print(f"Error fetching data: {e}")
     
     def hash_password(password):
@@ -0,0 +1,651 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Async Metadata Manager Module for the Watsonx IPG Testing platform.
+
+This module provides AsyncMetadataManager, a coroutine-based variant of the
+MetadataManager read and write surface for the FastAPI services. It runs the
+same SQL as MetadataManager on psycopg 3's async connection pool, so a slow
+query suspends only the awaiting request instead of blocking the event loop.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, List, Any, Tuple, Optional
+
+from psycopg.rows import dict_row, tuple_row
+from psycopg_pool import AsyncConnectionPool
+from psycopg2.extensions import make_dsn
+
+from src.common.exceptions.custom_exceptions import (
+    MetadataError,
+    DatabaseError
+)
+from src.services.phase1.test_case_manager.metadata_manager import MetadataManager
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+class AsyncMetadataManager(MetadataManager):
+    """
+    Async variant of MetadataManager.
+
+    Query building, validation and result shaping are inherited from
+    MetadataManager; only execution differs. The async pool is separate from
+    the synchronous pools and must be opened before use, either with open()
+    or with "async with AsyncMetadataManager() as manager". Schema setup, file
+    storage, imports and exports remain on MetadataManager.
+
+    Example (FastAPI):
+        manager = AsyncMetadataManager()
+
+        @app.on_event("startup")
+        async def startup():
+            await manager.open()
+
+        @app.get("/test-cases/{test_case_id}")
+        async def get_test_case(test_case_id: str):
+            return await manager.get_test_case_metadata(test_case_id)
+    """
+
+    def __init__(self, schema_path: str = None, min_conn: int = 1, max_conn: int = 10,
+                 stats_summary: bool = None, metadata_cache: bool = None):
+        """
+        Initialize the AsyncMetadataManager. No connection is opened until open().
+
+        Args:
+            schema_path (str, optional): Path to the metadata schema JSON file.
+                If None, uses the default schema.
+            min_conn (int, optional): Minimum number of connections in the async pool.
+            max_conn (int, optional): Maximum number of connections in the async pool.
+            stats_summary (bool, optional): Serve get_stats from the stats summary table.
+                Defaults to the STATS_SUMMARY_ENABLED environment variable.
+            metadata_cache (bool, optional): Serve get_test_case_metadata from a
+                read-through cache. Defaults to the METADATA_CACHE_ENABLED environment variable.
+        """
+        # Tag queries always go to the database (the bitmap index loads synchronously),
+        # and statements are prepared by psycopg 3 itself
+        self._init_settings(schema_path, stats_summary, tag_bitmap_cache=False,
+                            blob_backend=None, blob_root=None, metadata_cache=metadata_cache,
+                            prepared_statements=False)
+
+        self.connection_pool = None
+        self.async_pool = AsyncConnectionPool(
+            self.db_url or make_dsn(**self.db_config),
+            min_size=min_conn,
+            max_size=max_conn,
+            open=False,
+            check=AsyncConnectionPool.check_connection,
+            max_lifetime=float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+            max_idle=float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300')),
+            timeout=float(os.getenv('DB_POOL_TIMEOUT', '30')),
+            name="metadata_async"
+        )
+
+    async def open(self):
+        """
+        Open the async connection pool.
+
+        Raises:
+            DatabaseError: If the pool cannot connect.
+        """
+        try:
+            await self.async_pool.open(wait=True)
+            self.logger.info("Initialized async connection pool")
+        except Exception as e:
+            self.logger.error(f"Failed to initialize async connection pool: {str(e)}")
+            raise DatabaseError(f"Failed to connect to PostgreSQL database: {str(e)}")
+
+    async def close(self):
+        """
+        Close the async connection pool.
+        """
+        await self.async_pool.close()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _get_db_connection(self):
+        # Inherited synchronous methods end up here; fail loudly instead of blocking the loop
+        raise DatabaseError("AsyncMetadataManager has no synchronous connections; use its async methods")
+
+    async def _run_cache(self, method, *args) -> Any:
+        """
+        Call a MetadataCache method without blocking the event loop.
+
+        The in-process LRU is called directly; with a Redis backend the call
+        runs in a worker thread, since the Redis client is synchronous.
+
+        Args:
+            method: Bound MetadataCache method.
+            *args: Its arguments.
+
+        Returns:
+            Any: What the method returns.
+        """
+        if self.metadata_cache.redis is None:
+            return method(*args)
+        return await asyncio.to_thread(method, *args)
+
+    async def _invalidate_metadata_cache_async(self, test_case_ids: List[str]) -> Optional[int]:
+        """
+        Drop cached metadata of test cases that were written.
+
+        Args:
+            test_case_ids (List[str]): The test case IDs.
+
+        Returns:
+            Optional[int]: Cache version to pass to set(), or None without a cache.
+        """
+        if self.metadata_cache is not None:
+            return await self._run_cache(self.metadata_cache.invalidate, test_case_ids)
+        return None
+
+    async def _fetch(self, query: str, params: tuple = None, fetch_one: bool = False,
+                     as_dict: bool = False) -> Any:
+        """
+        Run a query and fetch its results.
+
+        Args:
+            query (str): The SQL query to execute.
+            params (tuple, optional): Query parameters.
+            fetch_one (bool, optional): Fetch one row instead of all rows.
+            as_dict (bool, optional): Return rows as dictionaries.
+
+        Returns:
+            Any: The row (or None) if fetch_one, else the list of rows.
+
+        Raises:
+            DatabaseError: If query execution fails.
+        """
+        try:
+            async with self.async_pool.connection() as conn:
+                async with conn.cursor(row_factory=dict_row if as_dict else tuple_row) as cursor:
+                    await cursor.execute(query, params)
+                    if fetch_one:
+                        return await cursor.fetchone()
+                    return await cursor.fetchall()
+
+        except Exception as e:
+            self.logger.error(f"Query execution failed: {str(e)}\nQuery: {query}\nParams: {params}")
+            raise DatabaseError(f"Database operation failed: {str(e)}")
+
+    async def _execute_transaction_async(self, queries: List[Tuple[str, tuple]]) -> int:
+        """
+        Execute multiple queries as a single transaction.
+
+        Args:
+            queries (List[Tuple[str, tuple]]): List of (query, params) tuples.
+
+        Returns:
+            int: Row count of the last query.
+
+        Raises:
+            DatabaseError: If transaction execution fails.
+        """
+        try:
+            rowcount = 0
+            async with self.async_pool.connection() as conn:
+                async with conn.transaction():
+                    async with conn.cursor() as cursor:
+                        for query, params in queries:
+                            await cursor.execute(query, params)
+                            rowcount = cursor.rowcount
+            return rowcount
+
+        except Exception as e:
+            self.logger.error(f"Transaction execution failed: {str(e)}")
+            raise DatabaseError(f"Transaction failed: {str(e)}")
+
+    async def check_database_connection(self) -> bool:
+        """
+        Check if the database connection is working.
+
+        Returns:
+            bool: True if connection is working, False otherwise.
+        """
+        try:
+            result = await self._fetch("SELECT 1", fetch_one=True)
+            return result is not None and result[0] == 1
+        except Exception as e:
+            self.logger.error(f"Database connection check failed: {str(e)}")
+            return False
+
+    async def get_test_case_metadata(self, test_case_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get metadata for a test case.
+
+        Args:
+            test_case_id (str): The test case ID.
+
+        Returns:
+            Optional[Dict[str, Any]]: The metadata, or None if not found.
+        """
+        try:
+            if self.metadata_cache is not None:
+                cached = await self._run_cache(self.metadata_cache.get, test_case_id)
+                if cached is not None:
+                    return cached
+                cache_version = self.metadata_cache.version()
+
+            results = await self._fetch(f"""
+            SELECT {self._METADATA_COLUMNS} FROM test_cases
+            WHERE TEST_CASE_NUMBER = %s
+            ORDER BY STEP_NO ASC
+            """, (test_case_id,), as_dict=True)
+
+            if not results:
+                return None
+
+            metadata = self._build_test_case_metadata(results)
+
+            if self.metadata_cache is not None:
+                await self._run_cache(self.metadata_cache.set, test_case_id, metadata, cache_version)
+
+            return metadata
+
+        except Exception as e:
+            self.logger.error(f"Failed to get metadata: {str(e)}")
+            return None
+
+    async def get_test_case_metadata_bulk(self, test_case_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get metadata for many test cases using a single query.
+
+        Args:
+            test_case_ids (List[str]): The test case IDs.
+
+        Returns:
+            List[Dict[str, Any]]: The metadata of the test cases that exist, in the
+                same order as test_case_ids.
+
+        Raises:
+            DatabaseError: If the query fails.
+        """
+        if not test_case_ids:
+            return []
+
+        unique_ids = list(dict.fromkeys(test_case_ids))
+
+        results = await self._fetch(f"""
+        SELECT {self._METADATA_COLUMNS} FROM test_cases
+        WHERE TEST_CASE_NUMBER = ANY(%s)
+        ORDER BY TEST_CASE_NUMBER ASC, STEP_NO ASC
+        """, (unique_ids,), as_dict=True)
+
+        rows_by_test_case = {}
+        for row in results:
+            rows_by_test_case.setdefault(row.get("test_case_number"), []).append(row)
+
+        return [
+            self._build_test_case_metadata(rows_by_test_case[test_case_id])
+            for test_case_id in unique_ids
+            if test_case_id in rows_by_test_case
+        ]
+
+    async def search_test_cases(self, criteria: Dict[str, Any], limit: int = None,
+                                order: str = "asc", cursor: str = None) -> List[Dict[str, Any]]:
+        """
+        Search for test cases based on metadata criteria (see MetadataManager.search_test_cases).
+
+        Args:
+            criteria (Dict[str, Any]): Search criteria.
+            limit (int, optional): Maximum number of test cases to return.
+            order (str, optional): Sort direction on TEST_CASE_NUMBER ("asc" or "desc").
+            cursor (str, optional): Opaque cursor from a previous page.
+
+        Returns:
+            List[Dict[str, Any]]: List of matching test case metadata.
+        """
+        page = await self.search_test_cases_page(criteria, limit, order, cursor)
+        return page["test_cases"]
+
+    async def search_test_cases_page(self, criteria: Dict[str, Any], limit: int = None,
+                                     order: str = "asc", cursor: str = None,
+                                     offset: int = 0) -> Dict[str, Any]:
+        """
+        Search for one page of test cases using keyset pagination.
+
+        Args:
+            criteria (Dict[str, Any]): Search criteria (see search_test_cases).
+            limit (int, optional): Page size. If None, returns all matches.
+            order (str, optional): Sort direction on TEST_CASE_NUMBER ("asc" or "desc").
+            cursor (str, optional): Opaque cursor from a previous page's next_cursor.
+            offset (int, optional): Number of matches to skip.
+
+        Returns:
+            Dict[str, Any]: {"test_cases": [...], "next_cursor": str or None}.
+
+        Raises:
+            MetadataError: If the ordering or cursor is invalid.
+            DatabaseError: If the search fails.
+        """
+        query, params = self._build_search_page_query(criteria, limit, order, cursor, offset)
+
+        try:
+            results = await self._fetch(query, params)
+            test_case_ids, next_cursor = self._split_search_page([row[0] for row in results], limit, order)
+
+            if not test_case_ids:
+                return {"test_cases": [], "next_cursor": None}
+
+            return {
+                "test_cases": await self.get_test_case_metadata_bulk(test_case_ids),
+                "next_cursor": next_cursor
+            }
+
+        except Exception as e:
+            self.logger.error(f"Search failed: {str(e)}")
+            raise DatabaseError(f"Search operation failed: {str(e)}")
+
+    async def get_metadata_history(self, test_case_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the history of metadata changes for a test case.
+
+        Args:
+            test_case_id (str): The test case ID.
+
+        Returns:
+            List[Dict[str, Any]]: List of history entries, ordered by time.
+        """
+        try:
+            history = await self._fetch(self._HISTORY_QUERY, (test_case_id,), as_dict=True)
+            return self._format_history(history)
+
+        except Exception as e:
+            self.logger.error(f"Failed to get metadata history: {str(e)}")
+            return []
+
+    async def find_test_case_ids_by_tags(self, all_tags: List[str] = None, any_tags: List[str] = None,
+                                         not_tags: List[str] = None) -> List[str]:
+        """
+        Find test cases by tag with ALL, ANY and NOT semantics.
+
+        Args:
+            all_tags (List[str], optional): Test cases must have every one of these tags.
+            any_tags (List[str], optional): Test cases must have at least one of these tags.
+            not_tags (List[str], optional): Test cases must have none of these tags.
+
+        Returns:
+            List[str]: Matching test case IDs, sorted.
+
+        Raises:
+            DatabaseError: If the query fails.
+        """
+        query, params = self._build_tag_query(
+            self._normalize_tags(all_tags),
+            self._normalize_tags(any_tags),
+            self._normalize_tags(not_tags)
+        )
+
+        results = await self._fetch(query, params)
+        return [row[0] for row in results]
+
+    async def get_test_cases_by_tags(self, tags: List[str], match: str = "all") -> List[Dict[str, Any]]:
+        """
+        Get all test cases that have the specified tags.
+
+        Args:
+            tags (List[str]): List of tags to match.
+            match (str, optional): "all" to require every tag, "any" to require at least one.
+
+        Returns:
+            List[Dict[str, Any]]: List of test case metadata.
+        """
+        if match == "any":
+            test_case_ids = await self.find_test_case_ids_by_tags(any_tags=tags)
+        else:
+            test_case_ids = await self.find_test_case_ids_by_tags(all_tags=tags)
+
+        return await self.get_test_case_metadata_bulk(test_case_ids)
+
+    async def search_test_cases_by_content(self, search_text: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Full-text search over step descriptions, expected results and data.
+
+        Args:
+            search_text (str): Text to search for, in web search syntax.
+            limit (int, optional): Maximum number of test cases to return.
+
+        Returns:
+            List[Dict[str, Any]]: Matching test case metadata, best match first, with
+                TAGS, RANK and MATCHES (see MetadataManager.search_test_cases_by_content).
+        """
+        try:
+            rows = await self._fetch(self._CONTENT_SEARCH_QUERY, (search_text, limit))
+
+            if not rows:
+                return []
+
+            matches = self._group_content_matches(rows)
+
+            processed_results = []
+            for metadata in await self.get_test_case_metadata_bulk(list(matches)):
+                metadata.update(matches[metadata["TEST_CASE_NUMBER"]])
+                processed_results.append(metadata)
+
+            return processed_results
+
+        except Exception as e:
+            self.logger.error(f"Content search failed: {str(e)}")
+            return []
+
+    async def get_all_tags(self) -> List[str]:
+        """
+        Get all unique tags used across all test cases.
+
+        Returns:
+            List[str]: List of unique tags.
+        """
+        try:
+            result = await self._fetch("SELECT name FROM tags ORDER BY name")
+            return [row[0] for row in result]
+
+        except Exception as e:
+            self.logger.error(f"Failed to get all tags: {str(e)}")
+            return []
+
+    async def get_stats(self, use_summary: bool = None) -> Dict[str, Any]:
+        """
+        Get statistics about test cases (see MetadataManager.get_stats).
+
+        Args:
+            use_summary (bool, optional): Read from the stats summary table.
+                Defaults to the stats_summary setting of this manager.
+
+        Returns:
+            Dict[str, Any]: Statistics including counts by status, type, etc.
+        """
+        if use_summary is None:
+            use_summary = self.stats_summary
+
+        try:
+            counts = await self._fetch(self._build_stats_query(use_summary))
+            return self._format_stats(counts)
+
+        except Exception as e:
+            self.logger.error(f"Failed to get statistics: {str(e)}")
+            return {"total_count": 0}
+
+    async def update_test_case_metadata(self, test_case_id: str, updates: Dict[str, Any],
+                                        modified_by: str = None) -> Dict[str, Any]:
+        """
+        Update metadata for an existing test case.
+
+        The inherited update_test_case_status, update_test_case_owner,
+        update_automation_status and update_test_execution_result helpers
+        validate synchronously and return this coroutine, so they are awaited
+        the same way.
+
+        Args:
+            test_case_id (str): The test case ID (TEST_CASE_NUMBER).
+            updates (Dict[str, Any]): Metadata fields to update.
+            modified_by (str, optional): Person making the updates.
+
+        Returns:
+            Dict[str, Any]: The updated metadata.
+
+        Raises:
+            MetadataError: If metadata update fails.
+        """
+        try:
+            async with self.async_pool.connection() as conn:
+                async with conn.transaction():
+                    async with conn.cursor(row_factory=dict_row) as cursor:
+                        await cursor.execute(self._LOCK_TEST_CASE_STEPS_QUERY, (test_case_id,))
+                        rows = await cursor.fetchall()
+                        if not rows:
+                            raise MetadataError(f"Test case {test_case_id} not found")
+
+                        if self._test_case_columns is None:
+                            await cursor.execute(self._TEST_CASE_COLUMNS_QUERY)
+                            self._test_case_columns = {row["name"]: row["type"] for row in await cursor.fetchall()}
+
+                        plan = self._build_step_update_query(test_case_id, rows, updates, self._test_case_columns)
+                        if plan:
+                            await cursor.execute(*plan)
+                            rows, history = self._merge_updated_steps(
+                                test_case_id, rows, await cursor.fetchall(), updates, modified_by
+                            )
+
+                            if history:
+                                await cursor.execute(*self._build_history_insert(history))
+
+            cache_version = await self._invalidate_metadata_cache_async([test_case_id])
+
+            # A later writer's invalidation still wins over caching these rows
+            updated_metadata = self._build_test_case_metadata(rows)
+            if self.metadata_cache is not None:
+                await self._run_cache(self.metadata_cache.set, test_case_id, updated_metadata, cache_version)
+
+            return updated_metadata
+
+        except Exception as e:
+            self.logger.error(f"Failed to update metadata: {str(e)}")
+            raise MetadataError(f"Failed to update metadata: {str(e)}")
+
+    async def delete_test_case_metadata(self, test_case_id: str) -> bool:
+        """
+        Delete metadata for a test case.
+
+        Args:
+            test_case_id (str): The test case ID.
+
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        try:
+            await self._execute_transaction_async(self._build_delete_test_case_queries(test_case_id))
+            await self._invalidate_metadata_cache_async([test_case_id])
+
+            self.logger.info(f"Deleted metadata for test case {test_case_id}")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to delete metadata: {str(e)}")
+            return False
+
+    async def _update_test_case_tags(self, test_case_id: str, tags: List[str]) -> bool:
+        """
+        Replace the tags of a test case in one transaction.
+
+        Args:
+            test_case_id (str): The test case ID.
+            tags (List[str]): The list of tags.
+
+        Returns:
+            bool: True if successful.
+
+        Raises:
+            DatabaseError: If tag update fails.
+        """
+        await self._execute_transaction_async(self._build_tag_update_queries(test_case_id, tags))
+        await self._invalidate_metadata_cache_async([test_case_id])
+        return True
+
+    async def bulk_tag(self, test_case_ids: List[str], tags: List[str], replace: bool = False) -> int:
+        """
+        Apply tags to many test cases in a single transaction.
+
+        Args:
+            test_case_ids (List[str]): The test case IDs to tag.
+            tags (List[str]): Tags to apply to every test case.
+            replace (bool, optional): Remove the existing tags of these test cases first.
+
+        Returns:
+            int: Number of tag associations created.
+
+        Raises:
+            DatabaseError: If the bulk tag update fails.
+        """
+        tags = self._normalize_tags(tags)
+        test_case_ids = list(dict.fromkeys(test_case_ids or []))
+
+        if not test_case_ids:
+            return 0
+
+        queries = self._build_bulk_tag_queries(test_case_ids, tags, replace)
+        created = await self._execute_transaction_async(queries)
+        await self._invalidate_metadata_cache_async(test_case_ids)
+
+        self.logger.info(f"Tagged {len(test_case_ids)} test cases with {len(tags)} tags")
+        return created if tags else 0
+
+    async def add_tags_to_test_case(self, test_case_id: str, tags: List[str],
+                                    modified_by: str = None) -> Dict[str, Any]:
+        """
+        Add tags to a test case.
+
+        Args:
+            test_case_id (str): The test case ID.
+            tags (List[str]): Tags to add.
+            modified_by (str, optional): Person making the update.
+
+        Returns:
+            Dict[str, Any]: The updated metadata.
+
+        Raises:
+            MetadataError: If the test case does not exist.
+        """
+        if not await self.get_test_case_metadata(test_case_id):
+            raise MetadataError(f"Test case {test_case_id} not found")
+
+        await self.bulk_tag([test_case_id], tags)
+        return await self.get_test_case_metadata(test_case_id)
+
+    async def remove_tags_from_test_case(self, test_case_id: str, tags: List[str],
+                                         modified_by: str = None) -> Dict[str, Any]:
+        """
+        Remove tags from a test case.
+
+        Args:
+            test_case_id (str): The test case ID.
+            tags (List[str]): Tags to remove.
+            modified_by (str, optional): Person making the update.
+
+        Returns:
+            Dict[str, Any]: The updated metadata.
+
+        Raises:
+            MetadataError: If the test case does not exist.
+        """
+        if not await self.get_test_case_metadata(test_case_id):
+            raise MetadataError(f"Test case {test_case_id} not found")
+
+        await self._execute_transaction_async([("""
+        DELETE FROM test_case_tags tct
+        USING tags t
+        WHERE t.id = tct.tag_id
+        AND tct.test_case_id = %s
+        AND t.name = ANY(%s)
+        """, (test_case_id, self._normalize_tags(tags)))])
+        await self._invalidate_metadata_cache_async([test_case_id])
+
+        return await self.get_test_case_metadata(test_case_id)
@@ -13,24 +13,38 @@ import os
 import pandas as pd
 import logging
 import json
-from typing import Dict, List, Any, Tuple, Optional, Union, Set
+import base64
+from typing import Dict, List, Any, Tuple, Optional, Union, Set, Iterator, BinaryIO
 from datetime import datetime
 import re
 import uuid
+import shutil
+import hashlib
+import tempfile
+import copy
+import time
+import threading
+from collections import OrderedDict
+from itertools import groupby, islice
 import psycopg2
-from psycopg2 import pool
+from psycopg2.extensions import make_dsn
 from psycopg2.extras import RealDictCursor, Json
 import dotenv
-from io import BytesIO
+from io import BytesIO, StringIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
 # Import from src.common
 from src.common.utils.file_utils import read_file, write_file
 from src.common.logging.log_utils import setup_logger
 from src.common.exceptions.custom_exceptions import (
     MetadataError,
+    MetadataValidationError,
     DatabaseError,
     SchemaValidationError
 )
+from src.persistence.connection.db_connection import get_pool
+from src.persistence.connection.statement_cache import StatementCache
+from src.persistence.storage.blob_store import BlobStore, CHUNK_SIZE
 
 # Import from phase1
 from src.phase1.system_configuration.rule_engine import get_assignment_rules
@@ -41,6 +55,722 @@ dotenv.load_dotenv()
 # Setup logger
 logger = logging.getLogger(__name__)
 
+def parse_test_case_file(file_path_or_content: Union[str, bytes],
+                         test_case_id: str = None) -> Dict[str, Any]:
+    """
+    Read a test case Excel file and extract its metadata without touching the database.
+    
+    Module-level so that it can run in a worker process (see
+    MetadataManager.bulk_import_test_cases with parallel=True).
+    
+    Args:
+        file_path_or_content (Union[str, bytes]): Path to the Excel file or file content as bytes.
+        test_case_id (str, optional): The test case ID. If None, extracted from file.
+        
+    Returns:
+        Dict[str, Any]: test_case_id, test_case_data, file_name, file_type and file_content.
+        
+    Raises:
+        MetadataError: If the file cannot be read.
+    """
+    # Determine if input is a file path or file content
+    file_name = None
+    file_type = None
+    file_content = None
+    df = None
+    
+    if isinstance(file_path_or_content, str) and os.path.exists(file_path_or_content):
+        # It's a file path
+        file_path = file_path_or_content
+        file_name = os.path.basename(file_path)
+        file_type = os.path.splitext(file_name)[1].lstrip('.')
+        
+        # Read file content as bytes
+        with open(file_path, 'rb') as f:
+            file_content = f.read()
+        
+        # Read Excel directly to DataFrame
+        file_io = BytesIO(file_content)
+        df = pd.read_excel(file_io, engine='openpyxl')
+    
+    elif isinstance(file_path_or_content, bytes):
+        # It's file content as bytes - assume Excel format
+        file_content = file_path_or_content
+        file_type = "xlsx"  # Default to xlsx
+        
+        # If test_case_id is provided, use it for the file name
+        file_name = f"{test_case_id}.{file_type}" if test_case_id else f"imported_test_case.{file_type}"
+        
+        # Read Excel directly to DataFrame
+        file_io = BytesIO(file_content)
+        df = pd.read_excel(file_io, engine='openpyxl')
+    
+    else:
+        raise MetadataError(f"Invalid input: must be a file path or file content as bytes")
+    
+    if df is None or df.empty:
+        raise MetadataError(f"Empty Excel file: {file_name}")
+    
+    # Extract TEST_CASE_ID from file if not provided
+    if not test_case_id:
+        if "TEST CASE NUMBER" in df.columns and not df["TEST CASE NUMBER"].isna().all():
+            test_case_id = df["TEST CASE NUMBER"].iloc[0]
+        else:
+            # Generate a new ID
+            test_case_id = f"TC-{uuid.uuid4().hex[:8].upper()}"
+    
+    # Extract test case metadata
+    test_case_data = {}
+    
+    # Map fields from first row if available
+    if len(df) > 0:
+        first_row = df.iloc[0]
+        
+        # Map common fields
+        field_mappings = {
+            "TEST CASE": "TEST_CASE",
+            "SUBJECT": "MODULE",
+            "TEST USER ID/ROLE": "OWNER",
+            "TYPE": "TEST_TYPE",
+            "TEST CASE NUMBER": "TEST_CASE_ID"
+        }
+        
+        for source, target in field_mappings.items():
+            if source in df.columns and not pd.isna(first_row.get(source)):
+                test_case_data[target] = first_row.get(source)
+    
+    # Override with provided test_case_id
+    test_case_data["TEST_CASE_ID"] = test_case_id
+    
+    return {
+        "test_case_id": test_case_id,
+        "test_case_data": test_case_data,
+        "file_name": file_name,
+        "file_type": file_type,
+        "file_content": file_content
+    }
+
+
+class TagBitmapIndex:
+    """
+    In-memory inverted index from tag name to a bitmap of test case ordinals.
+    
+    Each test case gets an ordinal and each tag a Python int whose set bits are
+    the ordinals of its test cases, so ALL/ANY/NOT tag queries become bitwise
+    AND/OR/AND-NOT operations. The index is rebuilt lazily after invalidation
+    or once it is older than ttl_seconds, which bounds staleness when other
+    processes write tags. Every invalidation bumps a generation counter; a
+    build whose data was read before an invalidation is not published, so a
+    concurrent write is never masked by an index that looks fresh.
+    """
+    
+    def __init__(self, ttl_seconds: int = 300):
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        # (test_case_ids, bitmaps, universe), replaced as a whole so readers
+        # never mix one build's ordinals with another build's bitmaps
+        self.snapshot: Tuple[List[str], Dict[str, int], int] = ([], {}, 0)
+        self.loaded_at = None
+        self.generation = 0
+    
+    @property
+    def test_case_ids(self) -> List[str]:
+        return self.snapshot[0]
+    
+    @property
+    def bitmaps(self) -> Dict[str, int]:
+        return self.snapshot[1]
+    
+    def load(self, test_case_ids: List[str], tag_pairs: List[Tuple[str, str]],
+             generation: Optional[int] = None) -> bool:
+        """
+        Build the bitmaps and publish them for queries.
+        
+        Args:
+            test_case_ids (List[str]): Every known test case ID.
+            tag_pairs (List[Tuple[str, str]]): (tag_name, test_case_id) associations.
+            generation (int, optional): Value of generation taken before the data
+                was read. The build is discarded if the index was invalidated since.
+            
+        Returns:
+            bool: True if the build was published.
+        """
+        ids = list(dict.fromkeys(test_case_ids))
+        ordinals = {test_case_id: i for i, test_case_id in enumerate(ids)}
+        
+        positions = {}
+        for tag_name, test_case_id in tag_pairs:
+            ordinal = ordinals.get(test_case_id)
+            if ordinal is None:
+                # Tagged but unknown test case; give it an ordinal so the tag still resolves
+                ordinal = ordinals[test_case_id] = len(ids)
+                ids.append(test_case_id)
+            positions.setdefault(tag_name, []).append(ordinal)
+        
+        # Each bitmap is assembled in a byte buffer and converted to an int once
+        bitmaps = {}
+        for tag_name, ordinals_of_tag in positions.items():
+            buffer = bytearray((max(ordinals_of_tag) >> 3) + 1)
+            for ordinal in ordinals_of_tag:
+                buffer[ordinal >> 3] |= 1 << (ordinal & 7)
+            bitmaps[tag_name] = int.from_bytes(buffer, "little")
+        
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self.snapshot = (ids, bitmaps, (1 << len(ids)) - 1)
+            self.loaded_at = datetime.now()
+            return True
+    
+    def invalidate(self):
+        """Mark the index for rebuild on next use."""
+        with self.lock:
+            self.generation += 1
+            self.loaded_at = None
+    
+    def is_stale(self) -> bool:
+        """Whether the index must be (re)built before use."""
+        return self.loaded_at is None or (datetime.now() - self.loaded_at).total_seconds() > self.ttl_seconds
+    
+    def query(self, all_tags: List[str], any_tags: List[str], not_tags: List[str]) -> List[str]:
+        """
+        Resolve a tag query to test case IDs.
+        
+        Args:
+            all_tags (List[str]): Test cases must have every one of these tags.
+            any_tags (List[str]): Test cases must have at least one of these tags.
+            not_tags (List[str]): Test cases must have none of these tags.
+            
+        Returns:
+            List[str]: Matching test case IDs, sorted.
+        """
+        with self.lock:
+            test_case_ids, bitmaps, universe = self.snapshot
+        
+        result = universe
+        for tag in all_tags:
+            result &= bitmaps.get(tag, 0)
+        
+        if any_tags:
+            any_bitmap = 0
+            for tag in any_tags:
+                any_bitmap |= bitmaps.get(tag, 0)
+            result &= any_bitmap
+        
+        for tag in not_tags:
+            result &= ~bitmaps.get(tag, 0)
+        
+        matches = []
+        while result:
+            lowest = result & -result
+            matches.append(test_case_ids[lowest.bit_length() - 1])
+            result ^= lowest
+        
+        return sorted(matches)
+
+
+class MetadataCache:
+    """
+    Read-through cache of test case metadata keyed by test case ID.
+    
+    Entries live in a bounded in-process LRU and, when a Redis URL is given, in
+    Redis as well so that worker processes share them. Writers invalidate the
+    IDs they touch; entries also expire after ttl_seconds, which bounds how long
+    another process's local LRU can serve a value invalidated elsewhere.
+    
+    Readers take version() before querying the database and pass it to set(),
+    which drops the value if the test case was invalidated in between, so a
+    slow read cannot re-cache data that a concurrent write has replaced.
+    """
+    
+    def __init__(self, max_size: int = 1024, ttl_seconds: int = 60,
+                 redis_url: str = None, key_prefix: str = "metadata:"):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "redis_hits": 0, "misses": 0, "evictions": 0,
+                         "invalidations": 0, "stale_sets": 0}
+        # Sequence number of the latest invalidation of each recently invalidated
+        # ID, bounded like the entries; IDs dropped from it are assumed to have
+        # been invalidated at forgotten_sequence
+        self.sequence = 0
+        self.invalidated = OrderedDict()
+        self.forgotten_sequence = 0
+        
+        self.redis = None
+        if redis_url:
+            import redis
+            self.redis = redis.Redis.from_url(redis_url)
+    
+    @staticmethod
+    def _encode(value: Any) -> str:
+        def default(obj):
+            if isinstance(obj, datetime):
+                return {"__datetime__": obj.isoformat()}
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        return json.dumps(value, default=default)
+    
+    @staticmethod
+    def _decode(data: Union[str, bytes]) -> Any:
+        def object_hook(obj):
+            if len(obj) == 1 and "__datetime__" in obj:
+                return datetime.fromisoformat(obj["__datetime__"])
+            return obj
+        return json.loads(data, object_hook=object_hook)
+    
+    def _count(self, counter: str, amount: int = 1):
+        with self.lock:
+            self.counters[counter] += amount
+    
+    def get(self, test_case_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a test case's metadata.
+        
+        Args:
+            test_case_id (str): The test case ID.
+            
+        Returns:
+            Optional[Dict[str, Any]]: A copy of the cached metadata, or None on a miss.
+        """
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(test_case_id)
+            if entry is not None and now - entry[1] <= self.ttl_seconds:
+                self.entries.move_to_end(test_case_id)
+                self.counters["hits"] += 1
+                return copy.deepcopy(entry[0])
+        
+        if self.redis is not None:
+            try:
+                data = self.redis.get(self.key_prefix + test_case_id)
+            except Exception as e:
+                logger.warning(f"Metadata cache Redis lookup failed: {str(e)}")
+                data = None
+            
+            if data is not None:
+                value = self._decode(data)
+                self._store_local(test_case_id, value)
+                self._count("redis_hits")
+                return copy.deepcopy(value)
+        
+        self._count("misses")
+        return None
+    
+    def _store_local(self, test_case_id: str, value: Dict[str, Any]):
+        with self.lock:
+            self._store_local_locked(test_case_id, value)
+    
+    def _store_local_locked(self, test_case_id: str, value: Dict[str, Any]):
+        self.entries[test_case_id] = (value, time.monotonic())
+        self.entries.move_to_end(test_case_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.counters["evictions"] += 1
+    
+    def version(self) -> int:
+        """
+        Get the invalidation sequence number to pass to set() after a read.
+        
+        Returns:
+            int: The current sequence number.
+        """
+        with self.lock:
+            return self.sequence
+    
+    def set(self, test_case_id: str, value: Dict[str, Any], version: Optional[int] = None) -> bool:
+        """
+        Cache a test case's metadata.
+        
+        Args:
+            test_case_id (str): The test case ID.
+            value (Dict[str, Any]): The metadata, as returned by the database.
+            version (int, optional): What version() returned before the value was
+                read. The value is dropped if the test case was invalidated since.
+                Writers caching the value they just wrote omit it.
+                
+        Returns:
+            bool: True if the value was cached.
+        """
+        value = copy.deepcopy(value)
+        with self.lock:
+            if version is not None and self.invalidated.get(test_case_id, self.forgotten_sequence) > version:
+                self.counters["stale_sets"] += 1
+                return False
+            self._store_local_locked(test_case_id, value)
+        
+        if self.redis is not None:
+            try:
+                self.redis.set(self.key_prefix + test_case_id, self._encode(value), ex=self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Metadata cache Redis write failed: {str(e)}")
+        
+        return True
+    
+    def invalidate(self, test_case_ids: List[str]) -> int:
+        """
+        Drop the cached metadata of some test cases.
+        
+        Args:
+            test_case_ids (List[str]): The test case IDs.
+            
+        Returns:
+            int: Sequence number of this invalidation, usable as a set() version.
+        """
+        test_case_ids = [str(test_case_id) for test_case_id in test_case_ids]
+        with self.lock:
+            self.sequence += 1
+            for test_case_id in test_case_ids:
+                self.entries.pop(test_case_id, None)
+                self.invalidated[test_case_id] = self.sequence
+                self.invalidated.move_to_end(test_case_id)
+            while len(self.invalidated) > self.max_size:
+                _, sequence = self.invalidated.popitem(last=False)
+                self.forgotten_sequence = max(self.forgotten_sequence, sequence)
+            self.counters["invalidations"] += len(test_case_ids)
+            sequence = self.sequence
+        
+        if self.redis is not None and test_case_ids:
+            try:
+                self.redis.delete(*[self.key_prefix + test_case_id for test_case_id in test_case_ids])
+            except Exception as e:
+                logger.warning(f"Metadata cache Redis invalidation failed: {str(e)}")
+        
+        return sequence
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters.
+        
+        Returns:
+            Dict[str, Any]: Counters, current size and overall hit rate.
+        """
+        with self.lock:
+            metrics = dict(self.counters)
+            metrics["size"] = len(self.entries)
+            metrics["max_size"] = self.max_size
+        
+        lookups = metrics["hits"] + metrics["redis_hits"] + metrics["misses"]
+        metrics["hit_rate"] = (metrics["hits"] + metrics["redis_hits"]) / lookups if lookups else 0.0
+        metrics["backend"] = "redis" if self.redis is not None else "memory"
+        return metrics
+
+
+def _serialize_date(value):
+    if isinstance(value, str):
+        # Convert ISO string to datetime; if conversion fails, store as is
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+    return value  # PostgreSQL can handle datetime objects directly
+
+
+def _serialize_array(value):
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    elif isinstance(value, str):
+        # If it's a JSON string, parse it; otherwise treat as a single-item array
+        try:
+            return json.loads(value)
+        except ValueError:
+            return [value]
+    return []
+
+
+def _serialize_binary(value):
+    return value.encode('utf-8') if isinstance(value, str) else value
+
+
+def _serialize_as_is(value):
+    return value
+
+
+# Serializers by schema field type; None is passed through before dispatch
+_SERIALIZERS = {
+    "date": _serialize_date,
+    "array": _serialize_array,
+    "boolean": bool,
+    "binary": _serialize_binary
+}
+
+
+class CompiledSchema:
+    """
+    Metadata schema compiled into one validator and one serializer per field.
+    
+    The schema dict is interpreted once, here; validating or serializing a
+    record then costs one dictionary lookup and one call per field present.
+    """
+    
+    def __init__(self, schema: Dict[str, Any]):
+        """
+        Compile a metadata schema.
+        
+        Args:
+            schema (Dict[str, Any]): Schema with a "metadata_fields" mapping.
+            
+        Raises:
+            SchemaValidationError: If a field definition has no type.
+        """
+        self.fields = schema["metadata_fields"]
+        
+        for field_name, field_def in self.fields.items():
+            if "type" not in field_def:
+                raise SchemaValidationError(f"Field '{field_name}' has no type")
+        
+        self.required = tuple(
+            field_name for field_name, field_def in self.fields.items()
+            if field_def.get("required", False)
+        )
+        self.defaults = {
+            field_name: field_def["default"]
+            for field_name, field_def in self.fields.items()
+            if "default" in field_def
+        }
+        self.serializers = {
+            field_name: _SERIALIZERS.get(field_def["type"], _serialize_as_is)
+            for field_name, field_def in self.fields.items()
+        }
+        self.validators = {}
+        for field_name, field_def in self.fields.items():
+            check = self._compile_validator(field_name, field_def)
+            if check is not None:
+                self.validators[field_name] = check
+    
+    @staticmethod
+    def _compile_validator(field_name: str, field_def: Dict[str, Any]):
+        """
+        Build the validator of one field.
+        
+        Args:
+            field_name (str): The field name.
+            field_def (Dict[str, Any]): The field definition.
+            
+        Returns:
+            Callable[[Any], Optional[str]]: Returns an error message for an invalid
+                value and None otherwise, or None if the field type is not checked.
+        """
+        field_type = field_def["type"]
+        
+        if field_type == "enum" and "values" in field_def:
+            values = field_def["values"]
+            try:
+                allowed = frozenset(values)
+            except TypeError:
+                allowed = values
+            
+            def check(value):
+                try:
+                    valid = value in allowed
+                except TypeError:
+                    valid = value in values
+                if not valid:
+                    return f"Value '{value}' for '{field_name}' must be one of: {values}"
+        
+        elif field_type == "date":
+            def check(value):
+                if isinstance(value, datetime):
+                    return None
+                if not isinstance(value, str):
+                    return f"Value for '{field_name}' must be a date string or datetime object"
+                try:
+                    datetime.fromisoformat(value.replace('Z', '+00:00'))
+                except ValueError:
+                    return f"Value '{value}' for '{field_name}' is not a valid date format"
+        
+        elif field_type in ("number", "integer"):
+            accepted = int if field_type == "integer" else (int, float)
+            message = f"Value for '{field_name}' must be a {field_type}"
+            
+            def check(value):
+                if not isinstance(value, accepted):
+                    return message
+        
+        elif field_type == "boolean":
+            message = f"Value for '{field_name}' must be a boolean"
+            
+            def check(value):
+                if not isinstance(value, bool):
+                    return message
+        
+        elif field_type == "array":
+            message = f"Value for '{field_name}' must be an array"
+            
+            def check(value):
+                if not isinstance(value, (list, tuple, set)):
+                    return message
+        
+        else:
+            return None
+        
+        if field_def.get("required", False):
+            return check
+        
+        # None is always valid for optional fields
+        return lambda value: None if value is None else check(value)
+    
+    def validate(self, metadata: Dict[str, Any]) -> List[str]:
+        """
+        Validate one metadata record.
+        
+        Args:
+            metadata (Dict[str, Any]): The metadata to validate.
+            
+        Returns:
+            List[str]: Error messages; empty if the record is valid.
+        """
+        errors = [f"Required field '{field_name}' is missing" for field_name in self.required if field_name not in metadata]
+        
+        validators = self.validators
+        for field_name, value in metadata.items():
+            check = validators.get(field_name)
+            if check is not None:
+                error = check(value)
+                if error is not None:
+                    errors.append(error)
+        
+        return errors
+    
+    def validate_many(self, records: List[Dict[str, Any]]) -> Dict[int, List[str]]:
+        """
+        Validate a batch of metadata records.
+        
+        Args:
+            records (List[Dict[str, Any]]): The metadata records.
+            
+        Returns:
+            Dict[int, List[str]]: Error messages keyed by record index, for invalid records only.
+        """
+        row_errors = {}
+        for index, metadata in enumerate(records):
+            errors = self.validate(metadata)
+            if errors:
+                row_errors[index] = errors
+        return row_errors
+    
+    def validate_frame(self, df: pd.DataFrame) -> Dict[int, List[str]]:
+        """
+        Validate a DataFrame of metadata records column by column.
+        
+        Date columns are converted to timestamps in place.
+        
+        Args:
+            df (pd.DataFrame): The metadata records.
+            
+        Returns:
+            Dict[int, List[str]]: Error messages keyed by row index, for invalid rows only.
+        """
+        row_errors = {}
+        
+        def add_errors(mask, message):
+            for idx in df.index[mask]:
+                row_errors.setdefault(idx, []).append(message(idx))
+        
+        for field_name, field_def in self.fields.items():
+            field_type = field_def["type"]
+            
+            if field_name not in df.columns:
+                if field_def.get("required", False):
+                    add_errors(pd.Series(True, index=df.index), lambda idx: f"Required field '{field_name}' is missing")
+                continue
+            
+            column = df[field_name]
+            present = column.notna()
+            
+            if field_def.get("required", False):
+                add_errors(~present, lambda idx: f"Required field '{field_name}' is missing")
+            
+            if field_type == "enum" and "values" in field_def:
+                add_errors(
+                    present & ~column.isin(field_def["values"]),
+                    lambda idx: f"Value '{column[idx]}' for '{field_name}' must be one of: {field_def['values']}"
+                )
+            
+            elif field_type == "date":
+                parsed = pd.to_datetime(column, errors="coerce", utc=True)
+                add_errors(
+                    present & parsed.isna(),
+                    lambda idx: f"Value '{column[idx]}' for '{field_name}' is not a valid date format"
+                )
+                df[field_name] = parsed
+            
+            elif field_type in ("number", "integer"):
+                numeric = pd.to_numeric(column, errors="coerce")
+                invalid = present & numeric.isna()
+                if field_type == "integer":
+                    invalid |= present & numeric.notna() & (numeric % 1 != 0)
+                add_errors(invalid, lambda idx: f"Value for '{field_name}' must be a {field_type}")
+            
+            elif field_type == "boolean":
+                add_errors(
+                    present & ~column.map(lambda value: isinstance(value, bool)),
+                    lambda idx: f"Value for '{field_name}' must be a boolean"
+                )
+        
+        return row_errors
+    
+    def apply_defaults(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return a copy of a record with schema defaults for its missing fields.
+        
+        Args:
+            metadata (Dict[str, Any]): The metadata record.
+            
+        Returns:
+            Dict[str, Any]: Metadata with defaults applied.
+        """
+        updated = metadata.copy()
+        for field_name, default in self.defaults.items():
+            if field_name not in updated:
+                updated[field_name] = default
+        return updated
+    
+    def serialize(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Serialize the schema fields of a record for storage in PostgreSQL.
+        
+        Args:
+            metadata (Dict[str, Any]): The metadata record.
+            
+        Returns:
+            Dict[str, Any]: Serialized values of the fields defined in the schema,
+                in the record's order.
+        """
+        serializers = self.serializers
+        return {
+            field_name: None if value is None else serializers[field_name](value)
+            for field_name, value in metadata.items()
+            if field_name in serializers
+        }
+
+
+class _ZipStreamBuffer:
+    """
+    Write-only, unseekable file object that collects the bytes zipfile writes.
+    
+    Without tell() zipfile switches to streaming mode (data descriptors after
+    each entry), so an archive can be produced chunk by chunk with no disk or
+    seeking; drain() hands over what has been written so far.
+    """
+    
+    def __init__(self):
+        self.chunks = []
+    
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
 class MetadataManager:
     """
     Class to manage test case metadata, enforce schema rules, and provide search functionality.
@@ -153,7 +883,20 @@ class MetadataManager:
         }
     }
     
-    def __init__(self, schema_path: str = None, min_conn: int = 1, max_conn: int = 10):
+    @property
+    def schema(self) -> Dict[str, Any]:
+        return self._schema
+    
+    @schema.setter
+    def schema(self, schema: Dict[str, Any]):
+        # Compile once per schema; validation and serialization use the compiled form
+        self.compiled_schema = CompiledSchema(schema)
+        self._schema = schema
+    
+    def __init__(self, schema_path: str = None, min_conn: int = 1, max_conn: int = 10,
+                 stats_summary: bool = None, tag_bitmap_cache: bool = None,
+                 blob_backend: str = None, blob_root: str = None,
+                 metadata_cache: bool = None, prepared_statements: bool = None):
         """
         Initialize the MetadataManager with PostgreSQL connection pool and schema.
         
@@ -162,56 +905,122 @@ class MetadataManager:
                 If None, uses the default schema.
             min_conn (int, optional): Minimum number of connections in the pool.
             max_conn (int, optional): Maximum number of connections in the pool.
+            stats_summary (bool, optional): Serve get_stats from the incrementally
+                maintained stats summary table (see enable_stats_summary).
+                Defaults to the STATS_SUMMARY_ENABLED environment variable.
+            tag_bitmap_cache (bool, optional): Answer tag queries from an in-memory
+                bitmap index. Defaults to the TAG_BITMAP_CACHE_ENABLED environment variable.
+            blob_backend (str, optional): Where test case file contents are stored,
+                "postgres" (large objects) or "filesystem". Defaults to the
+                BLOB_STORE_BACKEND environment variable, or "postgres".
+            blob_root (str, optional): Root directory of the filesystem blob backend.
+                Defaults to the BLOB_STORE_PATH environment variable.
+            metadata_cache (bool, optional): Serve get_test_case_metadata from a
+                read-through cache (see MetadataCache). Defaults to the
+                METADATA_CACHE_ENABLED environment variable; METADATA_CACHE_SIZE,
+                METADATA_CACHE_TTL and METADATA_CACHE_REDIS_URL configure it.
+            prepared_statements (bool, optional): Prepare hot queries once per
+                connection (see StatementCache). Defaults to the
+                DB_PREPARED_STATEMENTS_ENABLED environment variable;
+                DB_PREPARE_THRESHOLD and DB_PREPARED_STATEMENTS_MAX configure it.
         """
-        self.schema_path = schema_path
-        self.logger = logging.getLogger(__name__)
-        
-        # Load database configuration from environment variables
-        self.db_config = {
-            'host': os.getenv('DB_HOST', 'https://tldjlxdotaarczsdivav.supabase.co').replace('https://', ''),
-            'port': os.getenv('DB_PORT', '5432'),
-            'dbname': os.getenv('DB_NAME', 'watsonx_ipg_testing'),
-            'user': os.getenv('DB_USER', 'tosurajitc'),
-            'password': os.getenv('DB_PASSWORD', 'IpgTesting2025#'),
-            'sslmode': os.getenv('DB_SSL_MODE', 'require')
-        }
-        
-        # Alternative: use the DATABASE_URL if available
-        self.db_url = os.getenv('DATABASE_URL')
+        self._init_settings(schema_path, stats_summary, tag_bitmap_cache, blob_backend,
+                            blob_root, metadata_cache, prepared_statements)
         
-        # Load schema
-        if schema_path and os.path.exists(schema_path):
-            self._load_schema_from_file()
-        else:
-            self.schema = self.DEFAULT_SCHEMA
-            self.logger.info("Using default metadata schema")
-        
-        # Initialize connection pool
+        # Use the process-wide connection pool for this database
         try:
             if self.db_url:
-                self.connection_pool = pool.ThreadedConnectionPool(
-                    min_conn, max_conn, self.db_url
-                )
+                self.connection_pool = get_pool(self.db_url, min_size=min_conn, max_size=max_conn)
                 self.logger.info(f"Initialized connection pool using DATABASE_URL")
             else:
-                self.connection_pool = pool.ThreadedConnectionPool(
-                    min_conn, max_conn,
-                    host=self.db_config['host'],
-                    port=self.db_config['port'],
-                    dbname=self.db_config['dbname'],
-                    user=self.db_config['user'],
-                    password=self.db_config['password'],
-                    sslmode=self.db_config['sslmode']
+                self.connection_pool = get_pool(
+                    make_dsn(**self.db_config), min_size=min_conn, max_size=max_conn
                 )
                 self.logger.info(f"Initialized connection pool to PostgreSQL database: {self.db_config['dbname']}")
             
             # Initialize the database tables
             self._init_database()
             
+            # Make sure the summary table and its trigger exist before serving from it
+            if self.stats_summary and not self._stats_summary_exists():
+                self.enable_stats_summary()
+            
         except Exception as e:
             self.logger.error(f"Failed to initialize PostgreSQL connection pool: {str(e)}")
             raise DatabaseError(f"Failed to connect to PostgreSQL database: {str(e)}")
     
+    def _init_settings(self, schema_path: str, stats_summary: bool, tag_bitmap_cache: bool,
+                       blob_backend: str, blob_root: str, metadata_cache: bool,
+                       prepared_statements: bool):
+        """
+        Set up the schema, caches and configuration, resolving options left as
+        None from the environment. Opens no connections; shared with
+        AsyncMetadataManager.
+        
+        Args:
+            See __init__.
+        """
+        self.schema_path = schema_path
+        self.logger = logging.getLogger(__name__)
+        
+        if stats_summary is None:
+            stats_summary = os.getenv('STATS_SUMMARY_ENABLED', 'false').lower() == 'true'
+        self.stats_summary = stats_summary
+        
+        if tag_bitmap_cache is None:
+            tag_bitmap_cache = os.getenv('TAG_BITMAP_CACHE_ENABLED', 'false').lower() == 'true'
+        self.tag_index = TagBitmapIndex(int(os.getenv('TAG_BITMAP_CACHE_TTL', '300'))) if tag_bitmap_cache else None
+        
+        if metadata_cache is None:
+            metadata_cache = os.getenv('METADATA_CACHE_ENABLED', 'false').lower() == 'true'
+        self.metadata_cache = MetadataCache(
+            max_size=int(os.getenv('METADATA_CACHE_SIZE', '1024')),
+            ttl_seconds=int(os.getenv('METADATA_CACHE_TTL', '60')),
+            redis_url=os.getenv('METADATA_CACHE_REDIS_URL')
+        ) if metadata_cache else None
+        
+        if prepared_statements is None:
+            prepared_statements = os.getenv('DB_PREPARED_STATEMENTS_ENABLED', 'false').lower() == 'true'
+        self.statements = StatementCache(
+            enabled=prepared_statements,
+            prepare_threshold=int(os.getenv('DB_PREPARE_THRESHOLD', '5')),
+            max_prepared=int(os.getenv('DB_PREPARED_STATEMENTS_MAX', '100'))
+        )
+        
+        # Content-addressed store for test case file contents
+        self.blob_store = BlobStore(
+            blob_backend or os.getenv('BLOB_STORE_BACKEND', 'postgres'),
+            blob_root or os.getenv('BLOB_STORE_PATH')
+        )
+        
+        self._load_db_config()
+        
+        # Loaded on first use by update_test_case_metadata
+        self._test_case_columns = None
+        
+        # Load schema
+        if schema_path and os.path.exists(schema_path):
+            self._load_schema_from_file()
+        else:
+            self.schema = self.DEFAULT_SCHEMA
+            self.logger.info("Using default metadata schema")
+    
+    def _load_db_config(self):
+        """
+        Load database configuration from environment variables.
+        """
+        self.db_config = {
+            'host': os.getenv('DB_HOST', 'https://tldjlxdotaarczsdivav.supabase.co').replace('https://', ''),
+            'port': os.getenv('DB_PORT', '5432'),
+            'dbname': os.getenv('DB_NAME', 'watsonx_ipg_testing'),
+            'user': os.getenv('DB_USER', 'tosurajitc'),
+            'password': os.getenv('DB_PASSWORD', 'IpgTesting2025#'),
+            'sslmode': os.getenv('DB_SSL_MODE', 'require')
+        }
+        
+        # Alternative: use the DATABASE_URL if available
+        self.db_url = os.getenv('DATABASE_URL')
+
     def _get_db_connection(self):
         """
         Get a connection from the pool.
@@ -326,6 +1135,68 @@ class MetadataManager:
                 
                 self.logger.debug("Created test_cases table in PostgreSQL database")
             
+            # Full-text search vector over the step text, kept current by PostgreSQL.
+            # Checked first: the ALTER takes an ACCESS EXCLUSIVE lock even when it is a no-op
+            cursor.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = 'public'
+            AND table_name = 'test_cases'
+            AND column_name = 'search_vector'
+            """)
+            if cursor.fetchone() is None:
+                cursor.execute("""
+                ALTER TABLE test_cases
+                ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english', coalesce(test_step_description, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(expected_result, '')), 'B') ||
+                    setweight(to_tsvector('english', coalesce(data, '')), 'C')
+                ) STORED
+                """)
+                self.logger.info("Added search_vector column to test_cases")
+            
+            cursor.execute("""
+            SELECT 1 FROM pg_indexes
+            WHERE schemaname = 'public'
+            AND indexname = 'idx_test_cases_search_vector'
+            """)
+            if cursor.fetchone() is None:
+                cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_test_cases_search_vector
+                ON test_cases USING GIN (search_vector)
+                """)
+            
+            # Index the tag associations by tag so tag queries don't scan the table
+            cursor.execute("SELECT to_regclass('public.test_case_tags') IS NOT NULL")
+            if cursor.fetchone()[0]:
+                cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_test_case_tags_tag_id
+                ON test_case_tags (tag_id, test_case_id)
+                """)
+            
+            # File contents live in the blob store; test_case_files keeps the hash
+            self.blob_store.init_schema(cursor)
+            # Checked first, like search_vector, so the ALTER only runs when needed
+            cursor.execute("""
+            SELECT
+                bool_or(column_name = 'content'),
+                bool_or(column_name = 'content_hash'),
+                bool_or(column_name = 'file_size'),
+                bool_or(column_name = 'content' AND is_nullable = 'NO')
+            FROM information_schema.columns
+            WHERE table_schema = 'public'
+            AND table_name = 'test_case_files'
+            """)
+            has_content, has_hash, has_size, content_not_null = cursor.fetchone()
+            if has_content and not (has_hash and has_size and not content_not_null):
+                cursor.execute("""
+                ALTER TABLE test_case_files
+                ADD COLUMN IF NOT EXISTS content_hash CHAR(64),
+                ADD COLUMN IF NOT EXISTS file_size BIGINT,
+                ALTER COLUMN content DROP NOT NULL
+                """)
+                self.logger.info("Added blob store columns to test_case_files")
+            
             conn.commit()
             self.logger.debug("PostgreSQL database connection verified successfully")
             
@@ -348,52 +1219,21 @@ class MetadataManager:
         Returns:
             Tuple[bool, List[str]]: (is_valid, list_of_error_messages)
         """
-        errors = []
-        
-        # Check required fields
-        for field_name, field_def in self.schema["metadata_fields"].items():
-            if field_def.get("required", False) and field_name not in metadata:
-                errors.append(f"Required field '{field_name}' is missing")
+        errors = self.compiled_schema.validate(metadata)
         
-        # Validate field types and values
-        for field_name, value in metadata.items():
-            if field_name in self.schema["metadata_fields"]:
-                field_def = self.schema["metadata_fields"][field_name]
-                field_type = field_def["type"]
-                
-                # Skip validation for None values in non-required fields
-                if value is None and not field_def.get("required", False):
-                    continue
-                
-                # Validate based on type
-                if field_type == "enum" and "values" in field_def:
-                    if value not in field_def["values"]:
-                        errors.append(f"Value '{value}' for '{field_name}' must be one of: {field_def['values']}")
-                
-                elif field_type == "date":
-                    # Basic date format validation
-                    if not isinstance(value, (str, datetime)):
-                        errors.append(f"Value for '{field_name}' must be a date string or datetime object")
-                    elif isinstance(value, str):
-                        try:
-                            datetime.fromisoformat(value.replace('Z', '+00:00'))
-                        except ValueError:
-                            errors.append(f"Value '{value}' for '{field_name}' is not a valid date format")
-                
-                elif field_type == "number" or field_type == "integer":
-                    if not isinstance(value, (int, float)) or (field_type == "integer" and not isinstance(value, int)):
-                        errors.append(f"Value for '{field_name}' must be a {'integer' if field_type == 'integer' else 'number'}")
-                
-                elif field_type == "boolean":
-                    if not isinstance(value, bool):
-                        errors.append(f"Value for '{field_name}' must be a boolean")
-                
-                elif field_type == "array":
-                    if not isinstance(value, (list, tuple, set)):
-                        errors.append(f"Value for '{field_name}' must be an array")
+        return len(errors) == 0, errors
+
+    def validate_metadata_batch(self, records: List[Dict[str, Any]]) -> Dict[int, List[str]]:
+        """
+        Validate many metadata records against the schema, reporting every invalid record.
         
-        return len(errors) == 0, errors        
-    
+        Args:
+            records (List[Dict[str, Any]]): The metadata records.
+            
+        Returns:
+            Dict[int, List[str]]: Error messages keyed by record index, for invalid records only.
+        """
+        return self.compiled_schema.validate_many(records)
 
     def _serialize_metadata_value(self, value, field_type: str) -> Any:
         """
@@ -409,43 +1249,7 @@ class MetadataManager:
         if value is None:
             return None
         
-        if field_type == "date":
-            if isinstance(value, datetime):
-                return value  # PostgreSQL can handle datetime objects directly
-            elif isinstance(value, str):
-                # Convert ISO string to datetime
-                try:
-                    return datetime.fromisoformat(value.replace('Z', '+00:00'))
-                except ValueError:
-                    # If conversion fails, return as is
-                    return value
-            return value
-        
-        elif field_type == "array":
-            if isinstance(value, (list, tuple, set)):
-                # PostgreSQL can handle lists directly for array types
-                return list(value)
-            elif isinstance(value, str):
-                # If it's a JSON string, parse it
-                try:
-                    return json.loads(value)
-                except:
-                    # If parsing fails, treat as a single-item array
-                    return [value]
-            return []
-        
-        elif field_type == "boolean":
-            return bool(value)
-        
-        elif field_type == "binary":
-            # For binary data, ensure it's in bytes format
-            if isinstance(value, bytes):
-                return value
-            elif isinstance(value, str):
-                return value.encode('utf-8')
-            return value
-        
-        return value
+        return _SERIALIZERS.get(field_type, _serialize_as_is)(value)
 
     def _deserialize_metadata_value(self, value, field_type: str) -> Any:
         """
@@ -505,13 +1309,7 @@ class MetadataManager:
         Returns:
             Dict[str, Any]: Metadata with defaults applied.
         """
-        updated = metadata.copy()
-        
-        for field_name, field_def in self.schema["metadata_fields"].items():
-            if field_name not in updated and "default" in field_def:
-                updated[field_name] = field_def["default"]
-        
-        return updated
+        return self.compiled_schema.apply_defaults(metadata)
 
     def _execute_query(self, query: str, params: tuple = None, fetch_one: bool = False, 
                     fetch_all: bool = False, as_dict: bool = False) -> Any:
@@ -539,11 +1337,8 @@ class MetadataManager:
             cursor_factory = RealDictCursor if as_dict else None
             cursor = conn.cursor(cursor_factory=cursor_factory)
             
-            # Execute query with parameters if provided
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
+            # Execute through the statement cache (prepared once the query is hot)
+            self.statements.execute(cursor, query, params)
             
             # Fetch results if requested
             result = None
@@ -571,6 +1366,9 @@ class MetadataManager:
         """
         Execute multiple queries as a single transaction.
         
+        Consecutive queries with the same text (e.g. one UPDATE per step) are
+        sent as one batch instead of one round trip each.
+        
         Args:
             queries (List[Tuple[str, tuple]]): List of (query, params) tuples.
             
@@ -585,9 +1383,13 @@ class MetadataManager:
             conn = self._get_db_connection()
             cursor = conn.cursor()
             
-            # Execute each query in the transaction
-            for query, params in queries:
-                cursor.execute(query, params)
+            # Execute each run of identical queries in the transaction
+            for query, run in groupby(queries, key=lambda item: item[0]):
+                params_list = [params for _, params in run]
+                if len(params_list) > 1:
+                    self.statements.execute_many(cursor, query, params_list)
+                else:
+                    self.statements.execute(cursor, query, params_list[0])
             
             conn.commit()
             return True
@@ -601,15 +1403,71 @@ class MetadataManager:
             if conn:
                 self._return_db_connection(conn)
 
-    def _store_test_case_file(self, test_case_id: str, file_name: str, file_content: bytes,
-                            file_type: str = None) -> bool:
+    def _put_test_case_file(self, conn, test_case_id: str, file_name: str,
+                            file_content: Union[bytes, BinaryIO], file_type: str,
+                            uploaded_at: datetime) -> str:
+        """
+        Point a test case's file row at new content inside the caller's transaction.
+        
+        The content goes into the blob store (written only if its hash is new),
+        and the reference to the previous content is released. Does not commit.
+        
+        Args:
+            conn: Database connection of the current transaction.
+            test_case_id (str): The test case ID.
+            file_name (str): Original file name.
+            file_content (Union[bytes, BinaryIO]): File content, or a binary file object to stream from.
+            file_type (str): File type/extension.
+            uploaded_at (datetime): Upload timestamp.
+            
+        Returns:
+            str: Content hash of the stored file.
+        """
+        cursor = conn.cursor()
+        
+        # Make sure the row exists before locking it: a concurrent first upload waits
+        # here until the other one commits, then sees (and releases) its hash
+        cursor.execute("""
+        INSERT INTO test_case_files (test_case_id, file_name, file_type, content, uploaded_at)
+        VALUES (%s, %s, %s, NULL, %s)
+        ON CONFLICT (test_case_id) DO NOTHING
+        """, (test_case_id, file_name, file_type, uploaded_at))
+        
+        # Lock the current row so concurrent uploads release the right hash
+        cursor.execute(
+            "SELECT content_hash FROM test_case_files WHERE test_case_id = %s FOR UPDATE",
+            (test_case_id,)
+        )
+        old_hash = cursor.fetchone()[0]
+        
+        content_hash, file_size = self.blob_store.put(conn, file_content)
+        
+        cursor.execute("""
+        UPDATE test_case_files
+        SET file_name = %s,
+            file_type = %s,
+            content = NULL,
+            content_hash = %s,
+            file_size = %s,
+            uploaded_at = %s
+        WHERE test_case_id = %s
+        """, (file_name, file_type, content_hash, file_size, uploaded_at, test_case_id))
+        
+        self.blob_store.release(conn, old_hash)
+        
+        return content_hash
+
+    def _store_test_case_file(self, test_case_id: str, file_name: str,
+                              file_content: Union[bytes, BinaryIO],
+                              file_type: str = None) -> bool:
         """
         Store a test case file in the database.
         
         Args:
             test_case_id (str): The test case ID.
             file_name (str): Original file name.
-            file_content (bytes): File content as bytes.
+            file_content (Union[bytes, BinaryIO]): File content as bytes, or a binary
+                file object to stream from.
             file_type (str, optional): File type/extension. If None, extracted from file_name.
             
         Returns:
@@ -618,6 +1476,7 @@ class MetadataManager:
         Raises:
             DatabaseError: If file storage fails.
         """
+        conn = None
         try:
             # Extract file type from file name if not provided
             if not file_type and file_name:
@@ -626,26 +1485,21 @@ class MetadataManager:
             # Ensure we have a file type
             file_type = file_type or 'unknown'
             
-            # Insert or update file content
-            query = """
-            INSERT INTO test_case_files (test_case_id, file_name, file_type, content, uploaded_at)
-            VALUES (%s, %s, %s, %s, %s)
-            ON CONFLICT (test_case_id) DO UPDATE
-            SET file_name = EXCLUDED.file_name,
-                file_type = EXCLUDED.file_type,
-                content = EXCLUDED.content,
-                uploaded_at = EXCLUDED.uploaded_at
-            """
-            
-            params = (test_case_id, file_name, file_type, file_content, datetime.now())
-            self._execute_query(query, params)
+            conn = self._get_db_connection()
+            self._put_test_case_file(conn, test_case_id, file_name, file_content, file_type, datetime.now())
+            conn.commit()
             
             self.logger.info(f"Stored file '{file_name}' for test case {test_case_id}")
             return True
             
         except Exception as e:
+            if conn:
+                conn.rollback()
             self.logger.error(f"Failed to store test case file: {str(e)}")
             raise DatabaseError(f"Failed to store test case file: {str(e)}")
+        finally:
+            if conn:
+                self._return_db_connection(conn)
 
     def _retrieve_test_case_file(self, test_case_id: str) -> Tuple[str, str, bytes]:
         """
@@ -660,28 +1514,260 @@ class MetadataManager:
         Raises:
             DatabaseError: If file retrieval fails.
         """
+        conn = None
         try:
-            query = """
-            SELECT file_name, file_type, content
+            conn = self._get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT file_name, file_type, content, content_hash
             FROM test_case_files
             WHERE test_case_id = %s
-            """
+            """, (test_case_id,))
             
-            result = self._execute_query(query, (test_case_id,), fetch_one=True)
+            result = cursor.fetchone()
             
             if not result:
                 self.logger.warning(f"No file found for test case {test_case_id}")
                 return None, None, None
             
-            file_name = result[0]
-            file_type = result[1]
-            file_content = result[2]
+            file_name, file_type, file_content, content_hash = result
+            
+            # Rows written before the blob store keep their content inline
+            if content_hash:
+                file_content = self.blob_store.read(conn, content_hash)
             
             return file_name, file_type, file_content
             
         except Exception as e:
             self.logger.error(f"Failed to retrieve test case file: {str(e)}")
             raise DatabaseError(f"Failed to retrieve test case file: {str(e)}")
+        finally:
+            if conn:
+                conn.rollback()
+                self._return_db_connection(conn)
+
+    def get_test_case_file_info(self, test_case_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a test case file's name, type, content hash and size without reading its content.
+        
+        Args:
+            test_case_id (str): The test case ID.
+            
+        Returns:
+            Optional[Dict[str, Any]]: file_name, file_type, content_hash, file_size
+                and uploaded_at, or None if the test case has no file.
+        """
+        return self._execute_query("""
+        SELECT file_name, file_type, content_hash,
+               COALESCE(file_size, octet_length(content)) AS file_size, uploaded_at
+        FROM test_case_files
+        WHERE test_case_id = %s
+        """, (test_case_id,), fetch_one=True, as_dict=True)
+
+    # One row per requested ID; octet_length reads the stored size without detoasting the content
+    _PROBE_TEST_CASES_QUERY = """
+    SELECT ids.test_case_id,
+           EXISTS (SELECT 1 FROM test_cases t WHERE t.TEST_CASE_NUMBER = ids.test_case_id) AS test_case_exists,
+           f.test_case_id IS NOT NULL AS file_exists,
+           f.file_name, f.file_type, f.content_hash,
+           COALESCE(f.file_size, octet_length(f.content)) AS file_size, f.uploaded_at
+    FROM unnest(%s::text[]) AS ids(test_case_id)
+    LEFT JOIN test_case_files f ON f.test_case_id = ids.test_case_id
+    """
+
+    def probe_test_cases(self, test_case_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Check many test cases and their files with a single query, without reading file content.
+        
+        Args:
+            test_case_ids (List[str]): The test case IDs.
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: For each distinct ID, in the order given:
+                test_case_exists, file_exists, file_name, file_type, content_hash,
+                file_size and uploaded_at. The file fields are None when there is no file,
+                and file_size is None when a file row has no content.
+            
+        Raises:
+            DatabaseError: If the query fails.
+        """
+        unique_ids = list(dict.fromkeys(test_case_ids))
+        
+        if not unique_ids:
+            return {}
+        
+        rows = self._execute_query(self._PROBE_TEST_CASES_QUERY, (unique_ids,), fetch_all=True, as_dict=True)
+        
+        probes = {row["test_case_id"]: row for row in rows}
+        return {test_case_id: probes[test_case_id] for test_case_id in unique_ids}
+
+    def get_test_case_file_info_bulk(self, test_case_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get file name, type, content hash and size for many test cases with a single query.
+        
+        Args:
+            test_case_ids (List[str]): The test case IDs.
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: File info (as returned by get_test_case_file_info)
+                keyed by test case ID, for the test cases that have a file.
+            
+        Raises:
+            DatabaseError: If the query fails.
+        """
+        return {
+            test_case_id: {
+                key: probe[key]
+                for key in ("file_name", "file_type", "content_hash", "file_size", "uploaded_at")
+            }
+            for test_case_id, probe in self.probe_test_cases(test_case_ids).items()
+            if probe["file_exists"]
+        }
+
+    def iter_test_case_file_content(self, test_case_id: str,
+                                    chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Stream a test case file's content in chunks.
+        
+        A pooled connection is held until the iterator is exhausted or closed.
+        
+        Args:
+            test_case_id (str): The test case ID.
+            chunk_size (int, optional): Bytes per chunk.
+            
+        Yields:
+            bytes: The file content, in chunks.
+            
+        Raises:
+            MetadataError: If the test case has no file or reading fails.
+        """
+        conn = self._get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT content, content_hash FROM test_case_files WHERE test_case_id = %s",
+                (test_case_id,)
+            )
+            result = cursor.fetchone()
+            
+            if not result:
+                raise MetadataError(f"No file found for test case {test_case_id}")
+            
+            content, content_hash = result
+            
+            if content_hash:
+                yield from self.blob_store.iter_content(conn, content_hash, chunk_size)
+            elif content is not None:
+                content = bytes(content)
+                for start in range(0, len(content), chunk_size):
+                    yield content[start:start + chunk_size]
+            
+        except MetadataError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to stream test case file: {str(e)}")
+            raise MetadataError(f"Failed to stream test case file: {str(e)}")
+        finally:
+            conn.rollback()
+            self._return_db_connection(conn)
+
+    def delete_test_case_file_content(self, test_case_id: str) -> bool:
+        """
+        Delete a test case's file and release its content in the blob store.
+        
+        Args:
+            test_case_id (str): The test case ID.
+            
+        Returns:
+            bool: True if a file was deleted, False if the test case had none.
+            
+        Raises:
+            MetadataError: If the deletion fails.
+        """
+        conn = None
+        try:
+            conn = self._get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM test_case_files WHERE test_case_id = %s RETURNING content_hash",
+                (test_case_id,)
+            )
+            row = cursor.fetchone()
+            
+            if row:
+                self.blob_store.release(conn, row[0])
+            
+            conn.commit()
+            
+            if row:
+                self.logger.info(f"Deleted file for test case {test_case_id}")
+            return row is not None
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            self.logger.error(f"Failed to delete test case file: {str(e)}")
+            raise MetadataError(f"Failed to delete test case file: {str(e)}")
+        finally:
+            if conn:
+                self._return_db_connection(conn)
+
+    def migrate_file_contents_to_blob_store(self, batch_size: int = 100) -> Dict[str, int]:
+        """
+        Move file contents stored inline in test_case_files into the blob store.
+        
+        Each batch is moved in its own transaction, so the migration can be
+        interrupted and resumed.
+        
+        Args:
+            batch_size (int, optional): Files moved per transaction.
+            
+        Returns:
+            Dict[str, int]: Number of files migrated and of distinct blobs they share.
+            
+        Raises:
+            DatabaseError: If the migration fails.
+        """
+        conn = None
+        try:
+            stats = {"files_migrated": 0, "blobs": 0}
+            hashes = set()
+            conn = self._get_db_connection()
+            cursor = conn.cursor()
+            
+            while True:
+                cursor.execute("""
+                SELECT test_case_id, file_name, file_type, content, uploaded_at
+                FROM test_case_files
+                WHERE content_hash IS NULL AND content IS NOT NULL
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+                """, (batch_size,))
+                rows = cursor.fetchall()
+                
+                if not rows:
+                    break
+                
+                for test_case_id, file_name, file_type, content, uploaded_at in rows:
+                    hashes.add(self._put_test_case_file(
+                        conn, test_case_id, file_name, bytes(content), file_type, uploaded_at
+                    ))
+                
+                conn.commit()
+                stats["files_migrated"] += len(rows)
+            
+            stats["blobs"] = len(hashes)
+            self.logger.info(f"Migrated file contents to blob store: {stats}")
+            return stats
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            self.logger.error(f"File content migration failed: {str(e)}")
+            raise DatabaseError(f"File content migration failed: {str(e)}")
+        finally:
+            if conn:
+                self._return_db_connection(conn)
         
 
     def create_test_case_metadata(self, test_case_data: Dict[str, Any], 
@@ -763,14 +1849,10 @@ class MetadataManager:
             placeholders = []
             values = []
             
-            for field_name, value in metadata.items():
-                if field_name in self.schema["metadata_fields"]:
-                    field_type = self.schema["metadata_fields"][field_name]["type"]
-                    serialized_value = self._serialize_metadata_value(value, field_type)
-                    
-                    fields.append(field_name)
-                    placeholders.append(f"%s")
-                    values.append(serialized_value)
+            for field_name, serialized_value in self.compiled_schema.serialize(metadata).items():
+                fields.append(field_name)
+                placeholders.append(f"%s")
+                values.append(serialized_value)
             
             # Insert metadata using a single query
             insert_sql = f"""
@@ -784,6 +1866,8 @@ class MetadataManager:
             if "TAGS" in metadata and metadata["TAGS"]:
                 self._update_test_case_tags(test_case_id, metadata["TAGS"])
             
+            self._invalidate_metadata_cache([test_case_id])
+            
             self.logger.info(f"Created metadata for test case {test_case_id}")
             return test_case_id
             
@@ -791,10 +1875,45 @@ class MetadataManager:
             self.logger.error(f"Failed to create metadata: {str(e)}")
             raise MetadataError(f"Failed to create metadata: {str(e)}")
 
-    def _update_test_case_tags(self, test_case_id: str, tags: List[str]) -> bool:
+    # Upserts a set of tag names and yields their ids; names are sorted so that
+    # concurrent writers lock the tag rows in the same order
+    _UPSERT_TAGS_CTE = """
+    WITH upserted_tags AS (
+        INSERT INTO tags (name)
+        SELECT DISTINCT tag_name FROM unnest(%s::text[]) AS tag_name
+        ORDER BY tag_name
+        ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+        RETURNING id, name
+    )
+    """
+
+    def _normalize_tags(self, tags: Union[str, List[str], None]) -> List[str]:
+        """
+        Normalize a tag list or comma-separated tag string.
+        
+        Args:
+            tags (Union[str, List[str], None]): The tags.
+            
+        Returns:
+            List[str]: Distinct, non-empty tags in their original order.
+        """
+        # Convert to list if it's a string
+        if isinstance(tags, str):
+            tags = tags.split(',')
+        elif tags is None:
+            tags = []
+        
+        normalized = [str(tag).strip() for tag in tags if tag is not None]
+        return list(dict.fromkeys(tag for tag in normalized if tag))
+
+    def _update_test_case_tags(self, test_case_id: str, tags: List[str]) -> bool:
         """
         Update tags for a test case.
         
+        Replaces the tag associations in a single transaction: all tags are
+        upserted with one INSERT ... ON CONFLICT ... RETURNING statement that
+        also inserts the associations.
+        
         Args:
             test_case_id (str): The test case ID.
             tags (List[str]): The list of tags.
@@ -806,47 +1925,123 @@ class MetadataManager:
             DatabaseError: If tag update fails.
         """
         try:
-            # Convert to list if it's a string
-            if isinstance(tags, str):
-                tags = [tag.strip() for tag in tags.split(',')]
-            elif tags is None:
-                tags = []
-            
-            # Delete existing tag associations
-            delete_query = "DELETE FROM test_case_tags WHERE test_case_id = %s"
-            self._execute_query(delete_query, (test_case_id,))
-            
-            # Insert tags and create associations
-            for tag in tags:
-                if not tag:  # Skip empty tags
-                    continue
-                    
-                # Insert tag if it doesn't exist
-                insert_tag_query = """
-                INSERT INTO tags (name)
-                VALUES (%s)
-                ON CONFLICT (name) DO NOTHING
-                """
-                self._execute_query(insert_tag_query, (tag,))
-                
-                # Get tag id
-                get_tag_query = "SELECT id FROM tags WHERE name = %s"
-                tag_id = self._execute_query(get_tag_query, (tag,), fetch_one=True)[0]
-                
-                # Associate tag with test case
-                insert_assoc_query = """
-                INSERT INTO test_case_tags (test_case_id, tag_id)
-                VALUES (%s, %s)
-                ON CONFLICT (test_case_id, tag_id) DO NOTHING
-                """
-                self._execute_query(insert_assoc_query, (test_case_id, tag_id))
-            
-            return True
+            result = self._execute_transaction(self._build_tag_update_queries(test_case_id, tags))
+            self._invalidate_tag_index()
+            self._invalidate_metadata_cache([test_case_id])
+            return result
             
         except Exception as e:
             self.logger.error(f"Failed to update tags: {str(e)}")
             raise DatabaseError(f"Failed to update tags: {str(e)}")
 
+    def _build_tag_update_queries(self, test_case_id: str, tags: List[str]) -> List[Tuple[str, tuple]]:
+        """
+        Build the statements that replace a test case's tags.
+        
+        Args:
+            test_case_id (str): The test case ID.
+            tags (List[str]): The list of tags.
+            
+        Returns:
+            List[Tuple[str, tuple]]: List of (query, params) tuples.
+        """
+        tags = self._normalize_tags(tags)
+        
+        # Delete existing tag associations
+        queries = [("DELETE FROM test_case_tags WHERE test_case_id = %s", (test_case_id,))]
+        
+        # Insert tags and create associations
+        if tags:
+            assoc_query = self._UPSERT_TAGS_CTE + """
+            INSERT INTO test_case_tags (test_case_id, tag_id)
+            SELECT %s, id FROM upserted_tags
+            ON CONFLICT (test_case_id, tag_id) DO NOTHING
+            """
+            queries.append((assoc_query, (tags, test_case_id)))
+        
+        return queries
+
+    def _build_bulk_tag_queries(self, test_case_ids: List[str], tags: List[str],
+                                replace: bool = False) -> List[Tuple[str, tuple]]:
+        """
+        Build the statements for bulk_tag. The last statement creates the associations.
+        
+        Args:
+            test_case_ids (List[str]): Distinct test case IDs to tag.
+            tags (List[str]): Normalized tags to apply to every test case.
+            replace (bool, optional): Remove the existing tags of these test cases first.
+            
+        Returns:
+            List[Tuple[str, tuple]]: List of (query, params) tuples.
+        """
+        queries = []
+        
+        if replace:
+            queries.append((
+                "DELETE FROM test_case_tags WHERE test_case_id = ANY(%s)",
+                (test_case_ids,)
+            ))
+        
+        if tags:
+            queries.append((self._UPSERT_TAGS_CTE + """
+            INSERT INTO test_case_tags (test_case_id, tag_id)
+            SELECT tc.test_case_id, upserted_tags.id
+            FROM unnest(%s::text[]) AS tc (test_case_id)
+            CROSS JOIN upserted_tags
+            ON CONFLICT (test_case_id, tag_id) DO NOTHING
+            """, (tags, test_case_ids)))
+        
+        return queries
+
+    def bulk_tag(self, test_case_ids: List[str], tags: List[str], replace: bool = False) -> int:
+        """
+        Apply tags to many test cases in a single transaction.
+        
+        Args:
+            test_case_ids (List[str]): The test case IDs to tag.
+            tags (List[str]): Tags to apply to every test case.
+            replace (bool, optional): Remove the existing tags of these test cases first.
+                Otherwise the tags are added to the existing ones.
+            
+        Returns:
+            int: Number of tag associations created.
+            
+        Raises:
+            DatabaseError: If the bulk tag update fails.
+        """
+        tags = self._normalize_tags(tags)
+        test_case_ids = list(dict.fromkeys(test_case_ids or []))
+        
+        if not test_case_ids:
+            return 0
+        
+        conn = None
+        try:
+            conn = self._get_db_connection()
+            cursor = conn.cursor()
+            
+            for query, params in self._build_bulk_tag_queries(test_case_ids, tags, replace):
+                cursor.execute(query, params)
+            
+            # The association insert is the last statement when tags are given
+            created = cursor.rowcount if tags else 0
+            
+            conn.commit()
+            self._invalidate_tag_index()
+            self._invalidate_metadata_cache(test_case_ids)
+            
+            self.logger.info(f"Tagged {len(test_case_ids)} test cases with {len(tags)} tags")
+            return created
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            self.logger.error(f"Failed to bulk tag test cases: {str(e)}")
+            raise DatabaseError(f"Failed to bulk tag test cases: {str(e)}")
+        finally:
+            if conn:
+                self._return_db_connection(conn)
+
     def get_test_case_metadata(self, test_case_id: str) -> Dict[str, Any]:
         """
         Get metadata for a test case.
@@ -858,9 +2053,15 @@ class MetadataManager:
             Dict[str, Any]: The metadata, or None if not found.
         """
         try:
+            if self.metadata_cache is not None:
+                cached = self.metadata_cache.get(test_case_id)
+                if cached is not None:
+                    return cached
+                cache_version = self.metadata_cache.version()
+            
             # Check if the test case exists
-            query = """
-            SELECT * FROM test_cases 
+            query = f"""
+            SELECT {self._METADATA_COLUMNS} FROM test_cases
             WHERE TEST_CASE_NUMBER = %s
             ORDER BY STEP_NO ASC
             """
@@ -870,38 +2071,10 @@ class MetadataManager:
             if not results or len(results) == 0:
                 return None
             
-            # Construct a metadata structure from the query results
-            # For now, we'll return the first step metadata plus an array of all steps
-            first_step = results[0]
-            
-            # Basic metadata from the first step
-            metadata = {
-                "TEST_CASE_NUMBER": first_step.get("test_case_number"),
-                "SUBJECT": first_step.get("subject"),
-                "TEST_CASE": first_step.get("test_case"),
-                "TEST_USER_ID_ROLE": first_step.get("test_user_id_role"),
-                "STATUS": first_step.get("status"),
-                "TYPE": first_step.get("type"),
-                "CREATED_DATE": first_step.get("created_date"),
-                "MODIFIED_DATE": first_step.get("modified_date"),
-                # Add any additional fields that might be useful at the test case level
-            }
-            
-            # Add steps array with all steps' information
-            steps = []
-            for row in results:
-                step = {
-                    "STEP_NO": row.get("step_no"),
-                    "TEST_STEP_DESCRIPTION": row.get("test_step_description"),
-                    "DATA": row.get("data"),
-                    "REFERENCE_VALUES": row.get("reference_values"),
-                    "VALUES": row.get("values"),
-                    "EXPECTED_RESULT": row.get("expected_result"),
-                    "TRANS_CODE": row.get("trans_code")
-                }
-                steps.append(step)
+            metadata = self._build_test_case_metadata(results)
             
-            metadata["STEPS"] = steps
+            if self.metadata_cache is not None:
+                self.metadata_cache.set(test_case_id, metadata, cache_version)
             
             return metadata
             
@@ -909,14 +2082,117 @@ class MetadataManager:
             self.logger.error(f"Failed to get metadata: {str(e)}")
             return None
 
+    # Columns of test_cases read by _build_test_case_metadata
+    _METADATA_COLUMNS = """
+    test_case_number, step_no, subject, test_case, test_user_id_role, status, type,
+    created_date, modified_date, test_step_description, data, reference_values,
+    "values", expected_result, trans_code
+    """
+
+    def _build_test_case_metadata(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build the metadata structure for one test case from its step rows.
+        
+        Args:
+            rows (List[Dict[str, Any]]): The test_cases rows of a single test case,
+                ordered by STEP_NO.
+            
+        Returns:
+            Dict[str, Any]: The metadata with a STEPS array.
+        """
+        # Construct a metadata structure from the query results
+        # For now, we'll return the first step metadata plus an array of all steps
+        first_step = rows[0]
+        
+        # Basic metadata from the first step
+        metadata = {
+            "TEST_CASE_NUMBER": first_step.get("test_case_number"),
+            "SUBJECT": first_step.get("subject"),
+            "TEST_CASE": first_step.get("test_case"),
+            "TEST_USER_ID_ROLE": first_step.get("test_user_id_role"),
+            "STATUS": first_step.get("status"),
+            "TYPE": first_step.get("type"),
+            "CREATED_DATE": first_step.get("created_date"),
+            "MODIFIED_DATE": first_step.get("modified_date"),
+            # Add any additional fields that might be useful at the test case level
+        }
+        
+        # Add steps array with all steps' information
+        steps = []
+        for row in rows:
+            step = {
+                "STEP_NO": row.get("step_no"),
+                "TEST_STEP_DESCRIPTION": row.get("test_step_description"),
+                "DATA": row.get("data"),
+                "REFERENCE_VALUES": row.get("reference_values"),
+                "VALUES": row.get("values"),
+                "EXPECTED_RESULT": row.get("expected_result"),
+                "TRANS_CODE": row.get("trans_code")
+            }
+            steps.append(step)
+        
+        metadata["STEPS"] = steps
+        
+        return metadata
+
+    def get_test_case_metadata_bulk(self, test_case_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get metadata for many test cases using a single query.
+        
+        Loads the step rows of every requested test case at once and groups them
+        in Python, instead of issuing one query per test case.
+        
+        Args:
+            test_case_ids (List[str]): The test case IDs.
+            
+        Returns:
+            List[Dict[str, Any]]: The metadata of the test cases that exist, in the
+                same order as test_case_ids. Each entry has the same shape as
+                get_test_case_metadata.
+            
+        Raises:
+            DatabaseError: If the query fails.
+        """
+        if not test_case_ids:
+            return []
+        
+        # Deduplicate while preserving the caller's order
+        unique_ids = list(dict.fromkeys(test_case_ids))
+        
+        query = f"""
+        SELECT {self._METADATA_COLUMNS} FROM test_cases
+        WHERE TEST_CASE_NUMBER = ANY(%s)
+        ORDER BY TEST_CASE_NUMBER ASC, STEP_NO ASC
+        """
+        
+        results = self._execute_query(query, (unique_ids,), fetch_all=True, as_dict=True)
+        
+        # Group the step rows by test case
+        rows_by_test_case = {}
+        for row in results or []:
+            rows_by_test_case.setdefault(row.get("test_case_number"), []).append(row)
+        
+        return [
+            self._build_test_case_metadata(rows_by_test_case[test_case_id])
+            for test_case_id in unique_ids
+            if test_case_id in rows_by_test_case
+        ]
+
     def update_test_case_metadata(self, test_case_id: str, updates: Dict[str, Any], 
                             modified_by: str = None) -> Dict[str, Any]:
         """
         Update metadata for an existing test case.
         
+        All step and test case level changes are applied by a single
+        UPDATE ... FROM (VALUES ...) statement, and the changed fields are
+        recorded in metadata_history in the same transaction. The round trips
+        do not grow with the number of steps.
+        
         Args:
             test_case_id (str): The test case ID (TEST_CASE_NUMBER).
-            updates (Dict[str, Any]): Metadata fields to update.
+            updates (Dict[str, Any]): Metadata fields to update. A STEPS list of
+                dicts with STEP_NO updates individual steps; other fields apply
+                to every step and take precedence over step updates.
             modified_by (str, optional): Person making the updates.
             
         Returns:
@@ -925,94 +2201,270 @@ class MetadataManager:
         Raises:
             MetadataError: If metadata update fails.
         """
+        conn = None
         try:
-            # First check if the test case exists
-            existing_metadata = self.get_test_case_metadata(test_case_id)
-            if not existing_metadata:
-                raise MetadataError(f"Test case {test_case_id} not found")
+            conn = self._get_db_connection()
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
             
-            # Handle different update scenarios:
+            # Lock the steps; their current values are the "before" of the history
+            self.statements.execute(cursor, self._LOCK_TEST_CASE_STEPS_QUERY, (test_case_id,))
+            rows = cursor.fetchall()
+            if not rows:
+                raise MetadataError(f"Test case {test_case_id} not found")
             
-            # 1. If updates contain step-specific changes
-            if "STEPS" in updates:
-                steps_updates = updates.pop("STEPS")  # Remove steps from general updates
+            plan = self._build_step_update_query(test_case_id, rows, updates, self._get_test_case_columns(conn))
+            if plan:
+                self.statements.execute(cursor, *plan)
+                rows, history = self._merge_updated_steps(test_case_id, rows, cursor.fetchall(), updates, modified_by)
                 
-                # Process each step update
-                for step_update in steps_updates:
-                    if "STEP_NO" not in step_update:
-                        self.logger.warning(f"Skipping step update without STEP_NO: {step_update}")
-                        continue
-                    
-                    step_no = step_update.pop("STEP_NO")
-                    
-                    # Skip if no fields to update
-                    if not step_update:
-                        continue
-                    
-                    # Build the SET clause for SQL
-                    set_clauses = []
-                    values = []
-                    
-                    for field, value in step_update.items():
-                        # Convert to database column names (lowercase)
-                        db_field = field.lower()
-                        set_clauses.append(f"{db_field} = %s")
-                        values.append(value)
-                    
-                    # Add MODIFIED_DATE
-                    set_clauses.append("modified_date = %s")
-                    values.append(datetime.now())
-                    
-                    # Add WHERE clause parameters
-                    values.append(test_case_id)
-                    values.append(step_no)
-                    
-                    # Execute the update
-                    update_sql = f"""
-                    UPDATE test_cases
-                    SET {', '.join(set_clauses)}
-                    WHERE test_case_number = %s AND step_no = %s
-                    """
-                    
-                    self._execute_query(update_sql, tuple(values))
+                if history:
+                    self.statements.execute(cursor, *self._build_history_insert(history))
             
-            # 2. Handle test case level updates (will apply to all steps)
-            if updates:
-                # Build the SET clause for SQL
-                set_clauses = []
-                values = []
-                
-                for field, value in updates.items():
-                    # Convert to database column names (lowercase)
-                    db_field = field.lower()
-                    set_clauses.append(f"{db_field} = %s")
-                    values.append(value)
-                
-                # Add MODIFIED_DATE if not already included
-                if "MODIFIED_DATE" not in updates:
-                    set_clauses.append("modified_date = %s")
-                    values.append(datetime.now())
-                
-                # Add WHERE clause parameter
-                values.append(test_case_id)
-                
-                # Execute the update
-                update_sql = f"""
-                UPDATE test_cases
-                SET {', '.join(set_clauses)}
-                WHERE test_case_number = %s
-                """
-                
-                self._execute_query(update_sql, tuple(values))
+            conn.commit()
+            
+            cache_version = self._invalidate_metadata_cache([test_case_id])
             
-            # Get the updated metadata
-            updated_metadata = self.get_test_case_metadata(test_case_id)
+            # The statement returned the new rows, so no second read is needed.
+            # A later writer's invalidation still wins over caching them.
+            updated_metadata = self._build_test_case_metadata(rows)
+            if self.metadata_cache is not None:
+                self.metadata_cache.set(test_case_id, updated_metadata, cache_version)
             
             return updated_metadata
             
         except Exception as e:
+            if conn:
+                conn.rollback()
             self.logger.error(f"Failed to update metadata: {str(e)}")
             raise MetadataError(f"Failed to update metadata: {str(e)}")
+        finally:
+            if conn:
+                self._return_db_connection(conn)
+
+    _LOCK_TEST_CASE_STEPS_QUERY = """
+    SELECT * FROM test_cases
+    WHERE TEST_CASE_NUMBER = %s
+    ORDER BY STEP_NO ASC
+    FOR UPDATE
+    """
+
+    # Writable columns of test_cases and their SQL types, for typing VALUES lists
+    _TEST_CASE_COLUMNS_QUERY = """
+    SELECT attname AS name, format_type(atttypid, atttypmod) AS type
+    FROM pg_attribute
+    WHERE attrelid = 'test_cases'::regclass
+    AND attnum > 0
+    AND NOT attisdropped
+    AND attgenerated = ''
+    ORDER BY attnum
+    """
+
+    def _get_test_case_columns(self, conn) -> Dict[str, str]:
+        """
+        Get the writable test_cases columns and their SQL types, loading them once.
+        
+        Args:
+            conn: Database connection.
+            
+        Returns:
+            Dict[str, str]: Column name to SQL type, in table order.
+        """
+        if self._test_case_columns is None:
+            cursor = conn.cursor()
+            self.statements.execute(cursor, self._TEST_CASE_COLUMNS_QUERY)
+            self._test_case_columns = dict(cursor.fetchall())
+        
+        return self._test_case_columns
+
+    def _build_step_update_query(self, test_case_id: str, rows: List[Dict[str, Any]],
+                                 updates: Dict[str, Any],
+                                 column_types: Dict[str, str]) -> Optional[Tuple[str, list]]:
+        """
+        Build the set-based UPDATE for update_test_case_metadata.
+        
+        Each changed step becomes one row of a VALUES list holding its final
+        values, so step and test case level updates are applied by one statement.
+        The statement returns the updated rows, prefixed with the step_key they
+        were matched on.
+        
+        Args:
+            test_case_id (str): The test case ID (TEST_CASE_NUMBER).
+            rows (List[Dict[str, Any]]): The current step rows (from _LOCK_TEST_CASE_STEPS_QUERY).
+            updates (Dict[str, Any]): Metadata fields to update (see update_test_case_metadata).
+            column_types (Dict[str, str]): Writable test_cases columns and their SQL types.
+            
+        Returns:
+            Optional[Tuple[str, list]]: (query, params), or None if nothing changes.
+            
+        Raises:
+            MetadataError: If an update names a field that is not a writable column.
+        """
+        updates = dict(updates)
+        current = {row["step_no"]: row for row in rows}
+        changes = {}
+        now = datetime.now()
+        
+        def column_for(field: str) -> str:
+            column = field.lower()
+            if column not in column_types:
+                raise MetadataError(f"Unknown or read-only field: {field}")
+            return column
+        
+        # 1. Step-specific changes
+        for step_update in updates.pop("STEPS", None) or []:
+            if "STEP_NO" not in step_update:
+                self.logger.warning(f"Skipping step update without STEP_NO: {step_update}")
+                continue
+            
+            step_update = dict(step_update)
+            step_no = step_update.pop("STEP_NO")
+            
+            # Skip if no fields to update
+            if not step_update:
+                continue
+            
+            if isinstance(step_no, str) and step_no.strip().isdigit():
+                step_no = int(step_no)
+            
+            if step_no not in current:
+                self.logger.warning(f"Skipping update of missing step {step_no} of test case {test_case_id}")
+                continue
+            
+            step_changes = changes.setdefault(step_no, {})
+            step_changes.update({column_for(field): value for field, value in step_update.items()})
+            step_changes.setdefault("modified_date", now)
+        
+        # 2. Test case level changes apply to all steps and win over step changes
+        if updates:
+            case_changes = {column_for(field): value for field, value in updates.items()}
+            case_changes.setdefault("modified_date", now)
+            
+            for step_no in current:
+                changes.setdefault(step_no, {}).update(case_changes)
+        
+        if not changes:
+            return None
+        
+        columns = list(dict.fromkeys(column for step_changes in changes.values() for column in step_changes))
+        
+        # Unchanged columns of a changed step carry the locked current value
+        values_rows = []
+        params = []
+        for step_no, step_changes in changes.items():
+            values_rows.append("(" + ", ".join(
+                [f"%s::{column_types['step_no']}"] + [f"%s::{column_types[column]}" for column in columns]
+            ) + ")")
+            params.append(step_no)
+            params.extend(step_changes.get(column, current[step_no].get(column)) for column in columns)
+        
+        params.append(test_case_id)
+        quoted = [f'"{column}"' for column in columns]
+        
+        query = f"""
+        UPDATE test_cases AS t
+        SET {', '.join(f'{column} = v.{column}' for column in quoted)}
+        FROM (VALUES {', '.join(values_rows)}) AS v(step_key, {', '.join(quoted)})
+        WHERE t.TEST_CASE_NUMBER = %s AND t.STEP_NO = v.step_key
+        RETURNING v.step_key, t.*
+        """
+        return query, params
+
+    def _merge_updated_steps(self, test_case_id: str, rows: List[Dict[str, Any]],
+                             updated_rows: List[Dict[str, Any]], updates: Dict[str, Any],
+                             modified_by: str = None) -> Tuple[List[Dict[str, Any]], List[tuple]]:
+        """
+        Merge the rows returned by the step update into the current rows and
+        work out the history entries of the change.
+        
+        Test case level fields are recorded once under their own name; step
+        fields as STEPS[<step_no>].<FIELD>. MODIFIED_DATE is not recorded.
+        
+        Args:
+            test_case_id (str): The test case ID (TEST_CASE_NUMBER).
+            rows (List[Dict[str, Any]]): The step rows before the update.
+            updated_rows (List[Dict[str, Any]]): Rows returned by the update query.
+            updates (Dict[str, Any]): The updates that were applied.
+            modified_by (str, optional): Person making the updates.
+            
+        Returns:
+            Tuple[List[Dict[str, Any]], List[tuple]]: (all step rows ordered by STEP_NO,
+                (test_case_id, field_name, old_value, new_value, changed_by) entries)
+        """
+        def as_text(value):
+            if value is None:
+                return None
+            return value.isoformat() if isinstance(value, datetime) else str(value)
+        
+        case_fields = {field.lower(): field for field in updates if field != "STEPS"}
+        column_types = self._test_case_columns or {}
+        old_rows = {row["step_no"]: row for row in rows}
+        merged = dict(old_rows)
+        history = {}
+        
+        for updated in updated_rows:
+            updated = dict(updated)
+            step_key = updated.pop("step_key")
+            old = old_rows[step_key]
+            merged[step_key] = updated
+            
+            for column, new_value in updated.items():
+                # Generated columns (search_vector) follow the others and are not history
+                if column == "modified_date" or column not in column_types or old[column] == new_value:
+                    continue
+                
+                field_name = case_fields.get(column) or f"STEPS[{step_key}].{column.upper()}"
+                
+                # A test case level field is recorded once, with the first step's old value
+                history.setdefault(field_name, (
+                    test_case_id, field_name, as_text(old[column]), as_text(new_value), modified_by or "System"
+                ))
+        
+        return sorted(merged.values(), key=lambda row: row["step_no"]), list(history.values())
+
+    def _build_history_insert(self, entries: List[tuple]) -> Tuple[str, list]:
+        """
+        Build one INSERT for many metadata_history entries.
+        
+        Args:
+            entries (List[tuple]): (test_case_id, field_name, old_value, new_value, changed_by) tuples.
+            
+        Returns:
+            Tuple[str, list]: (query, params)
+        """
+        query = """
+        INSERT INTO metadata_history (test_case_id, field_name, old_value, new_value, changed_by)
+        VALUES """ + ", ".join(["(%s, %s, %s, %s, %s)"] * len(entries))
+        
+        return query, [value for entry in entries for value in entry]
+
+    def _build_delete_test_case_queries(self, test_case_id: str) -> List[Tuple[str, tuple]]:
+        """
+        Build the statements that delete a test case's metadata and related data.
+        
+        Args:
+            test_case_id (str): The test case ID.
+            
+        Returns:
+            List[Tuple[str, tuple]]: List of (query, params) tuples.
+        """
+        return [
+            # Delete tag associations
+            ("DELETE FROM test_case_tags WHERE test_case_id = %s", (test_case_id,)),
+            
+            # Delete history
+            ("DELETE FROM metadata_history WHERE test_case_id = %s", (test_case_id,)),
+            
+            # Release the file content and delete the file row
+            ("""
+            UPDATE test_case_blobs
+            SET ref_count = GREATEST(ref_count - 1, 0)
+            WHERE sha256 = (SELECT content_hash FROM test_case_files WHERE test_case_id = %s)
+            """, (test_case_id,)),
+            ("DELETE FROM test_case_files WHERE test_case_id = %s", (test_case_id,)),
+            
+            # Delete metadata
+            ("DELETE FROM test_case_metadata WHERE TEST_CASE_ID = %s", (test_case_id,))
+        ]
 
     def delete_test_case_metadata(self, test_case_id: str) -> bool:
         """
@@ -1026,22 +2478,9 @@ class MetadataManager:
         """
         try:
             # Setup a transaction to ensure all related data is deleted
-            queries = [
-                # Delete tag associations
-                ("DELETE FROM test_case_tags WHERE test_case_id = %s", (test_case_id,)),
-                
-                # Delete history
-                ("DELETE FROM metadata_history WHERE test_case_id = %s", (test_case_id,)),
-                
-                # Delete file content
-                ("DELETE FROM test_case_files WHERE test_case_id = %s", (test_case_id,)),
-                
-                # Delete metadata
-                ("DELETE FROM test_case_metadata WHERE TEST_CASE_ID = %s", (test_case_id,))
-            ]
-            
-            # Execute transaction
-            self._execute_transaction(queries)
+            self._execute_transaction(self._build_delete_test_case_queries(test_case_id))
+            self._invalidate_tag_index()
+            self._invalidate_metadata_cache([test_case_id])
             
             self.logger.info(f"Deleted metadata for test case {test_case_id}")
             return True
@@ -1051,110 +2490,395 @@ class MetadataManager:
             return False    
         
 
-    def search_test_cases(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def search_test_cases(self, criteria: Dict[str, Any], limit: int = None,
+                          order: str = "asc", cursor: str = None) -> List[Dict[str, Any]]:
+        """
+        Search for test cases based on metadata criteria.
+        
+        Args:
+            criteria (Dict[str, Any]): Search criteria, where:
+                - Keys are field names
+                - Values can be direct values or dicts with operators: 
+                {"op": "contains", "value": "partial"}, 
+                {"op": "in", "value": ["list", "of", "values"]},
+                {"op": ">", "value": 10}, etc.
+            limit (int, optional): Maximum number of test cases to return.
+                If None, returns all matches.
+            order (str, optional): Sort direction on TEST_CASE_NUMBER ("asc" or "desc").
+            cursor (str, optional): Opaque cursor returned by search_test_cases_page.
+                Only test cases after the cursor position are returned.
+            
+        Returns:
+            List[Dict[str, Any]]: List of matching test case metadata.
+        """
+        return self.search_test_cases_page(criteria, limit, order, cursor)["test_cases"]
+
+    def search_test_cases_page(self, criteria: Dict[str, Any], limit: int = None,
+                               order: str = "asc", cursor: str = None,
+                               offset: int = 0) -> Dict[str, Any]:
+        """
+        Search for one page of test cases using keyset pagination.
+        
+        The LIMIT and the cursor position are pushed into SQL, so reading a page
+        deep into the catalog costs the same as reading the first one.
+        
+        Args:
+            criteria (Dict[str, Any]): Search criteria (see search_test_cases).
+            limit (int, optional): Page size. If None, returns all matches.
+            order (str, optional): Sort direction on TEST_CASE_NUMBER ("asc" or "desc").
+            cursor (str, optional): Opaque cursor from a previous page's next_cursor.
+            offset (int, optional): Number of matches to skip. Kept for clients
+                that page by offset; prefer cursors for deep pages.
+            
+        Returns:
+            Dict[str, Any]: {"test_cases": [...], "next_cursor": str or None}.
+                next_cursor is None when there are no more matches.
+            
+        Raises:
+            MetadataValidationError: If the ordering, limit, offset or cursor is invalid.
+            DatabaseError: If the search fails.
+        """
+        query, params = self._build_search_page_query(criteria, limit, order, cursor, offset)
+        limit = self._page_int("limit", limit)
+        
+        try:
+            # Execute the query to get test case IDs
+            results = self._execute_query(query, params, fetch_all=True)
+            test_case_ids, next_cursor = self._split_search_page(
+                [row[0] for row in results] if results else [], limit, order
+            )
+            
+            # If no results, return empty page
+            if not test_case_ids:
+                return {"test_cases": [], "next_cursor": None}
+            
+            # Get full metadata for all matching test cases in one round trip
+            return {
+                "test_cases": self.get_test_case_metadata_bulk(test_case_ids),
+                "next_cursor": next_cursor
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Search failed: {str(e)}")
+            raise DatabaseError(f"Search operation failed: {str(e)}")
+
+    def _build_search_page_query(self, criteria: Dict[str, Any], limit: int = None,
+                                 order: str = "asc", cursor: str = None,
+                                 offset: int = 0) -> Tuple[str, tuple]:
+        """
+        Build the query selecting one page of matching test case numbers.
+        
+        Args:
+            criteria (Dict[str, Any]): Search criteria (see search_test_cases).
+            limit (int, optional): Page size. One extra row is selected to detect a next page.
+            order (str, optional): Sort direction on TEST_CASE_NUMBER ("asc" or "desc").
+            cursor (str, optional): Opaque cursor from a previous page's next_cursor.
+            offset (int, optional): Number of matches to skip.
+            
+        Returns:
+            Tuple[str, tuple]: (query, params)
+            
+        Raises:
+            MetadataValidationError: If the ordering, limit, offset or cursor is invalid.
+        """
+        if order is not None and not isinstance(order, str):
+            raise MetadataValidationError(message=f"Invalid order: {order!r}. Must be one of: ['asc', 'desc']")
+        order = (order or "asc").lower()
+        if order not in ("asc", "desc"):
+            raise MetadataValidationError(message=f"Invalid order: {order}. Must be one of: ['asc', 'desc']")
+        
+        limit = self._page_int("limit", limit)
+        offset = self._page_int("offset", offset)
+        
+        if cursor is not None and not isinstance(cursor, str):
+            raise MetadataValidationError(message=f"Invalid cursor: {cursor!r}")
+        after = self._decode_search_cursor(cursor, order) if cursor else None
+        
+        where_clauses, params = self._build_search_filters(criteria)
+        
+        # Keyset condition: continue strictly after the last returned test case
+        if after is not None:
+            where_clauses.append(f"test_case_number {'>' if order == 'asc' else '<'} %s")
+            params.append(after)
+        
+        # Build the query to get distinct test case numbers
+        query = """
+        SELECT DISTINCT test_case_number 
+        FROM test_cases
+        """
+        
+        if where_clauses:
+            query += " WHERE " + " AND ".join(f"({clause})" for clause in where_clauses)
+        
+        # Add ordering
+        query += f" ORDER BY test_case_number {order.upper()}"
+        
+        # Fetch one extra row to know whether another page exists
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit + 1)
+        
+        if offset:
+            query += " OFFSET %s"
+            params.append(offset)
+        
+        return query, tuple(params)
+
+    @staticmethod
+    def _page_int(name: str, value: Any) -> Optional[int]:
+        """
+        Coerce a page size or offset from client input.
+        
+        Args:
+            name (str): Parameter name, for the error message.
+            value (Any): An int, a string of digits, or None.
+            
+        Returns:
+            Optional[int]: The value as an int, or None if it was None.
+            
+        Raises:
+            MetadataValidationError: If the value is not a non-negative integer.
+        """
+        if value is None:
+            return None
+        if isinstance(value, str) and value.strip().isdigit():
+            value = int(value)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise MetadataValidationError(message=f"Invalid {name}: {value!r}. Must be a non-negative integer")
+        return value
+
+    def _split_search_page(self, test_case_ids: List[str], limit: int,
+                           order: str) -> Tuple[List[str], Optional[str]]:
+        """
+        Trim the extra row selected by _build_search_page_query and derive the next cursor.
+        
+        Args:
+            test_case_ids (List[str]): Test case numbers returned by the page query.
+            limit (int): Page size, or None for no limit.
+            order (str): Sort direction of the page.
+            
+        Returns:
+            Tuple[List[str], Optional[str]]: (page_ids, next_cursor)
+        """
+        if limit is None or len(test_case_ids) <= limit:
+            return test_case_ids, None
+        
+        test_case_ids = test_case_ids[:limit]
+        next_cursor = self._encode_search_cursor(test_case_ids[-1], (order or "asc").lower()) if test_case_ids else None
+        return test_case_ids, next_cursor
+
+    def _build_search_filters(self, criteria: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """
+        Build WHERE clauses and parameters from search criteria.
+        
+        Args:
+            criteria (Dict[str, Any]): Search criteria (see search_test_cases).
+            
+        Returns:
+            Tuple[List[str], List[Any]]: (where_clauses, params)
+        """
+        # Build the WHERE clause
+        where_clauses = []
+        params = []
+        
+        for field, criteria_value in criteria.items():
+            # Convert field name to lowercase for DB column names
+            db_field = field.lower()
+            
+            # Handle complex criteria with operators
+            if isinstance(criteria_value, dict) and "op" in criteria_value:
+                op = criteria_value["op"].lower()
+                value = criteria_value["value"]
+                
+                if op == "equals" or op == "=":
+                    where_clauses.append(f"{db_field} = %s")
+                    params.append(value)
+                    
+                elif op == "not equals" or op == "!=":
+                    where_clauses.append(f"{db_field} != %s OR {db_field} IS NULL")
+                    params.append(value)
+                    
+                elif op == "contains" or op == "like":
+                    # PostgreSQL ILIKE for case-insensitive search
+                    where_clauses.append(f"{db_field} ILIKE %s")
+                    params.append(f"%{value}%")
+                    
+                elif op == "in":
+                    placeholders = []
+                    for v in value:
+                        placeholders.append("%s")
+                        params.append(v)
+                    
+                    where_clauses.append(f"{db_field} IN ({', '.join(placeholders)})")
+                    
+                elif op == "not in":
+                    placeholders = []
+                    for v in value:
+                        placeholders.append("%s")
+                        params.append(v)
+                    
+                    where_clauses.append(f"{db_field} NOT IN ({', '.join(placeholders)}) OR {db_field} IS NULL")
+                    
+                elif op in [">", "<", ">=", "<="]:
+                    where_clauses.append(f"{db_field} {op} %s")
+                    params.append(value)
+                    
+                elif op == "between":
+                    if isinstance(value, (list, tuple)) and len(value) == 2:
+                        where_clauses.append(f"{db_field} BETWEEN %s AND %s")
+                        params.append(value[0])
+                        params.append(value[1])
+            else:
+                # Simple equality match
+                where_clauses.append(f"{db_field} = %s")
+                params.append(criteria_value)
+        
+        return where_clauses, params
+
+    def _encode_search_cursor(self, test_case_number: str, order: str) -> str:
         """
-        Search for test cases based on metadata criteria.
+        Encode a keyset position as an opaque cursor string.
         
         Args:
-            criteria (Dict[str, Any]): Search criteria, where:
-                - Keys are field names
-                - Values can be direct values or dicts with operators: 
-                {"op": "contains", "value": "partial"}, 
-                {"op": "in", "value": ["list", "of", "values"]},
-                {"op": ">", "value": 10}, etc.
+            test_case_number (str): The last TEST_CASE_NUMBER of the current page.
+            order (str): The sort direction the cursor belongs to.
             
         Returns:
-            List[Dict[str, Any]]: List of matching test case metadata.
+            str: URL-safe cursor string.
         """
-        try:
-            # Build the WHERE clause
-            where_clauses = []
-            params = []
+        payload = json.dumps({"after": test_case_number, "order": order})
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def _decode_search_cursor(self, cursor: str, order: str) -> str:
+        """
+        Decode an opaque cursor string into a keyset position.
+        
+        Args:
+            cursor (str): The cursor returned with a previous page.
+            order (str): The sort direction of the current request.
             
-            for field, criteria_value in criteria.items():
-                # Convert field name to lowercase for DB column names
-                db_field = field.lower()
-                
-                # Handle complex criteria with operators
-                if isinstance(criteria_value, dict) and "op" in criteria_value:
-                    op = criteria_value["op"].lower()
-                    value = criteria_value["value"]
-                    
-                    if op == "equals" or op == "=":
-                        where_clauses.append(f"{db_field} = %s")
-                        params.append(value)
-                        
-                    elif op == "not equals" or op == "!=":
-                        where_clauses.append(f"{db_field} != %s OR {db_field} IS NULL")
-                        params.append(value)
-                        
-                    elif op == "contains" or op == "like":
-                        # PostgreSQL ILIKE for case-insensitive search
-                        where_clauses.append(f"{db_field} ILIKE %s")
-                        params.append(f"%{value}%")
-                        
-                    elif op == "in":
-                        placeholders = []
-                        for v in value:
-                            placeholders.append("%s")
-                            params.append(v)
-                        
-                        where_clauses.append(f"{db_field} IN ({', '.join(placeholders)})")
-                        
-                    elif op == "not in":
-                        placeholders = []
-                        for v in value:
-                            placeholders.append("%s")
-                            params.append(v)
-                        
-                        where_clauses.append(f"{db_field} NOT IN ({', '.join(placeholders)}) OR {db_field} IS NULL")
-                        
-                    elif op in [">", "<", ">=", "<="]:
-                        where_clauses.append(f"{db_field} {op} %s")
-                        params.append(value)
-                        
-                    elif op == "between":
-                        if isinstance(value, (list, tuple)) and len(value) == 2:
-                            where_clauses.append(f"{db_field} BETWEEN %s AND %s")
-                            params.append(value[0])
-                            params.append(value[1])
-                else:
-                    # Simple equality match
-                    where_clauses.append(f"{db_field} = %s")
-                    params.append(criteria_value)
+        Returns:
+            str: The TEST_CASE_NUMBER to continue after.
             
-            # Build the query to get distinct test case numbers
-            query = """
-            SELECT DISTINCT test_case_number 
-            FROM test_cases
-            """
+        Raises:
+            MetadataValidationError: If the cursor is malformed or was issued for another ordering.
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+            after = payload["after"]
+            cursor_order = payload.get("order", "asc")
+        except Exception:
+            raise MetadataValidationError(message=f"Invalid cursor: {cursor}")
+        
+        if not isinstance(after, str):
+            raise MetadataValidationError(message=f"Invalid cursor: {cursor}")
+        
+        if cursor_order != order:
+            raise MetadataValidationError(message=f"Cursor was issued for order '{cursor_order}', not '{order}'")
+        
+        return after
+
+    def iter_test_case_metadata(self, criteria: Dict[str, Any] = None, order: str = "asc",
+                                chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream test case metadata matching the criteria from a server-side cursor.
+        
+        Rows are pulled from a named PostgreSQL cursor chunk_size at a time and
+        grouped into one metadata dict per test case, so memory stays bounded by
+        the chunk size regardless of how many test cases match. The pooled
+        connection is held until the generator is exhausted or closed.
+        
+        Args:
+            criteria (Dict[str, Any], optional): Search criteria (see search_test_cases).
+            order (str, optional): Sort direction on TEST_CASE_NUMBER ("asc" or "desc").
+            chunk_size (int, optional): Number of step rows fetched per round trip.
             
-            if where_clauses:
-                query += " WHERE " + " AND ".join(where_clauses)
+        Yields:
+            Dict[str, Any]: Test case metadata, same shape as get_test_case_metadata.
             
-            # Add ordering
-            query += " ORDER BY test_case_number ASC"
+        Raises:
+            MetadataError: If the ordering is invalid.
+            DatabaseError: If the query fails.
+        """
+        order = (order or "asc").lower()
+        if order not in ("asc", "desc"):
+            raise MetadataError(f"Invalid order: {order}. Must be one of: ['asc', 'desc']")
+        
+        where_clauses, params = self._build_search_filters(criteria or {})
+        
+        # Select every step of the test cases that have at least one matching step,
+        # which is the same set search_test_cases returns
+        query = f"SELECT {self._METADATA_COLUMNS} FROM test_cases"
+        if where_clauses:
+            query += """
+            WHERE test_case_number IN (
+                SELECT test_case_number FROM test_cases
+                WHERE """ + " AND ".join(f"({clause})" for clause in where_clauses) + """
+            )
+            """
+        query += f" ORDER BY test_case_number {order.upper()}, step_no ASC"
+        
+        conn = None
+        try:
+            conn = self._get_db_connection()
             
-            # Execute the query to get test case IDs
-            results = self._execute_query(query, tuple(params), fetch_all=True)
-            test_case_ids = [row[0] for row in results] if results else []
+            # Named cursors are server-side: rows stay in PostgreSQL until fetched
+            cursor = conn.cursor(name=f"metadata_export_{uuid.uuid4().hex}", cursor_factory=RealDictCursor)
+            cursor.itersize = chunk_size
+            cursor.execute(query, tuple(params))
             
-            # If no results, return empty list
-            if not test_case_ids:
-                return []
+            current_rows = []
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                
+                for row in rows:
+                    if current_rows and row.get("test_case_number") != current_rows[0].get("test_case_number"):
+                        yield self._build_test_case_metadata(current_rows)
+                        current_rows = []
+                    current_rows.append(row)
             
-            # Get full metadata for each matching test case
-            matching_test_cases = []
-            for test_case_id in test_case_ids:
-                metadata = self.get_test_case_metadata(test_case_id)
-                if metadata:
-                    matching_test_cases.append(metadata)
+            if current_rows:
+                yield self._build_test_case_metadata(current_rows)
             
-            return matching_test_cases
+            cursor.close()
             
         except Exception as e:
-            self.logger.error(f"Search failed: {str(e)}")
-            raise DatabaseError(f"Search operation failed: {str(e)}")
+            self.logger.error(f"Streaming metadata export failed: {str(e)}")
+            raise DatabaseError(f"Streaming metadata export failed: {str(e)}")
+        finally:
+            if conn:
+                # Read-only transaction; rolling back also releases the named cursor
+                # if the consumer stopped early
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                self._return_db_connection(conn)
+
+    _HISTORY_QUERY = """
+    SELECT id, test_case_id, field_name, old_value, new_value, changed_by, changed_at
+    FROM metadata_history
+    WHERE test_case_id = %s
+    ORDER BY changed_at DESC
+    """
+
+    def _format_history(self, history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert history timestamps to ISO format for consistency.
+        
+        Args:
+            history (List[Dict[str, Any]]): Rows from _HISTORY_QUERY.
+            
+        Returns:
+            List[Dict[str, Any]]: The same rows.
+        """
+        for entry in history:
+            if entry["changed_at"] and isinstance(entry["changed_at"], datetime):
+                entry["changed_at"] = entry["changed_at"].isoformat()
+        
+        return history
 
     def get_metadata_history(self, test_case_id: str) -> List[Dict[str, Any]]:
         """
@@ -1167,21 +2891,9 @@ class MetadataManager:
             List[Dict[str, Any]]: List of history entries, ordered by time.
         """
         try:
-            query = """
-            SELECT id, test_case_id, field_name, old_value, new_value, changed_by, changed_at
-            FROM metadata_history
-            WHERE test_case_id = %s
-            ORDER BY changed_at DESC
-            """
-            
-            history = self._execute_query(query, (test_case_id,), fetch_all=True, as_dict=True)
-            
-            # Convert timestamps to ISO format for consistency
-            for entry in history:
-                if entry["changed_at"] and isinstance(entry["changed_at"], datetime):
-                    entry["changed_at"] = entry["changed_at"].isoformat()
+            history = self._execute_query(self._HISTORY_QUERY, (test_case_id,), fetch_all=True, as_dict=True)
             
-            return history
+            return self._format_history(history)
             
         except Exception as e:
             self.logger.error(f"Failed to get metadata history: {str(e)}")
@@ -1211,17 +2923,195 @@ class MetadataManager:
         """
         return self.search_test_cases({"STATUS": status})
 
-    def get_test_cases_by_tags(self, tags: List[str]) -> List[Dict[str, Any]]:
+    def get_test_cases_by_tags(self, tags: List[str], match: str = "all") -> List[Dict[str, Any]]:
         """
-        Get all test cases that have all the specified tags.
+        Get all test cases that have the specified tags.
         
         Args:
             tags (List[str]): List of tags to match.
+            match (str, optional): "all" to require every tag, "any" to require at least one.
             
         Returns:
             List[Dict[str, Any]]: List of test case metadata.
         """
-        return self.search_test_cases({"TAGS": tags})
+        if match == "any":
+            test_case_ids = self.find_test_case_ids_by_tags(any_tags=tags)
+        else:
+            test_case_ids = self.find_test_case_ids_by_tags(all_tags=tags)
+        
+        return self.get_test_case_metadata_bulk(test_case_ids)
+
+    def find_test_case_ids_by_tags(self, all_tags: List[str] = None, any_tags: List[str] = None,
+                                   not_tags: List[str] = None) -> List[str]:
+        """
+        Find test cases by tag with ALL, ANY and NOT semantics.
+        
+        Queries join through test_case_tags, which is indexed by tag, or are
+        answered from the in-memory bitmap index when it is enabled.
+        
+        Args:
+            all_tags (List[str], optional): Test cases must have every one of these tags.
+            any_tags (List[str], optional): Test cases must have at least one of these tags.
+            not_tags (List[str], optional): Test cases must have none of these tags.
+            
+        Returns:
+            List[str]: Matching test case IDs, sorted.
+            
+        Raises:
+            DatabaseError: If the query fails.
+        """
+        all_tags = self._normalize_tags(all_tags)
+        any_tags = self._normalize_tags(any_tags)
+        not_tags = self._normalize_tags(not_tags)
+        
+        try:
+            if self.tag_index is not None:
+                if self.tag_index.is_stale():
+                    self._load_tag_index()
+                return self.tag_index.query(all_tags, any_tags, not_tags)
+            
+            query, params = self._build_tag_query(all_tags, any_tags, not_tags)
+            
+            results = self._execute_query(query, params, fetch_all=True)
+            return [row[0] for row in results] if results else []
+            
+        except Exception as e:
+            self.logger.error(f"Tag query failed: {str(e)}")
+            raise DatabaseError(f"Tag query failed: {str(e)}")
+
+    def _build_tag_query(self, all_tags: List[str], any_tags: List[str],
+                         not_tags: List[str]) -> Tuple[str, tuple]:
+        """
+        Build the SQL for an ALL/ANY/NOT tag query over normalized tag lists.
+        
+        Args:
+            all_tags (List[str]): Test cases must have every one of these tags.
+            any_tags (List[str]): Test cases must have at least one of these tags.
+            not_tags (List[str]): Test cases must have none of these tags.
+            
+        Returns:
+            Tuple[str, tuple]: (query, params) selecting matching test case IDs, sorted.
+        """
+        params = []
+        
+        if all_tags or any_tags:
+            # Candidates carry at least one of the positive tags
+            query = """
+            SELECT tct.test_case_id
+            FROM test_case_tags tct
+            JOIN tags t ON t.id = tct.tag_id
+            WHERE t.name = ANY(%s)
+            """
+            params.append(all_tags + any_tags)
+        else:
+            # Only exclusions: start from every test case
+            query = """
+            SELECT tct.test_case_id
+            FROM (SELECT DISTINCT test_case_number AS test_case_id FROM test_cases) tct
+            WHERE TRUE
+            """
+        
+        if not_tags:
+            query += """
+            AND NOT EXISTS (
+                SELECT 1 FROM test_case_tags excluded
+                JOIN tags xt ON xt.id = excluded.tag_id
+                WHERE excluded.test_case_id = tct.test_case_id
+                AND xt.name = ANY(%s)
+            )
+            """
+            params.append(not_tags)
+        
+        if all_tags or any_tags:
+            query += " GROUP BY tct.test_case_id HAVING TRUE"
+            if all_tags:
+                query += " AND COUNT(DISTINCT t.name) FILTER (WHERE t.name = ANY(%s)) = %s"
+                params.extend([all_tags, len(all_tags)])
+            if any_tags:
+                query += " AND bool_or(t.name = ANY(%s))"
+                params.append(any_tags)
+        
+        query += " ORDER BY 1"
+        
+        return query, tuple(params)
+
+    def _load_tag_index(self):
+        """
+        Load the in-memory tag bitmap index from the database.
+        """
+        # Taken before reading so a tag write during the read keeps the index stale
+        generation = self.tag_index.generation
+        test_case_ids = self._execute_query(
+            "SELECT DISTINCT test_case_number FROM test_cases ORDER BY test_case_number",
+            fetch_all=True
+        )
+        tag_pairs = self._execute_query("""
+        SELECT t.name, tct.test_case_id
+        FROM test_case_tags tct
+        JOIN tags t ON t.id = tct.tag_id
+        """, fetch_all=True)
+        
+        if self.tag_index.load([row[0] for row in test_case_ids or []], tag_pairs or [], generation):
+            self.logger.debug(f"Loaded tag bitmap index with {len(self.tag_index.bitmaps)} tags")
+        else:
+            self.logger.debug("Discarded tag bitmap index build invalidated during load")
+
+    def _invalidate_tag_index(self):
+        """
+        Drop the in-memory tag index after tag associations change.
+        """
+        if self.tag_index is not None:
+            self.tag_index.invalidate()
+
+    def _invalidate_metadata_cache(self, test_case_ids: List[str]) -> Optional[int]:
+        """
+        Drop cached metadata of test cases that were written.
+        
+        Args:
+            test_case_ids (List[str]): The test case IDs.
+            
+        Returns:
+            Optional[int]: Cache version to pass to set(), or None without a cache.
+        """
+        if self.metadata_cache is not None:
+            return self.metadata_cache.invalidate(test_case_ids)
+        return None
+
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """
+        Get hit/miss metrics of the metadata cache.
+        
+        Returns:
+            Dict[str, Any]: The cache metrics, or {"enabled": False} if the cache is off.
+        """
+        if self.metadata_cache is None:
+            return {"enabled": False}
+        
+        return {"enabled": True, **self.metadata_cache.metrics()}
+
+    def get_statement_metrics(self) -> Dict[str, Any]:
+        """
+        Get process-wide statement counters: statements, round trips, prepared
+        statement use and the round trips and parses saved by the statement cache.
+        
+        Returns:
+            Dict[str, Any]: The statement metrics.
+        """
+        return self.statements.metrics()
+
+    def track_statements(self):
+        """
+        Count the statements this thread executes within a block, e.g. one request.
+        
+        Example:
+            with metadata_manager.track_statements() as counts:
+                metadata_manager.update_test_case_metadata(test_case_id, updates)
+            logger.debug(f"Saved {counts['round_trips_saved']} round trips")
+        
+        Returns:
+            ContextManager[Dict[str, int]]: Yields the counters, updated in place.
+        """
+        return self.statements.track()
 
     def get_test_cases_by_module(self, module: str) -> List[Dict[str, Any]]:
         """
@@ -1235,75 +3125,98 @@ class MetadataManager:
         """
         return self.search_test_cases({"MODULE": module})
 
-    def search_test_cases_by_content(self, search_text: str) -> List[Dict[str, Any]]:
+    _CONTENT_SEARCH_QUERY = """
+    WITH q AS (
+        SELECT websearch_to_tsquery('english', %s) AS query
+    ),
+    ranked AS (
+        SELECT tc.test_case_number, tc.step_no,
+               tc.test_step_description, tc.expected_result, tc.data,
+               ts_rank(tc.search_vector, q.query) AS rank,
+               q.query
+        FROM test_cases tc, q
+        WHERE tc.search_vector @@ q.query
+    ),
+    top_cases AS (
+        SELECT test_case_number, MAX(rank) AS rank
+        FROM ranked
+        GROUP BY test_case_number
+        ORDER BY rank DESC, test_case_number
+        LIMIT %s
+    ),
+    case_tags AS (
+        SELECT tct.test_case_id, array_agg(t.name ORDER BY t.name) AS tags
+        FROM test_case_tags tct
+        JOIN tags t ON t.id = tct.tag_id
+        WHERE tct.test_case_id IN (SELECT test_case_number FROM top_cases)
+        GROUP BY tct.test_case_id
+    )
+    SELECT r.test_case_number, top_cases.rank AS case_rank, r.step_no, r.rank,
+           ts_headline('english',
+                       concat_ws(' ', r.test_step_description, r.expected_result, r.data),
+                       r.query,
+                       'StartSel=<mark>, StopSel=</mark>, MaxFragments=2') AS highlight,
+           case_tags.tags
+    FROM ranked r
+    JOIN top_cases USING (test_case_number)
+    LEFT JOIN case_tags ON case_tags.test_case_id = r.test_case_number
+    ORDER BY top_cases.rank DESC, r.test_case_number, r.rank DESC, r.step_no
+    """
+
+    def _group_content_matches(self, rows: List[Tuple]) -> Dict[str, Dict[str, Any]]:
         """
-        Search for test cases containing specific text in the file content.
+        Group matching steps from _CONTENT_SEARCH_QUERY by test case, keeping rank order.
         
         Args:
-            search_text (str): Text to search for in the test case content.
+            rows (List[Tuple]): Rows from _CONTENT_SEARCH_QUERY.
             
         Returns:
-            List[Dict[str, Any]]: List of matching test case metadata.
+            Dict[str, Dict[str, Any]]: TAGS, RANK and MATCHES per test case number.
+        """
+        matches = {}
+        for test_case_number, case_rank, step_no, rank, highlight, tags in rows:
+            entry = matches.setdefault(test_case_number, {
+                "TAGS": tags or [],
+                "RANK": case_rank,
+                "MATCHES": []
+            })
+            entry["MATCHES"].append({
+                "STEP_NO": step_no,
+                "RANK": rank,
+                "HIGHLIGHT": highlight
+            })
+        
+        return matches
+
+    def search_test_cases_by_content(self, search_text: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Full-text search over step descriptions, expected results and data.
+        
+        Uses the search_vector tsvector column of test_cases (maintained by
+        PostgreSQL and GIN indexed). Test cases are ranked by their best matching
+        step; the matching steps come back with highlighted fragments.
+        
+        Args:
+            search_text (str): Text to search for, in web search syntax
+                (quoted phrases, OR, -excluded).
+            limit (int, optional): Maximum number of test cases to return.
             
-        Note: This is a simplified implementation. PostgreSQL offers more advanced
-            text search capabilities like full-text search that could be used here.
+        Returns:
+            List[Dict[str, Any]]: Matching test case metadata, best match first. Each
+                entry also has TAGS, RANK and MATCHES (STEP_NO, RANK, HIGHLIGHT per step).
         """
         try:
-            # First, get all test case IDs that have files with the search text in the filename
-            file_query = """
-            SELECT DISTINCT test_case_id 
-            FROM test_case_files
-            WHERE file_name ILIKE %s
-            """
-            
-            file_results = self._execute_query(file_query, (f"%{search_text}%",), fetch_all=True)
-            matching_ids = [row[0] for row in file_results] if file_results else []
+            rows = self._execute_query(self._CONTENT_SEARCH_QUERY, (search_text, limit), fetch_all=True)
             
-            # If no matches in filenames, return empty list
-            if not matching_ids:
+            if not rows:
                 return []
             
-            # Now get the full metadata for these test cases
-            placeholders = []
-            params = []
-            for test_case_id in matching_ids:
-                placeholders.append("%s")
-                params.append(test_case_id)
-            
-            metadata_query = f"""
-            SELECT * FROM test_case_metadata
-            WHERE TEST_CASE_ID IN ({', '.join(placeholders)})
-            ORDER BY MODIFIED_DATE DESC
-            """
+            matches = self._group_content_matches(rows)
             
-            results = self._execute_query(metadata_query, tuple(params), fetch_all=True, as_dict=True)
-            
-            # Process results (similar to search_test_cases)
             processed_results = []
-            
-            for row in results:
-                # Remove the 'id' field
-                if "id" in row:
-                    del row["id"]
-                
-                # Deserialize values
-                for field_name, value in dict(row).items():
-                    if field_name in self.schema["metadata_fields"]:
-                        field_type = self.schema["metadata_fields"][field_name]["type"]
-                        row[field_name] = self._deserialize_metadata_value(value, field_type)
-                
-                # Get tags
-                tags_query = """
-                SELECT t.name
-                FROM tags t
-                JOIN test_case_tags tct ON t.id = tct.tag_id
-                WHERE tct.test_case_id = %s
-                """
-                
-                tags_result = self._execute_query(tags_query, (row["TEST_CASE_ID"],), fetch_all=True)
-                row["TAGS"] = [tag_row[0] for tag_row in tags_result] if tags_result else []
-                
-                processed_results.append(row)
+            for metadata in self.get_test_case_metadata_bulk(list(matches)):
+                metadata.update(matches[metadata["TEST_CASE_NUMBER"]])
+                processed_results.append(metadata)
             
             return processed_results
             
@@ -1328,94 +3241,296 @@ class MetadataManager:
             self.logger.error(f"Failed to get all tags: {str(e)}")
             return []
 
-    def get_stats(self) -> Dict[str, Any]:
+    # Dimensions kept in the stats summary table, mapped to their metadata columns
+    STATS_DIMENSIONS = {
+        "by_status": "STATUS",
+        "by_type": "TEST_TYPE",
+        "by_automation_status": "AUTOMATION_STATUS",
+        "by_module": "MODULE"
+    }
+    
+    # The summary total is spread over this many rows, picked by test case ID,
+    # so concurrent inserts and deletes rarely wait on the same counter row
+    STATS_TOTAL_SHARDS = 16
+
+    def get_stats(self, use_summary: bool = None) -> Dict[str, Any]:
         """
         Get statistics about test cases.
         
+        All breakdowns are computed in a single GROUPING SETS query. When the
+        stats summary table is enabled, counts are read from it instead, which
+        costs the same regardless of the number of test cases.
+        
+        Args:
+            use_summary (bool, optional): Read from the stats summary table.
+                Defaults to the stats_summary setting of this manager.
+        
         Returns:
             Dict[str, Any]: Statistics including counts by status, type, etc.
         """
+        if use_summary is None:
+            use_summary = self.stats_summary
+        
         try:
-            stats = {
-                "total_count": 0,
-                "by_status": {},
-                "by_type": {},
-                "by_automation_status": {},
-                "by_module": {},
-                "recently_modified": []
-            }
-            
-            # Get total count
-            count_query = "SELECT COUNT(*) FROM test_case_metadata"
-            total_count = self._execute_query(count_query, fetch_one=True)[0]
-            stats["total_count"] = total_count
-            
-            # Get counts by status
-            status_query = """
-            SELECT STATUS, COUNT(*) as count
-            FROM test_case_metadata
-            GROUP BY STATUS
-            ORDER BY count DESC
-            """
-            status_results = self._execute_query(status_query, fetch_all=True)
-            for row in status_results:
-                stats["by_status"][row[0]] = row[1]
-            
-            # Get counts by type
-            type_query = """
-            SELECT TEST_TYPE, COUNT(*) as count
-            FROM test_case_metadata
-            GROUP BY TEST_TYPE
-            ORDER BY count DESC
-            """
-            type_results = self._execute_query(type_query, fetch_all=True)
-            for row in type_results:
-                stats["by_type"][row[0] or "Unspecified"] = row[1]
+            counts = self._execute_query(self._build_stats_query(use_summary), fetch_all=True)
             
-            # Get counts by automation status
-            auto_query = """
-            SELECT AUTOMATION_STATUS, COUNT(*) as count
-            FROM test_case_metadata
-            GROUP BY AUTOMATION_STATUS
-            ORDER BY count DESC
-            """
-            auto_results = self._execute_query(auto_query, fetch_all=True)
-            for row in auto_results:
-                stats["by_automation_status"][row[0]] = row[1]
+            return self._format_stats(counts)
             
-            # Get counts by module
-            module_query = """
-            SELECT MODULE, COUNT(*) as count
-            FROM test_case_metadata
-            GROUP BY MODULE
-            ORDER BY count DESC
-            LIMIT 10
-            """
-            module_results = self._execute_query(module_query, fetch_all=True)
-            for row in module_results:
-                stats["by_module"][row[0] or "Unspecified"] = row[1]
+        except Exception as e:
+            self.logger.error(f"Failed to get statistics: {str(e)}")
+            return {"total_count": 0}   
+
+    def _build_stats_query(self, use_summary: bool) -> str:
+        """
+        Build the query returning (dimension, value, count, recently_modified) rows for get_stats.
+        
+        Args:
+            use_summary (bool): Read counts from the stats summary table.
             
-            # Get recently modified test cases
-            recent_query = """
-            SELECT TEST_CASE_ID, TEST_TYPE, MODULE, STATUS, MODIFIED_DATE
-            FROM test_case_metadata
-            ORDER BY MODIFIED_DATE DESC
-            LIMIT 5
+        Returns:
+            str: The query.
+        """
+        recently_modified = """
+            (SELECT json_agg(r) FROM (
+                SELECT TEST_CASE_ID, TEST_TYPE, MODULE, STATUS, MODIFIED_DATE
+                FROM test_case_metadata
+                ORDER BY MODIFIED_DATE DESC
+                LIMIT 5
+            ) r) AS recently_modified
+        """
+        
+        if use_summary:
+            # Total shards are summed; the summary stores NULL as an empty string
+            return f"""
+            SELECT
+                dimension,
+                CASE WHEN dimension = 'total' THEN NULL ELSE NULLIF(value, '') END AS value,
+                SUM(count)::bigint AS count,
+                {recently_modified}
+            FROM test_case_stats_summary
+            WHERE count > 0
+            GROUP BY 1, 2
             """
-            recent_results = self._execute_query(recent_query, fetch_all=True, as_dict=True)
-            
-            # Format dates
-            for row in recent_results:
-                if "MODIFIED_DATE" in row and isinstance(row["MODIFIED_DATE"], datetime):
-                    row["MODIFIED_DATE"] = row["MODIFIED_DATE"].isoformat()
+        
+        return f"""
+        SELECT
+            CASE
+                WHEN GROUPING(STATUS) = 0 THEN 'by_status'
+                WHEN GROUPING(TEST_TYPE) = 0 THEN 'by_type'
+                WHEN GROUPING(AUTOMATION_STATUS) = 0 THEN 'by_automation_status'
+                WHEN GROUPING(MODULE) = 0 THEN 'by_module'
+                ELSE 'total'
+            END AS dimension,
+            COALESCE(STATUS::text, TEST_TYPE::text, AUTOMATION_STATUS::text, MODULE::text) AS value,
+            COUNT(*) AS count,
+            {recently_modified}
+        FROM test_case_metadata
+        GROUP BY GROUPING SETS ((), (STATUS), (TEST_TYPE), (AUTOMATION_STATUS), (MODULE))
+        """
+
+    def _format_stats(self, counts: List[Tuple[str, Any, int, Any]]) -> Dict[str, Any]:
+        """
+        Shape (dimension, value, count, recently_modified) rows into the stats dict.
+        
+        Args:
+            counts (List[Tuple[str, Any, int, Any]]): Rows from the stats query.
             
-            stats["recently_modified"] = recent_results
+        Returns:
+            Dict[str, Any]: Statistics including counts by status, type, etc.
+        """
+        stats = {
+            "total_count": 0,
+            "by_status": {},
+            "by_type": {},
+            "by_automation_status": {},
+            "by_module": {},
+            "recently_modified": []
+        }
+        
+        # Largest groups first, matching the previous ORDER BY count DESC
+        for dimension, value, count, recent in sorted(counts, key=lambda row: row[2], reverse=True):
+            if dimension == "total":
+                stats["total_count"] = count
+            elif dimension in ("by_type", "by_module"):
+                stats[dimension][value or "Unspecified"] = count
+            elif dimension in stats:
+                stats[dimension][value] = count
+            
+            if recent:
+                stats["recently_modified"] = recent
+        
+        # Only the ten largest modules are reported
+        stats["by_module"] = dict(list(stats["by_module"].items())[:10])
+        
+        return stats
+
+    def enable_stats_summary(self) -> bool:
+        """
+        Create and populate the stats summary table used by get_stats.
+        
+        The table holds one count per (dimension, value) pair and is kept up to
+        date incrementally by a trigger on test_case_metadata, so every write
+        adjusts only the counts it affects: an update touches only the dimensions
+        whose value changed, and counts that drop to zero are removed. The total
+        is kept in STATS_TOTAL_SHARDS rows chosen by test case ID, so concurrent
+        inserts and deletes do not all queue on one row. Writers that add cases
+        with the same status, type or module still share that value's row.
+        Safe to call repeatedly.
+        
+        Returns:
+            bool: True if successful.
             
-            return stats
+        Raises:
+            DatabaseError: If the summary table cannot be created.
+        """
+        dimension_values = ", ".join(
+            f"('{dimension}', COALESCE({{row}}.{column}::text, ''))"
+            for dimension, column in self.STATS_DIMENSIONS.items()
+        )
+        changed_values = ", ".join(
+            f"('{dimension}', COALESCE(OLD.{column}::text, ''), COALESCE(NEW.{column}::text, ''))"
+            for dimension, column in self.STATS_DIMENSIONS.items()
+        )
+        total_shard = "('total', (hashtext({row}.TEST_CASE_ID) & {mask})::text)"
+        mask = self.STATS_TOTAL_SHARDS - 1
+        
+        queries = [
+            ("""
+            CREATE TABLE IF NOT EXISTS test_case_stats_summary (
+                dimension VARCHAR(50) NOT NULL,
+                value TEXT NOT NULL,
+                count BIGINT NOT NULL DEFAULT 0,
+                PRIMARY KEY (dimension, value)
+            )
+            """, None),
+            ("""
+            CREATE INDEX IF NOT EXISTS idx_test_case_metadata_modified_date
+            ON test_case_metadata (MODIFIED_DATE DESC)
+            """, None),
+            (f"""
+            CREATE OR REPLACE FUNCTION test_case_stats_summary_apply() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'UPDATE' THEN
+                    -- Only dimensions whose value changed; the total is unaffected
+                    UPDATE test_case_stats_summary s
+                    SET count = s.count - 1
+                    FROM (VALUES {changed_values}) AS d (dimension, old_value, new_value)
+                    WHERE s.dimension = d.dimension AND s.value = d.old_value
+                    AND d.old_value <> d.new_value;
+                    
+                    DELETE FROM test_case_stats_summary s
+                    USING (VALUES {changed_values}) AS d (dimension, old_value, new_value)
+                    WHERE s.dimension = d.dimension AND s.value = d.old_value
+                    AND d.old_value <> d.new_value AND s.count <= 0;
+                    
+                    INSERT INTO test_case_stats_summary (dimension, value, count)
+                    SELECT d.dimension, d.new_value, 1
+                    FROM (VALUES {changed_values}) AS d (dimension, old_value, new_value)
+                    WHERE d.old_value <> d.new_value
+                    ON CONFLICT (dimension, value)
+                    DO UPDATE SET count = test_case_stats_summary.count + 1;
+                ELSIF TG_OP = 'DELETE' THEN
+                    UPDATE test_case_stats_summary
+                    SET count = count - 1
+                    WHERE (dimension, value) IN ({total_shard.format(row='OLD', mask=mask)}, {dimension_values.format(row='OLD')});
+                    
+                    DELETE FROM test_case_stats_summary
+                    WHERE (dimension, value) IN ({total_shard.format(row='OLD', mask=mask)}, {dimension_values.format(row='OLD')})
+                    AND count <= 0;
+                ELSE
+                    INSERT INTO test_case_stats_summary (dimension, value, count)
+                    SELECT d.dimension, d.value, 1
+                    FROM (VALUES {total_shard.format(row='NEW', mask=mask)}, {dimension_values.format(row='NEW')}) AS d (dimension, value)
+                    ON CONFLICT (dimension, value)
+                    DO UPDATE SET count = test_case_stats_summary.count + 1;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """, None),
+            ("DROP TRIGGER IF EXISTS test_case_stats_summary_trigger ON test_case_metadata", None),
+            (f"""
+            CREATE TRIGGER test_case_stats_summary_trigger
+            AFTER INSERT OR DELETE OR UPDATE OF {', '.join(self.STATS_DIMENSIONS.values())}
+            ON test_case_metadata
+            FOR EACH ROW EXECUTE FUNCTION test_case_stats_summary_apply()
+            """, None)
+        ]
+        
+        # Seed the counts in the same transaction that installs the trigger
+        queries.extend(self._stats_summary_rebuild_queries())
+        
+        self._execute_transaction(queries)
+        self.stats_summary = True
+        self.logger.info("Enabled test case stats summary table")
+        return True
+
+    def _stats_summary_exists(self) -> bool:
+        """
+        Check whether the stats summary table has been created.
+        
+        Returns:
+            bool: True if the table exists.
+        """
+        query = "SELECT to_regclass('public.test_case_stats_summary') IS NOT NULL"
+        result = self._execute_query(query, fetch_one=True)
+        return bool(result and result[0])
+
+    def refresh_stats_summary(self) -> bool:
+        """
+        Rebuild the stats summary table from test_case_metadata.
+        
+        Only needed to repair drift, e.g. after bulk changes made with triggers disabled.
+        
+        Returns:
+            bool: True if successful.
             
-        except Exception as e:
-            self.logger.error(f"Failed to get statistics: {str(e)}")
-            return {"total_count": 0}   
+        Raises:
+            DatabaseError: If the rebuild fails.
+        """
+        self._execute_transaction(self._stats_summary_rebuild_queries())
+        self.logger.info("Rebuilt test case stats summary table")
+        return True
+
+    def _stats_summary_rebuild_queries(self) -> List[Tuple[str, tuple]]:
+        """
+        Build the queries that recompute the stats summary table from scratch.
+        
+        Returns:
+            List[Tuple[str, tuple]]: List of (query, params) tuples.
+        """
+        grouping_sets = ", ".join(f"({column})" for column in self.STATS_DIMENSIONS.values())
+        dimension_case = "\n".join(
+            f"WHEN GROUPING({column}) = 0 THEN '{dimension}'"
+            for dimension, column in self.STATS_DIMENSIONS.items()
+        )
+        value_case = "\n".join(
+            f"WHEN GROUPING({column}) = 0 THEN COALESCE({column}::text, '')"
+            for column in self.STATS_DIMENSIONS.values()
+        )
+        
+        mask = self.STATS_TOTAL_SHARDS - 1
+        
+        return [
+            ("LOCK TABLE test_case_metadata IN SHARE MODE", None),
+            ("DELETE FROM test_case_stats_summary", None),
+            # Each total shard counts the cases the trigger will later decrement from it
+            (f"""
+            INSERT INTO test_case_stats_summary (dimension, value, count)
+            SELECT 'total', (hashtext(TEST_CASE_ID) & {mask})::text, COUNT(*)
+            FROM test_case_metadata
+            GROUP BY 2
+            """, None),
+            (f"""
+            INSERT INTO test_case_stats_summary (dimension, value, count)
+            SELECT
+                CASE {dimension_case} END,
+                CASE {value_case} END,
+                COUNT(*)
+            FROM test_case_metadata
+            GROUP BY GROUPING SETS ({grouping_sets})
+            """, None)
+        ]
 
 
     def update_test_case_status(self, test_case_id: str, new_status: str, 
@@ -1605,7 +3720,7 @@ class MetadataManager:
         )
 
     def store_test_case_file_content(self, test_case_id: str, file_name: str, 
-                            file_content: bytes, file_type: str = None,
+                            file_content: Union[bytes, BinaryIO], file_type: str = None,
                             uploaded_by: str = None) -> bool:
         """
         Store the content of a test case file in the database.
@@ -1613,7 +3728,8 @@ class MetadataManager:
         Args:
             test_case_id (str): The test case ID.
             file_name (str): The name of the file.
-            file_content (bytes): The content of the file as bytes.
+            file_content (Union[bytes, BinaryIO]): The content of the file as bytes,
+                or a binary file object to stream from.
             file_type (str, optional): The file type, if not provided, extracted from file_name.
             uploaded_by (str, optional): Person uploading the file.
             
@@ -1633,19 +3749,8 @@ class MetadataManager:
             if not file_type:
                 file_type = os.path.splitext(file_name)[1].lstrip('.')
             
-            # Store file in the database
-            query = """
-            INSERT INTO test_case_files (test_case_id, file_name, file_type, content, uploaded_at)
-            VALUES (%s, %s, %s, %s, %s)
-            ON CONFLICT (test_case_id) DO UPDATE
-            SET file_name = EXCLUDED.file_name,
-                file_type = EXCLUDED.file_type,
-                content = EXCLUDED.content,
-                uploaded_at = EXCLUDED.uploaded_at
-            """
-            
-            params = (test_case_id, file_name, file_type, file_content, datetime.now())
-            self._execute_query(query, params)
+            # Store file in the blob store
+            self._store_test_case_file(test_case_id, file_name, file_content, file_type)
             
             # Update metadata to indicate file storage
             self.update_test_case_metadata(
@@ -1679,23 +3784,7 @@ class MetadataManager:
             MetadataError: If the retrieval fails.
         """
         try:
-            query = """
-            SELECT file_name, file_type, content
-            FROM test_case_files
-            WHERE test_case_id = %s
-            """
-            
-            result = self._execute_query(query, (test_case_id,), fetch_one=True)
-            
-            if not result:
-                self.logger.warning(f"No file found for test case {test_case_id}")
-                return None, None, None
-            
-            file_name = result[0]
-            file_type = result[1]
-            file_content = result[2]
-            
-            return file_name, file_type, file_content
+            return self._retrieve_test_case_file(test_case_id)
             
         except Exception as e:
             self.logger.error(f"Failed to retrieve test case file: {str(e)}")
@@ -1820,6 +3909,26 @@ class MetadataManager:
         except Exception as e:
             self.logger.error(f"Failed to check if file exists: {str(e)}")
             return False     
+
+    def file_exists_for_test_cases(self, test_case_ids: List[str]) -> Dict[str, bool]:
+        """
+        Check which of many test cases have a file, using a single query.
+        
+        Args:
+            test_case_ids (List[str]): The test case IDs.
+            
+        Returns:
+            Dict[str, bool]: Whether a file exists, keyed by test case ID.
+        """
+        try:
+            return {
+                test_case_id: probe["file_exists"]
+                for test_case_id, probe in self.probe_test_cases(test_case_ids).items()
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Failed to check if files exist: {str(e)}")
+            return {test_case_id: False for test_case_id in test_case_ids}
         
 
 
@@ -1841,15 +3950,14 @@ class MetadataManager:
         try:
             # Get metadata
             if test_case_ids:
-                metadata_list = [self.get_test_case_metadata(tc_id) for tc_id in test_case_ids]
-                metadata_list = [m for m in metadata_list if m]  # Filter out None values
+                metadata_list = self.get_test_case_metadata_bulk(test_case_ids)
             else:
                 # Get all test cases
                 query = "SELECT TEST_CASE_ID FROM test_case_metadata ORDER BY TEST_CASE_ID"
                 result = self._execute_query(query, fetch_all=True)
                 test_case_ids = [row[0] for row in result] if result else []
                 
-                metadata_list = [self.get_test_case_metadata(tc_id) for tc_id in test_case_ids]
+                metadata_list = self.get_test_case_metadata_bulk(test_case_ids)
             
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
@@ -1933,6 +4041,336 @@ class MetadataManager:
             self.logger.error(f"Failed to import metadata: {str(e)}")
             raise MetadataError(f"Failed to import metadata: {str(e)}")
 
+    # Columnar snapshot formats: name -> (pyarrow dataset format, file extension)
+    SNAPSHOT_FORMATS = {
+        "parquet": ("parquet", "parquet"),
+        "arrow": ("ipc", "arrow")
+    }
+
+    # Snapshot partition columns and the SQL that computes them
+    SNAPSHOT_PARTITIONS = {
+        "module": "m.MODULE",
+        "modified_month": "to_char(t.MODIFIED_DATE, 'YYYY-MM')"
+    }
+
+    SNAPSHOT_MANIFEST = "_snapshot.json"
+
+    @staticmethod
+    def _arrow_type(sql_type: str):
+        """
+        Map a PostgreSQL column type to an Arrow type; anything else is stored as a string.
+        
+        Args:
+            sql_type (str): Type as returned by format_type().
+            
+        Returns:
+            pyarrow.DataType: The Arrow type.
+        """
+        import pyarrow as pa
+        
+        if sql_type in ("integer", "smallint"):
+            return pa.int32()
+        if sql_type == "bigint":
+            return pa.int64()
+        if sql_type == "boolean":
+            return pa.bool_()
+        if sql_type in ("real", "double precision"):
+            return pa.float64()
+        if sql_type == "date":
+            return pa.date32()
+        if sql_type.startswith("timestamp"):
+            return pa.timestamp("us", tz="UTC" if "with time zone" in sql_type else None)
+        return pa.string()
+
+    def export_metadata_snapshot(self, output_dir: str, format: str = "parquet",
+                                 partition_by: Optional[str] = "module",
+                                 test_case_ids: List[str] = None, batch_size: int = 10000) -> int:
+        """
+        Export the test case catalog as a columnar snapshot (Parquet or Arrow IPC files).
+        
+        Step rows are read from a server-side cursor batch_size at a time and
+        written as Arrow record batches, so memory stays bounded by the batch
+        size. Files are hive-partitioned (e.g. module=Billing/part-0.parquet)
+        and a _snapshot.json manifest describes the snapshot. Requires pyarrow.
+        
+        Args:
+            output_dir (str): Directory of the snapshot. A previous snapshot in it is replaced.
+            format (str, optional): "parquet" (compressed, for storage) or "arrow"
+                (uncompressed, memory-mappable for zero-copy reads).
+            partition_by (str, optional): "module", "modified_month" or None.
+            test_case_ids (List[str], optional): Specific test cases to export.
+                If None, exports all test cases.
+            batch_size (int, optional): Rows per record batch and per fetch.
+            
+        Returns:
+            int: Number of test cases exported.
+            
+        Raises:
+            MetadataError: If the export fails.
+        """
+        if format not in self.SNAPSHOT_FORMATS:
+            raise MetadataError(f"Invalid snapshot format: {format}. Must be one of: {list(self.SNAPSHOT_FORMATS)}")
+        if partition_by is not None and partition_by not in self.SNAPSHOT_PARTITIONS:
+            raise MetadataError(f"Invalid snapshot partition: {partition_by}. Must be one of: {list(self.SNAPSHOT_PARTITIONS)}")
+        
+        conn = None
+        try:
+            import pyarrow as pa
+            import pyarrow.dataset as ds
+            
+            conn = self._get_db_connection()
+            column_types = self._get_test_case_columns(conn)
+            
+            fields = [pa.field(column, self._arrow_type(sql_type)) for column, sql_type in column_types.items()]
+            select_list = [f't."{column}"' for column in column_types]
+            query = "SELECT "
+            
+            if partition_by:
+                fields.append(pa.field(partition_by, pa.string()))
+                select_list.append(f"{self.SNAPSHOT_PARTITIONS[partition_by]} AS {partition_by}")
+            
+            query += ", ".join(select_list) + " FROM test_cases t"
+            if partition_by == "module":
+                query += " LEFT JOIN test_case_metadata m ON m.TEST_CASE_ID = t.TEST_CASE_NUMBER"
+            
+            params = None
+            if test_case_ids:
+                query += " WHERE t.TEST_CASE_NUMBER = ANY(%s)"
+                params = (list(test_case_ids),)
+            query += " ORDER BY t.TEST_CASE_NUMBER, t.STEP_NO"
+            
+            schema = pa.schema(fields)
+            string_columns = [i for i, field in enumerate(fields) if pa.types.is_string(field.type)]
+            counts = {"test_cases": 0, "rows": 0}
+            
+            # Named cursors are server-side: rows stay in PostgreSQL until fetched
+            cursor = conn.cursor(name=f"metadata_snapshot_{uuid.uuid4().hex}")
+            cursor.itersize = batch_size
+            cursor.execute(query, params)
+            
+            def record_batches():
+                last_test_case = None
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    
+                    columns = [list(values) for values in zip(*rows)]
+                    for i in string_columns:
+                        columns[i] = [value if value is None or isinstance(value, str) else str(value)
+                                      for value in columns[i]]
+                    
+                    for test_case in columns[list(column_types).index("test_case_number")]:
+                        if test_case != last_test_case:
+                            counts["test_cases"] += 1
+                            last_test_case = test_case
+                    counts["rows"] += len(rows)
+                    
+                    yield pa.RecordBatch.from_arrays(
+                        [pa.array(values, type=field.type) for values, field in zip(columns, fields)],
+                        schema=schema
+                    )
+            
+            # Only replace a directory that holds a previous snapshot
+            if os.path.exists(os.path.join(output_dir, self.SNAPSHOT_MANIFEST)):
+                shutil.rmtree(output_dir)
+            
+            dataset_format, extension = self.SNAPSHOT_FORMATS[format]
+            ds.write_dataset(
+                record_batches(),
+                output_dir,
+                schema=schema,
+                format=dataset_format,
+                partitioning=ds.partitioning(pa.schema([schema.field(partition_by)]), flavor="hive")
+                if partition_by else None,
+                basename_template=f"part-{{i}}.{extension}",
+                max_rows_per_group=batch_size,
+                existing_data_behavior="overwrite_or_ignore"
+            )
+            cursor.close()
+            
+            # write_dataset creates no directory when no rows matched
+            os.makedirs(output_dir, exist_ok=True)
+            with open(os.path.join(output_dir, self.SNAPSHOT_MANIFEST), 'w') as f:
+                json.dump({
+                    "format": format,
+                    "partition_by": partition_by,
+                    "columns": column_types,
+                    "test_cases": counts["test_cases"],
+                    "rows": counts["rows"],
+                    "created_at": datetime.now().isoformat()
+                }, f, indent=2)
+            
+            self.logger.info(f"Exported {counts['test_cases']} test cases ({counts['rows']} rows) to {format} snapshot {output_dir}")
+            return counts["test_cases"]
+            
+        except Exception as e:
+            self.logger.error(f"Failed to export metadata snapshot: {str(e)}")
+            raise MetadataError(f"Failed to export metadata snapshot: {str(e)}")
+        finally:
+            if conn:
+                # Read-only transaction; rolling back also releases the named cursor
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                self._return_db_connection(conn)
+
+    def _open_metadata_snapshot(self, input_dir: str):
+        """
+        Open a snapshot written by export_metadata_snapshot as a pyarrow dataset.
+        
+        Arrow IPC files are memory-mapped, so reading them does not copy.
+        
+        Args:
+            input_dir (str): Directory of the snapshot.
+            
+        Returns:
+            pyarrow.dataset.Dataset: The snapshot dataset, with partition columns.
+            
+        Raises:
+            MetadataError: If the directory is not a snapshot.
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        from pyarrow.fs import LocalFileSystem
+        
+        manifest_path = os.path.join(input_dir, self.SNAPSHOT_MANIFEST)
+        if not os.path.exists(manifest_path):
+            raise MetadataError(f"Not a metadata snapshot (no {self.SNAPSHOT_MANIFEST}): {input_dir}")
+        
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        
+        # Partition values are strings; they cannot be inferred if all are null
+        partitioning = None
+        if manifest.get("partition_by"):
+            partitioning = ds.partitioning(pa.schema([(manifest["partition_by"], pa.string())]), flavor="hive")
+        
+        return ds.dataset(
+            input_dir,
+            format=self.SNAPSHOT_FORMATS[manifest["format"]][0],
+            partitioning=partitioning,
+            filesystem=LocalFileSystem(use_mmap=True)
+        )
+
+    def load_metadata_snapshot(self, input_dir: str, columns: List[str] = None, filter=None):
+        """
+        Load a metadata snapshot as an Arrow table, e.g. for analytics jobs.
+        
+        Only the requested columns and the partitions matching the filter are
+        read. Arrow format snapshots are memory-mapped (zero-copy).
+        
+        Example:
+            import pyarrow.dataset as ds
+            table = manager.load_metadata_snapshot(path, ["test_case_number", "status"],
+                                                   filter=ds.field("module") == "Billing")
+            df = table.to_pandas()
+        
+        Args:
+            input_dir (str): Directory of the snapshot.
+            columns (List[str], optional): Columns to load. If None, loads all columns.
+            filter (pyarrow.compute.Expression, optional): Row filter; filters on the
+                partition column skip whole files.
+            
+        Returns:
+            pyarrow.Table: The snapshot rows.
+            
+        Raises:
+            MetadataError: If the snapshot cannot be read.
+        """
+        try:
+            return self._open_metadata_snapshot(input_dir).to_table(columns=columns, filter=filter)
+        except MetadataError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to load metadata snapshot: {str(e)}")
+            raise MetadataError(f"Failed to load metadata snapshot: {str(e)}")
+
+    def import_metadata_snapshot(self, input_dir: str, overwrite: bool = False,
+                                 batch_size: int = 10000) -> int:
+        """
+        Import a snapshot written by export_metadata_snapshot.
+        
+        Record batches are streamed from the files into a staging table with
+        COPY and merged into test_cases with one INSERT ... ON CONFLICT, in a
+        single transaction. Row ids are assigned by the database.
+        
+        Args:
+            input_dir (str): Directory of the snapshot.
+            overwrite (bool, optional): Update the steps of existing test cases
+                instead of skipping those test cases.
+            batch_size (int, optional): Rows read and copied per batch.
+            
+        Returns:
+            int: Number of test cases imported.
+            
+        Raises:
+            MetadataError: If the import fails.
+        """
+        conn = None
+        try:
+            import pyarrow.csv as pa_csv
+            
+            dataset = self._open_metadata_snapshot(input_dir)
+            
+            conn = self._get_db_connection()
+            column_types = self._get_test_case_columns(conn)
+            columns = [column for column in dataset.schema.names if column in column_types and column != "id"]
+            quoted = ", ".join(f'"{column}"' for column in columns)
+            
+            cursor = conn.cursor()
+            cursor.execute("""
+            CREATE TEMP TABLE test_cases_staging (LIKE test_cases INCLUDING DEFAULTS)
+            ON COMMIT DROP
+            """)
+            
+            write_options = pa_csv.WriteOptions(include_header=False)
+            for batch in dataset.to_batches(columns=columns, batch_size=batch_size):
+                buffer = BytesIO()
+                pa_csv.write_csv(batch, buffer, write_options)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY test_cases_staging ({quoted}) FROM STDIN WITH (FORMAT csv)", buffer)
+            
+            if overwrite:
+                updated = [f'"{column}" = EXCLUDED."{column}"' for column in columns
+                           if column not in ("test_case_number", "step_no")]
+                conflict_action = "DO UPDATE SET " + ", ".join(updated)
+                where_clause = ""
+            else:
+                # Like import_metadata_from_json, skip test cases that already exist
+                conflict_action = "DO NOTHING"
+                where_clause = """
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM test_cases e WHERE e.TEST_CASE_NUMBER = s.TEST_CASE_NUMBER
+                )
+                """
+            
+            cursor.execute(f"""
+            INSERT INTO test_cases ({quoted})
+            SELECT {', '.join(f's."{column}"' for column in columns)}
+            FROM test_cases_staging s
+            {where_clause}
+            ON CONFLICT (TEST_CASE_NUMBER, STEP_NO) {conflict_action}
+            RETURNING TEST_CASE_NUMBER
+            """)
+            imported_ids = list(dict.fromkeys(row[0] for row in cursor.fetchall()))
+            
+            conn.commit()
+            self._invalidate_metadata_cache(imported_ids)
+            
+            self.logger.info(f"Imported {len(imported_ids)} test cases from metadata snapshot {input_dir}")
+            return len(imported_ids)
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            self.logger.error(f"Failed to import metadata snapshot: {str(e)}")
+            raise MetadataError(f"Failed to import metadata snapshot: {str(e)}")
+        finally:
+            if conn:
+                self._return_db_connection(conn)
+
     def export_test_case_to_excel(self, test_case_id: str, output_path: str = None) -> Union[bool, BytesIO]:
         """
         Export a test case to an Excel file or return as in-memory buffer.
@@ -1995,74 +4433,9 @@ class MetadataManager:
             MetadataError: If the import fails.
         """
         try:
-            # Determine if input is a file path or file content
-            file_name = None
-            file_type = None
-            file_content = None
-            df = None
-            
-            if isinstance(file_path_or_content, str) and os.path.exists(file_path_or_content):
-                # It's a file path
-                file_path = file_path_or_content
-                file_name = os.path.basename(file_path)
-                file_type = os.path.splitext(file_name)[1].lstrip('.')
-                
-                # Read file content as bytes
-                with open(file_path, 'rb') as f:
-                    file_content = f.read()
-                
-                # Read Excel directly to DataFrame
-                file_io = BytesIO(file_content)
-                df = pd.read_excel(file_io, engine='openpyxl')
-            
-            elif isinstance(file_path_or_content, bytes):
-                # It's file content as bytes - assume Excel format
-                file_content = file_path_or_content
-                file_type = "xlsx"  # Default to xlsx
-                
-                # If test_case_id is provided, use it for the file name
-                file_name = f"{test_case_id}.{file_type}" if test_case_id else f"imported_test_case.{file_type}"
-                
-                # Read Excel directly to DataFrame
-                file_io = BytesIO(file_content)
-                df = pd.read_excel(file_io, engine='openpyxl')
-            
-            else:
-                raise MetadataError(f"Invalid input: must be a file path or file content as bytes")
-            
-            if df is None or df.empty:
-                raise MetadataError(f"Empty Excel file: {file_name}")
-            
-            # Extract TEST_CASE_ID from file if not provided
-            if not test_case_id:
-                if "TEST CASE NUMBER" in df.columns and not df["TEST CASE NUMBER"].isna().all():
-                    test_case_id = df["TEST CASE NUMBER"].iloc[0]
-                else:
-                    # Generate a new ID
-                    test_case_id = f"TC-{uuid.uuid4().hex[:8].upper()}"
-            
-            # Extract test case metadata
-            test_case_data = {}
-            
-            # Map fields from first row if available
-            if len(df) > 0:
-                first_row = df.iloc[0]
-                
-                # Map common fields
-                field_mappings = {
-                    "TEST CASE": "TEST_CASE",
-                    "SUBJECT": "MODULE",
-                    "TEST USER ID/ROLE": "OWNER",
-                    "TYPE": "TEST_TYPE",
-                    "TEST CASE NUMBER": "TEST_CASE_ID"
-                }
-                
-                for source, target in field_mappings.items():
-                    if source in df.columns and not pd.isna(first_row.get(source)):
-                        test_case_data[target] = first_row.get(source)
-            
-            # Override with provided test_case_id
-            test_case_data["TEST_CASE_ID"] = test_case_id
+            parsed = self._parse_test_case_file(file_path_or_content, test_case_id)
+            test_case_id = parsed["test_case_id"]
+            test_case_data = parsed["test_case_data"]
             
             # Create or update test case metadata
             if self.get_test_case_metadata(test_case_id):
@@ -2073,7 +4446,9 @@ class MetadataManager:
                 self.create_test_case_metadata(test_case_data, uploaded_by)
             
             # Store file content directly - no need to re-read from disk
-            self.store_test_case_file_content(test_case_id, file_name, file_content, file_type, uploaded_by)
+            self.store_test_case_file_content(
+                test_case_id, parsed["file_name"], parsed["file_content"], parsed["file_type"], uploaded_by
+            )
             
             self.logger.info(f"Imported test case with ID {test_case_id}")
             return test_case_id
@@ -2082,6 +4457,13 @@ class MetadataManager:
             self.logger.error(f"Failed to import test case from Excel: {str(e)}")
             raise MetadataError(f"Failed to import test case from Excel: {str(e)}")
 
+    def _parse_test_case_file(self, file_path_or_content: Union[str, bytes],
+                              test_case_id: str = None) -> Dict[str, Any]:
+        """
+        Read a test case Excel file and extract its metadata (see parse_test_case_file).
+        """
+        return parse_test_case_file(file_path_or_content, test_case_id)
+
     def bulk_export_test_cases(self, test_case_ids: List[str], output_dir: str,
                         include_metadata: bool = True) -> Dict[str, str]:
         """
@@ -2109,23 +4491,23 @@ class MetadataManager:
                 metadata_path = os.path.join(output_dir, "metadata.json")
                 self.export_metadata_to_json(metadata_path, test_case_ids)
             
+            # Check existence and get file names for all test cases at once
+            probes = self.probe_test_cases(test_case_ids)
+            
             # Export each test case file
-            for test_case_id in test_case_ids:
+            for test_case_id, probe in probes.items():
                 try:
-                    # Get file name and type
-                    metadata = self.get_test_case_metadata(test_case_id)
-                    if not metadata:
+                    if not probe["test_case_exists"]:
                         self.logger.warning(f"Test case not found: {test_case_id}")
                         continue
                     
-                    # Check if file exists
-                    if not self.file_exists_for_test_case(test_case_id):
+                    if not probe["file_exists"]:
                         self.logger.warning(f"No file found for test case: {test_case_id}")
                         continue
                     
-                    # Get file name from metadata or use test case ID
-                    file_name = metadata.get("FILE_NAME", f"{test_case_id}.xlsx")
-                    file_type = metadata.get("FILE_TYPE", "xlsx")
+                    # Get file name from the stored file or use test case ID
+                    file_name = probe["file_name"] or f"{test_case_id}.xlsx"
+                    file_type = probe["file_type"] or "xlsx"
                     
                     # Ensure file name has extension
                     if not os.path.splitext(file_name)[1]:
@@ -2150,13 +4532,24 @@ class MetadataManager:
             self.logger.error(f"Failed to bulk export test cases: {str(e)}")
             raise MetadataError(f"Failed to bulk export test cases: {str(e)}")
 
-    def bulk_import_test_cases(self, file_paths: List[str], uploaded_by: str = None) -> List[str]:
+    def bulk_import_test_cases(self, file_paths: List[str], uploaded_by: str = None,
+                               parallel: bool = False, max_workers: int = None,
+                               write_batch_size: int = 200) -> List[str]:
         """
         Import multiple test cases from files.
         
+        Files are parsed first, then written in batches: metadata with a single
+        bulk load and file contents with a single multi-row upsert per batch.
+        With parallel=True, workbook parsing runs in a process pool while this
+        process remains the only database writer.
+        
         Args:
             file_paths (List[str]): List of file paths to import.
             uploaded_by (str, optional): Person uploading the files.
+            parallel (bool, optional): Parse files in a ProcessPoolExecutor.
+            max_workers (int, optional): Worker processes for parallel parsing.
+                Defaults to the BULK_IMPORT_WORKERS environment variable, then the CPU count.
+            write_batch_size (int, optional): Parsed files written per database batch.
             
         Returns:
             List[str]: List of imported test case IDs.
@@ -2166,22 +4559,32 @@ class MetadataManager:
         """
         try:
             imported_ids = []
+            parsed_files = []
+            excel_paths = []
             
             for file_path in file_paths:
-                try:
-                    file_ext = os.path.splitext(file_path)[1].lower()
-                    
-                    if file_ext in ['.xlsx', '.xls']:
-                        # Import Excel file
-                        test_case_id = self.import_test_case_from_excel(file_path, None, uploaded_by)
-                        imported_ids.append(test_case_id)
-                    else:
-                        self.logger.warning(f"Unsupported file type: {file_ext}")
-                        # Skip this file
-                    
-                except Exception as file_error:
+                file_ext = os.path.splitext(file_path)[1].lower()
+                
+                if file_ext in ['.xlsx', '.xls']:
+                    excel_paths.append(file_path)
+                else:
+                    self.logger.warning(f"Unsupported file type: {file_ext}")
+                    # Skip this file
+            
+            for file_path, parsed, file_error in self._iter_parsed_files(excel_paths, parallel, max_workers):
+                if file_error is not None:
                     self.logger.error(f"Failed to import file {file_path}: {str(file_error)}")
                     # Continue with next file
+                    continue
+                
+                parsed_files.append(parsed)
+                
+                # Flush to the database in batches to bound memory
+                if len(parsed_files) >= write_batch_size:
+                    imported_ids.extend(self._write_parsed_test_case_files(parsed_files, uploaded_by))
+                    parsed_files = []
+            
+            imported_ids.extend(self._write_parsed_test_case_files(parsed_files, uploaded_by))
             
             self.logger.info(f"Imported {len(imported_ids)} test cases")
             return imported_ids
@@ -2190,53 +4593,295 @@ class MetadataManager:
             self.logger.error(f"Failed to bulk import test cases: {str(e)}")
             raise MetadataError(f"Failed to bulk import test cases: {str(e)}")
 
+    def _iter_parsed_files(self, file_paths: List[str], parallel: bool = False,
+                           max_workers: int = None) -> Iterator[Tuple[str, Dict[str, Any], Exception]]:
+        """
+        Parse test case files, serially or in a process pool.
+        
+        Args:
+            file_paths (List[str]): Excel files to parse.
+            parallel (bool, optional): Parse in a ProcessPoolExecutor.
+            max_workers (int, optional): Worker processes for parallel parsing.
+            
+        Yields:
+            Tuple[str, Dict[str, Any], Exception]: (file_path, parsed, error); exactly one of
+                parsed and error is None. In parallel mode files are yielded as they finish.
+        """
+        if not parallel or len(file_paths) < 2:
+            for file_path in file_paths:
+                try:
+                    yield file_path, parse_test_case_file(file_path), None
+                except Exception as file_error:
+                    yield file_path, None, file_error
+            return
+        
+        if max_workers is None:
+            max_workers = int(os.getenv('BULK_IMPORT_WORKERS', '0')) or os.cpu_count() or 1
+        max_workers = min(max_workers, len(file_paths))
+        
+        self.logger.info(f"Parsing {len(file_paths)} files with {max_workers} worker processes")
+        
+        # Keep only a bounded window of files in flight so parsed results cannot pile
+        # up faster than the caller writes them
+        window = max_workers * 2
+        pending_paths = iter(file_paths)
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for file_path in islice(pending_paths, window):
+                futures[executor.submit(parse_test_case_file, file_path)] = file_path
+            
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = futures.pop(future)
+                    try:
+                        parsed, error = future.result(), None
+                    except Exception as file_error:
+                        parsed, error = None, file_error
+                    yield file_path, parsed, error
+                    
+                    for next_path in islice(pending_paths, 1):
+                        futures[executor.submit(parse_test_case_file, next_path)] = next_path
+
+    def _write_parsed_test_case_files(self, parsed_files: List[Dict[str, Any]],
+                                      uploaded_by: str = None) -> List[str]:
+        """
+        Write parsed test case files to the database in bulk.
+        
+        Args:
+            parsed_files (List[Dict[str, Any]]): Results of _parse_test_case_file.
+            uploaded_by (str, optional): Person uploading the files.
+            
+        Returns:
+            List[str]: IDs of the test cases whose metadata and file were stored.
+        """
+        if not parsed_files:
+            return []
+        
+        records = []
+        for parsed in parsed_files:
+            record = dict(parsed["test_case_data"])
+            record["FILE_NAME"] = parsed["file_name"]
+            record["FILE_TYPE"] = parsed["file_type"]
+            records.append(record)
+        
+        # Imports update the fields each file supplies, like import_test_case_from_excel
+        load_result = self.bulk_load_test_case_metadata(records, created_by=uploaded_by, overwrite=True)
+        
+        for error in load_result["errors"]:
+            self.logger.error(f"Failed to import test case {error['test_case_id']}: {'; '.join(error['errors'])}")
+        
+        loaded_ids = set(load_result["test_case_ids"])
+        files = [parsed for parsed in parsed_files if parsed["test_case_id"] in loaded_ids]
+        
+        if files:
+            now = datetime.now()
+            conn = None
+            try:
+                # One transaction for the batch; duplicate spreadsheets share one blob
+                conn = self._get_db_connection()
+                for parsed in files:
+                    self._put_test_case_file(
+                        conn, str(parsed["test_case_id"]), parsed["file_name"],
+                        parsed["file_content"], parsed["file_type"], now
+                    )
+                conn.commit()
+            except Exception as e:
+                if conn:
+                    conn.rollback()
+                self.logger.error(f"Failed to store imported test case files: {str(e)}")
+                raise DatabaseError(f"Failed to store imported test case files: {str(e)}")
+            finally:
+                if conn:
+                    self._return_db_connection(conn)
+        
+        return [str(parsed["test_case_id"]) for parsed in files]
+
     def export_test_cases_as_zip(self, test_case_ids: List[str], output_path: str,
-                        include_metadata: bool = True) -> str:
+                        include_metadata: bool = True, max_workers: int = None) -> str:
         """
         Export multiple test cases as a ZIP file.
         
+        The archive is written straight to output_path by iter_test_cases_zip;
+        nothing is staged in a temporary directory.
+        
+        Args:
+            test_case_ids (List[str]): List of test case IDs to export.
+            output_path (str): Path for the output ZIP file.
+            include_metadata (bool, optional): Whether to include metadata in export.
+            max_workers (int, optional): Files fetched from the database concurrently.
+            
+        Returns:
+            str: Path to the created ZIP file.
+            
+        Raises:
+            MetadataError: If the export fails.
+        """
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+            
+            summary = {}
+            with open(output_path, 'wb') as f:
+                for chunk in self.iter_test_cases_zip(test_case_ids, include_metadata, max_workers, summary):
+                    f.write(chunk)
+            
+            self.logger.info(f"Exported {summary['file_count']} files for {len(test_case_ids)} test cases to ZIP file: {output_path}")
+            return output_path
+            
+        except Exception as e:
+            self.logger.error(f"Failed to export test cases as ZIP: {str(e)}")
+            raise MetadataError(f"Failed to export test cases as ZIP: {str(e)}")
+
+    def summarize_test_cases_export(self, test_case_ids: List[str]) -> Dict[str, Any]:
+        """
+        Report what iter_test_cases_zip would export, without reading file content.
+        
+        Args:
+            test_case_ids (List[str]): List of test case IDs to export.
+            
+        Returns:
+            Dict[str, Any]: test_case_count, file_count, exported_test_cases and
+                total_size (bytes of stored file content, before compression).
+            
+        Raises:
+            DatabaseError: If the lookup fails.
+        """
+        test_case_ids = list(dict.fromkeys(test_case_ids))
+        
+        # Same selection as iter_test_cases_zip: rows without content have no size
+        files = {
+            test_case_id: info["file_size"]
+            for test_case_id, info in self.get_test_case_file_info_bulk(test_case_ids).items()
+            if info["file_size"] is not None
+        }
+        
+        return {
+            "test_case_count": len(test_case_ids),
+            "file_count": len(files),
+            "exported_test_cases": list(files),
+            "total_size": sum(files.values())
+        }
+
+    def iter_test_cases_zip(self, test_case_ids: List[str], include_metadata: bool = True,
+                            max_workers: int = None, summary: Dict[str, Any] = None,
+                            metadata_batch_size: int = 500) -> Iterator[bytes]:
+        """
+        Stream a ZIP archive of test case files, e.g. as an HTTP response body.
+        
+        The stored files are looked up with one probe query and fetched from the blob
+        store by a thread pool, at most 2 * max_workers at a time. Each file is
+        added to the archive as soon as it arrives, and the archive bytes are
+        yielded as they are produced. metadata.json is written last, from bulk
+        reads of metadata_batch_size test cases.
+        
         Args:
             test_case_ids (List[str]): List of test case IDs to export.
-            output_path (str): Path for the output ZIP file.
-            include_metadata (bool, optional): Whether to include metadata in export.
+            include_metadata (bool, optional): Whether to include metadata.json.
+            max_workers (int, optional): Files fetched concurrently. Defaults to the
+                EXPORT_WORKERS environment variable, or 4.
+            summary (Dict[str, Any], optional): Filled in with test_case_count,
+                file_count and exported_test_cases once the archive is complete.
+            metadata_batch_size (int, optional): Test cases read per metadata query.
             
-        Returns:
-            str: Path to the created ZIP file.
+        Yields:
+            bytes: The ZIP archive, in chunks.
             
         Raises:
             MetadataError: If the export fails.
         """
+        import zipfile
+        
+        test_case_ids = list(dict.fromkeys(test_case_ids))
+        workers = max(1, max_workers or int(os.getenv('EXPORT_WORKERS', '4')))
+        
+        # Rows without content have no size
+        files = [
+            (test_case_id, info["file_name"], info["file_type"])
+            for test_case_id, info in self.get_test_case_file_info_bulk(test_case_ids).items()
+            if info["file_size"] is not None
+        ]
+        
+        buffer = _ZipStreamBuffer()
+        archive = zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        
+        def fetch(test_case_id):
+            return b"".join(self.iter_test_case_file_content(test_case_id))
+        
         try:
-            import zipfile
-            import tempfile
+            pending = {}
+            queued = iter(files)
+            used_names = set()
+            exported = []
+            
+            def submit_next():
+                for test_case_id, file_name, file_type in queued:
+                    pending[executor.submit(fetch, test_case_id)] = (test_case_id, file_name, file_type)
+                    return
             
-            # Create a temporary directory for files
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Export files to the temporary directory
-                self.bulk_export_test_cases(test_case_ids, temp_dir, include_metadata)
+            for _ in range(2 * workers):
+                submit_next()
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
                 
-                # Create ZIP file
-                with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    # Add all files from the temporary directory
-                    for root, _, files in os.walk(temp_dir):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            # Calculate the relative path for the archive
-                            arcname = os.path.relpath(file_path, temp_dir)
-                            zipf.write(file_path, arcname)
-            
-            self.logger.info(f"Exported {len(test_case_ids)} test cases to ZIP file: {output_path}")
-            return output_path
+                for future in done:
+                    test_case_id, file_name, file_type = pending.pop(future)
+                    submit_next()
+                    
+                    try:
+                        content = future.result()
+                    except Exception as case_error:
+                        self.logger.error(f"Failed to export test case {test_case_id}: {str(case_error)}")
+                        continue
+                    
+                    # Keep archive names unique when test cases share a file name
+                    arcname = file_name or f"{test_case_id}.{file_type or 'xlsx'}"
+                    if arcname in used_names:
+                        arcname = f"{test_case_id}_{arcname}"
+                    used_names.add(arcname)
+                    
+                    archive.writestr(arcname, content)
+                    exported.append(test_case_id)
+                    yield buffer.drain()
+            
+            if include_metadata:
+                with archive.open("metadata.json", 'w') as entry:
+                    entry.write(b"[")
+                    first = True
+                    for start in range(0, len(test_case_ids), metadata_batch_size):
+                        for metadata in self.get_test_case_metadata_bulk(test_case_ids[start:start + metadata_batch_size]):
+                            entry.write((b"" if first else b",") + b"\n" + json.dumps(
+                                metadata, indent=2, default=self._json_serialize
+                            ).encode("utf-8"))
+                            first = False
+                        yield buffer.drain()
+                    entry.write(b"\n]")
+            
+            archive.close()
+            yield buffer.drain()
+            
+            if summary is not None:
+                summary.update({
+                    "test_case_count": len(test_case_ids),
+                    "file_count": len(exported),
+                    "exported_test_cases": exported
+                })
             
         except Exception as e:
-            self.logger.error(f"Failed to export test cases as ZIP: {str(e)}")
-            raise MetadataError(f"Failed to export test cases as ZIP: {str(e)}")    
-        
-
+            self.logger.error(f"Failed to stream test cases as ZIP: {str(e)}")
+            raise MetadataError(f"Failed to stream test cases as ZIP: {str(e)}")
+        finally:
+            # Stop fetching if the consumer went away early
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def _close_connection_pool(self):
         """
         Close the connection pool and release all resources.
+        
+        The pool is shared with every other user of the same database in this
+        process, so this is meant for shutdown only.
         """
         try:
             if hasattr(self, 'connection_pool') and self.connection_pool:
@@ -2245,12 +4890,6 @@ class MetadataManager:
         except Exception as e:
             self.logger.error(f"Error closing connection pool: {str(e)}")
 
-    def __del__(self):
-        """
-        Destructor to ensure connection pool is closed when object is deleted.
-        """
-        self._close_connection_pool()
-
     def vacuum_database(self):
         """
         Run VACUUM operation to reclaim storage and update statistics.
@@ -2339,6 +4978,10 @@ class MetadataManager:
             table_sizes = self._execute_query(table_sizes_query, fetch_all=True, as_dict=True)
             stats["table_sizes"] = table_sizes
             
+            # Connection pool usage
+            stats["connection_pool"] = self.connection_pool.stats()
+            stats["statements"] = self.statements.metrics()
+            
             return stats
             
         except Exception as e:
@@ -2356,7 +4999,8 @@ class MetadataManager:
             cleanup_stats = {
                 "orphaned_tags": 0,
                 "orphaned_files": 0,
-                "unused_tags": 0
+                "unused_tags": 0,
+                "unreferenced_blobs": 0
             }
             
             # Remove orphaned tag associations (where test case no longer exists)
@@ -2369,16 +5013,40 @@ class MetadataManager:
             orphaned_tags_count = self._execute_query(orphaned_tags_query)
             cleanup_stats["orphaned_tags"] = orphaned_tags_count
             
-            # Remove orphaned files (where test case no longer exists)
+            # Remove orphaned files (where test case no longer exists) and release their content
             orphaned_files_query = """
-            DELETE FROM test_case_files
-            WHERE test_case_id NOT IN (
-                SELECT TEST_CASE_ID FROM test_case_metadata
+            WITH orphaned AS (
+                DELETE FROM test_case_files
+                WHERE test_case_id NOT IN (
+                    SELECT TEST_CASE_ID FROM test_case_metadata
+                )
+                RETURNING content_hash
+            ), released AS (
+                UPDATE test_case_blobs b
+                SET ref_count = GREATEST(b.ref_count - o.refs, 0)
+                FROM (
+                    SELECT content_hash, COUNT(*) AS refs
+                    FROM orphaned
+                    WHERE content_hash IS NOT NULL
+                    GROUP BY content_hash
+                ) o
+                WHERE b.sha256 = o.content_hash
             )
+            SELECT COUNT(*) FROM orphaned
             """
-            orphaned_files_count = self._execute_query(orphaned_files_query)
+            orphaned_files_count = self._execute_query(orphaned_files_query, fetch_one=True)[0]
             cleanup_stats["orphaned_files"] = orphaned_files_count
             
+            # Remove file contents no longer referenced by any file
+            conn = self._get_db_connection()
+            try:
+                cleanup_stats["unreferenced_blobs"] = self.blob_store.collect_garbage(conn)
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self._return_db_connection(conn)
+            
             # Remove unused tags (not associated with any test case)
             unused_tags_query = """
             DELETE FROM tags
@@ -2388,6 +5056,7 @@ class MetadataManager:
             """
             unused_tags_count = self._execute_query(unused_tags_query)
             cleanup_stats["unused_tags"] = unused_tags_count
+            self._invalidate_tag_index()
             
             self.logger.info(f"Cleanup completed: {cleanup_stats}")
             return cleanup_stats
@@ -2396,6 +5065,268 @@ class MetadataManager:
             self.logger.error(f"Cleanup failed: {str(e)}")
             raise DatabaseError(f"Database cleanup failed: {str(e)}")
 
+    # Aliases accepted by bulk_load_test_case_metadata, mapped to schema fields
+    BULK_LOAD_FIELD_ALIASES = {
+        "TEST CASE NUMBER": "TEST_CASE_ID",
+        "TEST USER ID/ROLE": "OWNER",
+        "SUBJECT": "MODULE",
+        "TYPE": "TEST_TYPE"
+    }
+
+    def bulk_load_test_case_metadata(self, records: Union[List[Dict[str, Any]], pd.DataFrame],
+                                     created_by: str = None, overwrite: bool = False,
+                                     chunk_size: int = 10000) -> Dict[str, Any]:
+        """
+        Load many test case metadata records with COPY and a set-based merge.
+        
+        The whole batch is defaulted and validated column-wise in pandas. Valid
+        rows are streamed with COPY FROM STDIN into a temporary staging table and
+        merged into test_case_metadata with one INSERT ... ON CONFLICT per chunk.
+        Tags are written with one statement for the whole batch. Invalid rows are
+        reported and skipped; a chunk rejected by the database is retried row by
+        row so only the offending rows are reported.
+        
+        Args:
+            records (Union[List[Dict[str, Any]], pd.DataFrame]): Metadata records keyed by
+                schema field name (or the Excel column aliases in BULK_LOAD_FIELD_ALIASES).
+            created_by (str, optional): Person creating the test cases.
+            overwrite (bool, optional): Update test cases that already exist instead of skipping
+                them. Only the fields a record supplies are updated; the rest keep their stored values.
+            chunk_size (int, optional): Rows per COPY and merge.
+            
+        Returns:
+            Dict[str, Any]: loaded and skipped counts, test_case_ids that were written,
+                and errors as a list of {"row", "test_case_id", "errors"}.
+            
+        Raises:
+            DatabaseError: If the load cannot be performed at all.
+        """
+        df = records.copy() if isinstance(records, pd.DataFrame) else pd.DataFrame(list(records))
+        df = df.reset_index(drop=True)
+        
+        result = {"loaded": 0, "skipped": 0, "test_case_ids": [], "errors": []}
+        
+        if df.empty:
+            return result
+        
+        # Map Excel-style column names onto schema fields
+        for alias, field_name in self.BULK_LOAD_FIELD_ALIASES.items():
+            if alias in df.columns:
+                df[field_name] = df[field_name].fillna(df[alias]) if field_name in df.columns else df[alias]
+        
+        fields = self.schema["metadata_fields"]
+        
+        # Remember which fields each record supplied before defaults are filled in
+        supplied = df.reindex(columns=[f for f in fields if f in df.columns]).notna()
+        
+        # Generate missing IDs and fill defaults column-wise
+        if "TEST_CASE_ID" not in df.columns:
+            df["TEST_CASE_ID"] = None
+        missing_ids = df["TEST_CASE_ID"].isna()
+        df.loc[missing_ids, "TEST_CASE_ID"] = [f"TC-{uuid.uuid4().hex[:8].upper()}" for _ in range(missing_ids.sum())]
+        df["TEST_CASE_ID"] = df["TEST_CASE_ID"].astype(str)
+        
+        now = pd.Timestamp(datetime.now())
+        for field_name in ("CREATED_DATE", "MODIFIED_DATE"):
+            df[field_name] = df[field_name].fillna(now) if field_name in df.columns else now
+        if created_by and fields.get("CREATED_BY"):
+            df["CREATED_BY"] = df["CREATED_BY"].fillna(created_by) if "CREATED_BY" in df.columns else created_by
+        
+        for field_name, field_def in fields.items():
+            if "default" in field_def:
+                if field_name in df.columns:
+                    df[field_name] = df[field_name].fillna(field_def["default"])
+                else:
+                    df[field_name] = field_def["default"]
+        
+        # Validate the whole batch at once
+        row_errors = self._validate_metadata_frame(df)
+        
+        duplicated = df["TEST_CASE_ID"].duplicated(keep="last")
+        for idx in df.index[duplicated]:
+            row_errors.setdefault(idx, []).append(
+                f"Duplicate TEST_CASE_ID '{df.at[idx, 'TEST_CASE_ID']}' in batch (a later row wins)"
+            )
+        
+        for idx, errors in sorted(row_errors.items()):
+            result["errors"].append({
+                "row": int(idx),
+                "test_case_id": df.at[idx, "TEST_CASE_ID"],
+                "errors": errors
+            })
+        
+        valid = df.drop(index=list(row_errors))
+        if valid.empty:
+            return result
+        
+        # Columns stored in test_case_metadata; tags and content live in their own tables
+        columns = [
+            field_name for field_name, field_def in fields.items()
+            if field_def["type"] not in ("array", "binary")
+        ]
+        for field_name in columns:
+            if field_name not in valid.columns:
+                valid[field_name] = None
+        
+        if overwrite:
+            # Staged as a text[] literal so updates can keep fields the record did not supply
+            supplied_columns = [c for c in supplied.columns if c in columns]
+            present = supplied.loc[valid.index, supplied_columns].to_numpy()
+            valid["SUPPLIED_FIELDS"] = [
+                "{" + ",".join(c for c, flag in zip(supplied_columns, row) if flag) + "}"
+                for row in present
+            ]
+        
+        conn = None
+        try:
+            conn = self._get_db_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+            CREATE TEMP TABLE test_case_metadata_staging
+            (LIKE test_case_metadata INCLUDING DEFAULTS, SUPPLIED_FIELDS TEXT[])
+            ON COMMIT DROP
+            """)
+            
+            for start in range(0, len(valid), chunk_size):
+                chunk = valid.iloc[start:start + chunk_size]
+                
+                cursor.execute("SAVEPOINT bulk_load_chunk")
+                try:
+                    written = self._copy_and_merge_metadata(cursor, chunk, columns, overwrite)
+                    cursor.execute("RELEASE SAVEPOINT bulk_load_chunk")
+                except psycopg2.Error:
+                    cursor.execute("ROLLBACK TO SAVEPOINT bulk_load_chunk")
+                    
+                    # Retry the rejected chunk row by row to isolate the bad rows
+                    written = []
+                    for idx in chunk.index:
+                        cursor.execute("SAVEPOINT bulk_load_row")
+                        try:
+                            written.extend(self._copy_and_merge_metadata(cursor, chunk.loc[[idx]], columns, overwrite))
+                            cursor.execute("RELEASE SAVEPOINT bulk_load_row")
+                        except psycopg2.Error as row_error:
+                            cursor.execute("ROLLBACK TO SAVEPOINT bulk_load_row")
+                            result["errors"].append({
+                                "row": int(idx),
+                                "test_case_id": chunk.at[idx, "TEST_CASE_ID"],
+                                "errors": [str(row_error).strip()]
+                            })
+                
+                result["test_case_ids"].extend(written)
+            
+            # Tags for the written test cases, one statement for the batch
+            if "TAGS" in valid.columns and result["test_case_ids"]:
+                written_ids = set(result["test_case_ids"])
+                pair_ids, pair_tags = [], []
+                for test_case_id, tags in zip(valid["TEST_CASE_ID"], valid["TAGS"]):
+                    if test_case_id not in written_ids or not isinstance(tags, (list, tuple, set, str)):
+                        continue
+                    for tag in self._normalize_tags(tags):
+                        pair_ids.append(test_case_id)
+                        pair_tags.append(tag)
+                
+                if pair_ids:
+                    cursor.execute(self._UPSERT_TAGS_CTE + """
+                    INSERT INTO test_case_tags (test_case_id, tag_id)
+                    SELECT pairs.test_case_id, upserted_tags.id
+                    FROM unnest(%s::text[], %s::text[]) AS pairs (test_case_id, tag_name)
+                    JOIN upserted_tags ON upserted_tags.name = pairs.tag_name
+                    ON CONFLICT (test_case_id, tag_id) DO NOTHING
+                    """, (pair_tags, pair_ids, pair_tags))
+            
+            conn.commit()
+            self._invalidate_tag_index()
+            self._invalidate_metadata_cache(result["test_case_ids"])
+            
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            self.logger.error(f"Bulk metadata load failed: {str(e)}")
+            raise DatabaseError(f"Bulk metadata load failed: {str(e)}")
+        finally:
+            if conn:
+                self._return_db_connection(conn)
+        
+        result["loaded"] = len(result["test_case_ids"])
+        result["skipped"] = len(valid) - result["loaded"] - sum(
+            1 for error in result["errors"] if error["row"] in valid.index
+        )
+        
+        self.logger.info(
+            f"Bulk loaded {result['loaded']} test cases "
+            f"({result['skipped']} skipped, {len(result['errors'])} rejected)"
+        )
+        return result
+
+    def _copy_and_merge_metadata(self, cursor, rows: pd.DataFrame, columns: List[str],
+                                 overwrite: bool) -> List[str]:
+        """
+        COPY rows into the staging table and merge them into test_case_metadata.
+        
+        Args:
+            cursor: Cursor of the bulk load transaction.
+            rows (pd.DataFrame): Validated rows.
+            columns (List[str]): Columns to load.
+            overwrite (bool): Update existing test cases instead of skipping them. The rows
+                then carry SUPPLIED_FIELDS and only those fields (and MODIFIED_DATE) are updated.
+            
+        Returns:
+            List[str]: IDs of the test cases inserted or updated.
+        """
+        cursor.execute("TRUNCATE test_case_metadata_staging")
+        
+        staged = columns + ["SUPPLIED_FIELDS"] if overwrite else columns
+        buffer = StringIO()
+        rows[staged].to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY test_case_metadata_staging ({', '.join(staged)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+        
+        written = []
+        if overwrite:
+            # Keep the creation audit fields, and any field the record left out or defaulted
+            updated = [c for c in columns if c not in ("TEST_CASE_ID", "CREATED_DATE", "CREATED_BY", "MODIFIED_DATE")]
+            assignments = [
+                f"{c} = CASE WHEN '{c}' = ANY(s.SUPPLIED_FIELDS) THEN s.{c} ELSE t.{c} END"
+                for c in updated
+            ]
+            assignments.append("MODIFIED_DATE = s.MODIFIED_DATE")
+            cursor.execute(f"""
+            UPDATE test_case_metadata t
+            SET {', '.join(assignments)}
+            FROM test_case_metadata_staging s
+            WHERE t.TEST_CASE_ID = s.TEST_CASE_ID
+            RETURNING t.TEST_CASE_ID
+            """)
+            written.extend(row[0] for row in cursor.fetchall())
+        
+        cursor.execute(f"""
+        INSERT INTO test_case_metadata ({', '.join(columns)})
+        SELECT {', '.join(columns)} FROM test_case_metadata_staging
+        ON CONFLICT (TEST_CASE_ID) DO NOTHING
+        RETURNING TEST_CASE_ID
+        """)
+        written.extend(row[0] for row in cursor.fetchall())
+        
+        return written
+
+    def _validate_metadata_frame(self, df: pd.DataFrame) -> Dict[int, List[str]]:
+        """
+        Validate a DataFrame of metadata records against the schema, column by column.
+        
+        Date columns are converted to timestamps in place.
+        
+        Args:
+            df (pd.DataFrame): The metadata records.
+            
+        Returns:
+            Dict[int, List[str]]: Error messages keyed by row index, for invalid rows only.
+        """
+        return self.compiled_schema.validate_frame(df)
+
     def migrate_from_sqlite(self, sqlite_db_path: str) -> Dict[str, int]:
         """
         Migrate data from SQLite database to PostgreSQL.
@@ -2428,7 +5359,7 @@ class MetadataManager:
                 "tag_associations_migrated": 0
             }
             
-            # Migrate test case metadata
+            # Migrate test case metadata in bulk
             sqlite_cursor = sqlite_conn.cursor()
             sqlite_cursor.execute("SELECT * FROM test_case_metadata")
             test_cases = [dict(row) for row in sqlite_cursor.fetchall()]
@@ -2437,92 +5368,78 @@ class MetadataManager:
                 # Remove SQLite rowid
                 if "id" in tc:
                     del tc["id"]
-                
-                # Create in PostgreSQL
-                try:
-                    self.create_test_case_metadata(tc, "Migration")
-                    stats["test_cases_migrated"] += 1
-                except Exception as tc_error:
-                    self.logger.error(f"Failed to migrate test case {tc.get('TEST_CASE_ID')}: {str(tc_error)}")
-                    # Continue with next test case
             
-            # Migrate tags
+            load_result = self.bulk_load_test_case_metadata(test_cases, created_by="Migration")
+            stats["test_cases_migrated"] = load_result["loaded"]
+            
+            for error in load_result["errors"]:
+                self.logger.error(f"Failed to migrate test case {error['test_case_id']}: {'; '.join(error['errors'])}")
+            
+            # Migrate tags with one upsert, mapping SQLite IDs to PostgreSQL IDs by name
             sqlite_cursor.execute("SELECT * FROM tags")
             tags = [dict(row) for row in sqlite_cursor.fetchall()]
             
-            tag_id_map = {}  # Map SQLite IDs to PostgreSQL IDs
+            tag_id_map = {}
             
-            for tag in tags:
-                tag_name = tag["name"]
-                
-                # Insert tag if it doesn't exist
-                tag_query = """
-                INSERT INTO tags (name)
-                VALUES (%s)
-                ON CONFLICT (name) DO NOTHING
-                RETURNING id
-                """
-                
-                tag_result = self._execute_query(tag_query, (tag_name,), fetch_one=True)
+            if tags:
+                tag_query = self._UPSERT_TAGS_CTE + "SELECT id, name FROM upserted_tags"
+                tag_result = self._execute_query(tag_query, ([tag["name"] for tag in tags],), fetch_all=True)
+                new_ids = {name: new_id for new_id, name in tag_result}
                 
-                if tag_result:
-                    new_id = tag_result[0]
-                else:
-                    # Get the ID if already exists
-                    get_id_query = "SELECT id FROM tags WHERE name = %s"
-                    new_id = self._execute_query(get_id_query, (tag_name,), fetch_one=True)[0]
-                
-                tag_id_map[tag["id"]] = new_id
-                stats["tags_migrated"] += 1
+                tag_id_map = {tag["id"]: new_ids[tag["name"]] for tag in tags if tag["name"] in new_ids}
+                stats["tags_migrated"] = len(tag_id_map)
             
             # Migrate tag associations
             sqlite_cursor.execute("SELECT * FROM test_case_tags")
-            tag_assocs = [dict(row) for row in sqlite_cursor.fetchall()]
+            tag_assocs = [
+                (assoc["test_case_id"], tag_id_map[assoc["tag_id"]])
+                for assoc in (dict(row) for row in sqlite_cursor.fetchall())
+                if assoc["tag_id"] in tag_id_map
+            ]
             
-            for assoc in tag_assocs:
-                test_case_id = assoc["test_case_id"]
-                old_tag_id = assoc["tag_id"]
+            if tag_assocs:
+                assoc_query = """
+                INSERT INTO test_case_tags (test_case_id, tag_id)
+                SELECT * FROM unnest(%s::text[], %s::int[])
+                ON CONFLICT (test_case_id, tag_id) DO NOTHING
+                """
                 
-                if old_tag_id in tag_id_map:
-                    new_tag_id = tag_id_map[old_tag_id]
-                    
-                    # Insert association
-                    assoc_query = """
-                    INSERT INTO test_case_tags (test_case_id, tag_id)
-                    VALUES (%s, %s)
-                    ON CONFLICT (test_case_id, tag_id) DO NOTHING
-                    """
-                    
-                    self._execute_query(assoc_query, (test_case_id, new_tag_id))
-                    stats["tag_associations_migrated"] += 1
+                self._execute_query(assoc_query, (
+                    [test_case_id for test_case_id, _ in tag_assocs],
+                    [tag_id for _, tag_id in tag_assocs]
+                ))
+                stats["tag_associations_migrated"] = len(tag_assocs)
+                self._invalidate_tag_index()
+                self._invalidate_metadata_cache([test_case_id for test_case_id, _ in tag_assocs])
             
             # Migrate history
             sqlite_cursor.execute("SELECT * FROM metadata_history")
             history = [dict(row) for row in sqlite_cursor.fetchall()]
             
-            for record in history:
-                # Remove SQLite rowid
-                if "id" in record:
-                    del record["id"]
-                
-                # Insert history record
+            if history:
                 history_query = """
                 INSERT INTO metadata_history
                 (test_case_id, field_name, old_value, new_value, changed_by, changed_at)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                SELECT * FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[], %s::text[], %s::timestamptz[])
                 """
                 
+                def as_text(value):
+                    return None if value is None else str(value)
+                
                 history_params = (
-                    record["test_case_id"],
-                    record["field_name"],
-                    record["old_value"],
-                    record["new_value"],
-                    record["changed_by"] or "Migration",
-                    datetime.fromisoformat(record["changed_at"]) if "changed_at" in record else datetime.now()
+                    [as_text(record["test_case_id"]) for record in history],
+                    [as_text(record["field_name"]) for record in history],
+                    [as_text(record["old_value"]) for record in history],
+                    [as_text(record["new_value"]) for record in history],
+                    [as_text(record["changed_by"]) or "Migration" for record in history],
+                    [
+                        datetime.fromisoformat(record["changed_at"]) if record.get("changed_at") else datetime.now()
+                        for record in history
+                    ]
                 )
                 
                 self._execute_query(history_query, history_params)
-                stats["history_records_migrated"] += 1
+                stats["history_records_migrated"] = len(history)
             
             sqlite_conn.close()
             self.logger.info(f"Migration completed: {stats}")
@@ -2532,10 +5449,117 @@ class MetadataManager:
             self.logger.error(f"Migration failed: {str(e)}")
             raise DatabaseError(f"Migration failed: {str(e)}")
 
+    BACKUP_MANIFEST = "backup_manifest.json"
+
+    def _read_backup_manifest(self, backup_dir: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the manifest of a backup directory.
+        
+        Args:
+            backup_dir (str): Path to the backup directory.
+            
+        Returns:
+            Optional[Dict[str, Any]]: The manifest, or None for a directory without one.
+        """
+        manifest_path = os.path.join(backup_dir, self.BACKUP_MANIFEST)
+        if not os.path.exists(manifest_path):
+            return None
+        
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+
+    def _write_backup_manifest(self, backup_dir: str, manifest: Dict[str, Any]):
+        """
+        Write the manifest of a backup directory atomically; it doubles as the checkpoint.
+        
+        Args:
+            backup_dir (str): Path to the backup directory.
+            manifest (Dict[str, Any]): The manifest.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=backup_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, indent=2, default=self._json_serialize)
+        os.replace(temp_path, os.path.join(backup_dir, self.BACKUP_MANIFEST))
+
+    def _backup_chain(self, backup_dir: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Resolve a backup and the bases it builds on.
+        
+        Args:
+            backup_dir (str): Path to a full or incremental backup.
+            
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: (directory, manifest) pairs, full backup first.
+            
+        Raises:
+            DatabaseError: If a backup of the chain is missing, incomplete or circular.
+        """
+        chain = []
+        seen = set()
+        directory = backup_dir
+        
+        while directory:
+            real_path = os.path.realpath(directory)
+            if real_path in seen:
+                raise DatabaseError(f"Circular backup chain at {directory}")
+            seen.add(real_path)
+            
+            manifest = self._read_backup_manifest(directory)
+            if manifest is None:
+                raise DatabaseError(f"Not an incremental-capable backup (no {self.BACKUP_MANIFEST}): {directory}")
+            if manifest["status"] != "complete":
+                raise DatabaseError(f"Backup {directory} is incomplete; run create_backup on it again to resume")
+            
+            chain.append((directory, manifest))
+            directory = os.path.normpath(os.path.join(directory, manifest["base"])) if manifest.get("base") else None
+        
+        return list(reversed(chain))
+
+    def _backup_file_blob(self, files_dir: str, test_case_id: str, content_hash: str) -> str:
+        """
+        Write one test case file into a backup, named by its content hash.
+        
+        Blobs are written to a temporary file and renamed, so a blob that exists
+        is complete and an interrupted backup can skip it when resumed.
+        
+        Args:
+            files_dir (str): The files directory of the backup.
+            test_case_id (str): The test case whose file to write.
+            content_hash (str): Expected hash of the content.
+            
+        Returns:
+            str: Hash of the content written (differs if the file changed meanwhile).
+        """
+        if os.path.exists(os.path.join(files_dir, content_hash)):
+            return content_hash
+        
+        fd, temp_path = tempfile.mkstemp(dir=files_dir, suffix='.tmp')
+        try:
+            hasher = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in self.iter_test_case_file_content(test_case_id):
+                    hasher.update(chunk)
+                    f.write(chunk)
+            
+            actual_hash = hasher.hexdigest()
+            os.replace(temp_path, os.path.join(files_dir, actual_hash))
+            return actual_hash
+            
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
     def restore_from_backup(self, backup_dir: str) -> Dict[str, int]:
         """
         Restore database from a backup directory containing JSON and file data.
         
+        A backup made by create_backup is restored together with its chain:
+        the full backup first, then each incremental backup in order. Older
+        backups without a manifest are restored from metadata.json and files/.
+        Metadata is restored from the columnar snapshot in metadata_snapshot/
+        if the backup has one, otherwise from metadata.json.
+        
         Args:
             backup_dir (str): Path to the backup directory.
             
@@ -2546,21 +5570,19 @@ class MetadataManager:
             DatabaseError: If restoration fails.
         """
         try:
+            # Check if directory exists
+            if not os.path.isdir(backup_dir):
+                raise DatabaseError(f"Backup directory not found: {backup_dir}")
+            
+            if self._read_backup_manifest(backup_dir) is not None:
+                return self._restore_backup_chain(backup_dir)
+            
             stats = {
                 "metadata_restored": 0,
                 "files_restored": 0
             }
             
-            # Check if directory exists
-            if not os.path.isdir(backup_dir):
-                raise DatabaseError(f"Backup directory not found: {backup_dir}")
-            
-            # Check for metadata JSON file
-            metadata_file = os.path.join(backup_dir, "metadata.json")
-            if os.path.exists(metadata_file):
-                # Import metadata
-                metadata_count = self.import_metadata_from_json(metadata_file, overwrite=True)
-                stats["metadata_restored"] = metadata_count
+            stats["metadata_restored"] = self._restore_backup_metadata(backup_dir)
             
             # Check for files directory
             files_dir = os.path.join(backup_dir, "files")
@@ -2606,13 +5628,129 @@ class MetadataManager:
             self.logger.error(f"Restoration failed: {str(e)}")
             raise DatabaseError(f"Database restoration failed: {str(e)}")
 
-    def create_backup(self, backup_dir: str, include_files: bool = True) -> Dict[str, int]:
+    def _restore_backup_metadata(self, backup_dir: str) -> int:
+        """
+        Restore the metadata of one backup directory.
+        
+        Args:
+            backup_dir (str): Path to the backup directory.
+            
+        Returns:
+            int: Number of test cases restored.
+        """
+        # Check for a columnar snapshot, then for the metadata JSON file
+        snapshot_dir = os.path.join(backup_dir, "metadata_snapshot")
+        metadata_file = os.path.join(backup_dir, "metadata.json")
+        
+        if os.path.exists(os.path.join(snapshot_dir, self.SNAPSHOT_MANIFEST)):
+            return self.import_metadata_snapshot(snapshot_dir, overwrite=True)
+        if os.path.exists(metadata_file):
+            return self.import_metadata_from_json(metadata_file, overwrite=True)
+        return 0
+
+    def _restore_backup_chain(self, backup_dir: str) -> Dict[str, int]:
+        """
+        Restore a backup made by create_backup, applying its base chain in order.
+        
+        Args:
+            backup_dir (str): Path to the newest backup to restore to.
+            
+        Returns:
+            Dict[str, int]: Restoration statistics.
+        """
+        stats = {
+            "backups_applied": 0,
+            "metadata_restored": 0,
+            "files_restored": 0,
+            "test_cases_deleted": 0
+        }
+        
+        # Blobs are written once per chain, into the backup that first saw them
+        blob_paths = {}
+        
+        for directory, manifest in self._backup_chain(backup_dir):
+            for content_hash in manifest.get("blobs", []):
+                blob_paths[content_hash] = os.path.join(directory, "files", content_hash)
+            
+            stats["metadata_restored"] += self._restore_backup_metadata(directory)
+            
+            for test_case_id in manifest.get("deleted_test_cases", []):
+                self._execute_transaction(self._build_delete_test_case_queries(test_case_id) + [
+                    ("DELETE FROM test_cases WHERE TEST_CASE_NUMBER = %s", (test_case_id,))
+                ])
+                stats["test_cases_deleted"] += 1
+            self._invalidate_metadata_cache(manifest.get("deleted_test_cases", []))
+            
+            for test_case_id in manifest.get("deleted_files", []):
+                self.delete_test_case_file_content(test_case_id)
+            
+            for test_case_id, entry in manifest.get("files", {}).items():
+                blob_path = blob_paths.get(entry["content_hash"])
+                if not blob_path or not os.path.exists(blob_path):
+                    self.logger.error(f"Backup blob {entry['content_hash']} for test case {test_case_id} is missing")
+                    continue
+                
+                with open(blob_path, 'rb') as f:
+                    self._store_test_case_file(test_case_id, entry["file_name"], f, entry["file_type"])
+                stats["files_restored"] += 1
+            
+            stats["backups_applied"] += 1
+            self.logger.info(f"Applied {manifest['type']} backup {directory}")
+        
+        self.logger.info(f"Restoration completed: {stats}")
+        return stats
+
+    def _backup_watermark(self) -> datetime:
+        """
+        Get the time from which the next incremental backup must collect changes.
+        
+        Transactions in progress may still commit rows whose MODIFIED_DATE is
+        older than now, so the watermark goes back to the oldest of them and
+        then by a safety overlap. Backends whose activity this role cannot
+        see are covered by the overlap only.
+        
+        Returns:
+            datetime: The watermark.
+        """
+        overlap = float(os.getenv('BACKUP_WATERMARK_OVERLAP', '300'))
+        return self._execute_query("""
+        SELECT LEAST(statement_timestamp(), MIN(xact_start)) - make_interval(secs => %s)
+        FROM pg_stat_activity
+        WHERE datname = current_database() AND pid <> pg_backend_pid()
+        """, (overlap,), fetch_one=True)[0]
+
+    def create_backup(self, backup_dir: str, include_files: bool = True,
+                      metadata_format: str = None, base_dir: str = None,
+                      max_workers: int = None) -> Dict[str, int]:
         """
         Create a backup of the database.
         
+        Without base_dir this is a full backup. With base_dir it is an
+        incremental backup on top of that (full or incremental) backup: only
+        test cases whose MODIFIED_DATE is at or after the base's watermark,
+        and files whose content hash changed, are written; deletions are
+        recorded. Files are stored once per chain, named by content hash, and
+        written in parallel.
+        
+        The watermark is set back to the start of the oldest transaction still
+        running, less BACKUP_WATERMARK_OVERLAP seconds (default 300) for
+        MODIFIED_DATE values taken from application clocks, so rows committed
+        after the backup but dated before it are picked up by the next one.
+        
+        Progress is checkpointed in backup_manifest.json. Running create_backup
+        again on an interrupted backup resumes it with the same watermark,
+        skipping the metadata export if it finished and the files already written.
+        
         Args:
             backup_dir (str): Directory to store the backup.
             include_files (bool, optional): Whether to include test case files.
+            metadata_format (str, optional): "json" for metadata.json, or "parquet" or
+                "arrow" for a columnar snapshot in metadata_snapshot/ (see
+                export_metadata_snapshot). Defaults to the BACKUP_METADATA_FORMAT
+                environment variable, or "json".
+            base_dir (str, optional): Backup to build an incremental backup on.
+            max_workers (int, optional): Parallel file writers. Defaults to the
+                BACKUP_WORKERS environment variable, or 4.
             
         Returns:
             Dict[str, int]: Backup statistics.
@@ -2621,53 +5759,172 @@ class MetadataManager:
             DatabaseError: If backup fails.
         """
         try:
-            stats = {
-                "metadata_backed_up": 0,
-                "files_backed_up": 0
-            }
-            
             # Create backup directory if it doesn't exist
             os.makedirs(backup_dir, exist_ok=True)
             
-            # Backup metadata
-            metadata_file = os.path.join(backup_dir, "metadata.json")
-            metadata_count = self.export_metadata_to_json(metadata_file)
-            stats["metadata_backed_up"] = metadata_count
+            manifest = self._read_backup_manifest(backup_dir)
+            if manifest is not None and manifest["status"] == "in_progress":
+                self.logger.info(f"Resuming backup {backup_dir} from its checkpoint")
+            else:
+                base_chain = self._backup_chain(base_dir) if base_dir else []
+                watermark = self._backup_watermark()
+                
+                manifest = {
+                    "type": "incremental" if base_dir else "full",
+                    "base": os.path.relpath(base_dir, backup_dir) if base_dir else None,
+                    "since": base_chain[-1][1]["watermark"] if base_chain else None,
+                    "watermark": watermark.isoformat(),
+                    "metadata_format": metadata_format or os.getenv('BACKUP_METADATA_FORMAT', 'json'),
+                    "status": "in_progress",
+                    "metadata_complete": False,
+                    "created_at": datetime.now().isoformat()
+                }
+                
+                # Drop the metadata of an earlier backup in this directory
+                if os.path.exists(os.path.join(backup_dir, "metadata.json")):
+                    os.remove(os.path.join(backup_dir, "metadata.json"))
+                if os.path.isdir(os.path.join(backup_dir, "metadata_snapshot")):
+                    shutil.rmtree(os.path.join(backup_dir, "metadata_snapshot"))
+                
+                self._write_backup_manifest(backup_dir, manifest)
+            
+            base_chain = self._backup_chain(os.path.join(backup_dir, manifest["base"])) if manifest["base"] else []
+            since = manifest["since"]
+            
+            # Backup metadata of the test cases changed since the base's watermark
+            if not manifest["metadata_complete"]:
+                current_ids = [row[0] for row in self._execute_query(
+                    "SELECT DISTINCT TEST_CASE_NUMBER FROM test_cases ORDER BY TEST_CASE_NUMBER", fetch_all=True
+                ) or []]
+                
+                if since is None:
+                    changed_ids = current_ids
+                else:
+                    changed_ids = [row[0] for row in self._execute_query("""
+                    SELECT DISTINCT TEST_CASE_NUMBER FROM test_cases
+                    WHERE MODIFIED_DATE >= %s
+                    ORDER BY TEST_CASE_NUMBER
+                    """, (since,), fetch_all=True) or []]
+                
+                previous_ids = set(base_chain[-1][1]["test_case_ids"]) if base_chain else set()
+                
+                if changed_ids:
+                    if manifest["metadata_format"] == "json":
+                        self.export_metadata_to_json(os.path.join(backup_dir, "metadata.json"), changed_ids)
+                    else:
+                        self.export_metadata_snapshot(
+                            os.path.join(backup_dir, "metadata_snapshot"),
+                            format=manifest["metadata_format"],
+                            test_case_ids=changed_ids if since else None
+                        )
+                
+                manifest.update({
+                    "metadata_complete": True,
+                    "test_case_ids": current_ids,
+                    "changed_test_cases": changed_ids,
+                    "deleted_test_cases": sorted(previous_ids - set(current_ids))
+                })
+                self._write_backup_manifest(backup_dir, manifest)
+            
+            stats = {
+                "metadata_backed_up": len(manifest["changed_test_cases"]),
+                "test_cases_deleted": len(manifest["deleted_test_cases"]),
+                "files_backed_up": 0,
+                "files_unchanged": 0,
+                "files_failed": 0
+            }
             
             # Backup files if requested
             if include_files:
                 files_dir = os.path.join(backup_dir, "files")
                 os.makedirs(files_dir, exist_ok=True)
                 
-                # Get all test case IDs
-                query = "SELECT TEST_CASE_ID FROM test_case_metadata"
-                result = self._execute_query(query, fetch_all=True)
-                test_case_ids = [row[0] for row in result] if result else []
+                # Latest file hash of each test case, and the blobs already in the chain
+                chain_files = {}
+                chain_blobs = set()
+                for _, base_manifest in base_chain:
+                    chain_files.update({
+                        test_case_id: entry["content_hash"]
+                        for test_case_id, entry in base_manifest.get("files", {}).items()
+                    })
+                    for test_case_id in base_manifest.get("deleted_files", []) + base_manifest.get("deleted_test_cases", []):
+                        chain_files.pop(test_case_id, None)
+                    chain_blobs.update(base_manifest.get("blobs", []))
                 
-                # Backup each file
-                for test_case_id in test_case_ids:
-                    try:
-                        file_name, file_type, file_content = self.retrieve_test_case_file_content(test_case_id)
+                # Legacy rows without a blob are hashed by PostgreSQL
+                result = self._execute_query("""
+                SELECT test_case_id, file_name, file_type,
+                       COALESCE(content_hash, encode(sha256(content), 'hex')) AS content_hash,
+                       COALESCE(file_size, octet_length(content)) AS size
+                FROM test_case_files
+                WHERE content_hash IS NOT NULL OR content IS NOT NULL
+                """, fetch_all=True, as_dict=True) or []
+                
+                files = {}
+                for row in result:
+                    if chain_files.get(row["test_case_id"]) == row["content_hash"]:
+                        stats["files_unchanged"] += 1
+                        continue
+                    files[row["test_case_id"]] = {
+                        "file_name": row["file_name"] or f"{row['test_case_id']}.{row['file_type'] or 'xlsx'}",
+                        "file_type": row["file_type"],
+                        "content_hash": row["content_hash"],
+                        "size": row["size"]
+                    }
+                
+                # One writer per distinct blob not already in the chain
+                to_write = {}
+                for test_case_id, entry in files.items():
+                    if entry["content_hash"] not in chain_blobs:
+                        to_write.setdefault(entry["content_hash"], []).append(test_case_id)
+                
+                workers = max_workers or int(os.getenv('BACKUP_WORKERS', '4'))
+                blobs = []
+                with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                    futures = {
+                        executor.submit(self._backup_file_blob, files_dir, test_case_ids[0], content_hash): test_case_ids
+                        for content_hash, test_case_ids in to_write.items()
+                    }
+                    
+                    for future in as_completed(futures):
+                        test_case_ids = futures[future]
+                        try:
+                            written_hash = future.result()
+                        except Exception as file_error:
+                            self.logger.error(f"Failed to backup file for {test_case_ids[0]}: {str(file_error)}")
+                            written_hash = None
                         
-                        if file_content:
-                            # Create file name if not present
-                            if not file_name:
-                                file_name = f"{test_case_id}.{file_type or 'xlsx'}"
-                            
-                            # Save file
-                            file_path = os.path.join(files_dir, file_name)
-                            with open(file_path, 'wb') as f:
-                                f.write(file_content)
-                            
-                            stats["files_backed_up"] += 1
+                        # The file may have changed between listing and writing; test
+                        # cases left without a blob are picked up by the next backup
+                        if written_hash != files[test_case_ids[0]]["content_hash"]:
+                            if written_hash:
+                                files[test_case_ids[0]]["content_hash"] = written_hash
+                                test_case_ids, skipped_ids = test_case_ids[:1], test_case_ids[1:]
+                            else:
+                                test_case_ids, skipped_ids = [], test_case_ids
                             
-                    except Exception as file_error:
-                        self.logger.error(f"Failed to backup file for {test_case_id}: {str(file_error)}")
-                        # Continue with next test case
+                            for test_case_id in skipped_ids:
+                                files.pop(test_case_id)
+                            stats["files_failed"] += len(skipped_ids)
+                        
+                        if written_hash:
+                            blobs.append(written_hash)
+                            stats["files_backed_up"] += len(test_case_ids)
+                
+                current_files = {row["test_case_id"] for row in result}
+                manifest.update({
+                    "files": files,
+                    "blobs": sorted(blobs),
+                    "deleted_files": sorted(set(chain_files) - current_files)
+                })
+            
+            manifest["status"] = "complete"
+            manifest["completed_at"] = datetime.now().isoformat()
+            self._write_backup_manifest(backup_dir, manifest)
             
             self.logger.info(f"Backup completed: {stats}")
             return stats
             
         except Exception as e:
             self.logger.error(f"Backup failed: {str(e)}")
-            raise DatabaseError(f"Database backup failed: {str(e)}")    
\ No newline at end of file
+            raise DatabaseError(f"Database backup failed: {str(e)}")
@@ -9,15 +9,20 @@ and maintains a history of test case modifications over time.
 """
 
 import os
+import numbers
+import numpy as np
 import pandas as pd
 import logging
-import json
 import difflib
 import hashlib
 from typing import Dict, List, Any, Tuple, Optional, Union
-from datetime import datetime
+from datetime import datetime, date, timezone
+from io import BytesIO
 import shutil
 import re
+import copy
+import threading
+from collections import OrderedDict
 
 # Import from src.common
 from src.common.utils.file_utils import read_file, write_file
@@ -28,35 +33,401 @@ from src.common.exceptions.custom_exceptions import (
     InvalidVersionError
 )
 
+from src.persistence.storage.version_store import VersionStore, create_version_store
+from src.persistence.storage.version_delta import (
+    KEYFRAME, DELTA, encode_frame, decode_frame, diff_snapshots, apply_delta, pack, unpack
+)
+
 # Import from phase1
 from src.phase1.sharepoint_connector.document_uploader import upload_document
 from src.phase1.notification_service.notification_manager import send_notification
+from src.phase1.notification_service.notification_outbox import NotificationOutbox, create_notification_outbox
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
+# Bumped whenever the canonical form changes, so old and new hashes never collide
+_HASH_FORMAT = b"test-case-hash/1"
+
+# Encoded form of an empty cell; every other cell starts with its length
+_NULL_CELL = "-"
+
+
+def _native_value(value) -> Any:
+    """
+    Convert a DataFrame cell to a plain Python value that JSON encoders accept.
+    
+    Numpy scalars become int, float or bool, empty cells become None and
+    timestamps become datetime.
+    """
+    if isinstance(value, (list, dict, str)):
+        return value
+    if pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _canonical_value(value) -> Optional[str]:
+    """
+    Type-tagged text of a single value, or None for an empty cell.
+    
+    Numbers are tagged "n:" and integral floats are written as integers, so a
+    column that round-trips through Excel as float or int hashes the same.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return "s:" + value
+    if isinstance(value, (bool, np.bool_)):
+        return "b:true" if value else "b:false"
+    if isinstance(value, numbers.Integral):
+        return "n:%d" % int(value)
+    if isinstance(value, numbers.Real):
+        value = float(value)
+        if np.isnan(value):
+            return None
+        if value.is_integer() and abs(value) < 2 ** 53:
+            return "n:%d" % value
+        return "n:" + repr(value)
+    if isinstance(value, datetime):
+        if pd.isna(value):
+            return None
+        # Timestamps are written in UTC with microseconds, as _canonical_column does
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return "d:" + np.datetime_as_string(np.datetime64(value, "us"), unit="us")
+    if isinstance(value, date):
+        return "d:" + value.isoformat()
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    return "s:" + str(value)
+
+
+def _canonical_column(series: pd.Series) -> np.ndarray:
+    """
+    Encode a column as length-prefixed, type-tagged cells ("<length>:<tag>:<text>").
+    
+    Plain numeric, boolean, datetime and string columns are converted with array
+    operations; anything else falls back to _canonical_value per cell.
+    """
+    null = series.isna().to_numpy()
+    dtype = series.dtype
+    prefix = ""
+    
+    if pd.api.types.is_bool_dtype(dtype) and not null.any():
+        tagged = np.where(series.to_numpy(bool), "b:true", "b:false")
+    elif pd.api.types.is_integer_dtype(dtype) and not null.any():
+        prefix, tagged = "n:", series.to_numpy("int64").astype(str)
+    elif pd.api.types.is_float_dtype(dtype):
+        values = series.to_numpy(float, na_value=np.nan)
+        integral = np.isfinite(values) & (np.floor(values) == values) & (np.abs(values) < 2 ** 53)
+        fractional = ~integral & ~null
+        prefix, tagged = "n:", np.full(len(values), "", dtype=object)
+        tagged[integral] = values[integral].astype(np.int64).astype(str)
+        # NumPy writes floats in the same shortest round-trip form as repr()
+        tagged[fractional] = values[fractional].astype(str)
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        if getattr(dtype, "tz", None) is not None:
+            series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        prefix = "d:"
+        tagged = np.datetime_as_string(series.to_numpy().astype("datetime64[us]"), unit="us")
+    elif isinstance(dtype, pd.StringDtype) or (
+            dtype == object and pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty")):
+        prefix, tagged = "s:", series.to_numpy(object)
+    else:
+        tagged = series.map(_canonical_value).to_numpy(object)
+        null = pd.isna(tagged)
+    
+    return np.array([
+        _NULL_CELL if is_null else f"{len(prefix) + len(cell)}:{prefix}{cell}"
+        for cell, is_null in zip(tagged.tolist(), null.tolist())
+    ], dtype=object)
+
+
+def _canonical_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Encode every cell of a test case in its canonical form, keeping column names.
+    """
+    canonical = pd.DataFrame(
+        {position: _canonical_column(df.iloc[:, position]) for position in range(df.shape[1])},
+        index=pd.RangeIndex(len(df)),
+        dtype=object
+    )
+    canonical.columns = df.columns
+    return canonical
+
+
+def _hash_canonical(canonical: pd.DataFrame, step_column: str = "STEP NO") -> Tuple[str, List[bytes]]:
+    """
+    Hash a canonical frame (see hash_test_case_frame).
+    """
+    order = sorted(range(canonical.shape[1]), key=lambda position: str(canonical.columns[position]))
+    content = [position for position in order if canonical.columns[position] != step_column]
+    steps = [position for position in order if canonical.columns[position] == step_column]
+    
+    # Cells are self-delimiting, so a row's text is just its cells in column order
+    if content:
+        cells = [canonical.iloc[:, position].to_numpy() for position in content]
+        row_hashes = [hashlib.sha256("".join(row).encode('utf-8')).digest() for row in zip(*cells)]
+    else:
+        row_hashes = [hashlib.sha256(b"").digest()] * len(canonical)
+    
+    header = "".join(
+        f"{len(name)}:{name}" for name in (str(canonical.columns[position]) for position in order)
+    )
+    step_cells = "".join(
+        "".join(canonical.iloc[:, position]) for position in steps
+    )
+    
+    root = hashlib.sha256(_HASH_FORMAT)
+    root.update(hashlib.sha256(header.encode('utf-8')).digest())
+    root.update(hashlib.sha256(step_cells.encode('utf-8')).digest())
+    root.update(hashlib.sha256(b"".join(row_hashes)).digest())
+    return root.hexdigest(), row_hashes
+
+
+def hash_test_case_frame(df: pd.DataFrame, step_column: str = "STEP NO") -> Tuple[str, List[bytes]]:
+    """
+    Compute the content hash of a test case and the hash of each of its steps.
+    
+    Every cell is written in a canonical, type-tagged form that does not depend
+    on pandas display settings. Each row is hashed on all columns except the
+    step number, in sorted column order. The content hash combines the hashes
+    of the column names, of the step numbers and of the row hashes in order, so
+    identical content always gives the same hash and the row hashes can be
+    reused to align steps when diffing.
+    
+    Args:
+        df (pd.DataFrame): The test case.
+        step_column (str, optional): Column holding the step number.
+        
+    Returns:
+        Tuple[str, List[bytes]]: The SHA-256 content hash (hex) and one SHA-256
+            digest per row.
+    """
+    return _hash_canonical(_canonical_frame(df), step_column)
+
+
+def diff_test_case_frames(df1: pd.DataFrame, df2: pd.DataFrame,
+                          step_column: str = "STEP NO") -> Dict[str, Any]:
+    """
+    Diff two versions of a test case step by step.
+    
+    Rows are aligned by their hashes from hash_test_case_frame, which leave out
+    the step number so renumbering alone is not a change, using difflib's
+    longest matching blocks. Unmatched rows whose content reappears elsewhere
+    are reported as moved; the rest of a replaced block is paired up in order
+    and compared column-wise on canonical cells, and what is left over is added
+    or removed.
+    
+    Args:
+        df1 (pd.DataFrame): The earlier version.
+        df2 (pd.DataFrame): The later version.
+        step_column (str, optional): Column holding the step number.
+        
+    Returns:
+        Dict[str, Any]: added_steps, removed_steps, modified_steps, moved_steps and summary.
+    """
+    canonical1, canonical2 = _canonical_frame(df1), _canonical_frame(df2)
+    _, hashes1 = _hash_canonical(canonical1, step_column)
+    _, hashes2 = _hash_canonical(canonical2, step_column)
+    
+    columns = list(dict.fromkeys(list(df1.columns) + list(df2.columns)))
+    content_columns = [column for column in columns if column != step_column]
+    
+    def value(df, position, column):
+        # Fields missing from one version show as empty
+        return str(df.iloc[position][column]) if column in df.columns else ""
+    
+    def step_no(df, position):
+        if step_column not in df.columns:
+            return None
+        number = _native_value(df.iloc[position][step_column])
+        # Step numbers read back from Excel as floats when a column has gaps
+        return int(number) if isinstance(number, float) and number.is_integer() else number
+    
+    def details(df, position):
+        return {column: _native_value(cell) for column, cell in df.iloc[position].items()}
+    
+    matcher = difflib.SequenceMatcher(None, hashes1, hashes2, autojunk=False)
+    
+    unchanged = 0
+    removed, added, pairs = [], [], []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            unchanged += i2 - i1
+            continue
+        paired = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        pairs.extend(zip(range(i1, i1 + paired), range(j1, j1 + paired)))
+        removed.extend(range(i1 + paired, i2))
+        added.extend(range(j1 + paired, j2))
+    
+    # A row that left one place and arrived unchanged at another was moved
+    moved = []
+    added_by_hash = {}
+    for position in added:
+        added_by_hash.setdefault(hashes2[position], []).append(position)
+    
+    still_removed = []
+    for position in removed:
+        targets = added_by_hash.get(hashes1[position])
+        if targets:
+            moved.append((position, targets.pop(0)))
+        else:
+            still_removed.append(position)
+    moved_targets = {target for _, target in moved}
+    still_added = [position for position in added if position not in moved_targets]
+    
+    # Paired rows are compared field by field in one array comparison of their
+    # canonical cells; a column missing from one version never equals a cell
+    modified = []
+    if pairs:
+        left = canonical1.reindex(columns=content_columns, fill_value="")
+        right = canonical2.reindex(columns=content_columns, fill_value="")
+        changed = (
+            left.iloc[[i for i, _ in pairs]].to_numpy() != right.iloc[[j for _, j in pairs]].to_numpy()
+        )
+        
+        for (i, j), row_changed in zip(pairs, changed):
+            if not row_changed.any():
+                unchanged += 1
+                continue
+            modified.append((i, j, {
+                content_columns[k]: {
+                    "from": value(df1, i, content_columns[k]),
+                    "to": value(df2, j, content_columns[k])
+                }
+                for k in row_changed.nonzero()[0]
+            }))
+    
+    comparison = {
+        "added_steps": [
+            {"step_no": step_no(df2, j), "details": details(df2, j)} for j in still_added
+        ],
+        "removed_steps": [
+            {"step_no": step_no(df1, i), "details": details(df1, i)} for i in still_removed
+        ],
+        "modified_steps": [],
+        "moved_steps": [
+            {"step_no": step_no(df2, j), "previous_step_no": step_no(df1, i),
+             "from_position": i, "to_position": j}
+            for i, j in moved
+        ],
+        "summary": {
+            "added": len(still_added),
+            "removed": len(still_removed),
+            "modified": len(modified),
+            "moved": len(moved),
+            "unchanged": unchanged
+        }
+    }
+    
+    for i, j, differences in modified:
+        entry = {"step_no": step_no(df2, j), "differences": differences}
+        if step_no(df1, i) != entry["step_no"]:
+            entry["previous_step_no"] = step_no(df1, i)
+        comparison["modified_steps"].append(entry)
+    
+    return comparison
+
+
 class VersionController:
     """
     Class to manage test case versions, track changes, and maintain version history.
     """
     
-    def __init__(self, version_store_path: str = None):
+    def __init__(self, version_store_path: str = None, version_store: VersionStore = None,
+                 keyframe_interval: int = None, notification_outbox: NotificationOutbox = None):
         """
-        Initialize the VersionController with a version store path.
+        Initialize the VersionController with a version store.
         
         Args:
-            version_store_path (str, optional): Path to the version store directory.
-                If None, uses a default path in the current directory.
+            version_store_path (str, optional): Path to the version store directory
+                of the file store. If None, uses a default path in the current directory.
+            version_store (VersionStore, optional): Where versions are kept. If None,
+                the backend comes from the VERSION_STORE_BACKEND environment variable
+                ("file", the default, or "postgres").
+            keyframe_interval (int, optional): Versions are stored as deltas against the
+                previous version, with a full keyframe every keyframe_interval versions.
+                Defaults to the VERSION_KEYFRAME_INTERVAL environment variable, or 10.
+            notification_outbox (NotificationOutbox, optional): Queue for owner
+                notifications. If None, one is configured from the environment.
         """
         self.version_store_path = version_store_path or os.path.join(
             os.path.dirname(__file__), "../../../storage/test_case_versions"
         )
         self.logger = logging.getLogger(__name__)
         
-        # Create version store directory if it doesn't exist
-        os.makedirs(self.version_store_path, exist_ok=True)
+        self.version_store = version_store or create_version_store(root_dir=self.version_store_path)
+        
+        if keyframe_interval is None:
+            keyframe_interval = int(os.getenv('VERSION_KEYFRAME_INTERVAL', '10'))
+        self.keyframe_interval = max(1, keyframe_interval)
+        
+        # Recent compare_versions results, least recently used first out
+        self.diff_cache_size = max(0, int(os.getenv('VERSION_DIFF_CACHE_SIZE', '256')))
+        self._diff_cache = OrderedDict()
+        self._diff_cache_lock = threading.Lock()
+        
+        self._notification_outbox = notification_outbox
+        self._notification_outbox_lock = threading.Lock()
+        
+        # Opening the outbox resumes delivery of notifications queued before a restart
+        try:
+            self.notification_outbox
+        except Exception as e:
+            self.logger.warning(f"Notification outbox unavailable, retrying on first notification: {str(e)}")
+        
+        self.logger.info(f"VersionController initialized with {self.version_store.name} version store")
+    
+    @property
+    def notification_outbox(self) -> NotificationOutbox:
+        """
+        The outbox owner notifications are queued in, created on first use.
+        """
+        with self._notification_outbox_lock:
+            if self._notification_outbox is None:
+                self._notification_outbox = create_notification_outbox(send=send_notification)
+            return self._notification_outbox
+    
+    def queue_owner_notification(self, test_case_id: str, owner: str, version: str,
+                                 change_comment: str = None, changed_by: str = None,
+                                 timestamp: str = None) -> Optional[int]:
+        """
+        Queue a notification to the owner of a test case about a new version.
+        
+        The notification is sent in the background, combined with other updates
+        to the same owner, so the caller never waits on the notifier.
         
-        self.logger.info(f"VersionController initialized with store at: {self.version_store_path}")
+        Args:
+            test_case_id (str): The test case ID.
+            owner (str): The owner to notify.
+            version (str): The new version.
+            change_comment (str, optional): Comment describing the changes.
+            changed_by (str, optional): Name/ID of the person who made the changes.
+            timestamp (str, optional): When the version was created.
+            
+        Returns:
+            Optional[int]: ID of the queued notification, or None if it could not be queued.
+        """
+        try:
+            notification_id = self.notification_outbox.enqueue(
+                owner,
+                f"Test Case {test_case_id} Updated to Version {version}",
+                f"A new version ({version}) of Test Case {test_case_id} has been created.\n\n"
+                f"Comment: {change_comment or 'No comment provided'}\n"
+                f"Changed by: {changed_by or 'System'}\n"
+                f"Timestamp: {timestamp or datetime.now().isoformat()}"
+            )
+            self.logger.info(f"Notification to owner ({owner}) of test case {test_case_id} queued")
+            return notification_id
+        except Exception as e:
+            self.logger.warning(f"Failed to queue notification to owner: {str(e)}")
+            return None
     
     def _get_test_case_id_from_df(self, test_case_df: pd.DataFrame) -> str:
         """
@@ -95,120 +466,83 @@ class VersionController:
         Returns:
             str: Hash string representing the test case content.
         """
-        # Convert DataFrame to string and calculate SHA-256 hash
-        try:
-            # Sort columns to ensure consistent order
-            sorted_df = test_case_df.sort_index(axis=1)
-            
-            # Concat values to a single string and calculate hash
-            content_str = sorted_df.to_string(index=False)
-            return hashlib.sha256(content_str.encode('utf-8')).hexdigest()
-        except Exception as e:
-            self.logger.warning(f"Could not calculate hash accurately: {str(e)}")
-            
-            # Fallback - just hash column names and row count as a basic check
-            cols = ','.join(sorted(test_case_df.columns))
-            return hashlib.sha256(f"{cols}:{len(test_case_df)}".encode('utf-8')).hexdigest()
+        content_hash, _ = hash_test_case_frame(test_case_df)
+        return content_hash
     
-    def _get_version_history_path(self, test_case_id: str) -> str:
+    def _load_snapshot(self, test_case_id: str, version_entry: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Get the path to the version history file for a test case.
+        Rebuild the snapshot of a version by replaying deltas from the nearest keyframe.
         
         Args:
             test_case_id (str): The test case ID.
+            version_entry (Dict[str, Any]): The version entry.
             
         Returns:
-            str: Path to the version history JSON file.
-        """
-        return os.path.join(self.version_store_path, f"{test_case_id}_version_history.json")
-    
-    def _get_version_directory(self, test_case_id: str) -> str:
-        """
-        Get the directory path for storing versions of a test case.
-        
-        Args:
-            test_case_id (str): The test case ID.
+            Dict[str, Any]: The snapshot (see version_delta).
             
-        Returns:
-            str: Path to the version directory.
-        """
-        version_dir = os.path.join(self.version_store_path, test_case_id)
-        os.makedirs(version_dir, exist_ok=True)
-        return version_dir
-    
-    def _load_version_history(self, test_case_id: str) -> Dict[str, Any]:
+        Raises:
+            InvalidVersionError: If a version in the chain or its content is missing.
         """
-        Load the version history for a test case.
-        
-        Args:
-            test_case_id (str): The test case ID.
+        deltas = []
+        visited = set()
+        entry = version_entry
+        
+        while True:
+            if entry["version"] in visited:
+                raise VersionControlError(f"Delta chain of test case {test_case_id} loops at version {entry['version']}")
+            visited.add(entry["version"])
             
-        Returns:
-            Dict[str, Any]: The version history data.
-        """
-        history_path = self._get_version_history_path(test_case_id)
-        
-        if os.path.exists(history_path):
-            try:
-                with open(history_path, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                self.logger.error(f"Failed to load version history: {str(e)}")
-                # Return a new empty history if file is corrupted
-                return self._create_new_version_history(test_case_id)
-        else:
-            # Create a new version history if none exists
-            return self._create_new_version_history(test_case_id)
-    
-    def _save_version_history(self, test_case_id: str, history: Dict[str, Any]) -> None:
-        """
-        Save the version history for a test case.
+            content = self.version_store.read_version_content(test_case_id, entry["version"])
+            if content is None:
+                raise InvalidVersionError(f"Version file for {entry['version']} of test case {test_case_id} not found")
+            
+            encoding = entry.get("encoding")
+            if encoding != DELTA:
+                # A keyframe, or a workbook stored before versions were encoded
+                snapshot = unpack(content) if encoding == KEYFRAME else encode_frame(pd.read_excel(BytesIO(content)))
+                break
+            
+            deltas.append(unpack(content))
+            base_version = entry["base_version"]
+            entry = self.version_store.get_version(test_case_id, base_version)
+            if entry is None:
+                raise InvalidVersionError(f"Base version {base_version} of test case {test_case_id} not found")
         
-        Args:
-            test_case_id (str): The test case ID.
-            history (Dict[str, Any]): The version history data.
-        """
-        history_path = self._get_version_history_path(test_case_id)
+        for delta in reversed(deltas):
+            snapshot = apply_delta(snapshot, delta)
         
-        try:
-            with open(history_path, 'w') as f:
-                json.dump(history, f, indent=2)
-            
-            self.logger.debug(f"Version history saved for {test_case_id}")
-        except Exception as e:
-            self.logger.error(f"Failed to save version history: {str(e)}")
-            raise VersionControlError(f"Failed to save version history: {str(e)}")
+        return snapshot
     
-    def _create_new_version_history(self, test_case_id: str) -> Dict[str, Any]:
+    def _encode_version(self, test_case_id: str, snapshot: Dict[str, Any],
+                        content_hash: str) -> Tuple[bytes, Dict[str, Any]]:
         """
-        Create a new version history structure for a test case.
+        Encode a new version as a delta against the current version, or as a
+        keyframe when the delta chain is full or the delta would be larger.
         
         Args:
             test_case_id (str): The test case ID.
+            snapshot (Dict[str, Any]): Snapshot of the new version.
+            content_hash (str): Content hash of the new version.
             
         Returns:
-            Dict[str, Any]: New version history structure.
+            Tuple[bytes, Dict[str, Any]]: (payload, encoding, base_version and chain_length)
         """
-        return {
-            "test_case_id": test_case_id,
-            "created_at": datetime.now().isoformat(),
-            "current_version": None,
-            "versions": []
-        }
-    
-    def _get_test_case_version_path(self, test_case_id: str, version: str) -> str:
-        """
-        Get the path to a specific version of a test case.
+        keyframe = pack(snapshot)
+        base = self.version_store.get_version(test_case_id)
         
-        Args:
-            test_case_id (str): The test case ID.
-            version (str): The version identifier.
-            
-        Returns:
-            str: Path to the version file.
-        """
-        version_dir = self._get_version_directory(test_case_id)
-        return os.path.join(version_dir, f"{version}.xlsx")
+        if base and base["content_hash"] != content_hash and (base.get("chain_length") or 0) + 1 < self.keyframe_interval:
+            try:
+                delta = pack(diff_snapshots(self._load_snapshot(test_case_id, base), snapshot))
+                if len(delta) < len(keyframe):
+                    return delta, {
+                        "encoding": DELTA,
+                        "base_version": base["version"],
+                        "chain_length": (base.get("chain_length") or 0) + 1
+                    }
+            except (VersionControlError, ValueError) as e:
+                self.logger.warning(f"Storing a keyframe, version {base['version']} could not be rebuilt: {str(e)}")
+        
+        return keyframe, {"encoding": KEYFRAME, "base_version": None, "chain_length": 0}
     
     def load_test_case(self, file_path: str) -> pd.DataFrame:
         """
@@ -282,91 +616,45 @@ class VersionController:
         owner = None
         if "TEST USER ID/ROLE" in test_case_df.columns and len(test_case_df) > 0:
             owner = test_case_df.iloc[0]["TEST USER ID/ROLE"]
+            owner = None if pd.isna(owner) else str(owner)
         
         # Calculate content hash
         content_hash = self._get_test_case_hash(test_case_df)
         
-        # Load version history
-        history = self._load_version_history(test_case_id)
-        
-        # Check if this is identical to the current version
-        is_new_version = True
-        current_version = history.get("current_version")
-        
-        if current_version:
-            # Find the current version in the history
-            for version in history["versions"]:
-                if version["version"] == current_version:
-                    if version["content_hash"] == content_hash:
-                        is_new_version = False
-                        self.logger.info(f"Test case {test_case_id} content matches current version {current_version}")
-                        
-                        # Return current version info
-                        return {
-                            "test_case_id": test_case_id,
-                            "version": current_version,
-                            "is_new_version": False,
-                            "timestamp": version["timestamp"],
-                            "message": "Test case content is identical to current version"
-                        }
-                    break
-        
-        # Generate new version number
-        if not history["versions"]:
-            # First version is 1.0
-            new_version = "1.0"
-        else:
-            # Increment the last version
-            last_version = history["versions"][-1]["version"]
-            major, minor = map(int, last_version.split('.'))
-            
-            # For now, just increment the minor version
-            # Could implement logic to determine major vs minor changes
-            new_version = f"{major}.{minor + 1}"
-        
-        # Create new version entry
-        timestamp = datetime.now().isoformat()
-        version_entry = {
-            "version": new_version,
-            "timestamp": timestamp,
-            "content_hash": content_hash,
-            "changed_by": changed_by or "System",
-            "comment": change_comment or "No comment provided",
-            "file_name": os.path.basename(test_case_path),
-            "owner": owner
-        }
-        
-        # Save the file to version storage
-        version_path = self._get_test_case_version_path(test_case_id, new_version)
+        # Store a delta against the current version (or a keyframe)
         try:
-            test_case_df.to_excel(version_path, index=False)
-            self.logger.info(f"Version {new_version} of test case {test_case_id} saved to {version_path}")
+            content, encoding = self._encode_version(test_case_id, encode_frame(test_case_df), content_hash)
+            
+            version_entry, is_new_version = self.version_store.add_version(test_case_id, content, content_hash, {
+                "changed_by": changed_by or "System",
+                "comment": change_comment or "No comment provided",
+                "file_name": os.path.basename(test_case_path),
+                "owner": owner,
+                **encoding
+            })
         except Exception as e:
-            self.logger.error(f"Failed to save version file: {str(e)}")
-            raise VersionControlError(f"Failed to save version file: {str(e)}")
+            self.logger.error(f"Failed to save version: {str(e)}")
+            raise VersionControlError(f"Failed to save version: {str(e)}")
         
-        # Update history
-        history["versions"].append(version_entry)
-        history["current_version"] = new_version
+        if not is_new_version:
+            self.logger.info(f"Test case {test_case_id} content matches current version {version_entry['version']}")
+            
+            # Return current version info
+            return {
+                "test_case_id": test_case_id,
+                "version": version_entry["version"],
+                "is_new_version": False,
+                "timestamp": version_entry["timestamp"],
+                "message": "Test case content is identical to current version"
+            }
         
-        # Save updated history
-        self._save_version_history(test_case_id, history)
+        new_version = version_entry["version"]
+        timestamp = version_entry["timestamp"]
+        self.logger.info(f"Version {new_version} of test case {test_case_id} saved to {self.version_store.name} version store")
         
-        # Notify owner if requested
+        # Notify owner if requested; the notification is sent in the background
         if notify_owner and owner:
-            try:
-                notification_data = {
-                    "recipient": owner,
-                    "subject": f"Test Case {test_case_id} Updated to Version {new_version}",
-                    "message": f"A new version ({new_version}) of Test Case {test_case_id} has been created.\n\n"
-                               f"Comment: {change_comment or 'No comment provided'}\n"
-                               f"Changed by: {changed_by or 'System'}\n"
-                               f"Timestamp: {timestamp}"
-                }
-                send_notification(notification_data)
-                self.logger.info(f"Notification sent to owner ({owner}) of test case {test_case_id}")
-            except Exception as e:
-                self.logger.warning(f"Failed to send notification to owner: {str(e)}")
+            self.queue_owner_notification(test_case_id, owner, new_version, change_comment, changed_by, timestamp)
         
         # Return new version info
         return {
@@ -374,7 +662,7 @@ class VersionController:
             "version": new_version,
             "is_new_version": True,
             "timestamp": timestamp,
-            "file_path": version_path
+            "file_path": self.version_store.get_version_path(test_case_id, new_version)
         }
     
     # Keep the old method name as an alias for backward compatibility
@@ -401,8 +689,7 @@ class VersionController:
             VersionControlError: If the history can't be loaded.
         """
         try:
-            history = self._load_version_history(test_case_id)
-            return history
+            return self.version_store.get_history(test_case_id)
         except Exception as e:
             self.logger.error(f"Failed to get version history: {str(e)}")
             raise VersionControlError(f"Failed to get version history: {str(e)}")
@@ -421,39 +708,64 @@ class VersionController:
         Raises:
             InvalidVersionError: If the requested version doesn't exist.
         """
-        # Load history
-        history = self._load_version_history(test_case_id)
-        
-        # Determine which version to get
-        target_version = version or history.get("current_version")
+        # Look up the version (the current one if none is given)
+        try:
+            version_entry = self.version_store.get_version(test_case_id, version)
+        except Exception as e:
+            self.logger.error(f"Failed to look up version: {str(e)}")
+            raise VersionControlError(f"Failed to look up version: {str(e)}")
         
-        if not target_version:
+        if not version_entry:
+            if version:
+                raise InvalidVersionError(f"Version {version} not found for test case {test_case_id}")
             raise InvalidVersionError(f"No version found for test case {test_case_id}")
         
-        # Verify the version exists
-        version_exists = False
-        for ver in history["versions"]:
-            if ver["version"] == target_version:
-                version_exists = True
-                break
-        
-        if not version_exists:
-            raise InvalidVersionError(f"Version {target_version} not found for test case {test_case_id}")
+        target_version = version_entry["version"]
         
-        # Get the path to the version file
-        version_path = self._get_test_case_version_path(test_case_id, target_version)
+        # Load the test case, replaying deltas for encoded versions
+        try:
+            if version_entry.get("encoding"):
+                return decode_frame(self._load_snapshot(test_case_id, version_entry))
+            
+            content = self.version_store.read_version_content(test_case_id, target_version)
+        except VersionControlError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to load version file: {str(e)}")
+            raise VersionControlError(f"Failed to load version file: {str(e)}")
         
-        if not os.path.exists(version_path):
-            raise InvalidVersionError(f"Version file for {target_version} not found at {version_path}")
+        if content is None:
+            raise InvalidVersionError(f"Version file for {target_version} of test case {test_case_id} not found")
         
-        # Load the test case
         try:
-            test_case_df = pd.read_excel(version_path)
+            test_case_df = pd.read_excel(BytesIO(content))
             return test_case_df
         except Exception as e:
             self.logger.error(f"Failed to load version file: {str(e)}")
             raise VersionControlError(f"Failed to load version file: {str(e)}")
     
+    def list_versions(self, test_case_ids: List[str] = None, since: str = None,
+                      limit: int = None) -> List[Dict[str, Any]]:
+        """
+        List versions across test cases, newest first.
+        
+        Args:
+            test_case_ids (List[str], optional): Only these test cases.
+            since (str, optional): Only versions created at or after this ISO timestamp.
+            limit (int, optional): Maximum number of versions.
+            
+        Returns:
+            List[Dict[str, Any]]: Version entries, each with its test_case_id.
+            
+        Raises:
+            VersionControlError: If the versions can't be listed.
+        """
+        try:
+            return self.version_store.list_versions(test_case_ids, since, limit)
+        except Exception as e:
+            self.logger.error(f"Failed to list versions: {str(e)}")
+            raise VersionControlError(f"Failed to list versions: {str(e)}")
+    
     def export_version_to_file(self, test_case_id: str, output_path: str, version: str = None) -> str:
         """
         Export a specific version of a test case to a file.
@@ -472,9 +784,9 @@ class VersionController:
         # Get the test case version
         test_case_df = self.get_test_case_version(test_case_id, version)
         
-        # Get the version history to determine the version number exported
-        history = self._load_version_history(test_case_id)
-        version_exported = version or history.get("current_version", "unknown")
+        # Determine the version number exported
+        current = None if version else self.version_store.get_version(test_case_id)
+        version_exported = version or (current["version"] if current else "unknown")
         
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
@@ -492,6 +804,10 @@ class VersionController:
         """
         Compare two versions of a test case and identify differences.
         
+        Steps are aligned by content rather than by step number, so inserting or
+        moving a step does not mark the steps after it as modified. Results are
+        cached per pair of versions.
+        
         Args:
             test_case_id (str): The test case ID.
             version1 (str): First version to compare.
@@ -503,92 +819,47 @@ class VersionController:
         Raises:
             InvalidVersionError: If either requested version doesn't exist.
         """
-        # Load both versions
-        df1 = self.get_test_case_version(test_case_id, version1)
-        df2 = self.get_test_case_version(test_case_id, version2)
+        try:
+            entry1 = self.version_store.get_version(test_case_id, version1)
+            entry2 = self.version_store.get_version(test_case_id, version2)
+        except Exception as e:
+            self.logger.error(f"Failed to look up version: {str(e)}")
+            raise VersionControlError(f"Failed to look up version: {str(e)}")
+        
+        for version, entry in ((version1, entry1), (version2, entry2)):
+            if not entry:
+                raise InvalidVersionError(f"Version {version} not found for test case {test_case_id}")
+        
+        # Versions are immutable; the content hashes guard against a rebuilt store
+        cache_key = (test_case_id, entry1["version"], entry2["version"],
+                     entry1.get("content_hash"), entry2.get("content_hash"))
+        
+        with self._diff_cache_lock:
+            cached = self._diff_cache.get(cache_key)
+            if cached is not None:
+                self._diff_cache.move_to_end(cache_key)
+        
+        if cached is None:
+            df1 = self.get_test_case_version(test_case_id, entry1["version"])
+            df2 = self.get_test_case_version(test_case_id, entry2["version"])
+            
+            if len(df1) != len(df2):
+                self.logger.info(f"Different number of steps: {len(df1)} vs {len(df2)}")
+            
+            cached = diff_test_case_frames(df1, df2)
+            
+            with self._diff_cache_lock:
+                self._diff_cache[cache_key] = cached
+                if len(self._diff_cache) > self.diff_cache_size:
+                    self._diff_cache.popitem(last=False)
         
-        # Initialize results
         comparison = {
             "test_case_id": test_case_id,
             "version1": version1,
-            "version2": version2,
-            "added_steps": [],
-            "removed_steps": [],
-            "modified_steps": [],
-            "summary": {"added": 0, "removed": 0, "modified": 0, "unchanged": 0}
+            "version2": version2
         }
-        
-        # Compare basic structure
-        if len(df1) != len(df2):
-            self.logger.info(f"Different number of steps: {len(df1)} vs {len(df2)}")
-        
-        # Create dictionaries of steps by step number for easy comparison
-        steps1 = {}
-        steps2 = {}
-        
-        for _, row in df1.iterrows():
-            step_no = row.get("STEP NO")
-            if step_no is not None:
-                steps1[step_no] = row.to_dict()
-        
-        for _, row in df2.iterrows():
-            step_no = row.get("STEP NO")
-            if step_no is not None:
-                steps2[step_no] = row.to_dict()
-        
-        # Find added, removed, and common steps
-        all_step_numbers = sorted(set(list(steps1.keys()) + list(steps2.keys())))
-        
-        for step_no in all_step_numbers:
-            if step_no in steps1 and step_no not in steps2:
-                # Step was removed in version2
-                comparison["removed_steps"].append({
-                    "step_no": step_no,
-                    "details": steps1[step_no]
-                })
-                comparison["summary"]["removed"] += 1
-                
-            elif step_no not in steps1 and step_no in steps2:
-                # Step was added in version2
-                comparison["added_steps"].append({
-                    "step_no": step_no,
-                    "details": steps2[step_no]
-                })
-                comparison["summary"]["added"] += 1
-                
-            else:
-                # Step exists in both versions - check for differences
-                step1 = steps1[step_no]
-                step2 = steps2[step_no]
-                
-                differences = {}
-                
-                # Compare each field
-                for field in set(list(step1.keys()) + list(step2.keys())):
-                    value1 = step1.get(field, "")
-                    value2 = step2.get(field, "")
-                    
-                    # Convert to string for comparison
-                    value1_str = str(value1)
-                    value2_str = str(value2)
-                    
-                    if value1_str != value2_str:
-                        differences[field] = {
-                            "from": value1_str,
-                            "to": value2_str
-                        }
-                
-                if differences:
-                    # Step was modified
-                    comparison["modified_steps"].append({
-                        "step_no": step_no,
-                        "differences": differences
-                    })
-                    comparison["summary"]["modified"] += 1
-                else:
-                    # Step is unchanged
-                    comparison["summary"]["unchanged"] += 1
-        
+        # Callers get their own copy so they cannot alter the cached result
+        comparison.update(copy.deepcopy(cached))
         return comparison
 
     def upload_to_sharepoint(self, test_case_id: str, version: str = None, 
@@ -618,8 +889,8 @@ class VersionController:
         self.export_version_to_file(test_case_id, temp_path, version)
         
         # Get the version number for the file name
-        history = self._load_version_history(test_case_id)
-        version_uploaded = version or history.get("current_version", "unknown")
+        current = None if version else self.version_store.get_version(test_case_id)
+        version_uploaded = version or (current["version"] if current else "unknown")
         
         # Set default SharePoint folder if not provided
         if not sharepoint_folder:
@@ -642,13 +913,10 @@ class VersionController:
             upload_result = upload_document(temp_path, sharepoint_folder, sharepoint_filename)
             
             # Update version history with SharePoint info
-            for v in history["versions"]:
-                if v["version"] == version_uploaded:
-                    v["sharepoint_url"] = upload_result.get("url", "Unknown")
-                    v["sharepoint_path"] = f"{sharepoint_folder}/{sharepoint_filename}"
-                    break
-            
-            self._save_version_history(test_case_id, history)
+            self.version_store.update_version(test_case_id, version_uploaded, {
+                "sharepoint_url": upload_result.get("url", "Unknown"),
+                "sharepoint_path": f"{sharepoint_folder}/{sharepoint_filename}"
+            })
             
             # Clean up temp file
             if os.path.exists(temp_path):
@@ -685,22 +953,16 @@ class VersionController:
             VersionControlError: If the operation fails.
         """
         try:
-            # Load history
-            history = self._load_version_history(test_case_id)
-            
             # Mark as under maintenance
-            history["status"] = "Under Maintenance"
-            history["maintenance_started"] = datetime.now().isoformat()
-            
-            # Save updated history
-            self._save_version_history(test_case_id, history)
+            timestamp = datetime.now().isoformat()
+            self.version_store.set_status(test_case_id, "Under Maintenance", timestamp)
             
             self.logger.info(f"Test case {test_case_id} marked as Under Maintenance")
             
             return {
                 "test_case_id": test_case_id,
                 "status": "Under Maintenance",
-                "timestamp": history["maintenance_started"]
+                "timestamp": timestamp
             }
             
         except Exception as e:
@@ -728,23 +990,16 @@ class VersionController:
             VersionControlError: If the operation fails.
         """
         try:
-            # Load history
-            history = self._load_version_history(test_case_id)
-            
-            # Mark as active
-            history["status"] = "Active"
-            if "maintenance_started" in history:
-                history["maintenance_ended"] = datetime.now().isoformat()
-            
-            # Save updated history
-            self._save_version_history(test_case_id, history)
+            # Mark as active; ends the maintenance period if one was started
+            timestamp = datetime.now().isoformat()
+            self.version_store.set_status(test_case_id, "Active", timestamp)
             
             self.logger.info(f"Test case {test_case_id} marked as Active")
             
             return {
                 "test_case_id": test_case_id,
                 "status": "Active",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
             
         except Exception as e:
@@ -0,0 +1,77 @@
+"""Shared fixtures for tests that need a PostgreSQL database.
+
+Database tests run only when TEST_DATABASE_URL points at a scratch database;
+its metadata tables are dropped and recreated for every test.
+"""
+
+import os
+
+import pytest
+
+METADATA_TABLES = """
+DROP TABLE IF EXISTS test_cases, test_case_metadata, tags, test_case_tags, test_case_files,
+    metadata_history, test_case_stats_summary, test_case_blobs CASCADE;
+
+CREATE TABLE test_case_metadata (
+    id SERIAL,
+    TEST_CASE_ID VARCHAR(100) PRIMARY KEY,
+    OWNER VARCHAR(100),
+    STATUS VARCHAR(50),
+    PRIORITY VARCHAR(50),
+    AUTOMATION_STATUS VARCHAR(50),
+    CREATED_DATE TIMESTAMP WITH TIME ZONE,
+    MODIFIED_DATE TIMESTAMP WITH TIME ZONE,
+    CREATED_BY VARCHAR(100),
+    MODIFIED_BY VARCHAR(100),
+    MODULE VARCHAR(100),
+    TEST_LEVEL VARCHAR(50),
+    TEST_TYPE VARCHAR(50),
+    LAST_EXECUTION_DATE TIMESTAMP WITH TIME ZONE,
+    LAST_EXECUTION_RESULT VARCHAR(50),
+    FILE_NAME VARCHAR(255),
+    FILE_TYPE VARCHAR(50)
+);
+
+CREATE TABLE tags (id SERIAL PRIMARY KEY, name VARCHAR(100) UNIQUE NOT NULL);
+
+CREATE TABLE test_case_tags (
+    test_case_id VARCHAR(100),
+    tag_id INTEGER,
+    PRIMARY KEY (test_case_id, tag_id)
+);
+
+CREATE TABLE test_case_files (
+    test_case_id VARCHAR(100) PRIMARY KEY,
+    file_name VARCHAR(255),
+    file_type VARCHAR(50),
+    content BYTEA NOT NULL,
+    uploaded_at TIMESTAMP WITH TIME ZONE
+);
+"""
+
+
+@pytest.fixture(autouse=True)
+def notification_outbox_path(monkeypatch, tmp_path):
+    """Keep notification outboxes opened by tests out of the storage directory."""
+    path = str(tmp_path / "notification_outbox.db")
+    monkeypatch.setenv("NOTIFICATION_OUTBOX_PATH", path)
+    return path
+
+
+@pytest.fixture
+def database_url(monkeypatch):
+    """URL of a scratch database with fresh metadata tables."""
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    psycopg2 = pytest.importorskip("psycopg2")
+
+    conn = psycopg2.connect(url)
+    conn.autocommit = True
+    try:
+        conn.cursor().execute(METADATA_TABLES)
+    finally:
+        conn.close()
+
+    monkeypatch.setenv("DATABASE_URL", url)
+    return url
@@ -0,0 +1,36 @@
+"""Tests for incremental backup watermarks."""
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+metadata_manager = pytest.importorskip("src.services.phase1.test_case_manager.metadata_manager")
+MetadataManager = metadata_manager.MetadataManager
+
+
+def test_watermark_precedes_transactions_in_progress(database_url, monkeypatch):
+    monkeypatch.setenv("BACKUP_WATERMARK_OVERLAP", "0")
+    manager = MetadataManager()
+
+    writer = psycopg2.connect(database_url)
+    try:
+        cursor = writer.cursor()
+        cursor.execute("SELECT now()")
+        writer_started = cursor.fetchone()[0]
+        cursor.execute("SELECT pg_sleep(0.2)")
+
+        # Rows the writer commits later may carry a MODIFIED_DATE from its start
+        assert manager._backup_watermark() <= writer_started
+    finally:
+        writer.close()
+
+    assert manager._backup_watermark() > writer_started
+
+
+def test_watermark_applies_overlap(database_url, monkeypatch):
+    monkeypatch.setenv("BACKUP_WATERMARK_OVERLAP", "600")
+    manager = MetadataManager()
+
+    watermark = manager._backup_watermark()
+    now = manager._execute_query("SELECT statement_timestamp()", fetch_one=True)[0]
+
+    assert (now - watermark).total_seconds() >= 600
@@ -0,0 +1,144 @@
+"""Tests for blob reference counting and garbage collection."""
+
+import os
+import threading
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+blob_store = pytest.importorskip("src.persistence.storage.blob_store")
+BlobStore = blob_store.BlobStore
+
+
+@pytest.fixture
+def connect(database_url):
+    connections = []
+
+    def connect():
+        conn = psycopg2.connect(database_url)
+        connections.append(conn)
+        return conn
+
+    yield connect
+    for conn in connections:
+        conn.close()
+
+
+@pytest.fixture
+def store(connect, tmp_path):
+    store = BlobStore("filesystem", str(tmp_path))
+    conn = connect()
+    store.init_schema(conn.cursor())
+    conn.commit()
+    return store
+
+
+def _ref_count(conn, sha256):
+    cursor = conn.cursor()
+    cursor.execute("SELECT ref_count FROM test_case_blobs WHERE sha256 = %s", (sha256,))
+    row = cursor.fetchone()
+    conn.commit()
+    return row[0] if row else None
+
+
+def _path(store, sha256):
+    return os.path.join(store.backend.root_dir, sha256[:2], sha256[2:4], sha256)
+
+
+def test_identical_content_is_stored_once_and_collected_when_unreferenced(store, connect):
+    conn = connect()
+    sha256, size = store.put(conn, b"same bytes")
+    assert store.put(conn, b"same bytes") == (sha256, size)
+    conn.commit()
+
+    assert _ref_count(conn, sha256) == 2
+    assert store.read(conn, sha256) == b"same bytes"
+
+    store.release(conn, sha256)
+    conn.commit()
+    assert store.collect_garbage(conn) == 0
+    assert os.path.exists(_path(store, sha256))
+
+    store.release(conn, sha256)
+    conn.commit()
+    assert store.collect_garbage(conn) == 1
+    assert _ref_count(conn, sha256) is None
+    assert not os.path.exists(_path(store, sha256))
+
+
+def test_put_after_collection_writes_the_blob_again(store, connect):
+    conn = connect()
+    sha256, _ = store.put(conn, b"content")
+    store.release(conn, sha256)
+    conn.commit()
+    store.collect_garbage(conn)
+
+    store.put(conn, b"content")
+    conn.commit()
+
+    assert store.read(conn, sha256) == b"content"
+    assert os.listdir(os.path.dirname(_path(store, sha256))) == [sha256]
+
+
+def test_collection_skips_blob_referenced_by_open_transaction(store, connect):
+    writer, collector = connect(), connect()
+    sha256, _ = store.put(writer, b"content")
+    store.release(writer, sha256)
+    writer.commit()
+
+    # A put of the same content takes its reference before the collector runs
+    store.put(writer, b"content")
+
+    assert store.collect_garbage(collector) == 0
+    writer.commit()
+    assert store.collect_garbage(collector) == 0
+    assert store.read(collector, sha256) == b"content"
+
+
+def test_put_waits_for_collection_and_rewrites_the_blob(store, connect):
+    writer, collector = connect(), connect()
+    sha256, _ = store.put(writer, b"content")
+    store.release(writer, sha256)
+    writer.commit()
+
+    # Start a put while the collector holds the row, just before it commits
+    put_done = threading.Event()
+    original_commit = collector.commit
+
+    class Collector:
+        def __getattr__(self, name):
+            return getattr(collector, name)
+
+        def commit(self):
+            thread = threading.Thread(target=lambda: (store.put(writer, b"content"), put_done.set()))
+            thread.start()
+            assert not put_done.wait(0.5)
+            original_commit()
+            thread.join()
+
+    assert store.collect_garbage(Collector()) == 1
+    writer.commit()
+
+    assert _ref_count(writer, sha256) == 1
+    assert store.read(writer, sha256) == b"content"
+
+
+def test_concurrent_first_uploads_leave_one_reference(database_url, connect):
+    metadata_manager = pytest.importorskip("src.services.phase1.test_case_manager.metadata_manager")
+    manager = metadata_manager.MetadataManager()
+    first, second = connect(), connect()
+
+    manager._put_test_case_file(first, "TC-1", "a.xlsx", b"first", "xlsx", None)
+    thread = threading.Thread(
+        target=manager._put_test_case_file, args=(second, "TC-1", "b.xlsx", b"second", "xlsx", None)
+    )
+    thread.start()
+    thread.join(0.5)
+    first.commit()
+    thread.join()
+    second.commit()
+
+    cursor = first.cursor()
+    cursor.execute("SELECT sha256, ref_count FROM test_case_blobs")
+    ref_counts = dict(cursor.fetchall())
+    assert ref_counts == {BlobStore.hash_bytes(b"first"): 0, BlobStore.hash_bytes(b"second"): 1}
@@ -0,0 +1,79 @@
+"""Tests for bulk metadata loading and re-importing existing test cases."""
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+metadata_manager = pytest.importorskip("src.services.phase1.test_case_manager.metadata_manager")
+MetadataManager = metadata_manager.MetadataManager
+
+
+def _row(url, test_case_id):
+    conn = psycopg2.connect(url)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+        SELECT OWNER, STATUS, PRIORITY, AUTOMATION_STATUS, MODULE, TEST_LEVEL, CREATED_BY, MODIFIED_DATE
+        FROM test_case_metadata WHERE TEST_CASE_ID = %s
+        """, (test_case_id,))
+        return cursor.fetchone()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def manager(database_url):
+    manager = MetadataManager()
+    manager.bulk_load_test_case_metadata([{
+        "TEST_CASE_ID": "TC-1",
+        "OWNER": "alice",
+        "STATUS": "Active",
+        "PRIORITY": "High",
+        "AUTOMATION_STATUS": "Automated",
+        "MODULE": "Billing",
+        "TEST_LEVEL": "System",
+    }], created_by="alice")
+    return manager
+
+
+def test_overwrite_updates_only_supplied_fields(manager, database_url):
+    before = _row(database_url, "TC-1")
+
+    result = manager.bulk_load_test_case_metadata(
+        [{"TEST_CASE_ID": "TC-1", "OWNER": "bob", "MODULE": None}],
+        created_by="bob", overwrite=True
+    )
+
+    assert result["test_case_ids"] == ["TC-1"]
+    owner, status, priority, automation, module, level, created_by, modified = _row(database_url, "TC-1")
+    assert owner == "bob"
+    assert (status, priority, automation) == ("Active", "High", "Automated")
+    assert (module, level) == ("Billing", "System")
+    assert created_by == "alice"
+    assert modified > before[-1]
+
+
+def test_reimport_keeps_fields_the_file_does_not_supply(manager, database_url):
+    parsed = {
+        "test_case_id": "TC-1",
+        "test_case_data": {"TEST_CASE_ID": "TC-1", "OWNER": "carol", "MODULE": "Payments"},
+        "file_name": "TC-1.xlsx",
+        "file_type": "xlsx",
+        "file_content": b"spreadsheet",
+    }
+
+    assert manager._write_parsed_test_case_files([parsed], uploaded_by="carol") == ["TC-1"]
+
+    owner, status, priority, automation, module, level, created_by, _ = _row(database_url, "TC-1")
+    assert (owner, module) == ("carol", "Payments")
+    assert (status, priority, automation, level) == ("Active", "High", "Automated", "System")
+    assert created_by == "alice"
+
+
+def test_overwrite_still_inserts_new_cases_with_defaults(manager, database_url):
+    result = manager.bulk_load_test_case_metadata(
+        [{"TEST_CASE_ID": "TC-2", "OWNER": "dave"}], overwrite=True
+    )
+
+    assert result["test_case_ids"] == ["TC-2"]
+    owner, status, priority, automation, *_ = _row(database_url, "TC-2")
+    assert (owner, status, priority, automation) == ("dave", "Draft", "Medium", "Manual")
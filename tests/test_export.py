@@ -0,0 +1,30 @@
+"""Tests for exporting test case files."""
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+metadata_manager = pytest.importorskip("src.services.phase1.test_case_manager.metadata_manager")
+MetadataManager = metadata_manager.MetadataManager
+
+
+def test_export_summary_matches_archive(database_url):
+    manager = MetadataManager()
+    conn = psycopg2.connect(database_url)
+    try:
+        manager._put_test_case_file(conn, "TC-1", "a.xlsx", b"first", "xlsx", None)
+        manager._put_test_case_file(conn, "TC-2", "b.xlsx", b"second!", "xlsx", None)
+        conn.commit()
+    finally:
+        conn.close()
+
+    test_case_ids = ["TC-2", "TC-1", "TC-3", "TC-1"]
+    archived = {}
+    for _ in manager.iter_test_cases_zip(test_case_ids, include_metadata=False, summary=archived):
+        pass
+
+    summary = manager.summarize_test_cases_export(test_case_ids)
+
+    assert summary["test_case_count"] == archived["test_case_count"] == 3
+    assert summary["file_count"] == archived["file_count"] == 2
+    assert sorted(summary["exported_test_cases"]) == sorted(archived["exported_test_cases"])
+    assert summary["total_size"] == len(b"first") + len(b"second!")
@@ -0,0 +1,50 @@
+"""Tests for the read-through metadata cache."""
+
+import pytest
+
+metadata_manager = pytest.importorskip("src.services.phase1.test_case_manager.metadata_manager")
+MetadataCache = metadata_manager.MetadataCache
+
+
+def test_read_started_before_invalidation_is_not_cached():
+    cache = MetadataCache()
+    cache.set("TC-1", {"STATUS": "Draft"})
+
+    # A reader misses and queries the database while a writer commits
+    cache.invalidate(["TC-1"])
+    version = cache.version()
+    cache.invalidate(["TC-1"])
+
+    assert cache.set("TC-1", {"STATUS": "Draft"}, version) is False
+    assert cache.get("TC-1") is None
+    assert cache.metrics()["stale_sets"] == 1
+
+    assert cache.set("TC-1", {"STATUS": "Active"}, cache.version()) is True
+    assert cache.get("TC-1") == {"STATUS": "Active"}
+
+
+def test_invalidation_of_other_ids_does_not_block_set():
+    cache = MetadataCache()
+    version = cache.version()
+    cache.invalidate(["TC-2"])
+
+    assert cache.set("TC-1", {"STATUS": "Draft"}, version) is True
+
+
+def test_forgotten_invalidations_are_treated_as_recent():
+    cache = MetadataCache(max_size=2)
+    version = cache.version()
+    cache.invalidate(["TC-1"])
+    cache.invalidate(["TC-2", "TC-3"])
+
+    # TC-1 no longer has its own record, so the read is assumed to be stale
+    assert "TC-1" not in cache.invalidated
+    assert cache.set("TC-1", {"STATUS": "Draft"}, version) is False
+
+
+def test_writer_version_loses_to_later_writer():
+    cache = MetadataCache()
+    first = cache.invalidate(["TC-1"])
+    cache.invalidate(["TC-1"])
+
+    assert cache.set("TC-1", {"STATUS": "Old"}, first) is False
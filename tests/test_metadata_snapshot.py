@@ -0,0 +1,24 @@
+"""Tests for columnar metadata snapshots."""
+
+import json
+import os
+
+import pytest
+
+pytest.importorskip("pyarrow")
+metadata_manager = pytest.importorskip("src.services.phase1.test_case_manager.metadata_manager")
+MetadataManager = metadata_manager.MetadataManager
+
+
+@pytest.mark.parametrize("partition_by", ["module", None])
+def test_export_without_matching_rows_writes_empty_snapshot(database_url, tmp_path, partition_by):
+    manager = MetadataManager()
+    output_dir = str(tmp_path / "snapshot")
+
+    exported = manager.export_metadata_snapshot(output_dir, partition_by=partition_by, test_case_ids=["TC-MISSING"])
+
+    assert exported == 0
+    with open(os.path.join(output_dir, manager.SNAPSHOT_MANIFEST)) as f:
+        manifest = json.load(f)
+    assert manifest["test_cases"] == 0 and manifest["rows"] == 0
+    assert manager.load_metadata_snapshot(output_dir).num_rows == 0
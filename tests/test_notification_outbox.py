@@ -0,0 +1,74 @@
+"""Tests for the durable notification outbox."""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+notification_outbox = pytest.importorskip("src.services.phase1.notification_service.notification_outbox")
+NotificationOutbox = notification_outbox.NotificationOutbox
+
+
+class Recorder:
+    """Send function that records digests and signals each delivery."""
+
+    def __init__(self):
+        self.sent = []
+        self.delivered = threading.Event()
+
+    def __call__(self, data):
+        self.sent.append(data)
+        self.delivered.set()
+
+
+def _outbox(path, send, **options):
+    options.setdefault("coalesce_window", 0)
+    options.setdefault("poll_interval", 0.05)
+    return NotificationOutbox(db_path=path, send=send, **options)
+
+
+def test_idle_outbox_does_not_start_dispatcher(notification_outbox_path):
+    outbox = _outbox(notification_outbox_path, Recorder())
+
+    assert outbox.stats()["dispatcher_running"] is False
+
+
+def test_pending_notifications_are_delivered_after_restart(notification_outbox_path):
+    # The first process queues a notification and stops before it is sent
+    first = _outbox(notification_outbox_path, Recorder(), coalesce_window=3600)
+    first.enqueue("owner@example.com", "TC-1 updated", "Version 1.1 checked in")
+    first.stop()
+
+    recorder = Recorder()
+    restarted = _outbox(notification_outbox_path, recorder)
+    try:
+        assert restarted.stats()["dispatcher_running"] is True
+        assert recorder.delivered.wait(5)
+    finally:
+        restarted.stop()
+
+    assert [digest["recipient"] for digest in recorder.sent] == ["owner@example.com"]
+    assert restarted.stats()["pending"] == 0
+
+
+def test_claims_of_crashed_dispatcher_are_redelivered(notification_outbox_path):
+    first = _outbox(notification_outbox_path, Recorder(), coalesce_window=3600)
+    first.enqueue("owner@example.com", "TC-1 updated", "Version 1.1 checked in")
+    first.stop()
+
+    # Simulate a process that claimed the row and died before sending
+    conn = sqlite3.connect(notification_outbox_path)
+    with conn:
+        conn.execute("UPDATE notification_outbox SET status = 'sending', claimed_at = ?", (time.time() - 10,))
+    conn.close()
+
+    recorder = Recorder()
+    restarted = _outbox(notification_outbox_path, recorder, claim_lease=1)
+    try:
+        assert recorder.delivered.wait(5)
+    finally:
+        restarted.stop()
+
+    assert len(recorder.sent) == 1
+    assert restarted.stats()["sending"] == 0
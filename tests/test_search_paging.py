@@ -0,0 +1,47 @@
+"""Tests for validation of search paging parameters."""
+
+import pytest
+
+metadata_manager = pytest.importorskip("src.services.phase1.test_case_manager.metadata_manager")
+custom_exceptions = pytest.importorskip("src.common.exceptions.custom_exceptions")
+MetadataValidationError = custom_exceptions.MetadataValidationError
+
+
+@pytest.fixture
+def manager():
+    # Query building needs no connection
+    manager = metadata_manager.MetadataManager.__new__(metadata_manager.MetadataManager)
+    manager._init_settings(None, False, False, None, None, False, False)
+    return manager
+
+
+@pytest.mark.parametrize("arguments", [
+    {"order": "sideways"},
+    {"order": 1},
+    {"limit": -1},
+    {"limit": "ten"},
+    {"limit": 2.5},
+    {"limit": True},
+    {"offset": "-3"},
+    {"cursor": "not-a-cursor"},
+    {"cursor": 42},
+])
+def test_invalid_paging_input_is_a_validation_error(manager, arguments):
+    with pytest.raises(MetadataValidationError):
+        manager._build_search_page_query({}, **arguments)
+
+
+def test_cursor_from_other_order_is_rejected(manager):
+    cursor = manager._encode_search_cursor("TC-5", "asc")
+
+    with pytest.raises(MetadataValidationError):
+        manager._build_search_page_query({}, limit=10, order="desc", cursor=cursor)
+
+
+def test_numeric_strings_are_accepted(manager):
+    cursor = manager._encode_search_cursor("TC-5", "asc")
+
+    query, params = manager._build_search_page_query({}, limit="10", order="ASC", cursor=cursor, offset="2")
+
+    assert params == ("TC-5", 11, 2)
+    assert "ORDER BY test_case_number ASC" in query
@@ -0,0 +1,85 @@
+"""Tests for prepared statements surviving schema changes."""
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+statement_cache = pytest.importorskip("src.persistence.connection.statement_cache")
+StatementCache = statement_cache.StatementCache
+
+QUERY = "SELECT * FROM statement_cache_probe WHERE id = %s"
+
+
+@pytest.fixture
+def connections(database_url):
+    conn, other = psycopg2.connect(database_url), psycopg2.connect(database_url)
+    other.autocommit = True
+    other.cursor().execute("""
+    DROP TABLE IF EXISTS statement_cache_probe;
+    CREATE TABLE statement_cache_probe (id INTEGER PRIMARY KEY, name TEXT);
+    INSERT INTO statement_cache_probe VALUES (1, 'one');
+    """)
+    yield conn, other
+    conn.close()
+    other.cursor().execute("DROP TABLE IF EXISTS statement_cache_probe")
+    other.close()
+
+
+def _prepare(cache, conn):
+    cursor = conn.cursor()
+    cache.execute(cursor, QUERY, (1,))
+    conn.commit()
+    assert cache.metrics()["prepared_statements"] == 1
+    return cursor
+
+
+def test_statement_is_prepared_again_after_schema_change(connections):
+    conn, other = connections
+    cache = StatementCache(prepare_threshold=1)
+    cursor = _prepare(cache, conn)
+
+    other.cursor().execute("ALTER TABLE statement_cache_probe ADD COLUMN note TEXT DEFAULT 'new'")
+
+    cache.execute(cursor, QUERY, (1,))
+
+    assert cursor.fetchall() == [(1, "one", "new")]
+    conn.commit()
+
+    cursor.execute("SELECT count(*) FROM pg_prepared_statements")
+    assert cursor.fetchone() == (1,)
+    assert cache.metrics()["prepared_statements"] == 1
+
+
+def test_schema_change_inside_transaction_raises_and_recovers(connections):
+    conn, other = connections
+    cache = StatementCache(prepare_threshold=1)
+    cursor = _prepare(cache, conn)
+
+    other.cursor().execute("ALTER TABLE statement_cache_probe ADD COLUMN note TEXT DEFAULT 'new'")
+
+    cursor.execute("INSERT INTO statement_cache_probe VALUES (2, 'two')")
+    with pytest.raises(psycopg2.errors.FeatureNotSupported):
+        cache.execute(cursor, QUERY, (1,))
+    conn.rollback()
+
+    # The next call deallocates the invalidated statement and prepares the query again
+    cache.execute(cursor, QUERY, (1,))
+    assert cursor.fetchall() == [(1, "one", "new")]
+    conn.commit()
+
+    cursor.execute("SELECT count(*) FROM pg_prepared_statements")
+    assert cursor.fetchone() == (1,)
+    assert cache.metrics()["prepared_statements"] == 1
+
+
+def test_prepared_execution_in_transaction_keeps_results(connections):
+    conn, _ = connections
+    cache = StatementCache(prepare_threshold=1)
+    cursor = _prepare(cache, conn)
+
+    cursor.execute("SELECT 1")
+    cache.execute(cursor, QUERY, (1,))
+
+    assert cursor.fetchall() == [(1, "one")]
+    assert cache.metrics()["prepared_executions"] == 2
+    # One round trip for the PREPARE, one per EXECUTE
+    assert cache.metrics()["round_trips"] == 3
@@ -0,0 +1,39 @@
+"""Tests for the trigger-maintained stats summary table."""
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+metadata_manager = pytest.importorskip("src.services.phase1.test_case_manager.metadata_manager")
+MetadataManager = metadata_manager.MetadataManager
+
+
+def _execute(url, query):
+    conn = psycopg2.connect(url)
+    conn.autocommit = True
+    try:
+        conn.cursor().execute(query)
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def manager(database_url):
+    _execute(database_url, """
+    INSERT INTO test_case_metadata (TEST_CASE_ID, STATUS, TEST_TYPE, MODULE)
+    SELECT 'TC-' || i, CASE WHEN i % 2 = 0 THEN 'Active' ELSE 'Draft' END, 'Functional', 'Billing'
+    FROM generate_series(1, 40) AS i
+    """)
+    return MetadataManager()
+
+
+@pytest.mark.parametrize("rebuild", ["enable", "refresh"])
+def test_deletes_after_rebuild_lower_the_total(manager, database_url, rebuild):
+    manager.enable_stats_summary()
+    if rebuild == "refresh":
+        manager.refresh_stats_summary()
+
+    _execute(database_url, "DELETE FROM test_case_metadata WHERE TEST_CASE_ID IN ('TC-1', 'TC-2', 'TC-3')")
+    _execute(database_url, "INSERT INTO test_case_metadata (TEST_CASE_ID, STATUS) VALUES ('TC-99', 'Active')")
+
+    assert manager.get_stats(use_summary=True) == manager.get_stats(use_summary=False)
+    assert manager.get_stats(use_summary=True)["total_count"] == 38
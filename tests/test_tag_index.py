@@ -0,0 +1,95 @@
+"""Tests for the in-memory tag bitmap index used by MetadataManager tag queries."""
+
+import random
+import threading
+
+import pytest
+
+metadata_manager = pytest.importorskip("src.services.phase1.test_case_manager.metadata_manager")
+TagBitmapIndex = metadata_manager.TagBitmapIndex
+
+
+def _expected(tags_by_case, all_tags, any_tags, not_tags):
+    return sorted(
+        test_case_id for test_case_id, tags in tags_by_case.items()
+        if all(tag in tags for tag in all_tags)
+        and (not any_tags or any(tag in tags for tag in any_tags))
+        and not any(tag in tags for tag in not_tags)
+    )
+
+
+def test_query_matches_all_any_not_semantics():
+    rng = random.Random(7)
+    tag_names = [f"tag{i}" for i in range(8)]
+    tags_by_case = {f"TC-{i}": set(rng.sample(tag_names, rng.randint(0, 4))) for i in range(300)}
+
+    index = TagBitmapIndex()
+    index.load(list(tags_by_case), [(tag, tc) for tc, tags in tags_by_case.items() for tag in tags])
+
+    for _ in range(200):
+        all_tags = rng.sample(tag_names, rng.randint(0, 2))
+        any_tags = rng.sample(tag_names, rng.randint(0, 3))
+        not_tags = rng.sample(tag_names, rng.randint(0, 2))
+        assert index.query(all_tags, any_tags, not_tags) == _expected(tags_by_case, all_tags, any_tags, not_tags)
+
+
+def test_unknown_tags_and_untagged_cases():
+    index = TagBitmapIndex()
+    index.load(["TC-1", "TC-2"], [("smoke", "TC-1"), ("smoke", "TC-9")])
+
+    assert index.query([], [], []) == ["TC-1", "TC-2", "TC-9"]
+    assert index.query(["smoke"], [], []) == ["TC-1", "TC-9"]
+    assert index.query([], [], ["smoke"]) == ["TC-2"]
+    assert index.query(["missing"], [], []) == []
+    assert index.query([], ["missing"], []) == []
+
+
+def test_concurrent_reload_never_mixes_generations():
+    # Two generations tag different cases; every query must match one of them
+    first = (["A", "B", "C"], [("x", "A"), ("x", "C")])
+    second = (["C", "B", "A", "D"], [("x", "B"), ("x", "D")])
+    answers = ({"A", "C"}, {"B", "D"})
+
+    index = TagBitmapIndex()
+    index.load(*first)
+    stop = threading.Event()
+    seen = []
+
+    def reload():
+        while not stop.is_set():
+            index.load(*second)
+            index.load(*first)
+
+    def query():
+        for _ in range(2000):
+            seen.append(set(index.query(["x"], [], [])))
+
+    writer = threading.Thread(target=reload)
+    readers = [threading.Thread(target=query) for _ in range(4)]
+    writer.start()
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join()
+    stop.set()
+    writer.join()
+
+    assert all(result in answers for result in seen)
+
+
+def test_build_invalidated_during_load_is_not_published():
+    index = TagBitmapIndex()
+    index.load(["A"], [("x", "A")])
+
+    # A tag write lands while the next build is reading the database
+    generation = index.generation
+    index.invalidate()
+    published = index.load(["A", "B"], [("x", "B")], generation)
+
+    assert published is False
+    assert index.is_stale()
+    assert index.query(["x"], [], []) == ["A"]
+
+    assert index.load(["A", "B"], [("x", "B")], index.generation) is True
+    assert not index.is_stale()
+    assert index.query(["x"], [], []) == ["B"]
@@ -0,0 +1,118 @@
+"""Tests for VersionController version comparison and content hashing."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+version_controller = pytest.importorskip("src.services.phase1.test_case_manager.version_controller")
+
+
+def _frame(steps, data=None):
+    return pd.DataFrame({
+        "TEST CASE NUMBER": ["TC-1"] * len(steps),
+        "STEP NO": list(range(1, len(steps) + 1)),
+        "TEST STEP DESCRIPTION": steps,
+        "DATA": data if data is not None else [float(len(step)) for step in steps],
+        "EXPECTED RESULT": [f"{step} works" for step in steps],
+    })
+
+
+@pytest.fixture
+def controller(tmp_path):
+    return version_controller.VersionController(version_store_path=str(tmp_path / "versions"))
+
+
+def _check_in(controller, tmp_path, df, name):
+    path = tmp_path / f"{name}.xlsx"
+    df.to_excel(path, index=False)
+    return controller.create_new_version(str(path), notify_owner=False)["version"]
+
+
+def test_compare_versions_output_is_json_serializable(controller, tmp_path):
+    steps = [f"step {i}" for i in range(20)]
+    v1 = _check_in(controller, tmp_path, _frame(steps), "v1")
+
+    # Modify, insert, remove and move steps
+    changed = list(steps)
+    changed[2] = "step 2 reworded"
+    changed.insert(10, "new step")
+    changed.remove("step 15")
+    changed.append(changed.pop(6))
+    v2 = _check_in(controller, tmp_path, _frame(changed), "v2")
+
+    comparison = controller.compare_versions("TC-1", v1, v2)
+
+    assert all(comparison["summary"][key] for key in ("added", "removed", "modified", "moved"))
+    decoded = json.loads(json.dumps(comparison))
+    assert decoded == comparison
+    for group in ("added_steps", "removed_steps", "modified_steps", "moved_steps"):
+        for step in comparison[group]:
+            assert type(step["step_no"]) is int
+
+
+def test_diff_details_use_native_types():
+    df1 = _frame(["a", "b"], data=[np.float64(1.5), np.nan])
+    df2 = _frame(["a", "b", "c"], data=[np.float64(1.5), np.nan, np.float64(2.0)])
+
+    comparison = version_controller.diff_test_case_frames(df1, df2)
+
+    (added,) = comparison["added_steps"]
+    assert added["step_no"] == 3 and type(added["step_no"]) is int
+    assert added["details"] == {
+        "TEST CASE NUMBER": "TC-1",
+        "STEP NO": 3,
+        "TEST STEP DESCRIPTION": "c",
+        "DATA": 2.0,
+        "EXPECTED RESULT": "c works",
+    }
+    assert all(type(value) in (str, int, float) for value in added["details"].values())
+
+
+def _hash(df):
+    return version_controller.hash_test_case_frame(df)[0]
+
+
+def test_hash_ignores_representation_details(tmp_path):
+    df = _frame([f"step {i}" for i in range(5)])
+    expected = _hash(df)
+
+    assert _hash(df[list(reversed(df.columns))]) == expected
+    assert _hash(df.assign(**{"STEP NO": df["STEP NO"].astype(float)})) == expected
+
+    with pd.option_context("display.precision", 2, "display.max_colwidth", 3):
+        assert _hash(df) == expected
+
+    path = tmp_path / "round_trip.xlsx"
+    df.to_excel(path, index=False)
+    assert _hash(pd.read_excel(path)) == expected
+
+
+def test_hash_treats_all_empty_cells_alike():
+    df = _frame(["a", "b"])
+    with_none = df.astype(object).assign(DATA=[1.0, None])
+    with_nan = df.assign(DATA=[1.0, np.nan])
+
+    assert _hash(with_none) == _hash(with_nan)
+
+
+def test_hash_separates_values_that_print_alike():
+    df = _frame(["a", "b"])
+
+    assert _hash(df.assign(DATA=["1", "2"])) != _hash(df.assign(DATA=[1, 2]))
+    assert _hash(df.assign(DATA=["", ""])) != _hash(df.assign(DATA=[None, None]))
+    # Cells are length-prefixed, so moving text into the neighbouring column changes the hash
+    shifted = df.assign(**{"TEST CASE NUMBER": ["TC-1a", "TC-1b"], "TEST STEP DESCRIPTION": ["", ""]})
+    assert _hash(shifted) != _hash(df)
+
+
+def test_row_hashes_ignore_step_numbers():
+    df = _frame(["a", "b", "c"])
+    renumbered = df.assign(**{"STEP NO": [10, 20, 30]})
+
+    root, rows = version_controller.hash_test_case_frame(df)
+    renumbered_root, renumbered_rows = version_controller.hash_test_case_frame(renumbered)
+
+    assert rows == renumbered_rows and len(rows) == 3
+    assert root != renumbered_root
@@ -0,0 +1,96 @@
+"""Tests for delta and keyframe encoding of test case versions."""
+
+import pandas as pd
+import pytest
+
+version_delta = pytest.importorskip("src.persistence.storage.version_delta")
+
+
+def _frame(steps):
+    return pd.DataFrame({
+        "TEST CASE NUMBER": ["TC-1"] * len(steps),
+        "STEP NO": list(range(1, len(steps) + 1)),
+        "TEST STEP DESCRIPTION": steps,
+        "EXPECTED RESULT": [f"{step} works" for step in steps],
+    })
+
+
+def _edits():
+    """Successive versions of one test case: edits, inserts, deletes, moves and a new column."""
+    steps = [f"step {i}" for i in range(20)]
+    yield _frame(steps)
+
+    steps[3] = "step 3 reworded"
+    yield _frame(steps)
+
+    steps.insert(10, "new step")
+    yield _frame(steps)
+
+    del steps[0:2]
+    yield _frame(steps)
+
+    steps.append(steps.pop(5))
+    yield _frame(steps)
+
+    df = _frame(steps)
+    df["DATA"] = [None] * (len(df) - 1) + [42.5]
+    yield df
+
+
+def test_snapshot_round_trip_keeps_values_and_dtypes():
+    df = pd.DataFrame({
+        "STEP NO": [1, 2, 3],
+        "WEIGHT": [0.5, None, 2.0],
+        "TEXT": ["a", None, "c"],
+        "WHEN": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01"]),
+        "FLAG": [True, False, True],
+    })
+
+    decoded = version_delta.decode_frame(version_delta.unpack(version_delta.pack(version_delta.encode_frame(df))))
+
+    pd.testing.assert_frame_equal(decoded, df, check_dtype=False)
+    assert [str(dtype) for dtype in decoded.dtypes[["STEP NO", "WEIGHT", "WHEN", "FLAG"]]] == \
+        [str(dtype) for dtype in df.dtypes[["STEP NO", "WEIGHT", "WHEN", "FLAG"]]]
+
+
+def test_chained_deltas_rebuild_every_version():
+    snapshots = [version_delta.encode_frame(df) for df in _edits()]
+
+    rebuilt = version_delta.unpack(version_delta.pack(snapshots[0]))
+    for target in snapshots[1:]:
+        delta = version_delta.unpack(version_delta.pack(version_delta.diff_snapshots(rebuilt, target)))
+        rebuilt = version_delta.apply_delta(rebuilt, delta)
+        assert rebuilt == target
+
+
+def test_small_edit_produces_small_delta():
+    frames = list(_edits())
+    base, target = version_delta.encode_frame(frames[0]), version_delta.encode_frame(frames[1])
+
+    delta = version_delta.diff_snapshots(base, target)
+
+    assert [op[0] for op in delta["ops"]] == ["copy", "patch", "copy"]
+    assert len(version_delta.pack(delta)) < len(version_delta.pack(target))
+
+
+def test_version_controller_stores_deltas_between_keyframes(tmp_path):
+    version_controller = pytest.importorskip("src.services.phase1.test_case_manager.version_controller")
+    controller = version_controller.VersionController(
+        version_store_path=str(tmp_path / "versions"), keyframe_interval=3
+    )
+
+    frames = list(_edits())
+    versions = []
+    for index, df in enumerate(frames):
+        path = tmp_path / f"TC-1-{index}.xlsx"
+        df.to_excel(path, index=False)
+        versions.append(controller.create_new_version(str(path), notify_owner=False)["version"])
+
+    entries = [controller.version_store.get_version("TC-1", version) for version in versions]
+    assert [entry["encoding"] for entry in entries] == ["keyframe", "delta", "delta"] * 2
+    assert [entry["chain_length"] for entry in entries] == [0, 1, 2] * 2
+
+    for index, version in enumerate(versions):
+        expected = controller.load_test_case(str(tmp_path / f"TC-1-{index}.xlsx"))
+        stored = controller.get_test_case_version("TC-1", version)
+        assert version_delta.encode_frame(stored)["rows"] == version_delta.encode_frame(expected)["rows"]